@@ -0,0 +1,108 @@
+# Атомарная запись файлов: временный файл рядом с целевым + os.replace.
+import itertools
+import os
+import threading
+
+_temp_counter = itertools.count()
+_temp_lock = threading.Lock()
+
+
+def _temp_path(file_path: str) -> str:
+    with _temp_lock:
+        number = next(_temp_counter)
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{number}.tmp")
+
+
+def _write_temp_file(file_path: str, data: bytes) -> str:
+    """
+    Записывает data во временный файл в той же директории (os.replace атомарен только в пределах одного диска).
+    Права создаваемого файла - как у обычного open(..., 'w') с учётом umask.
+    """
+    temp_path = _temp_path(file_path)
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    return temp_path
+
+
+def _fsync_file(file_path: str):
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: str):
+    """Фиксирует на диске сам факт переименования. На Windows директорию открыть нельзя - пропускаем."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(file_path: str):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def _to_bytes(data, encoding: str) -> bytes:
+    return data.encode(encoding) if isinstance(data, str) else data
+
+
+def atomic_write(file_path: str, data: str | bytes, encoding: str = "utf-8", fsync: bool = False):
+    """
+    Атомарно заменяет содержимое file_path: читатель видит либо старый файл целиком, либо новый целиком.
+
+    :param file_path: Путь к целевому файлу
+    :param data: Новое содержимое (str кодируется в encoding)
+    :param encoding: Кодировка для str
+    :param fsync: True - дождаться записи данных на диск (защита от потери питания, а не только от падения процесса)
+    """
+    atomic_write_many([(file_path, data)], encoding=encoding, fsync=fsync)
+
+
+def atomic_write_many(files: list[tuple[str, str | bytes]], encoding: str = "utf-8", fsync: bool = True):
+    """
+    Пакетная атомарная запись нескольких файлов с одним барьером fsync:
+    сначала пишутся все временные файлы, затем они сбрасываются на диск одним проходом,
+    затем все переименовываются, и в конце один раз сбрасывается каждая затронутая директория.
+
+    :param files: [(путь к файлу, содержимое), ...]
+    :param encoding: Кодировка для str
+    :param fsync: False - только атомарность замены, без ожидания диска
+    """
+    temp_files: list[tuple[str, str]] = []
+    try:
+        for file_path, data in files:
+            temp_files.append((_write_temp_file(file_path, _to_bytes(data, encoding)), file_path))
+        if fsync:
+            for temp_path, _ in temp_files:
+                _fsync_file(temp_path)
+    except BaseException:
+        for temp_path, _ in temp_files:
+            _remove_quietly(temp_path)
+        raise
+
+    replaced = 0
+    try:
+        for temp_path, file_path in temp_files:
+            os.replace(temp_path, file_path)
+            replaced += 1
+    finally:
+        for temp_path, _ in temp_files[replaced:]:
+            _remove_quietly(temp_path)
+
+    if fsync:
+        for directory in dict.fromkeys(os.path.dirname(file_path) for _, file_path in temp_files):
+            _fsync_directory(directory)
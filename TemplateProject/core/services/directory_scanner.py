@@ -0,0 +1,110 @@
+# Потоковый обход директорий на os.scandir
+import heapq
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Iterator
+
+from TemplateProject.core.services.path_matcher import PathMatcher
+
+_NATURAL_SPLIT = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=1 << 18)
+def natural_name_key(name: str) -> list:
+    """
+    Ключ естественной сортировки по имени файла без расширения: "2" < "10".
+    Ключи кэшируются - одни и те же имена ("1.png", "1.exe", ...) встречаются во многих папках
+    и при каждом открытии проекта. Возвращаемый список не изменять.
+    """
+    dot = name.rfind(".")
+    # Быстрый путь os.path.splitext для имён без точки в начале
+    stem = name[:dot] if dot > 0 and name[0] != "." else os.path.splitext(name)[0]
+    parts = _NATURAL_SPLIT.split(stem.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+def natural_key(path: str) -> list:
+    """Ключ естественной сортировки полного пути - по имени файла"""
+    return natural_name_key(path.rsplit("/", 1)[-1])
+
+
+def scan_files(
+    root: str,
+    extension_filter: str | None = None,
+    max_depth: int | None = None,
+    name_filter: Callable[[str], bool] | None = None,
+    exclude: PathMatcher | None = None
+) -> Iterator[str]:
+    """
+    Генератор путей файлов в root в порядке os.walk (сначала файлы папки, затем вложенные папки).
+    Пути собираются через "/", без replace("\\\\", "/") для каждого файла.
+
+    :param root: Директория обхода
+    :param extension_filter: Окончание имени файла, например "json" или ".exe" (без учёта регистра)
+    :param max_depth: Глубина обхода: 0 - только файлы root, None - без ограничения
+    :param name_filter: Дополнительная проверка имени файла
+    :param exclude: Исключения .gitignore (PathMatcher) - исключённые папки не обходятся
+    """
+    root = root.replace("\\", "/").rstrip("/") or "/"
+    extension = extension_filter.lower() if extension_filter else None
+    exclude = exclude or None
+    root_length = len(root) + 1
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        prefix = directory[root_length:] + "/" if len(directory) > root_length else ""
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Как os.walk: недоступные папки пропускаются
+            continue
+        sub_directories = []
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Ссылки на папки, как в os.walk(followlinks=False), не обходятся и файлами не считаются
+                    if (max_depth is None or depth < max_depth) and not entry.is_symlink() \
+                            and (exclude is None or not exclude.excludes_dir(prefix + entry.name)):
+                        sub_directories.append(f"{directory}/{entry.name}")
+                    continue
+                name = entry.name
+                if extension and not name.lower().endswith(extension):
+                    continue
+                if name_filter is not None and not name_filter(name):
+                    continue
+                if exclude is not None and exclude.excludes_file(
+                        prefix + name, entry.stat().st_size if exclude.max_file_size is not None else None):
+                    continue
+                yield f"{directory}/{name}"
+        stack.extend((sub_directory, depth + 1) for sub_directory in reversed(sub_directories))
+
+
+def list_files(
+    root: str,
+    extension_filter: str | None = None,
+    max_depth: int | None = None,
+    limit: int | None = None,
+    exclude: PathMatcher | None = None
+) -> list[str]:
+    """
+    Файлы root в естественном порядке имён ("1", "2", ..., "10").
+
+    :param limit: Вернуть только первые limit файлов - выбираются через heapq.nsmallest,
+                  без сортировки всего списка
+    :param exclude: Исключения .gitignore (PathMatcher)
+    """
+    files = scan_files(root, extension_filter=extension_filter, max_depth=max_depth, exclude=exclude)
+    if limit is not None:
+        return heapq.nsmallest(limit, files, key=natural_key)
+    return sorted(files, key=natural_key)
+
+
+def has_files(root: str, extension_filter: str | None = None) -> bool:
+    """Есть ли в root хотя бы один файл - обход останавливается на первом найденном"""
+    return next(scan_files(root, extension_filter=extension_filter), None) is not None
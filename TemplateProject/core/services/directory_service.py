@@ -1,12 +1,10 @@
 # Основные операции над путями
 import os
-import re
 import shutil
 import subprocess
 import sys
 import time
 import zipfile
-import os
 from pathlib import Path
 
 # pip install pywin32
@@ -16,6 +14,10 @@ from win32comext.shell import shell
 import pythoncom
 import win32com.client
 
+from TemplateProject.core.services import directory_scanner
+from TemplateProject.core.services.file_index_service import FileIndexService
+from TemplateProject.core.services.path_matcher import PathMatcher
+
 
 class DirectoryService:
     def __init__(self, full_base_directory, starry_dir=False):
@@ -83,32 +85,27 @@ class DirectoryService:
 
         return exe_path
 
-    def list_files(self, extension_filter: str | None = None, directory: str | None = None) -> list[str]:
+    def list_files(
+        self,
+        extension_filter: str | None = None,
+        directory: str | None = None,
+        max_depth: int | None = None,
+        limit: int | None = None,
+        exclude: PathMatcher | list[str] | None = None
+    ) -> list[str]:
         """
         Lists all files in the base directory (or in `directory` if задано),
         optionally filtering by file extension, и возвращает их в естественном
         (numeric) порядке, чтобы "1", "2", ..., "10", "11" шли правильно.
+
+        :param max_depth: Глубина обхода: 0 - только файлы самой директории, None - все вложенные
+        :param limit: Вернуть только первые limit файлов в естественном порядке
+        :param exclude: Шаблоны .gitignore или PathMatcher - исключённые папки не обходятся
         """
-        root = directory or self.base_directory
-        files: list[str] = []
-
-        for dirpath, _, filenames in os.walk(root):
-            for fn in filenames:
-                if not extension_filter or fn.lower().endswith(extension_filter.lower()):
-                    files.append(os.path.join(dirpath, fn).replace("\\", "/"))
-
-        # natural sort: разбиваем имя (без расширения) на текст и числа
-        def natural_key(path: str):
-            name = os.path.splitext(os.path.basename(path))[0]
-            parts = re.split(r'(\d+)', name)
-            return [
-                int(part) if part.isdigit() else part.lower()
-                for part in parts
-            ]
-
-        files.sort(key=natural_key)
-        # print("list_files", files)
-        return files
+        if exclude is not None and not isinstance(exclude, PathMatcher):
+            exclude = PathMatcher(exclude)
+        return directory_scanner.list_files(directory or self.base_directory, extension_filter=extension_filter,
+                                            max_depth=max_depth, limit=limit, exclude=exclude)
 
     def name_list_files(self, extension_filter=None):
         """
@@ -132,8 +129,7 @@ class DirectoryService:
         """
         directory_path = os.path.join(self.base_directory, directory_name).replace("\\", "/")
         if os.path.exists(directory_path):
-            print(self.list_files(directory=directory_path))
-            if not self.list_files(directory=directory_path):
+            if not directory_scanner.has_files(directory_path):
                 shutil.rmtree(directory_path)
                 return True
             else:
@@ -310,22 +306,22 @@ class DirectoryService:
     def search_files(self, keyword):
         """
         Searches for files containing the specified keyword in their name.
+        Поиск идёт по постоянному индексу имён (FileIndexService), дерево заново не обходится.
         """
-        result = []
-        for root, _, filenames in os.walk(self.base_directory):
-            for file in filenames:
-                if keyword in file:
-                    result.append(os.path.join(root, file).replace("\\", "/"))
-        return result
+        return FileIndexService.for_root(self.base_directory).search_files(keyword)
 
     def get_directories(self):
         return [d for d in os.listdir(self.base_directory) if os.path.isdir(os.path.join(self.base_directory, d))]
 
-    def move_directory_to_create_zip_file(self, target_directory, archive_name, archive_extension):
+    def move_directory_to_create_zip_file(self, target_directory, archive_name, archive_extension, exclude=None):
         """
         Обходит folder_path и упаковывает все файлы в archive_path.
         Сохраняет структуру вложенных папок.
+
+        :param exclude: Шаблоны .gitignore или PathMatcher - исключённые папки не обходятся
         """
+        if exclude is not None and not isinstance(exclude, PathMatcher):
+            exclude = PathMatcher(exclude)
 
         target_directory = target_directory + f'/{archive_name}.{archive_extension}'
         print(target_directory)
@@ -334,6 +330,10 @@ class DirectoryService:
 
         with zipfile.ZipFile(target_directory, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
             for root, dirs, files in os.walk(self.base_directory):
+                if exclude:
+                    rel_dir = os.path.relpath(root, start=self.base_directory).replace("\\", "/")
+                    dirs[:] = exclude.filter_dirs(rel_dir, dirs)
+                    files = exclude.filter_files(rel_dir, files, root)
                 for file in files:
                     full_path = os.path.join(root, file)
                     # Делаем относительный путь, чтобы не складывать абсолютные пути в архив
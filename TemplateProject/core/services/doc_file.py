@@ -0,0 +1,401 @@
+# Загруженный в память json документ (DSDocFile.json, FSDocFile.json) с проверкой актуальности по mtime.
+import os
+
+from TemplateProject.core.services.doc_sidecar import CHANGE_DELETE, CHANGE_MERGE, CHANGE_SET, DocSidecar, has_sidecar
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.file_transaction import FileTransaction
+from TemplateProject.core.services.json_file_service import copy_json_data, deep_merge_dicts
+from TemplateProject.core.services.log_service import get_logger
+
+_MISSING = object()
+
+
+class DocFile:
+    """
+    Json документ, который читается с диска один раз и дальше живёт в памяти.
+
+    Чтение (get) - обращение к словарю; перед ним сравнивается (st_mtime_ns, st_size) файла с тем,
+    что было при загрузке или последней записи: если файл изменили снаружи, документ перечитывается.
+    Изменение (set, merge, delete, replace) меняет документ в памяти. С autoflush=True он сразу
+    записывается целиком (без повторного чтения, как в write_file(safeMode=True)), иначе - при flush().
+
+    Внутри FileService.transaction() запись уходит в транзакцию; до её завершения документ берётся
+    из памяти, после - перечитывается (при откате в памяти могли остаться отменённые изменения).
+    Считается, что в одной транзакции файл меняет только этот DocFile.
+
+    С sidecar=True документ хранится ещё и двоичным снимком с журналом изменений (DocSidecar):
+    flush() дописывает в журнал только изменения, json и снимок перезаписываются целиком при уплотнении
+    журнала (compact). Внутри транзакции запись идёт в json, как без sidecar.
+    Документ, у которого снимок уже есть, читается и пишется через журнал и с sidecar=False: json такого
+    документа может быть старее журнала, а запись json в обход журнала отбросила бы его изменения.
+
+    :param file_service: FileService json файла
+    :param autoflush: True - записывать файл после каждого изменения
+    :param sidecar: True - создать двоичный снимок и журнал изменений рядом с json, если их ещё нет
+    """
+
+    def __init__(self, file_service: FileService, autoflush: bool = True, sidecar: bool = False):
+        self.logger = get_logger("DocFile")
+        self.file_service = file_service
+        self.file_path = file_service.get_file_path()
+        self.autoflush = autoflush
+        self.create_sidecar = sidecar
+        self.sidecar = DocSidecar(self.file_path) if sidecar or has_sidecar(self.file_path) else None
+        self.dirty = False
+        self.__data = None
+        self.__signature = None
+        self.__transaction = None
+        # Записи журнала sidecar, ещё не записанные на диск; None - документ нужно записать целиком
+        self.__records = []
+
+    def __stat(self):
+        if self.sidecar is not None:
+            return self.sidecar.signature()
+        if has_sidecar(self.file_path):
+            # Рядом с json появился снимок - документ перечитывается через журнал
+            return None
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __fresh(self) -> bool:
+        if self.__data is None:
+            return False
+        if self.dirty:
+            # Несохранённые изменения важнее файла на диске
+            return True
+        transaction = FileTransaction.current()
+        if self.__transaction is not None:
+            if transaction is self.__transaction:
+                return True
+            self.__transaction = None
+            return False
+        if transaction is not None and transaction.has_document(self.file_path):
+            return False
+        return self.__signature is not None and self.__signature == self.__stat()
+
+    def __load(self, required: bool = True) -> dict:
+        if self.__fresh():
+            return self.__data
+        transaction = FileTransaction.current()
+        if transaction is not None and transaction.has_document(self.file_path):
+            self.__data = transaction.read(self.file_path)
+            self.__transaction = transaction
+            self.__signature = None
+            return self.__data
+        data, signature = self.__read()
+        if data is None:
+            if required:
+                raise FileNotFoundError(f"File not found: {self.file_path}")
+            # Как write_file(safeMode=True): изменения несуществующего файла начинаются с пустого документа
+            self.__data, self.__signature = {}, None
+            self.__records = None
+            return self.__data
+        self.__data, self.__signature = data, signature
+        self.__records = []
+        return self.__data
+
+    def __read(self) -> tuple[dict | None, tuple | None]:
+        """:return: (документ, подпись файлов) или (None, None) - файла нет"""
+        if not self.create_sidecar:
+            if self.sidecar is None and has_sidecar(self.file_path):
+                self.sidecar = DocSidecar(self.file_path)
+            elif self.sidecar is not None and not has_sidecar(self.file_path):
+                self.sidecar = None
+        if self.sidecar is not None:
+            data = self.sidecar.load(self.__read_json)
+            return data, self.__stat()
+        signature = self.__stat()
+        if signature is None:
+            return None, None
+        return self.__read_json(), signature
+
+    def __read_json(self) -> dict:
+        self.logger.info("[📁] - DocFile - __read_json - Чтение документа %s", self.file_path)
+        data = self.file_service.read_file()[1]
+        if not isinstance(data, dict):
+            raise ValueError(f"В файле не json документ: {self.file_path}")
+        return data
+
+    def invalidate(self):
+        """Забыть документ (файл создан, удалён или перезаписан в обход DocFile)"""
+        self.__data = None
+        self.__signature = None
+        self.__transaction = None
+        self.__records = []
+        self.dirty = False
+
+    @property
+    def data(self) -> dict:
+        """Документ целиком. Не изменять напрямую - только через set/merge/delete/replace"""
+        return self.__load()
+
+    def exists(self) -> bool:
+        return self.dirty or self.file_service.file_exists()
+
+    # --- чтение ---
+    def get(self, *keys, default=_MISSING):
+        """
+        Значение по пути ключей: get("Directory", "Details", "Priority").
+        :raise KeyError: Нет ключа и не задан default
+        """
+        value = self.__load()
+        try:
+            for key in keys:
+                value = value[key]
+        except (KeyError, TypeError, IndexError):
+            if default is _MISSING:
+                raise KeyError(keys[-1] if keys else None)
+            return default
+        return value
+
+    def get_copy(self, *keys, default=_MISSING):
+        """get(), но копия: её можно менять, не затрагивая документ"""
+        return copy_json_data(self.get(*keys, default=default))
+
+    # --- изменение ---
+    def set(self, *keys_and_value):
+        """set("Directory", "Details", "Priority", "1") - недостающие словари по пути создаются"""
+        *keys, value = keys_and_value
+        if not keys:
+            raise ValueError("Не указан путь ключей")
+        document = self.__load(required=False)
+        for key in keys[:-1]:
+            document = document.setdefault(key, {})
+        document[keys[-1]] = copy_json_data(value)
+        self.__changed(CHANGE_SET, keys, value)
+
+    def merge(self, content: dict):
+        """Рекурсивное объединение с документом - то же, что write_file(content, safeMode=True)"""
+        if not isinstance(content, dict):
+            raise ValueError("Content for JSON files must be a dictionary.")
+        deep_merge_dicts(self.__load(required=False), copy_json_data(content))
+        self.__changed(CHANGE_MERGE, (), content)
+
+    def delete(self, *keys):
+        """:raise KeyError: Нет ключа"""
+        parent = self.get(*keys[:-1]) if len(keys) > 1 else self.__load()
+        del parent[keys[-1]]
+        self.__changed(CHANGE_DELETE, keys)
+
+    def replace(self, content: dict):
+        """Документ целиком - то же, что write_file(content)"""
+        if not isinstance(content, dict):
+            raise ValueError("Content for JSON files must be a dictionary.")
+        self.__load(required=False)
+        self.__data = copy_json_data(content)
+        # Документ заменён целиком - журнал не нужен, документ записывается целиком
+        self.__records = None
+        self.__changed()
+
+    def _changed(self, kind: int | None, keys, value):
+        """Документ изменён через set/merge/delete (kind - CHANGE_*) или replace (kind=None) - для наследников"""
+
+    def __changed(self, kind: int | None = None, keys=(), value=None):
+        self.dirty = True
+        self._changed(kind, keys, value)
+        if self.sidecar is not None and self.__records is not None:
+            if self.sidecar.loaded:
+                self.__records.append(self.sidecar.encode_change(kind, keys, value))
+            else:
+                self.__records = None
+        if self.autoflush:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Записывает документ, если он изменён. :return: True - файл записан"""
+        if not self.dirty:
+            return False
+        transaction = FileTransaction.current()
+        records = self.__records
+        if self.sidecar is not None and transaction is None and records is not None \
+                and not self.sidecar.compaction_due(sum(map(len, records))):
+            self.sidecar.append(records)
+        else:
+            self.file_service.write_file(self.__data)
+            if self.sidecar is not None and transaction is None:
+                self.sidecar.compact(self.__data)
+        self.__records = []
+        self.dirty = False
+        if transaction is not None:
+            self.__transaction = transaction
+            self.__signature = None
+        else:
+            self.__signature = self.__stat()
+        return True
+
+    def compact(self) -> bool:
+        """
+        Уплотнение sidecar: json и двоичный снимок записываются целиком, журнал очищается.
+        Без sidecar и внутри транзакции - то же, что flush().
+        :return: True - документ записан
+        """
+        if self.sidecar is None or FileTransaction.current() is not None:
+            return self.flush()
+        self.__load(required=False)
+        if not (self.dirty or self.file_service.file_exists()):
+            return False
+        self.__records = None
+        self.dirty = True
+        return self.flush()
+
+
+class SubdirectoryIndex:
+    """
+    Индексы SubdirectoryInfo: следующий свободный SdN (наибольший + 1), Dirname -> SdN, DetailName -> SdN.
+    Строится один раз за O(n), дальше добавление, поиск и удаление - O(1).
+
+    :param subdirectories: {SdN: {"Dirname", "DetailName", "DocFile"}}
+    """
+
+    def __init__(self, subdirectories: dict):
+        self.subdirectories = subdirectories
+        self.next_sdn = 0
+        self.by_dirname: dict[str, dict[str, None]] = {}
+        self.by_detail_name: dict[str, dict[str, None]] = {}
+        # Порядок SdN в документе: поиск возвращает первое совпадение, как перебор SubdirectoryInfo
+        self.order: dict[str, int] = {}
+        self.__counter = 0
+        for sdn, entry in subdirectories.items():
+            self.add(sdn, entry)
+
+    @staticmethod
+    def __names(entry) -> tuple:
+        if not isinstance(entry, dict):
+            return None, None
+        return entry.get("Dirname"), entry.get("DetailName")
+
+    def add(self, sdn: str, entry: dict):
+        """SdN добавлен в документ (или его Dirname, DetailName изменены - после remove)"""
+        if sdn not in self.order:
+            self.order[sdn] = self.__counter
+            self.__counter += 1
+        self.next_sdn = max(self.next_sdn, int(sdn) + 1)
+        dirname, detail_name = self.__names(entry)
+        if dirname is not None:
+            self.by_dirname.setdefault(dirname, {})[sdn] = None
+        if detail_name is not None:
+            self.by_detail_name.setdefault(detail_name, {})[sdn] = None
+
+    def remove(self, sdn: str, entry: dict, deleted: bool = True):
+        """
+        :param entry: Значение SdN до изменения
+        :param deleted: True - SdN удалён из документа, False - будет добавлен заново (add) с новыми значениями
+        """
+        dirname, detail_name = self.__names(entry)
+        for index, name in ((self.by_dirname, dirname), (self.by_detail_name, detail_name)):
+            sdns = index.get(name)
+            if sdns is not None:
+                sdns.pop(sdn, None)
+                if not sdns:
+                    del index[name]
+        if not deleted:
+            return
+        del self.order[sdn]
+        # Как max(SubdirectoryInfo) + 1: после удаления последнего SdN номер освобождается.
+        # Каждый шаг назад отменяет один шаг вперёд, поэтому в среднем O(1)
+        while self.next_sdn > 0 and str(self.next_sdn - 1) not in self.subdirectories:
+            self.next_sdn -= 1
+
+    def __first(self, sdns: dict | None) -> str | None:
+        if not sdns:
+            return None
+        if len(sdns) == 1:
+            return next(iter(sdns))
+        return min(sdns, key=self.order.__getitem__)
+
+    def sdn_by_dirname(self, dirname: str) -> str | None:
+        return self.__first(self.by_dirname.get(dirname))
+
+    def sdn_by_detail_name(self, detail_name: str) -> str | None:
+        return self.__first(self.by_detail_name.get(detail_name))
+
+    def find(self, name: str) -> tuple[str, str] | tuple[None, None]:
+        """Первый по порядку документа SdN, у которого Dirname или DetailName равен name: (name, SdN)"""
+        candidates = [sdn for sdn in (self.sdn_by_dirname(name), self.sdn_by_detail_name(name)) if sdn is not None]
+        if not candidates:
+            return None, None
+        return name, min(candidates, key=self.order.__getitem__)
+
+
+class DirectoryDocFile(DocFile):
+    """DSDocFile.json: {"Directory": {"Dirname", "Description", "Details": {...}, "SubdirectoryInfo": {SdN: {...}}, "SubdirectoryNonIndex"}}"""
+    _SUBDIRECTORIES_PATH = ("Directory", "SubdirectoryInfo")
+
+    def __init__(self, file_service: FileService, autoflush: bool = True, sidecar: bool = False):
+        super().__init__(file_service, autoflush=autoflush, sidecar=sidecar)
+        self.__index = None
+        self.__index_data = None
+
+    def _changed(self, kind, keys, value):
+        if kind == CHANGE_MERGE:
+            directory = value.get("Directory")
+            touched = isinstance(directory, dict) and "SubdirectoryInfo" in directory
+        elif kind is not None:
+            # Путь ведёт в SubdirectoryInfo или заменяет его вместе с родителем
+            depth = min(len(keys), len(self._SUBDIRECTORIES_PATH))
+            touched = tuple(keys[:depth]) == self._SUBDIRECTORIES_PATH[:depth]
+        else:
+            touched = True
+        if touched:
+            self.__index = None
+
+    def subdirectory_index(self) -> SubdirectoryIndex:
+        """Индексы SubdirectoryInfo; перестраиваются, если документ перечитан или SubdirectoryInfo изменён в обход них"""
+        data = self.data
+        if self.__index is None or self.__index_data is not data:
+            self.__index = SubdirectoryIndex(self.subdirectories())
+            self.__index_data = data
+        return self.__index
+
+    def set_subdirectory(self, sdn: str, values: dict):
+        """Объединяет values с SubdirectoryInfo[SdN] (SdN создаётся, если его нет) и обновляет индексы"""
+        index = self.subdirectory_index()
+        old = index.subdirectories.get(sdn)
+        if old is not None:
+            old = dict(old) if isinstance(old, dict) else old
+        self.merge({"Directory": {"SubdirectoryInfo": {sdn: values}}})
+        if old is not None:
+            index.remove(sdn, old, deleted=False)
+        index.add(sdn, index.subdirectories[sdn])
+        self.__index = index
+
+    def remove_subdirectory(self, sdn: str):
+        """:raise KeyError: Нет SdN"""
+        index = self.subdirectory_index()
+        old = index.subdirectories[sdn]
+        self.delete("Directory", "SubdirectoryInfo", sdn)
+        index.remove(sdn, old)
+        self.__index = index
+
+    def directory(self, tag: str, default=_MISSING):
+        return self.get("Directory", tag, default=default)
+
+    def detail(self, tag: str, default=_MISSING):
+        return self.get("Directory", "Details", tag, default=default)
+
+    def set_detail(self, tag: str, value):
+        self.set("Directory", "Details", tag, value)
+
+    def subdirectories(self) -> dict:
+        """{SdN: {"Dirname", "DetailName", "DocFile"}}"""
+        return self.get("Directory", "SubdirectoryInfo")
+
+    def non_index(self):
+        """Список не индексируемых поддиректорий ("" - ещё ни одной)"""
+        return self.get("Directory", "SubdirectoryNonIndex")
+
+
+class FilesDocFile(DocFile):
+    """FSDocFile.json: {"Files": {"SystemFiles" | "UserFiles" | "NonIndexedFiles": {file_id: {"DirName", "DetailName", "FileDetails"}}}}"""
+
+    def files(self, file_type: str) -> dict:
+        return self.get("Files", file_type)
+
+    def file(self, file_type: str, file_id: str) -> dict:
+        return self.get("Files", file_type, file_id)
+
+    def file_detail(self, file_type: str, file_id: str, tag: str):
+        return self.get("Files", file_type, file_id, "FileDetails", tag)
@@ -0,0 +1,401 @@
+# Двоичный снимок json документа (DSDocFile, FSDocFile) с журналом изменений рядом с ним.
+import os
+import struct
+import zlib
+
+from TemplateProject.core.services.atomic_file_service import atomic_write
+from TemplateProject.core.services.json_file_service import deep_merge_dicts
+from TemplateProject.core.services.log_service import get_logger
+from TemplateProject.core.services.metadata_service import MetadataService
+
+SNAPSHOT_EXTENSION = "bin"
+LOG_EXTENSION = "log"
+SNAPSHOT_MAGIC = b"MGSDSNP1"
+LOG_MAGIC = b"MGSDLOG1"
+LOG_HEADER = struct.Struct("<8sQ")  # magic, поколение снимка
+RECORD_HEADER = struct.Struct("<II")  # длина записи, crc32
+
+# Типы значений
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _EMPTY_STR, _LIST, _DICT = range(9)
+_FLOAT_STRUCT = struct.Struct("<d")
+# Ключи словарей: 0.._MAX_KEYS-1 - номер тега из таблицы ключей снимка, иначе ID или строка
+_KEY_ID = 0xFE
+_KEY_STR = 0xFF
+_MAX_KEYS = 0xFE
+
+# Изменения документа в журнале: [вид, путь ключей, значение]
+CHANGE_SET, CHANGE_MERGE, CHANGE_DELETE = range(3)
+
+
+def sidecar_paths(json_path: str) -> tuple[str, str]:
+    """DSDocFile.json -> (DSDocFile.bin, DSDocFile.log)"""
+    base = os.path.splitext(json_path)[0]
+    return f"{base}.{SNAPSHOT_EXTENSION}", f"{base}.{LOG_EXTENSION}"
+
+
+def has_sidecar(json_path: str) -> bool:
+    return os.path.exists(sidecar_paths(json_path)[0])
+
+
+def schema_keys() -> list[str]:
+    """Имена тегов из MetadataService.meta_tags в порядке объявления - ключи, которые кодируются одним байтом"""
+    keys = {}
+
+    def collect(value):
+        if isinstance(value, str):
+            keys.setdefault(value)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                collect(key)
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(MetadataService.meta_tags)
+    return list(keys)[:_MAX_KEYS]
+
+
+def _write_varint(out: bytearray, number: int):
+    while number > 0x7F:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    number = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+def _is_id(key: str) -> bool:
+    """Числовой ID без ведущих нулей ("0", "17") - хранится как число"""
+    return key.isdigit() and key.isascii() and (key == "0" or key[0] != "0")
+
+
+class SchemaCodec:
+    """
+    Компактная двоичная запись json-значений. Ключи-теги из таблицы (schema_keys) занимают один байт,
+    ID поддиректорий и файлов (SdN, file_id) - varint, строки и числа - длина/varint без кавычек и отступов.
+
+    Таблица ключей хранится в самом снимке: снимок, записанный до изменения meta_tags, читается той
+    таблицей, с которой был записан.
+
+    :param keys: Таблица ключей
+    """
+
+    def __init__(self, keys: list[str]):
+        if len(keys) > _MAX_KEYS:
+            raise ValueError(f"Не больше {_MAX_KEYS} ключей в таблице")
+        self.keys = list(keys)
+        self.index = {key: number for number, key in enumerate(self.keys)}
+
+    def encode(self, value) -> bytes:
+        out = bytearray()
+        self.__encode(value, out)
+        return bytes(out)
+
+    def decode(self, data: bytes, pos: int = 0) -> tuple[object, int]:
+        """:return: (значение, позиция после него)"""
+        return self.__decode(data, pos)
+
+    def __encode(self, value, out: bytearray):
+        if isinstance(value, str):
+            if not value:
+                out.append(_EMPTY_STR)
+                return
+            encoded = value.encode("utf-8")
+            out.append(_STR)
+            _write_varint(out, len(encoded))
+            out += encoded
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self.__encode_key(key, out)
+                self.__encode(item, out)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.__encode(item, out)
+        elif value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _FLOAT_STRUCT.pack(value)
+        else:
+            raise TypeError(f"Тип {type(value).__name__} не поддерживается в json документе")
+
+    def __encode_key(self, key, out: bytearray):
+        if not isinstance(key, str):
+            raise TypeError(f"Ключ json документа должен быть строкой: {key!r}")
+        number = self.index.get(key)
+        if number is not None:
+            out.append(number)
+        elif _is_id(key):
+            out.append(_KEY_ID)
+            _write_varint(out, int(key))
+        else:
+            encoded = key.encode("utf-8")
+            out.append(_KEY_STR)
+            _write_varint(out, len(encoded))
+            out += encoded
+
+    def __decode(self, data: bytes, pos: int):
+        kind = data[pos]
+        pos += 1
+        if kind == _EMPTY_STR:
+            return "", pos
+        if kind == _STR:
+            length, pos = _read_varint(data, pos)
+            return data[pos:pos + length].decode("utf-8"), pos + length
+        if kind == _DICT:
+            count, pos = _read_varint(data, pos)
+            result = {}
+            for _ in range(count):
+                key, pos = self.__decode_key(data, pos)
+                result[key], pos = self.__decode(data, pos)
+            return result, pos
+        if kind == _LIST:
+            count, pos = _read_varint(data, pos)
+            result = []
+            for _ in range(count):
+                item, pos = self.__decode(data, pos)
+                result.append(item)
+            return result, pos
+        if kind == _INT:
+            number, pos = _read_varint(data, pos)
+            return (number >> 1) if not number & 1 else -((number + 1) >> 1), pos
+        if kind == _NONE:
+            return None, pos
+        if kind == _TRUE:
+            return True, pos
+        if kind == _FALSE:
+            return False, pos
+        if kind == _FLOAT:
+            return _FLOAT_STRUCT.unpack_from(data, pos)[0], pos + _FLOAT_STRUCT.size
+        raise ValueError(f"Неизвестный тип значения {kind} в позиции {pos - 1}")
+
+    def __decode_key(self, data: bytes, pos: int):
+        kind = data[pos]
+        pos += 1
+        if kind < _MAX_KEYS:
+            return self.keys[kind], pos
+        if kind == _KEY_ID:
+            number, pos = _read_varint(data, pos)
+            return str(number), pos
+        length, pos = _read_varint(data, pos)
+        return data[pos:pos + length].decode("utf-8"), pos + length
+
+
+def apply_change(document: dict, kind: int, keys: list, value=None):
+    """Применяет изменение из журнала к документу - то же, что DocFile.set/merge/delete"""
+    if kind == CHANGE_SET:
+        for key in keys[:-1]:
+            document = document.setdefault(key, {})
+        document[keys[-1]] = value
+    elif kind == CHANGE_MERGE:
+        for key in keys:
+            document = document.setdefault(key, {})
+        deep_merge_dicts(document, value)
+    elif kind == CHANGE_DELETE:
+        for key in keys[:-1]:
+            document = document[key]
+        del document[keys[-1]]
+    else:
+        raise ValueError(f"Неизвестное изменение {kind}")
+
+
+def _stat(path: str):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DocSidecar:
+    """
+    Двоичная копия json документа: <имя>.bin - снимок документа (SchemaCodec), <имя>.log - журнал
+    изменений после снимка. Изменение тега дописывает в журнал одну короткую запись вместо перезаписи
+    json целиком; когда журнал вырастает больше снимка (и COMPACT_MIN_BYTES), документ уплотняется:
+    json и снимок записываются заново, журнал очищается.
+
+    json документ остаётся основным: снимок помнит (mtime, size) json, с которого он записан. Если json
+    изменили в обход журнала (другая программа, запись внутри FileService.transaction()), снимок
+    пересобирается из json, а не записанные в json изменения журнала отбрасываются. Поэтому DocFile
+    документа, у которого есть снимок, всегда работает через журнал (has_sidecar).
+
+    Запись журнала: длина, crc32, [вид, путь ключей, значение]. Оборванная при падении последняя запись
+    не применяется и отрезается при следующей записи. Журнал относится к поколению снимка - журнал
+    старого поколения (падение между записью снимка и журнала) не применяется.
+
+    :param json_path: Путь к json документу
+    :param fsync: True - дожидаться записи журнала и снимка на диск
+    """
+    COMPACT_MIN_BYTES = 64 * 1024
+
+    def __init__(self, json_path: str, fsync: bool = False):
+        self.logger = get_logger("DocSidecar")
+        self.json_path = json_path
+        self.snapshot_path, self.log_path = sidecar_paths(json_path)
+        self.fsync = fsync
+        self.codec: SchemaCodec | None = None
+        self.generation = 0
+        self.snapshot_size = 0
+        self.log_size = 0  # длина журнала без оборванного хвоста
+
+    @property
+    def loaded(self) -> bool:
+        """Снимок прочитан или записан - изменения можно дописывать в журнал"""
+        return self.codec is not None
+
+    def signature(self) -> tuple:
+        """(json, снимок, журнал) - (st_mtime_ns, st_size) или None, для проверки актуальности в DocFile"""
+        return _stat(self.json_path), _stat(self.snapshot_path), _stat(self.log_path)
+
+    def load(self, read_json) -> dict | None:
+        """
+        Документ из снимка и журнала. Если снимка нет или json изменили в обход журнала -
+        документ читается read_json() и снимок пересобирается.
+
+        :param read_json: Функция чтения json документа
+        :return: Документ или None - json документа нет
+        """
+        snapshot = self.__read_snapshot()
+        json_signature = _stat(self.json_path)
+        if json_signature is None:
+            if snapshot is not None:
+                # json удалён - его двоичная копия тоже
+                self.remove()
+            self.codec = None
+            return None
+        if snapshot is not None and snapshot[1] == json_signature:
+            document = snapshot[0]
+            for change in self.__read_log():
+                apply_change(document, *change)
+            return document
+        if snapshot is not None:
+            self.logger.info("[📁] - DocSidecar - load - %s изменён в обход журнала, снимок пересобирается",
+                             self.json_path)
+        document = read_json()
+        self.compact(document)
+        return document
+
+    def encode_change(self, kind: int, keys, value=None) -> bytes:
+        """Запись журнала для изменения (кодируется сразу - последующие изменения документа её не меняют)"""
+        payload = self.codec.encode([kind, list(keys), value])
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def compaction_due(self, pending: int = 0) -> bool:
+        """:param pending: Байт, которые будут дописаны в журнал"""
+        return self.log_size + pending > max(self.COMPACT_MIN_BYTES, self.snapshot_size)
+
+    def append(self, records: list[bytes]):
+        """Дописывает записи журнала одним вызовом write"""
+        if not self.loaded:
+            raise RuntimeError(f"Снимок {self.snapshot_path} не загружен")
+        data = b"".join(records)
+        with open(self.log_path, "r+b") as file:
+            # Оборванная запись отрезается, новые записи пишутся вместо неё
+            file.seek(self.log_size)
+            file.truncate()
+            file.write(data)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        self.log_size += len(data)
+
+    def compact(self, document: dict):
+        """Записывает снимок document (json уже записан) и пустой журнал нового поколения"""
+        self.codec = SchemaCodec(schema_keys())
+        self.generation += 1
+        json_signature = _stat(self.json_path) or (0, 0)
+        header = bytearray()
+        for number in (self.generation, json_signature[0], json_signature[1], len(self.codec.keys)):
+            _write_varint(header, number)
+        for key in self.codec.keys:
+            encoded = key.encode("utf-8")
+            _write_varint(header, len(encoded))
+            header += encoded
+        body = bytes(header) + self.codec.encode(document)
+        atomic_write(self.snapshot_path, SNAPSHOT_MAGIC + struct.pack("<I", zlib.crc32(body)) + body,
+                     fsync=self.fsync)
+        atomic_write(self.log_path, LOG_HEADER.pack(LOG_MAGIC, self.generation), fsync=self.fsync)
+        self.snapshot_size = len(body)
+        self.log_size = LOG_HEADER.size
+        self.logger.info("[📁] - DocSidecar - compact - Снимок %s: %s байт", self.snapshot_path, len(body))
+
+    def remove(self):
+        for path in (self.snapshot_path, self.log_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.codec = None
+
+    def __read_snapshot(self) -> tuple[dict, tuple] | None:
+        """:return: (документ, (mtime_ns, size) json при записи снимка) или None - снимка нет или он повреждён"""
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        body = data[len(SNAPSHOT_MAGIC) + 4:]
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC \
+                or struct.unpack_from("<I", data, len(SNAPSHOT_MAGIC))[0] != zlib.crc32(body):
+            self.logger.warning("[📁] - DocSidecar - __read_snapshot - Снимок %s повреждён", self.snapshot_path)
+            return None
+        generation, pos = _read_varint(body, 0)
+        mtime_ns, pos = _read_varint(body, pos)
+        size, pos = _read_varint(body, pos)
+        count, pos = _read_varint(body, pos)
+        keys = []
+        for _ in range(count):
+            length, pos = _read_varint(body, pos)
+            keys.append(body[pos:pos + length].decode("utf-8"))
+            pos += length
+        codec = SchemaCodec(keys)
+        document, _ = codec.decode(body, pos)
+        self.codec, self.generation, self.snapshot_size = codec, generation, len(body)
+        return document, (mtime_ns, size)
+
+    def __read_log(self) -> list:
+        """Изменения журнала текущего поколения до первой повреждённой записи"""
+        try:
+            with open(self.log_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        if len(data) < LOG_HEADER.size or LOG_HEADER.unpack_from(data) != (LOG_MAGIC, self.generation):
+            # Журнала нет или он от другого снимка - начинается заново
+            atomic_write(self.log_path, LOG_HEADER.pack(LOG_MAGIC, self.generation), fsync=self.fsync)
+            self.log_size = LOG_HEADER.size
+            return []
+        changes = []
+        pos = LOG_HEADER.size
+        while pos + RECORD_HEADER.size <= len(data):
+            length, crc = RECORD_HEADER.unpack_from(data, pos)
+            payload = data[pos + RECORD_HEADER.size:pos + RECORD_HEADER.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            changes.append(self.codec.decode(payload)[0])
+            pos += RECORD_HEADER.size + length
+        if pos != len(data):
+            self.logger.warning("[📁] - DocSidecar - __read_log - Оборванная запись в конце %s", self.log_path)
+        self.log_size = pos
+        return changes
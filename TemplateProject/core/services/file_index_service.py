@@ -0,0 +1,253 @@
+# Постоянный индекс имён файлов директории (SQLite)
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from TemplateProject.core.services.log_service import get_logger
+
+
+def default_index_path(root: str) -> str:
+    """Файл индекса хранится вне индексируемой директории: %LOCALAPPDATA%/MGSD/FileIndex/<хэш пути>.sqlite"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()
+    return f"{base}/MGSD/FileIndex/{key}.sqlite".replace("\\", "/")
+
+
+def escape_glob(text: str) -> str:
+    """Экранирует *, ? и [ для GLOB - текст ищется как есть"""
+    return "".join(f"[{char}]" if char in "*?[" else char for char in text)
+
+
+class FileIndexService:
+    """
+    Индекс имён файлов одной корневой директории в SQLite - поиск без обхода дерева.
+
+    Индекс обновляется инкрементально: для каждой известной папки проверяется только её mtime,
+    перечитываются лишь папки, в которых добавляли, удаляли или переименовывали файлы.
+    Папка, изменённая меньше RACY_SECONDS назад, повторно проверяется при следующем обновлении -
+    изменения в пределах одного тика mtime не теряются.
+
+    Запросы (регистр учитывается, как в DirectoryService.search_files):
+        search_files(keyword)  - подстрока имени (индекс триграмм FTS5)
+        search_prefix(prefix)  - начало имени (индекс по имени)
+        search_glob(pattern)   - шаблон GLOB: *, ?, [...]
+
+    :param root: Индексируемая директория
+    :param index_path: Файл индекса, по умолчанию - default_index_path(root)
+    :param refresh_interval: Сколько секунд запросы пользуются индексом без проверки mtime папок
+    """
+    SCHEMA_VERSION = 1
+    RACY_SECONDS = 2
+    __roots = {}
+
+    def __init__(self, root: str, index_path: str | None = None, refresh_interval: float = 0.0):
+        self.logger = get_logger("FileIndexService")
+        self.lock = threading.RLock()
+        self.root = root.replace("\\", "/").rstrip("/")
+        self.index_path = index_path or default_index_path(self.root)
+        self.refresh_interval = refresh_interval
+        self.last_refresh = None
+        self.__bulk = False
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        try:
+            self.connection = self.__connect()
+        except sqlite3.DatabaseError:
+            # Индекс - только кэш: повреждённый файл пересоздаётся
+            self.logger.warning("[📁] - FileIndexService - __init__ - Индекс %s повреждён, пересоздаём", self.index_path)
+            os.remove(self.index_path)
+            self.connection = self.__connect()
+
+    @classmethod
+    def for_root(cls, root: str, **kwargs):
+        """Один общий индекс на директорию в пределах процесса"""
+        key = os.path.normcase(os.path.abspath(root))
+        service = cls.__roots.get(key)
+        if service is None:
+            service = cls(root, **kwargs)
+            cls.__roots[key] = service
+        return service
+
+    def __connect(self):
+        connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        stored_root = None
+        if version == self.SCHEMA_VERSION:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+            stored_root = row and row[0]
+        if version != self.SCHEMA_VERSION or stored_root != self.root:
+            self.__create_schema(connection)
+        return connection
+
+    def __create_schema(self, connection):
+        connection.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS files_names;
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS directories;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE directories (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE files (
+                id INTEGER PRIMARY KEY,
+                directory INTEGER NOT NULL,
+                name TEXT NOT NULL
+            );
+            CREATE INDEX files_name ON files (name);
+            CREATE INDEX files_directory ON files (directory);
+            CREATE VIRTUAL TABLE files_names USING fts5 (
+                name, content='files', content_rowid='id', tokenize='trigram case_sensitive 1'
+            );
+        """)
+        connection.execute("INSERT INTO meta (key, value) VALUES ('root', ?)", (self.root,))
+        connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        connection.commit()
+
+    def __full_path(self, relative_path: str) -> str:
+        return f"{self.root}/{relative_path}" if relative_path else self.root
+
+    def refresh(self) -> int:
+        """
+        Приводит индекс в соответствие с диском.
+        :return: Количество перечитанных папок
+        """
+        with self.lock:
+            started = time.time_ns()
+            racy_ns = started - self.RACY_SECONDS * 1_000_000_000
+            known = {}
+            children = {}
+            for directoryID, path, parent, mtime_ns in self.connection.execute(
+                    "SELECT id, path, parent, mtime_ns FROM directories"):
+                known[path] = (directoryID, mtime_ns)
+                children.setdefault(parent, []).append(path)
+            # Первое построение: индекс триграмм строится одним проходом в конце
+            self.__bulk = not known
+
+            rescanned = 0
+            seen = set()
+            stack = [""]
+            with self.connection:
+                while stack:
+                    relative_path = stack.pop()
+                    try:
+                        mtime_ns = os.stat(self.__full_path(relative_path)).st_mtime_ns
+                    except OSError:
+                        continue
+                    entry = known.get(relative_path)
+                    if entry is not None and entry[1] == mtime_ns:
+                        seen.add(relative_path)
+                        stack.extend(children.get(relative_path, ()))
+                        continue
+                    sub_directories = self.__rescan_directory(relative_path, entry, -1 if mtime_ns >= racy_ns else mtime_ns)
+                    if sub_directories is None:
+                        continue
+                    seen.add(relative_path)
+                    rescanned += 1
+                    stack.extend(sub_directories)
+                removed = [known[path][0] for path in known.keys() - seen]
+                for directoryID in removed:
+                    self.__remove_files(directoryID)
+                self.connection.executemany("DELETE FROM directories WHERE id = ?", ((iD,) for iD in removed))
+                if self.__bulk:
+                    self.connection.execute("INSERT INTO files_names (files_names) VALUES ('rebuild')")
+            self.last_refresh = time.monotonic()
+            if rescanned or removed:
+                self.logger.info("[📁] - FileIndexService - refresh - %s: перечитано папок %s, удалено %s",
+                                 self.root, rescanned, len(removed))
+            return rescanned
+
+    def __remove_files(self, directoryID: int, names=None):
+        """Удаляет файлы папки (все или только names) из индекса"""
+        rows = self.connection.execute("SELECT id, name FROM files WHERE directory = ?", (directoryID,)).fetchall()
+        if names is not None:
+            rows = [row for row in rows if row[1] in names]
+        self.connection.executemany("INSERT INTO files_names (files_names, rowid, name) VALUES ('delete', ?, ?)", rows)
+        self.connection.executemany("DELETE FROM files WHERE id = ?", ((fileID,) for fileID, _ in rows))
+
+    def __rescan_directory(self, relative_path: str, entry, mtime_ns: int):
+        """
+        Перечитывает одну папку: в индексе меняются только добавленные и удалённые файлы.
+        :return: Относительные пути вложенных папок или None, если папку прочитать нельзя
+        """
+        full_path = self.__full_path(relative_path)
+        names = set()
+        sub_directories = []
+        try:
+            with os.scandir(full_path) as entries:
+                for dir_entry in entries:
+                    try:
+                        is_dir = dir_entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        names.add(dir_entry.name)
+                    elif not dir_entry.is_symlink():
+                        sub_directories.append(f"{relative_path}/{dir_entry.name}" if relative_path else dir_entry.name)
+        except OSError:
+            return None
+
+        if entry is None:
+            parent = relative_path.rpartition("/")[0] if relative_path else None
+            directoryID = self.connection.execute(
+                "INSERT INTO directories (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                (relative_path, parent, mtime_ns)).lastrowid
+            added = names
+        else:
+            directoryID = entry[0]
+            self.connection.execute("UPDATE directories SET mtime_ns = ? WHERE id = ?", (mtime_ns, directoryID))
+            indexed = {name for name, in self.connection.execute(
+                "SELECT name FROM files WHERE directory = ?", (directoryID,))}
+            if indexed - names:
+                self.__remove_files(directoryID, indexed - names)
+            added = names - indexed
+        if self.__bulk:
+            self.connection.executemany("INSERT INTO files (directory, name) VALUES (?, ?)",
+                                        ((directoryID, name) for name in added))
+            return sub_directories
+        for name in added:
+            fileID = self.connection.execute("INSERT INTO files (directory, name) VALUES (?, ?)",
+                                             (directoryID, name)).lastrowid
+            self.connection.execute("INSERT INTO files_names (rowid, name) VALUES (?, ?)", (fileID, name))
+        return sub_directories
+
+    def __refresh_if_stale(self):
+        if self.last_refresh is None or time.monotonic() - self.last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    def __query(self, where: str, argument: str, limit: int | None) -> list[str]:
+        with self.lock:
+            self.__refresh_if_stale()
+            rows = self.connection.execute(
+                "SELECT directories.path, files.name FROM files "
+                "JOIN directories ON directories.id = files.directory "
+                f"WHERE {where} ORDER BY directories.path, files.name LIMIT ?",
+                (argument, -1 if limit is None else limit))
+            return [f"{self.root}/{path}/{name}" if path else f"{self.root}/{name}" for path, name in rows]
+
+    def search_files(self, keyword: str, limit: int | None = None) -> list[str]:
+        """:return: Пути файлов, в имени которых есть keyword"""
+        return self.__query("files.id IN (SELECT rowid FROM files_names WHERE name GLOB ?)",
+                            f"*{escape_glob(keyword)}*", limit)
+
+    def search_prefix(self, prefix: str, limit: int | None = None) -> list[str]:
+        """:return: Пути файлов, имя которых начинается с prefix"""
+        return self.__query("files.name GLOB ?", f"{escape_glob(prefix)}*", limit)
+
+    def search_glob(self, pattern: str, limit: int | None = None) -> list[str]:
+        """:return: Пути файлов, имя которых подходит под шаблон GLOB ("*.exe", "1?.png", "[0-9]*")"""
+        if pattern[:1] not in ("", "*", "?", "["):
+            # Шаблон с постоянным началом - диапазон по индексу имени
+            return self.__query("files.name GLOB ?", pattern, limit)
+        return self.__query("files.id IN (SELECT rowid FROM files_names WHERE name GLOB ?)", pattern, limit)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
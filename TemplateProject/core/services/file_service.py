@@ -1,76 +1,104 @@
 # Основные операции над файлами.
 import csv
-import json
-import logging
 import os
 from json import JSONDecodeError
 
-from TemplateProject.core.services.json_file_service import write_json_file_service
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.atomic_file_service import atomic_write, atomic_write_many
+from TemplateProject.core.services.file_transaction import FileTransaction
+from TemplateProject.core.services.json_file_service import write_json_file_service, prepare_json_file_content, \
+    json_file_bytes
+from TemplateProject.core.services.log_service import get_logger
 
 
 class FileService:
     """
     json
+
+    :param compact: True - json файл записывается без отступов (для файлов, которые читает только программа)
     """
-    def __init__(self, full_directory: str, file_name: str, file_extension: str):
-        self.logger = logging.getLogger("FileService")
-        self.logger.info(f"[📁] - FileService - __init__ - Инициализация файлового сервиса: {full_directory, file_name, file_extension}")
+    def __init__(self, full_directory: str, file_name: str, file_extension: str, compact: bool = False):
+        self.logger = get_logger("FileService")
+        self.logger.info("[📁] - FileService - __init__ - Инициализация файлового сервиса: %s", (full_directory, file_name, file_extension))
         self.directory = full_directory.replace("\\", "/")
         self.file_name = file_name
         self.file_extension = file_extension
+        self.compact = compact
         self._file_path = os.path.join(self.directory, f"{self.file_name}.{self.file_extension}").replace("\\", "/")
 
         # if not os.path.exists(self._file_path):
         #     raise FileNotFoundError(f"File not found: {self._file_path}")
 
+    @staticmethod
+    def transaction(fsync=True) -> FileTransaction:
+        """
+        Транзакция записи json файлов: внутри блока with записи копятся в памяти,
+        а при выходе каждый изменённый файл записывается один раз.
+
+        :param fsync: True - дождаться записи всей пачки на диск при выходе из блока
+        """
+        return FileTransaction(fsync=fsync)
+
     def file_exists(self):
         """
         :return: True -> Если существует файл, иначе False
         """
-        self.logger.info(f"[📁] - FileService - file_exists - Проверка существование файла...")
+        self.logger.info("[📁] - FileService - file_exists - Проверка существование файла...")
+        transaction = FileTransaction.current()
+        if transaction is not None and transaction.has_document(self._file_path):
+            return True
         if os.path.exists(self._file_path):
             return True
         return False
 
     def get_file_name(self):
-        self.logger.info(f"[📁] - FileService - get_file_name - Получение названия файла...")
+        self.logger.info("[📁] - FileService - get_file_name - Получение названия файла...")
         return f"{self.file_name}"
 
     def get_file_extension(self):
-        self.logger.info(f"[📁] - FileService - get_file_extension - Получение существование файла...")
+        self.logger.info("[📁] - FileService - get_file_extension - Получение существование файла...")
         return f"{self.file_extension}"
 
     def get_file_path(self):
-        self.logger.info(f"[📁] - FileService - get_file_path - Получение существование файла...")
+        self.logger.info("[📁] - FileService - get_file_path - Получение существование файла...")
         return self._file_path
 
     def get_path_to_file(self):
-        self.logger.info(f"[📁] - FileService - get_path_to_file - Получение существование файла...")
+        self.logger.info("[📁] - FileService - get_path_to_file - Получение существование файла...")
         return self.directory
 
     def append_file(self, content):
         """
         Appends content to an existing file.
         """
-        self.logger.info(f"[📁] - FileService - append_file - Добавление данных {content} в файл...")
+        self.logger.info("[📁] - FileService - append_file - Добавление данных %s в файл...", content)
         self.write_file(content, safeMode=True)
 
     def read_file(self, mode='r', encoding='utf-8'):
-        self.logger.info(f"[📁] - FileService - read_file - Чтение файла...")
+        """
+        :return: ['json', данные], ['csv', reader], ['markdown', текст] или 'NOT_SUPPORTED'
+        :raise JSONDecodeError: В json файле не json
+        """
+        self.logger.info("[📁] - FileService - read_file - Чтение файла...")
+        transaction = FileTransaction.current()
+        if transaction is not None and self.file_extension == "json" and transaction.has_document(self._file_path):
+            self.logger.info("[✅] - FileService - read_file - Данные json файла из активной транзакции!")
+            return ['json', transaction.read(self._file_path)]
+        if self.file_extension == "json":
+            # json читается байтами и разбирается через json_codec (orjson/ujson/msgspec, если установлены)
+            with open(self._file_path, 'rb') as file:
+                data = file.read()
+            try:
+                value_json_file = json_codec.decode(data)
+            except JSONDecodeError as e:
+                self.logger.error("[📁] - FileService - read_file - В json файле %s не верные данные: %s", self._file_path, e)
+                raise
+            self.logger.info("[✅] - FileService - read_file - Чтение и закрытие json файла!")
+            return ['json', value_json_file]
+
         with open(self._file_path, mode, encoding=encoding) as file:
-            self.logger.info(f"[📁] - FileService - read_file - Проверка формата файла... {self.file_extension}")
-            if self.file_extension == "json":
-                try:
-                    self.logger.info(f"[✅] - FileService - read_file - Чтение и закрытие json файла!")
-                    value_json_file = json.load(file)
-                    file.close()
-                    return ['json', value_json_file]
-                except JSONDecodeError as e:
-                    self.logger.warning(f"[✅] - FileService - read_file - В json файле указаны не верные данные файла!")
-                    print("В файле не верные данные:", e)
-                    return ['json', file]
-
-            elif self.file_extension == "zip":
+            self.logger.info("[📁] - FileService - read_file - Проверка формата файла... %s", self.file_extension)
+            if self.file_extension == "zip":
                 pass
 
             elif self.file_extension == "csv":
@@ -92,24 +120,29 @@ class FileService:
         """
         Creates a new file with the specified content. Content handling depends on the file type.
         """
-        self.logger.info(f"[📁] - FileService - create_file - Создание файла...")
-        self.logger.info(f"[📁] - FileService - create_file - Проверка наличия корректного пути для файла...")
+        self.logger.info("[📁] - FileService - create_file - Создание файла...")
+        self.logger.info("[📁] - FileService - create_file - Проверка наличия корректного пути для файла...")
+        transaction = FileTransaction.current()
+        if transaction is not None and self.file_extension == "json" and isinstance(content, dict):
+            transaction.create(self, content)
+            return
         if os.path.exists(self._file_path):
             # Путь не найден куда вставлять файл
             raise FileExistsError(f"File already exists: {self._file_path}")
             # raise FileExistsError()
 
-        self.logger.info(f"[📁] - FileService - create_file - Проверка пути для файла...")
+        self.logger.info("[📁] - FileService - create_file - Проверка формата файла %s...", self.file_extension)
+        if self.file_extension == "json":
+            self.logger.info("[📁] - FileService - create_file - Проверка формата содержимого для json файла if(content == dict)...")
+            if isinstance(content, dict):
+                atomic_write(self._file_path, json_file_bytes(content, compact=self.compact))
+                self.logger.info("[✅] - FileService - create_file - Файл успешно записан!")
+                return
+            raise ValueError("Content for JSON files must be a dictionary.")
+
+        self.logger.info("[📁] - FileService - create_file - Проверка пути для файла...")
         with open(self._file_path, 'w', encoding='utf-8') as file:
-            self.logger.info(f"[📁] - FileService - create_file - Проверка формата файла {self.file_extension}...")
-            if self.file_extension == "json":
-                self.logger.info(f"[📁] - FileService - create_file - Проверка формата содержимого для json файла if(content == dict)...")
-                if isinstance(content, dict):
-                    json.dump(content, file, indent=4)
-                    self.logger.info(f"[✅] - FileService - create_file - Файл успешно записан!")
-                else:
-                    raise ValueError("Content for JSON files must be a dictionary.")
-            elif self.file_extension == "csv":
+            if self.file_extension == "csv":
                 if isinstance(content, list):
                     writer = csv.writer(file)
                     writer.writerows(content)
@@ -123,36 +156,41 @@ class FileService:
             else:
                 raise ValueError(f"File type '{self.file_extension}' is not supported.")
 
-    def write_file(self, content, safeMode=False, ignore_value_type=False):
+    def write_file(self, content, safeMode=False, ignore_value_type=False, fsync=False):
         """
         Writes new content to an existing file. Supports two modes:
         - Safe mode (safeMode=True): Appends new content to the existing content.
         - Default mode (safeMode=False): Completely overwrites the existing content.
+        JSON files are replaced atomically (temporary file + os.replace).
 
         :param content: New content to write into the file.
         :param safeMode: If True, appends new content to the old one.
         :param ignore_value_type: If True, overwrites existing keys even if their types differ.
+        :param fsync: If True, waits until the JSON file is flushed to disk.
         """
-        self.logger.info(f"[📁] - FileService - write_file - запись данных в файл с параметрами...")
-        self.logger.info(f"[📁] - FileService - write_file - Параметры записи: {content, safeMode, ignore_value_type}")
-        self.logger.info(f"[📁] - FileService - write_file - Проверка формата файла {self.file_extension}...")
+        self.logger.info("[📁] - FileService - write_file - запись данных в файл с параметрами...")
+        self.logger.info("[📁] - FileService - write_file - Параметры записи: %s", (content, safeMode, ignore_value_type))
+        self.logger.info("[📁] - FileService - write_file - Проверка формата файла %s...", self.file_extension)
         if self.file_extension == "json":
-            self.logger.info(f"[📁][if[📁]else] - FileService - write_file - Проверка формата записываемых данных для json файла if(content == dict)...")
+            self.logger.info("[📁][if[📁]else] - FileService - write_file - Проверка формата записываемых данных для json файла if(content == dict)...")
             if not isinstance(content, dict):
-                self.logger.warn(f"[📁][if[!!]else] - FileService - write_file - Данные кривые, выдаём ошибку...")
+                self.logger.warning("[📁][if[!!]else] - FileService - write_file - Данные кривые, выдаём ошибку...")
                 raise ValueError("Content for JSON files must be a dictionary.")
-            self.logger.info(f"[📁][if[✅]else] - FileService - write_file - Проверка успешна пройдена!")
+            self.logger.info("[📁][if[✅]else] - FileService - write_file - Проверка успешна пройдена!")
+            transaction = FileTransaction.current()
+            if transaction is not None:
+                self.logger.info("[📁] - FileService - write_file - Запись данных в активную транзакцию...")
+                return transaction.write(self, content, safeMode)
+            self.logger.info("[📁] - FileService - write_file - Начало записи данных через функцию (write_json_file_service)...")
+            return write_json_file_service(self._file_path, content, safeMode, ignore_value_type, fsync=fsync,
+                                           compact=self.compact)
 
-        self.logger.info(f"[if📁else] - FileService - write_file - Установка режима открытия файла if(safeMode==True): mode='a', else:'w'...")
+        self.logger.info("[if📁else] - FileService - write_file - Установка режима открытия файла if(safeMode==True): mode='a', else:'w'...")
         mode = 'a' if safeMode else 'w'
-        self.logger.info(f"[📁] - FileService - write_file - Открытие файла...")
+        self.logger.info("[📁] - FileService - write_file - Открытие файла...")
         with open(self._file_path, mode, encoding='utf-8') as file:
-            self.logger.info(f"[📁] - FileService - write_file - Проверка формата файла {self.file_extension}...")
-            if self.file_extension == "json":
-                self.logger.info(f"[📁] - FileService - write_file - Начало записи данных через функцию (write_json_file_service)...")
-                return write_json_file_service(file, self._file_path, content, safeMode, ignore_value_type)
-
-            elif self.file_extension == "csv":
+            self.logger.info("[📁] - FileService - write_file - Проверка формата файла %s...", self.file_extension)
+            if self.file_extension == "csv":
                 if not isinstance(content, list):
                     raise ValueError("Content for CSV files must be a list of lists.")
                 writer = csv.writer(file)
@@ -172,15 +210,47 @@ class FileService:
             else:
                 raise ValueError(f"File type '{self.file_extension}' is not supported.")
 
+    @staticmethod
+    def write_many_files(files_content, fsync=True):
+        """
+        Пакетная атомарная запись нескольких json файлов с одним барьером fsync на всю пачку,
+        вместо отдельного ожидания диска для каждого файла.
+
+        :param files_content: [(FileService, content), ...] или [(FileService, content, safeMode), ...]
+        :param fsync: True - дождаться записи всей пачки на диск
+        :return: Список записанных данных в том же порядке
+        """
+        prepared = []
+        files = []
+        transaction = FileTransaction.current()
+        for file_content in files_content:
+            file_service, content = file_content[0], file_content[1]
+            safeMode = file_content[2] if len(file_content) > 2 else False
+            if file_service.file_extension != "json":
+                raise ValueError(f"File type '{file_service.file_extension}' is not supported in write_many_files.")
+            if transaction is not None:
+                prepared.append(transaction.write(file_service, content, safeMode))
+                continue
+            content = prepare_json_file_content(file_service.get_file_path(), content, safeMode)
+            prepared.append(content)
+            files.append((file_service.get_file_path(), json_file_bytes(content, compact=file_service.compact)))
+        atomic_write_many(files, fsync=fsync)
+        return prepared
+
     def delete_file(self):
         """
         Deletes the file at the specified path.
         """
-        self.logger.info(f"[📁] - FileService - delete_file - Удаление файла если он существует...")
+        self.logger.info("[📁] - FileService - delete_file - Удаление файла если он существует...")
+        transaction = FileTransaction.current()
+        pending = transaction is not None and transaction.discard(self._file_path)
+        if pending and not os.path.exists(self._file_path):
+            self.logger.info("[✅] - FileService - delete_file - Файл удалён из активной транзакции!")
+            return 1
         if os.path.exists(self._file_path):
             os.remove(self._file_path)
-            self.logger.info(f"[✅] - FileService - delete_file - Файл удалён!")
+            self.logger.info("[✅] - FileService - delete_file - Файл удалён!")
             return 1
         else:
-            self.logger.info(f"[✅] - FileService - delete_file - Файл не найден!")
+            self.logger.info("[✅] - FileService - delete_file - Файл не найден!")
             raise FileNotFoundError(f"File not found: {self._file_path}")
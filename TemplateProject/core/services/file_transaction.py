@@ -0,0 +1,108 @@
+# Транзакция записи json файлов: изменения копятся в памяти и записываются один раз.
+import os
+import threading
+
+from TemplateProject.core.services.json_file_service import copy_json_data, deep_merge_dicts, \
+    prepare_json_file_content
+
+
+class FileTransaction:
+    """
+    Накопитель json-записей FileService. Пока транзакция активна (в текущем потоке),
+    write_file/create_file только изменяют документ в памяти, а read_file видит эти изменения.
+    При выходе из блока with все изменённые файлы записываются одной пачкой (один раз на файл).
+    Если внутри блока возникло исключение - изменения отбрасываются.
+
+    Вложенные транзакции присоединяются к внешней, запись происходит при выходе из внешней.
+
+    Пример:
+        with FileService.transaction():
+            metadata.writeMetadataDSDocFile('Details', 'Priority', '1')
+            metadata.writeMetadataDSDocFile('Details', 'TotalSize', '0')
+    """
+    _local = threading.local()
+
+    def __init__(self, fsync=True):
+        self.fsync = fsync
+        self._depth = 0
+        self._joined = None
+        self._documents: dict[str, dict] = {}
+        self._file_services: dict = {}
+
+    @classmethod
+    def current(cls):
+        """:return: Активная транзакция текущего потока или None"""
+        return getattr(cls._local, "transaction", None)
+
+    def __enter__(self):
+        active = FileTransaction.current()
+        if active is not None:
+            active._depth += 1
+            self._joined = active
+            return active
+        self._depth = 1
+        FileTransaction._local.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        transaction = self._joined or self
+        self._joined = None
+        transaction._depth -= 1
+        if transaction._depth > 0:
+            return False
+        FileTransaction._local.transaction = None
+        if exc_type is None:
+            transaction.commit()
+        else:
+            transaction.rollback()
+        return False
+
+    def has_document(self, file_path: str) -> bool:
+        return file_path in self._documents
+
+    def read(self, file_path: str):
+        """:return: Копия накопленного документа или None, если файл в транзакции не менялся"""
+        document = self._documents.get(file_path)
+        return None if document is None else copy_json_data(document)
+
+    def write(self, file_service, content, safeMode=False):
+        """
+        Применяет запись к документу в памяти (аналог write_json_file_service без записи на диск).
+        Существующий файл читается с диска не более одного раза за транзакцию.
+        """
+        file_path = file_service.get_file_path()
+        document = self._documents.get(file_path)
+        if document is None:
+            document = copy_json_data(prepare_json_file_content(file_path, content, safeMode))
+        elif safeMode:
+            deep_merge_dicts(document, copy_json_data(content))
+        else:
+            document = copy_json_data(content)
+        self._documents[file_path] = document
+        self._file_services[file_path] = file_service
+        return document
+
+    def create(self, file_service, content):
+        file_path = file_service.get_file_path()
+        if file_path in self._documents or os.path.exists(file_path):
+            raise FileExistsError(f"File already exists: {file_path}")
+        self._documents[file_path] = copy_json_data(content)
+        self._file_services[file_path] = file_service
+
+    def discard(self, file_path: str) -> bool:
+        """Забывает накопленные изменения файла. :return: True, если изменения были"""
+        self._file_services.pop(file_path, None)
+        return self._documents.pop(file_path, None) is not None
+
+    def commit(self):
+        from TemplateProject.core.services.file_service import FileService
+
+        files_content = [(self._file_services[file_path], document)
+                         for file_path, document in self._documents.items()]
+        self.rollback()
+        if files_content:
+            FileService.write_many_files(files_content, fsync=self.fsync)
+
+    def rollback(self):
+        self._documents = {}
+        self._file_services = {}
@@ -0,0 +1,163 @@
+# Выдача свободных числовых ID для файлов директории ("1.exe.lnk", "1.png", ...)
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+def default_lock_path(directory: str) -> str:
+    """Файл межпроцессной блокировки хранится вне директории: %LOCALAPPDATA%/MGSD/Locks/<хэш пути>.lock"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(directory)).encode("utf-8")).hexdigest()
+    return f"{base}/MGSD/Locks/{key}.lock".replace("\\", "/")
+
+
+def file_name_id(name: str) -> int | None:
+    """:return: Числовой ID файла ("12.exe.lnk" -> 12) или None, если имя начинается не с числа"""
+    stem = name.split(".", 1)[0]
+    return int(stem) if stem.isdecimal() else None
+
+
+class InterProcessLock:
+    """Блокировка файла между процессами (msvcrt на Windows, fcntl на остальных системах)"""
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self.__file = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        self.__file = open(self.lock_path, "a+b")
+        if os.name == "nt":
+            self.__file.seek(0)
+            # LK_LOCK повторяет попытку 10 раз с паузой в секунду, дальше ждём сами
+            while True:
+                try:
+                    msvcrt.locking(self.__file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(self.__file.fileno(), fcntl.LOCK_EX)
+
+    def release(self):
+        if os.name == "nt":
+            self.__file.seek(0)
+            msvcrt.locking(self.__file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+        self.__file.close()
+        self.__file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class IDAllocatorService:
+    """
+    Выдача наименьшего свободного числового ID в директории без перебора search_files.
+
+    Директория сканируется один раз (только верхний уровень), занятые ID хранятся во множестве,
+    поиск следующего свободного идёт от наименьшего возможного - выдача N-го ID O(1) в среднем.
+    Повторное сканирование - только если директорию изменил кто-то другой (поменялся её mtime).
+    ID занят, если имя файла начинается с этого числа: "1.exe.lnk" занимает 1, "11.exe" - только 11.
+
+    ID выдаётся на время блока reserve() под блокировкой потоков и процессов - в блоке создаются файлы:
+
+        with IDAllocatorService.for_directory(main_path).reserve() as file_name_id:
+            ...  # создать f"{file_name_id}.exe.lnk", f"{file_name_id}.png"
+
+    :param directory: Директория с файлами
+    :param lock_path: Файл межпроцессной блокировки, по умолчанию - default_lock_path(directory)
+    """
+    __directories = {}
+
+    def __init__(self, directory: str, lock_path: str | None = None):
+        self.directory = directory.replace("\\", "/").rstrip("/")
+        self.lock = threading.RLock()
+        self.process_lock = InterProcessLock(lock_path or default_lock_path(self.directory))
+        self.used: set[int] = set()
+        self.lowest_free = 1
+        self.scanned_mtime = None
+
+    @classmethod
+    def for_directory(cls, directory: str, **kwargs):
+        """Один общий распределитель на директорию в пределах процесса"""
+        key = os.path.normcase(os.path.abspath(directory))
+        allocator = cls.__directories.get(key)
+        if allocator is None:
+            allocator = cls(directory, **kwargs)
+            cls.__directories[key] = allocator
+        return allocator
+
+    def __directory_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def scan(self):
+        """Перечитывает занятые ID из директории"""
+        used = set()
+        if os.path.isdir(self.directory):
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    iD = file_name_id(entry.name)
+                    if iD is not None:
+                        used.add(iD)
+        self.used = used
+        self.lowest_free = 1
+        self.scanned_mtime = self.__directory_mtime()
+
+    def __sync(self):
+        if self.scanned_mtime is None or self.scanned_mtime != self.__directory_mtime():
+            self.scan()
+
+    def __next_free(self) -> int:
+        while self.lowest_free in self.used:
+            self.lowest_free += 1
+        return self.lowest_free
+
+    def used_ids(self) -> list[int]:
+        with self.lock:
+            self.__sync()
+            return sorted(self.used)
+
+    @contextmanager
+    def reserve(self):
+        """
+        Выдаёт свободный ID, пока выполняется блок with. Если блок завершился ошибкой,
+        ID не считается занятым (при частично созданных файлах их найдёт следующее сканирование).
+        """
+        with self.lock, self.process_lock:
+            self.__sync()
+            iD = self.__next_free()
+            try:
+                yield iD
+            except BaseException:
+                self.scanned_mtime = None
+                raise
+            self.used.add(iD)
+            # Директорию меняли только мы, под блокировкой - повторно сканировать не нужно
+            self.scanned_mtime = self.__directory_mtime()
+
+    def allocate(self) -> int:
+        """Выдаёт и сразу считает занятым свободный ID (файлы создаются позже, без блокировки)"""
+        with self.reserve() as iD:
+            return iD
+
+    def release(self, iD: int):
+        """ID снова свободен (файлы с этим ID удалены)"""
+        with self.lock:
+            self.used.discard(iD)
+            self.lowest_free = min(self.lowest_free, iD)
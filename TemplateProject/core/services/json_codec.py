@@ -0,0 +1,141 @@
+# Кодек json: использует orjson, ujson или msgspec, если они установлены, иначе стандартный json.
+import importlib
+import json
+import os
+
+BACKENDS_PRIORITY = ("orjson", "ujson", "msgspec", "json")
+
+
+class JSONCodec:
+    """
+    Общий интерфейс json-бэкендов. encode всегда возвращает bytes (utf-8), decode принимает bytes или str.
+    Ошибки разбора всех бэкендов приводятся к json.JSONDecodeError, как у стандартного json.
+
+    Форматы записи:
+        - обычный (compact=False) - с отступами, для файлов, которые читает человек. Всегда стандартный
+          json.dumps(indent=4): файл и его diff не зависят от того, какой бэкенд установлен на машине;
+        - компактный (compact=True) - без отступов и пробелов, для машинных файлов. Здесь работают быстрые бэкенды.
+    """
+    name = "json"
+
+    def encode(self, data, compact=False) -> bytes:
+        if compact:
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    def decode(self, data: bytes | str):
+        return json.loads(data)
+
+    @staticmethod
+    def _decode_error(error, data):
+        doc = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+        return json.JSONDecodeError(str(error), doc, 0)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self, module):
+        self.orjson = module
+        self.compact_option = module.OPT_NON_STR_KEYS
+
+    def encode(self, data, compact=False) -> bytes:
+        if not compact:
+            return super().encode(data)
+        try:
+            return self.orjson.dumps(data, option=self.compact_option)
+        except TypeError:
+            # Например, целые числа больше 64 бит - их умеет только стандартный json
+            return super().encode(data, compact)
+
+    def decode(self, data: bytes | str):
+        return self.orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def __init__(self, module):
+        self.ujson = module
+
+    def encode(self, data, compact=False) -> bytes:
+        if not compact:
+            return super().encode(data)
+        try:
+            return self.ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return super().encode(data, compact)
+
+    def decode(self, data: bytes | str):
+        try:
+            return self.ujson.loads(data)
+        except ValueError as e:
+            raise self._decode_error(e, data) from e
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self, module):
+        self.msgspec = module
+
+    def encode(self, data, compact=False) -> bytes:
+        if not compact:
+            return super().encode(data)
+        try:
+            return self.msgspec.json.encode(data)
+        except (TypeError, OverflowError):
+            return super().encode(data, compact)
+
+    def decode(self, data: bytes | str):
+        try:
+            return self.msgspec.json.decode(data)
+        except self.msgspec.DecodeError as e:
+            raise self._decode_error(e, data) from e
+
+
+_CODEC_CLASSES = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "msgspec": MsgspecCodec}
+
+
+def get_codec(name: str) -> JSONCodec:
+    """
+    :param name: "orjson", "ujson", "msgspec" или "json"
+    :raise: ImportError - если библиотека бэкенда не установлена
+    """
+    if name == "json":
+        return JSONCodec()
+    if name not in _CODEC_CLASSES:
+        raise ValueError(f"Неизвестный json-бэкенд: {name}, допустимые: {BACKENDS_PRIORITY}")
+    if name == "msgspec":
+        importlib.import_module("msgspec.json")
+    return _CODEC_CLASSES[name](importlib.import_module(name))
+
+
+def available_backends() -> list[str]:
+    backends = []
+    for name in BACKENDS_PRIORITY:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+def _default_codec() -> JSONCodec:
+    """Бэкенд можно зафиксировать переменной окружения MGSD_JSON_BACKEND, иначе - самый быстрый из установленных."""
+    forced = os.environ.get("MGSD_JSON_BACKEND")
+    if forced:
+        return get_codec(forced)
+    return get_codec(available_backends()[0])
+
+
+codec = _default_codec()
+
+
+def encode(data, compact=False) -> bytes:
+    return codec.encode(data, compact)
+
+
+def decode(data: bytes | str):
+    return codec.decode(data)
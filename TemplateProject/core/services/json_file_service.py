@@ -1,40 +1,67 @@
 import json
 
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.atomic_file_service import atomic_write
 
-def write_json_file_service(file, _file_path, content, safeMode, ignore_value_type):
-    def deep_merge_dicts(original, new):
-        """
-        Рекурсивное объединение вложенных словарей. Значения из new перезаписывают значения из original.
-        """
-        for key, value in new.items():
-            if key in original and isinstance(original[key], dict) and isinstance(value, dict):
-                deep_merge_dicts(original[key], value)
-            else:
-                original[key] = value
-
-    if safeMode:
-        # Читаем существующее содержимое файла
-        try:
-            with open(_file_path, 'r', encoding='utf-8') as existing_file:
-                existing_content = json.load(existing_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            existing_content = {}
-
-        if not isinstance(content, dict):
-            raise ValueError("Content for JSON files must be a dictionary.")
-
-        # Объединяем существующее содержимое с новым
-        deep_merge_dicts(existing_content, content)
-
-        # Сохраняем объединенный результат
-        with open(_file_path, 'w', encoding='utf-8') as merge_file:
-            json.dump(existing_content, merge_file, indent=4)
-            # print('write_json_file_service - SafeMode, WriteToFile')
-
-        return existing_content
-    else:
-        if not isinstance(content, dict):
-            raise ValueError("Content for JSON files must be a dictionary.")
-        json.dump(content, file, indent=4)
-        # print('write_json_file_service - NoSafeMode, json.dump')
+
+def deep_merge_dicts(original, new):
+    """
+    Рекурсивное объединение вложенных словарей. Значения из new перезаписывают значения из original.
+    """
+    for key, value in new.items():
+        if key in original and isinstance(original[key], dict) and isinstance(value, dict):
+            deep_merge_dicts(original[key], value)
+        else:
+            original[key] = value
+
+
+def copy_json_data(data):
+    """
+    Быстрая глубокая копия json-данных (dict, list и скаляры).
+    В отличие от copy.deepcopy не ведёт memo-таблицу, поэтому заметно быстрее на больших документах.
+    """
+    if isinstance(data, dict):
+        return {key: copy_json_data(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [copy_json_data(value) for value in data]
+    return data
+
+
+def prepare_json_file_content(_file_path, content, safeMode):
+    """
+    Готовит итоговые данные для записи в json файл.
+    В safeMode читает существующее содержимое файла и объединяет его с content.
+    """
+    if not isinstance(content, dict):
+        raise ValueError("Content for JSON files must be a dictionary.")
+    if not safeMode:
         return content
+
+    # Читаем существующее содержимое файла
+    try:
+        with open(_file_path, 'rb') as existing_file:
+            existing_content = json_codec.decode(existing_file.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        existing_content = {}
+
+    # Объединяем существующее содержимое с новым
+    deep_merge_dicts(existing_content, content)
+    return existing_content
+
+
+def json_file_bytes(content, compact=False) -> bytes:
+    """
+    Содержимое json файла в utf-8 через json_codec (orjson/ujson/msgspec, если установлены).
+    :param compact: True - без отступов, для файлов, которые читает только программа
+    """
+    return json_codec.encode(content, compact=compact)
+
+
+def write_json_file_service(_file_path, content, safeMode, ignore_value_type, fsync=False, compact=False):
+    """
+    Запись json файла через временный файл и os.replace - при падении посреди записи
+    на диске остаётся либо старый файл, либо новый, но не обрезанный.
+    """
+    content = prepare_json_file_content(_file_path, content, safeMode)
+    atomic_write(_file_path, json_file_bytes(content, compact=compact), fsync=fsync)
+    return content
@@ -0,0 +1,79 @@
+# Логгер с отложенным форматированием сообщений для горячих путей (FileService, JSONDataManager).
+import logging
+import reprlib
+
+# Максимальная длина представления одного аргумента в сообщении лога
+LOG_PAYLOAD_LIMIT = 300
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 3
+_payload_repr.maxdict = 8
+_payload_repr.maxlist = 8
+_payload_repr.maxtuple = 8
+_payload_repr.maxset = 8
+_payload_repr.maxstring = LOG_PAYLOAD_LIMIT
+_payload_repr.maxother = LOG_PAYLOAD_LIMIT
+
+
+class Payload:
+    """
+    Обёртка аргумента лога: представление строится только при форматировании записи
+    и обрезается - reprlib не обходит словарь/список целиком, поэтому стоимость не зависит от размера данных.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        if isinstance(self.value, str):
+            if len(self.value) <= LOG_PAYLOAD_LIMIT:
+                return self.value
+            return f"{self.value[:LOG_PAYLOAD_LIMIT]}...(+{len(self.value) - LOG_PAYLOAD_LIMIT})"
+        text = _payload_repr.repr(self.value)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return text[:LOG_PAYLOAD_LIMIT] + "..."
+        return text
+
+    __repr__ = __str__
+
+
+class LazyLogger:
+    """
+    Фасад над logging.Logger. Сообщения передаются в %-стиле:
+        self.logger.info("[📁] - FileService - write_file - Параметры записи: %s", content)
+    Если уровень выключен - ни сообщение, ни аргументы не форматируются.
+    Аргументы оборачиваются в Payload, большие словари/строки в логе обрезаются.
+    """
+    __slots__ = ("logger",)
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level, msg, args, kwargs):
+        if self.logger.isEnabledFor(level):
+            kwargs.setdefault("stacklevel", 3)
+            self.logger.log(level, msg, *(Payload(arg) for arg in args), **kwargs)
+
+    def debug(self, msg, *args, **kwargs):
+        self._log(logging.DEBUG, msg, args, kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        self._log(logging.INFO, msg, args, kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        self._log(logging.WARNING, msg, args, kwargs)
+
+    def error(self, msg, *args, **kwargs):
+        self._log(logging.ERROR, msg, args, kwargs)
+
+    def exception(self, msg, *args, **kwargs):
+        kwargs.setdefault("exc_info", True)
+        self._log(logging.ERROR, msg, args, kwargs)
+
+
+def get_logger(name: str) -> LazyLogger:
+    return LazyLogger(name)
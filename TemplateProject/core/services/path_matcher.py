@@ -0,0 +1,202 @@
+# Исключение путей по шаблонам в стиле .gitignore
+import os
+import re
+from functools import lru_cache
+from typing import Iterable
+
+_WILDCARDS = re.compile(r"[*?\[\\]")
+
+
+def _translate(pattern: str) -> str:
+    """Шаблон .gitignore (без "/" в начале и конце) -> регулярное выражение для относительного пути"""
+    result = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                if i + 2 == n:
+                    # "a/**" - всё внутри a
+                    result.append(".*")
+                    i += 2
+                    continue
+                if pattern[i + 2] == "/":
+                    # "**/" - ноль или больше папок
+                    result.append("(?:.*/)?")
+                    i += 3
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            result.append("[^/]*")
+            continue
+        if char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end < 0:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                result.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif char == "\\" and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return "".join(result)
+
+
+class _Rule:
+    """Разобранная строка шаблона"""
+    __slots__ = ("negated", "directory_only", "name", "regex")
+
+    def __init__(self, line: str):
+        self.negated = line.startswith("!")
+        if self.negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        self.directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        # Шаблон с "/" в начале или в середине - от корня обхода
+        anchored = "/" in line
+        line = line[1:] if line.startswith("/") else line
+        # Имя без "/" и спецсимволов ("__pycache__", ".venv") проверяется по множеству, без регулярного выражения
+        self.name = line if not anchored and not _WILDCARDS.search(line) else None
+        self.regex = None if self.name is not None else ("" if anchored else "(?:.*/)?") + _translate(line)
+
+
+class _Group:
+    """Подряд идущие правила с одинаковым знаком - одно множество имён и одно регулярное выражение"""
+    __slots__ = ("negated", "names", "regex")
+
+    def __init__(self, negated: bool, rules: list[_Rule], ignore_case: bool):
+        self.negated = negated
+        self.names = {rule.name.lower() if ignore_case else rule.name for rule in rules if rule.name is not None}
+        expressions = [rule.regex for rule in rules if rule.regex is not None]
+        flags = re.IGNORECASE if ignore_case else 0
+        self.regex = re.compile("|".join(f"(?:{expression})" for expression in expressions), flags) \
+            if expressions else None
+
+    def matches(self, path: str, name: str) -> bool:
+        return name in self.names or (self.regex is not None and self.regex.fullmatch(path) is not None)
+
+
+def _groups(rules: list[_Rule], ignore_case: bool) -> tuple[_Group, ...]:
+    """Группы в обратном порядке: решает последнее подходящее правило"""
+    groups = []
+    current = []
+    for rule in rules:
+        if current and current[-1].negated != rule.negated:
+            groups.append(_Group(current[-1].negated, current, ignore_case))
+            current = []
+        current.append(rule)
+    if current:
+        groups.append(_Group(current[-1].negated, current, ignore_case))
+    return tuple(reversed(groups))
+
+
+@lru_cache(maxsize=256)
+def _compile(patterns: tuple[str, ...], ignore_case: bool):
+    rules = []
+    for line in patterns:
+        line = line.rstrip("\n").rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line.strip() or line.startswith("#"):
+            continue
+        rules.append(_Rule(line))
+    return _groups(rules, ignore_case), _groups([rule for rule in rules if not rule.directory_only], ignore_case)
+
+
+class PathMatcher:
+    """
+    Исключение файлов и папок по шаблонам .gitignore. Шаблоны компилируются один раз (кэш по набору шаблонов).
+
+    Поддерживается:
+        name        - файл или папка с таким именем на любом уровне
+        name/       - только папка
+        /name, a/b  - путь от корня обхода (шаблон с "/" в начале или в середине)
+        *, ?, [a-z] - в пределах одного имени; **/ - любые папки; a/** - всё внутри a
+        !pattern    - вернуть исключённое ранее (решает последний подходящий шаблон)
+        #           - комментарий; \\#, \\! - символ в начале имени
+
+    Как в git, файл внутри исключённой папки вернуть нельзя - поэтому исключённая папка
+    отсекается при обходе целиком (.venv, node_modules не читаются).
+    Пути - относительные от корня обхода, через "/".
+
+    :param patterns: Строки шаблонов
+    :param max_file_size: Исключать файлы больше этого размера в байтах (None - без ограничения)
+    :param ignore_case: Без учёта регистра (по умолчанию - на Windows)
+    """
+
+    def __init__(self, patterns: Iterable[str] = (), max_file_size: int | None = None,
+                 ignore_case: bool = os.name == "nt"):
+        self.patterns = tuple(patterns)
+        self.max_file_size = max_file_size
+        self.ignore_case = ignore_case
+        self.__directory_groups, self.__file_groups = _compile(self.patterns, ignore_case)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs):
+        """Шаблоны из файла в формате .gitignore"""
+        with open(path, encoding="utf-8") as file:
+            return cls(file.read().splitlines(), **kwargs)
+
+    def __bool__(self):
+        return bool(self.__directory_groups) or self.max_file_size is not None
+
+    def __decide(self, groups, path: str) -> bool:
+        name = path.rpartition("/")[2]
+        if self.ignore_case:
+            name = name.lower()
+        for group in groups:
+            if group.matches(path, name):
+                return not group.negated
+        return False
+
+    def excludes_dir(self, rel_path: str) -> bool:
+        """Исключена ли папка rel_path (родительские папки не проверяются - их отсекает обход)"""
+        return self.__decide(self.__directory_groups, rel_path)
+
+    def excludes_file(self, rel_path: str, size: int | None = None) -> bool:
+        """Исключён ли файл rel_path размером size (родительские папки не проверяются)"""
+        if self.max_file_size is not None and size is not None and size > self.max_file_size:
+            return True
+        return self.__decide(self.__file_groups, rel_path)
+
+    def is_excluded(self, rel_path: str, is_dir: bool = False, size: int | None = None) -> bool:
+        """Исключён ли путь с учётом родительских папок"""
+        parts = rel_path.strip("/").split("/")
+        for index in range(1, len(parts)):
+            if self.excludes_dir("/".join(parts[:index])):
+                return True
+        return self.excludes_dir(rel_path.strip("/")) if is_dir else self.excludes_file(rel_path, size)
+
+    def filter_dirs(self, rel_dir: str, names: Iterable[str]) -> list[str]:
+        """Вложенные папки rel_dir ("" или "." - корень), в которые нужно спускаться: dirs[:] = ... в os.walk"""
+        prefix = "" if rel_dir in ("", ".") else rel_dir + "/"
+        return [name for name in names if not self.excludes_dir(prefix + name)]
+
+    def filter_files(self, rel_dir: str, names: Iterable[str], directory: str | None = None) -> list[str]:
+        """Файлы rel_dir, которые не исключены. directory - путь папки на диске, нужен для max_file_size"""
+        prefix = "" if rel_dir in ("", ".") else rel_dir + "/"
+        if self.max_file_size is None or directory is None:
+            return [name for name in names if not self.excludes_file(prefix + name)]
+        return [name for name in names
+                if not self.excludes_file(prefix + name, os.path.getsize(os.path.join(directory, name)))]
+
+
+def build_matcher(exclude_dirs: Iterable[str] = (), patterns: Iterable[str] = (),
+                  max_file_size: int | None = None) -> PathMatcher:
+    """
+    Исключения для архивирования и обхода: exclude_dirs - имена папок на любом уровне (прежний параметр),
+    patterns - шаблоны .gitignore (применяются после exclude_dirs и могут их отменить через "!").
+    """
+    return PathMatcher([f"{name.strip('/')}/" for name in exclude_dirs or ()] + list(patterns or ()),
+                       max_file_size=max_file_size)
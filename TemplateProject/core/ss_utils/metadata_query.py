@@ -0,0 +1,442 @@
+# Запросы к мета-данным всего дерева структур (DSDocFile, FSDocFile) через индекс тегов в SQLite.
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from TemplateProject.core.services.doc_file import DirectoryDocFile, FilesDocFile
+from TemplateProject.core.services.doc_sidecar import sidecar_paths
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.log_service import get_logger
+
+DS_DOC_FILE = "DSDocFile.json"
+FS_DOC_FILE = "FSDocFile.json"
+OPERATORS = {"=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "glob": "GLOB", "like": "LIKE",
+             "in": "IN"}
+# Параметров в одном запросе SQLite - не больше 999 в старых сборках
+_CHUNK = 500
+
+
+def default_index_path(root: str) -> str:
+    """Файл индекса хранится вне дерева: %LOCALAPPDATA%/MGSD/MetadataQuery/<хэш пути>.sqlite"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()
+    return f"{base}/MGSD/MetadataQuery/{key}.sqlite".replace("\\", "/")
+
+
+def doc_signature(json_path: str) -> str | None:
+    """"mtime_ns:size" json документа и журнала его sidecar одной строкой; None - json нет"""
+    parts = []
+    for path in (json_path, sidecar_paths(json_path)[1]):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if path == json_path:
+                return None
+            parts.append("-")
+            continue
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    return "|".join(parts)
+
+
+def _recent(signature: str | None, racy_ns: int) -> bool:
+    """Документ изменён позже racy_ns - изменение в пределах тика mtime может быть не видно"""
+    if signature is None:
+        return False
+    return any(part != "-" and int(part.partition(":")[0]) >= racy_ns for part in signature.split("|"))
+
+
+def _scalar(value) -> tuple[object, float | None] | None:
+    """Значение тега для индекса: (значение, число для сравнения и сортировки) или None - не скаляр"""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+        return value, number if math.isfinite(number) else None
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value, None
+        return value, number if math.isfinite(number) else None
+    return value, None
+
+
+def tag_rows(tags: dict) -> list[tuple]:
+    """Теги -> строки индекса (тег, значение, число, позиция); элемент списка (DirLinks, FilesLinks) - отдельная строка"""
+    rows = []
+    for tag, value in tags.items():
+        if isinstance(value, list):
+            for position, item in enumerate(value):
+                scalar = _scalar(item)
+                if scalar is not None:
+                    rows.append((tag, scalar[0], scalar[1], position))
+            continue
+        scalar = _scalar(value)
+        if scalar is not None:
+            rows.append((tag, scalar[0], scalar[1], None))
+    return rows
+
+
+def read_structure(path: str, doc_name: str) -> dict | None:
+    """
+    Документы одной структуры: теги директории, теги файлов и ссылки на вложенные структуры.
+    Документ с sidecar читается через журнал изменений.
+
+    :param path: Директория структуры
+    :param doc_name: Имя DSDocFile (SubdirectoryInfo.DocFile)
+    :return: {"DS", "FS" - подписи документов, "Tags", "Files": [(FileType, FileID, теги)],
+              "Children": [[SdN, Dirname, DocFile]]} или None - DSDocFile нет
+    """
+    ds_path = f"{path}/{doc_name}"
+    fs_path = f"{path}/{FS_DOC_FILE}"
+    ds_signature = doc_signature(ds_path)
+    if ds_signature is None:
+        return None
+    fs_signature = doc_signature(fs_path)
+    name = os.path.splitext(doc_name)[0]
+    directory = DirectoryDocFile(FileService(path, name, "json")).get(
+        "Directory", default={})
+    tags = {tag: value for tag, value in directory.items() if tag not in ("Details", "SubdirectoryInfo")}
+    if isinstance(directory.get("Details"), dict):
+        tags.update(directory["Details"])
+    children = []
+    subdirectories = directory.get("SubdirectoryInfo")
+    for sdn, entry in (subdirectories.items() if isinstance(subdirectories, dict) else ()):
+        dirname = entry.get("Dirname") if isinstance(entry, dict) else None
+        # Вложенная структура - папка внутри этой; другие ссылки (пустые, "..", пути) не обходятся
+        if not dirname or dirname in (".", "..") or "/" in dirname or "\\" in dirname:
+            continue
+        children.append([sdn, dirname, entry.get("DocFile") or DS_DOC_FILE])
+
+    files = []
+    if fs_signature is not None:
+        groups = FilesDocFile(FileService(path, "FSDocFile", "json")).get(
+            "Files", default={})
+        for file_type, entries in (groups.items() if isinstance(groups, dict) else ()):
+            for file_id, entry in (entries.items() if isinstance(entries, dict) else ()):
+                if not isinstance(entry, dict) or not entry.get("DirName"):
+                    continue
+                file_tags = {tag: value for tag, value in entry.items() if tag != "FileDetails"}
+                if isinstance(entry.get("FileDetails"), dict):
+                    file_tags.update(entry["FileDetails"])
+                files.append((file_type, file_id, file_tags))
+    return {"DS": ds_signature, "FS": fs_signature, "Tags": tags, "Files": files, "Children": children}
+
+
+class MetadataQuery:
+    """
+    Запросы к мета-данным всего дерева структур без открытия каждого документа.
+
+    Обход начинается с DSDocFile.json корня и идёт по ссылкам SubdirectoryInfo (Dirname, DocFile);
+    документы читаются параллельно в workers потоках. Теги директорий (Directory, Details) и файлов
+    (DirName, DetailName, FileDetails) складываются в индекс SQLite: тег, значение, число.
+
+    Индекс обновляется инкрементально, как FileIndexService: документ, (mtime, size) которого
+    (и журнала sidecar) не изменились, не перечитывается - его ссылки на вложенные структуры берутся из индекса.
+    Документ, изменённый меньше RACY_SECONDS назад, перечитывается при следующем обновлении.
+
+    Пример:
+        query = MetadataQuery(root)
+        query.directories(where={"Priority": "high"}, order_by="TotalSize", descending=True)
+        query.files(where={"FilesLinks": "path/to/file"})
+
+    :param root: Корень дерева (директория с DSDocFile.json)
+    :param index_path: Файл индекса, по умолчанию - default_index_path(root)
+    :param workers: Потоков чтения документов
+    :param refresh_interval: Сколько секунд запросы пользуются индексом без проверки документов
+    """
+    SCHEMA_VERSION = 1
+    RACY_SECONDS = 2
+    __roots = {}
+
+    def __init__(self, root: str, index_path: str | None = None, workers: int | None = None,
+                 refresh_interval: float = 0.0):
+        self.logger = get_logger("MetadataQuery")
+        self.lock = threading.RLock()
+        self.root = root.replace("\\", "/").rstrip("/")
+        self.index_path = index_path or default_index_path(self.root)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.refresh_interval = refresh_interval
+        self.last_refresh = None
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        try:
+            self.connection = self.__connect()
+        except sqlite3.DatabaseError:
+            # Индекс - только кэш: повреждённый файл пересоздаётся
+            self.logger.warning("[📁] - MetadataQuery - __init__ - Индекс %s повреждён, пересоздаём", self.index_path)
+            os.remove(self.index_path)
+            self.connection = self.__connect()
+
+    @classmethod
+    def for_root(cls, root: str, **kwargs):
+        """
+        Один общий индекс на дерево и файл индекса в пределах процесса.
+        workers и refresh_interval задаются при первом вызове - другие значения при повторных не применяются.
+        """
+        root_key = os.path.normcase(os.path.abspath(root))
+        index_path = kwargs.get("index_path") or default_index_path(root)
+        key = (root_key, os.path.normcase(os.path.abspath(index_path)))
+        query = cls.__roots.get(key)
+        if query is None:
+            query = cls(root, **kwargs)
+            cls.__roots[key] = query
+            return query
+        ignored = {name: value for name, value in kwargs.items()
+                   if name in ("workers", "refresh_interval") and value is not None
+                   and value != getattr(query, name)}
+        if ignored:
+            query.logger.warning("[📁] - MetadataQuery - for_root - Индекс %s уже открыт с workers=%s, "
+                                 "refresh_interval=%s, параметры %s не применены",
+                                 query.index_path, query.workers, query.refresh_interval, ignored)
+        return query
+
+    def __connect(self):
+        connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        stored_root = None
+        if version == self.SCHEMA_VERSION:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+            stored_root = row and row[0]
+        if version != self.SCHEMA_VERSION or stored_root != self.root:
+            self.__create_schema(connection)
+        return connection
+
+    def __create_schema(self, connection):
+        connection.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS tags;
+            DROP TABLE IF EXISTS entries;
+            DROP TABLE IF EXISTS directories;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE directories (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                sdn TEXT NOT NULL,
+                doc_file TEXT NOT NULL,
+                ds_signature TEXT,
+                fs_signature TEXT,
+                children TEXT NOT NULL
+            );
+            CREATE TABLE entries (
+                id INTEGER PRIMARY KEY,
+                directory INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                file_type TEXT,
+                file_id TEXT,
+                name TEXT
+            );
+            CREATE INDEX entries_directory ON entries (directory);
+            CREATE TABLE tags (
+                entry INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                value,
+                number REAL,
+                position INTEGER
+            );
+            CREATE INDEX tags_value ON tags (tag, value);
+            CREATE INDEX tags_number ON tags (tag, number);
+            CREATE INDEX tags_entry ON tags (entry);
+        """)
+        connection.execute("INSERT INTO meta (key, value) VALUES ('root', ?)", (self.root,))
+        connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        connection.commit()
+
+    def __full_path(self, relative_path: str) -> str:
+        return f"{self.root}/{relative_path}" if relative_path else self.root
+
+    def refresh(self) -> int:
+        """
+        Приводит индекс в соответствие с документами дерева.
+        :return: Количество перечитанных структур
+        """
+        with self.lock:
+            racy_ns = time.time_ns() - self.RACY_SECONDS * 1_000_000_000
+            known = {row[1]: row for row in self.connection.execute(
+                "SELECT id, path, sdn, doc_file, ds_signature, fs_signature, children FROM directories")}
+            seen = set()
+            rescanned = 0
+            with self.connection, ThreadPoolExecutor(max_workers=self.workers,
+                                                     thread_name_prefix="MetadataQuery") as executor:
+                scheduled = {""}
+                pending = {executor.submit(self.__visit, "", "", DS_DOC_FILE, known.get(""))}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        relative_path, sdn, doc_name, structure, changed = future.result()
+                        if structure is None:
+                            continue
+                        seen.add(relative_path)
+                        if changed:
+                            self.__store(relative_path, sdn, doc_name, structure, known.get(relative_path), racy_ns)
+                            rescanned += 1
+                        prefix = relative_path + "/" if relative_path else ""
+                        for child_sdn, dirname, child_doc in structure["Children"]:
+                            child = prefix + dirname
+                            if child not in scheduled:
+                                scheduled.add(child)
+                                pending.add(executor.submit(self.__visit, child, child_sdn, child_doc, known.get(child)))
+                removed = [known[path][0] for path in known.keys() - seen]
+                for directoryID in removed:
+                    self.__remove_entries(directoryID)
+                self.connection.executemany("DELETE FROM directories WHERE id = ?", ((iD,) for iD in removed))
+            self.last_refresh = time.monotonic()
+            if rescanned or removed:
+                self.logger.info("[📁] - MetadataQuery - refresh - %s: перечитано структур %s, удалено %s",
+                                 self.root, rescanned, len(removed))
+            return rescanned
+
+    def __visit(self, relative_path: str, sdn: str, doc_name: str, known):
+        """Поток обхода: :return: (путь, SdN, DocFile, структура или None, перечитана ли структура)"""
+        path = self.__full_path(relative_path)
+        if known is not None and known[2] == sdn and known[3] == doc_name and known[4] is not None \
+                and known[4] == doc_signature(f"{path}/{doc_name}") \
+                and known[5] == doc_signature(f"{path}/{FS_DOC_FILE}"):
+            return relative_path, sdn, doc_name, {"Children": json.loads(known[6])}, False
+        try:
+            structure = read_structure(path, doc_name)
+        except FileNotFoundError:
+            # Документ удалили во время обхода
+            structure = None
+        except ValueError as error:
+            self.logger.warning("[📁] - MetadataQuery - __visit - %s/%s не читается: %s", path, doc_name, error)
+            structure = None
+        return relative_path, sdn, doc_name, structure, True
+
+    def __store(self, relative_path: str, sdn: str, doc_name: str, structure: dict, known, racy_ns: int):
+        ds_signature, fs_signature = structure["DS"], structure["FS"]
+        if _recent(ds_signature, racy_ns) or _recent(fs_signature, racy_ns):
+            ds_signature = None
+        values = (sdn, doc_name, ds_signature, fs_signature, json.dumps(structure["Children"]))
+        if known is None:
+            directoryID = self.connection.execute(
+                "INSERT INTO directories (sdn, doc_file, ds_signature, fs_signature, children, path) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (*values, relative_path)).lastrowid
+        else:
+            directoryID = known[0]
+            self.__remove_entries(directoryID)
+            self.connection.execute(
+                "UPDATE directories SET sdn = ?, doc_file = ?, ds_signature = ?, fs_signature = ?, children = ? "
+                "WHERE id = ?", (*values, directoryID))
+        rows = []
+        entryID = self.connection.execute(
+            "INSERT INTO entries (directory, kind, name) VALUES (?, 'directory', ?)",
+            (directoryID, relative_path)).lastrowid
+        rows.extend((entryID, *row) for row in tag_rows(structure["Tags"]))
+        for file_type, file_id, tags in structure["Files"]:
+            entryID = self.connection.execute(
+                "INSERT INTO entries (directory, kind, file_type, file_id, name) VALUES (?, 'file', ?, ?, ?)",
+                (directoryID, file_type, file_id, tags.get("DirName"))).lastrowid
+            rows.extend((entryID, *row) for row in tag_rows(tags))
+        self.connection.executemany("INSERT INTO tags (entry, tag, value, number, position) VALUES (?, ?, ?, ?, ?)",
+                                    rows)
+
+    def __remove_entries(self, directoryID: int):
+        self.connection.execute("DELETE FROM tags WHERE entry IN (SELECT id FROM entries WHERE directory = ?)",
+                                (directoryID,))
+        self.connection.execute("DELETE FROM entries WHERE directory = ?", (directoryID,))
+
+    def __refresh_if_stale(self):
+        if self.last_refresh is None or time.monotonic() - self.last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    @staticmethod
+    def __condition(tag: str, condition) -> tuple[str, list]:
+        """Условие where -> подзапрос по индексу тегов"""
+        operator, value = condition if isinstance(condition, tuple) else ("=", condition)
+        if operator not in OPERATORS:
+            raise ValueError(f"Неизвестный оператор {operator!r}, допустимые: {list(OPERATORS)}")
+        values = list(value) if operator == "in" else [value]
+        if not values:
+            return "0", []
+        # Числа сравниваются по числовому значению тега (10 найдёт и 10, и "10"), остальное - как есть
+        numeric = all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in values)
+        column = "number" if numeric else "value"
+        placeholders = f"({', '.join('?' * len(values))})" if operator == "in" else "?"
+        return (f"e.id IN (SELECT entry FROM tags WHERE tag = ? AND {column} {OPERATORS[operator]} {placeholders})",
+                [tag, *values])
+
+    def __select(self, kind: str, file_type: str | None, where: dict | None, order_by: str | None,
+                 descending: bool, limit: int | None) -> list[dict]:
+        conditions = ["e.kind = ?"]
+        params = [kind]
+        if file_type is not None:
+            conditions.append("e.file_type = ?")
+            params.append(file_type)
+        for tag, condition in (where or {}).items():
+            sql, values = self.__condition(tag, condition)
+            conditions.append(sql)
+            params.extend(values)
+        join = ""
+        order = "d.path, e.name, e.id"
+        if order_by is not None:
+            join = "LEFT JOIN tags o ON o.entry = e.id AND o.tag = ? AND o.position IS NULL"
+            params.insert(0, order_by)
+            direction = "DESC" if descending else "ASC"
+            # Без тега - в конце; числа по числу, остальное по значению
+            order = f"o.entry IS NULL, o.number IS NULL, o.number {direction}, o.value {direction}, {order}"
+        with self.lock:
+            self.__refresh_if_stale()
+            rows = self.connection.execute(
+                "SELECT e.id, e.file_type, e.file_id, d.path, d.sdn FROM entries e "
+                f"JOIN directories d ON d.id = e.directory {join} "
+                f"WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT ?",
+                (*params, -1 if limit is None else limit)).fetchall()
+            results = {}
+            for entryID, row_file_type, file_id, relative_path, sdn in rows:
+                directory = self.__full_path(relative_path)
+                if kind == "directory":
+                    results[entryID] = {"Path": directory, "SdN": sdn}
+                else:
+                    results[entryID] = {"Path": "", "Directory": directory, "FileType": row_file_type,
+                                        "FileID": file_id}
+            ids = list(results)
+            for start in range(0, len(ids), _CHUNK):
+                chunk = ids[start:start + _CHUNK]
+                for entryID, tag, value, position in self.connection.execute(
+                        f"SELECT entry, tag, value, position FROM tags WHERE entry IN ({', '.join('?' * len(chunk))}) "
+                        "ORDER BY entry, tag, position", chunk):
+                    if position is None:
+                        results[entryID][tag] = value
+                    else:
+                        results[entryID].setdefault(tag, []).append(value)
+        if kind == "file":
+            for result in results.values():
+                result["Path"] = f"{result['Directory']}/{result.get('DirName', '')}"
+        return list(results.values())
+
+    def directories(self, where: dict | None = None, order_by: str | None = None, descending: bool = False,
+                    limit: int | None = None) -> list[dict]:
+        """
+        Структуры дерева, подходящие под все условия where.
+
+        :param where: {тег: значение} или {тег: (оператор, значение)}; операторы: =, !=, <, <=, >, >=,
+                      glob, like, in (значение - список). Для списков (DirLinks) достаточно одного подходящего элемента
+        :param order_by: Тег сортировки (структуры без тега - в конце); без него - по пути
+        :param descending: Сортировка по убыванию
+        :param limit: Не больше limit результатов
+        :return: [{"Path", "SdN", тег: значение, ...}] - теги Directory и Details
+        """
+        return self.__select("directory", None, where, order_by, descending, limit)
+
+    def files(self, where: dict | None = None, file_type: str | None = None, order_by: str | None = None,
+              descending: bool = False, limit: int | None = None) -> list[dict]:
+        """
+        Зарегистрированные файлы всех структур дерева (FSDocFile), подходящие под все условия where.
+
+        :param where: Как в directories(): {"FilesLinks": "path/to/file"}, {"FileSize": (">", 1024)}
+        :param file_type: "SystemFiles", "UserFiles", "NonIndexedFiles" или None - все
+        :return: [{"Path", "Directory", "FileType", "FileID", тег: значение, ...}] - DirName, DetailName и FileDetails
+        """
+        return self.__select("file", file_type, where, order_by, descending, limit)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
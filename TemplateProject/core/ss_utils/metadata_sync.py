@@ -0,0 +1,263 @@
+# Синхронизация мета-данных структуры (TotalSize, FileCount, CreatedAt, ModifiedAt) с файловой системой.
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.atomic_file_service import atomic_write
+from TemplateProject.core.services.doc_file import DirectoryDocFile, DocFile, FilesDocFile
+from TemplateProject.core.services.doc_sidecar import has_sidecar, sidecar_paths
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.log_service import get_logger
+
+DATE_FORMAT = "%d-%m-%Y %H:%M:%S"
+DS_DOC_FILE = "DSDocFile.json"
+FS_DOC_FILE = "FSDocFile.json"
+# Файлы мета-данных (и их двоичные снимки с журналами) не входят в размер и количество файлов -
+# иначе каждая синхронизация меняла бы итог
+DOC_FILES = frozenset((DS_DOC_FILE, FS_DOC_FILE, *sidecar_paths(DS_DOC_FILE), *sidecar_paths(FS_DOC_FILE)))
+# Группы FSDocFile, у записей которых есть FileDetails
+DETAILED_FILE_TYPES = ("SystemFiles", "UserFiles")
+
+
+def default_state_path(root: str) -> str:
+    """Состояние хранится вне структуры: %LOCALAPPDATA%/MGSD/MetadataSync/<хэш пути>.json"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()
+    return f"{base}/MGSD/MetadataSync/{key}.json".replace("\\", "/")
+
+
+def format_time(time_ns: int) -> str:
+    return datetime.fromtimestamp(time_ns / 1e9).strftime(DATE_FORMAT)
+
+
+def created_ns(stat: os.stat_result) -> int:
+    """Время создания: st_birthtime_ns (Windows, macOS), иначе st_ctime_ns (в Linux - последнее изменение inode)"""
+    return getattr(stat, "st_birthtime_ns", None) or stat.st_ctime_ns
+
+
+def scan_directory(path: str) -> dict:
+    """
+    Один уровень директории: её файлы (без файлов мета-данных) и имена вложенных папок.
+    :return: {"MTime", "CTime", "Size", "Count", "Latest" - последнее изменение файла, "Dirs",
+              "Files": {имя: [размер, mtime_ns, ctime_ns]} - только если в папке есть FSDocFile.json, "DS", "FS"}
+    """
+    stat = os.stat(path)
+    size = count = latest = 0
+    dirs = []
+    files = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+                continue
+            if entry.name in DOC_FILES:
+                continue
+            file_stat = entry.stat(follow_symlinks=False)
+            size += file_stat.st_size
+            count += 1
+            latest = max(latest, file_stat.st_mtime_ns)
+            files[entry.name] = [file_stat.st_size, file_stat.st_mtime_ns, created_ns(file_stat)]
+    has_fs = os.path.exists(f"{path}/{FS_DOC_FILE}")
+    return {"MTime": stat.st_mtime_ns, "CTime": created_ns(stat), "Size": size, "Count": count, "Latest": latest,
+            "Dirs": dirs, "Files": files if has_fs else None,
+            "DS": os.path.exists(f"{path}/{DS_DOC_FILE}"), "FS": has_fs}
+
+
+class MetadataSync:
+    """
+    Заполняет мета-данные структуры по файловой системе:
+        DSDocFile.json - Details: TotalSize, FileCount (с вложенными папками), ModifiedAt
+                         (последнее изменение файла в поддереве), CreatedAt - если ещё не заполнен
+        FSDocFile.json - FileDetails зарегистрированных файлов (SystemFiles, UserFiles): FileSize, ModifiedAt,
+                         CreatedAt - если ещё не заполнен
+
+    sync() обходит дерево один раз: папки читаются os.scandir параллельно в workers потоках
+    (scandir и stat отпускают GIL), итоги считаются снизу вверх. Все изменённые документы
+    записываются одной пачкой в FileService.transaction(); документ, итог которого не изменился, не трогается.
+
+    Повторный sync() - инкрементальный, как FileIndexService: папка, mtime которой не изменился,
+    не перечитывается - её итог берётся из состояния прошлого запуска, проверяются только вложенные папки.
+    mtime папки меняется при создании, удалении и переименовании файлов; файл, изменённый на месте
+    (без пересоздания), учитывается при sync(full=True). Запись документов (временный файл и os.replace)
+    тоже меняет mtime папки - после записи пачки он перечитывается и запоминается, чтобы следующий
+    запуск не перечитывал папки только из-за своей же записи.
+
+    :param root: Корень структуры
+    :param state_path: Файл состояния, по умолчанию - default_state_path(root); None не сохраняет состояние
+    :param workers: Потоков обхода
+    :param fsync: Дождаться записи документов на диск
+    """
+    STATE_VERSION = 1
+    RACY_SECONDS = 2
+
+    def __init__(self, root: str, state_path: str | None = "", workers: int | None = None, fsync: bool = True):
+        self.logger = get_logger("MetadataSync")
+        self.root = root.replace("\\", "/").rstrip("/")
+        self.state_path = default_state_path(self.root) if state_path == "" else state_path
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.fsync = fsync
+        self.directories = self.__load_state()
+
+    def __load_state(self) -> dict:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "rb") as file:
+                state = json_codec.decode(file.read())
+        except (OSError, ValueError):
+            self.logger.warning("[📁] - MetadataSync - __load_state - Состояние %s не читается, полный обход",
+                                self.state_path)
+            return {}
+        if state.get("Version") != self.STATE_VERSION or state.get("Root") != self.root:
+            return {}
+        return state["Directories"]
+
+    def __save_state(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        atomic_write(self.state_path, json_codec.encode(
+            {"Version": self.STATE_VERSION, "Root": self.root, "Directories": self.directories}, compact=True))
+
+    def path(self, rel_dir: str) -> str:
+        return f"{self.root}/{rel_dir}" if rel_dir else self.root
+
+    def __mtime(self, rel_dir: str) -> int | None:
+        try:
+            return os.stat(self.path(rel_dir)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def __visit(self, rel_dir: str, full: bool) -> tuple[str, dict, bool]:
+        """:return: (rel_dir, состояние папки, перечитана ли папка)"""
+        path = self.path(rel_dir)
+        cached = self.directories.get(rel_dir)
+        if not full and cached is not None and cached["MTime"] is not None \
+                and os.stat(path).st_mtime_ns == cached["MTime"]:
+            return rel_dir, cached, False
+        entry = scan_directory(path)
+        if time.time_ns() - entry["MTime"] < self.RACY_SECONDS * 1_000_000_000:
+            # Изменение в пределах тика mtime может быть не видно - папка перечитывается в следующий раз
+            entry["MTime"] = None
+        # Written не переносится: документ в перечитанной папке могли изменить снаружи - он сверяется заново
+        return rel_dir, entry, True
+
+    def __walk(self, full: bool) -> tuple[dict, set]:
+        """Параллельный обход от корня: новые состояния папок и множество перечитанных папок"""
+        directories = {}
+        scanned = set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="MetadataSync") as executor:
+            pending = {executor.submit(self.__visit, "", full)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        rel_dir, entry, rescanned = future.result()
+                    except FileNotFoundError:
+                        # Папку удалили во время обхода
+                        continue
+                    directories[rel_dir] = entry
+                    if rescanned:
+                        scanned.add(rel_dir)
+                    prefix = rel_dir + "/" if rel_dir else ""
+                    pending.update(executor.submit(self.__visit, prefix + name, full) for name in entry["Dirs"])
+        return directories, scanned
+
+    @staticmethod
+    def __aggregate(directories: dict) -> dict:
+        """Итоги поддеревьев снизу вверх: {rel_dir: (TotalSize, FileCount, Latest)}"""
+        totals = {}
+        for rel_dir in sorted(directories, key=lambda name: name.count("/") + bool(name), reverse=True):
+            entry = directories[rel_dir]
+            size, count, latest = entry["Size"], entry["Count"], entry["Latest"]
+            prefix = rel_dir + "/" if rel_dir else ""
+            for name in entry["Dirs"]:
+                child = totals.get(prefix + name)
+                if child is not None:
+                    size += child[0]
+                    count += child[1]
+                    latest = max(latest, child[2])
+            totals[rel_dir] = (size, count, latest)
+        return totals
+
+    def sync(self, full: bool = False) -> dict:
+        """
+        :param full: Перечитать все папки и все документы, не доверяя состоянию прошлого запуска
+        :return: {"Directories", "Scanned", "DocFiles" - записано документов, "Files", "TotalSize", "Duration"}
+        """
+        start = time.perf_counter()
+        directories, scanned = self.__walk(full)
+        totals = self.__aggregate(directories)
+        written = 0
+        updated = []
+        written_dirs = set()
+        with FileService.transaction(fsync=self.fsync):
+            for rel_dir, entry in directories.items():
+                path = self.path(rel_dir)
+                if entry["DS"]:
+                    size, count, latest = totals[rel_dir]
+                    details = {"TotalSize": size, "FileCount": count,
+                               "ModifiedAt": format_time(latest) if latest else ""}
+                    if full or entry.get("Written") != details:
+                        if self.__update_directory_doc(path, details, format_time(entry["CTime"])):
+                            written += 1
+                            written_dirs.add(rel_dir)
+                        updated.append((entry, details))
+                if entry["FS"] and (full or rel_dir in scanned):
+                    if self.__update_files_doc(path, entry["Files"]):
+                        written += 1
+                        written_dirs.add(rel_dir)
+            # mtime после записи можно запомнить, только если папку не меняли снаружи после обхода
+            unchanged = [rel_dir for rel_dir in written_dirs
+                         if directories[rel_dir]["MTime"] is not None
+                         and self.__mtime(rel_dir) == directories[rel_dir]["MTime"]]
+        # Записанные итоги запоминаются только после записи пачки
+        for entry, details in updated:
+            entry["Written"] = details
+        for rel_dir in unchanged:
+            path = self.path(rel_dir)
+            for name in ("DSDocFile", "FSDocFile"):
+                if has_sidecar(f"{path}/{name}.json"):
+                    # Снимок sidecar пересобирается из записанного json сейчас, а не при следующем чтении
+                    DocFile(FileService(path, name, "json")).get()
+            directories[rel_dir]["MTime"] = self.__mtime(rel_dir)
+        self.directories = directories
+        self.__save_state()
+        size, count, _ = totals.get("", (0, 0, 0))
+        result = {"Directories": len(directories), "Scanned": len(scanned), "DocFiles": written,
+                  "Files": count, "TotalSize": size, "Duration": time.perf_counter() - start}
+        self.logger.info("[✅] - MetadataSync - sync - %s: %s", self.root, result)
+        return result
+
+    @staticmethod
+    def __update_directory_doc(path: str, details: dict, created: str) -> int:
+        file_service = FileService(path, "DSDocFile", "json")
+        doc = DirectoryDocFile(file_service, autoflush=False)
+        current = doc.get("Directory", "Details", default={})
+        # Время создания не пересчитывается: в Linux вместо него ctime, который меняет сама запись документа
+        if not current.get("CreatedAt"):
+            doc.set_detail("CreatedAt", created)
+        for tag, value in details.items():
+            if current.get(tag) != value:
+                doc.set_detail(tag, value)
+        return int(doc.flush())
+
+    @staticmethod
+    def __update_files_doc(path: str, files: dict) -> int:
+        file_service = FileService(path, "FSDocFile", "json")
+        doc = FilesDocFile(file_service, autoflush=False)
+        for file_type in DETAILED_FILE_TYPES:
+            for file_id, file in doc.get("Files", file_type, default={}).items():
+                stat = files.get(file.get("DirName"))
+                if stat is None or not isinstance(file.get("FileDetails"), dict):
+                    continue
+                details = {"FileSize": stat[0], "ModifiedAt": format_time(stat[1])}
+                if not file["FileDetails"].get("CreatedAt"):
+                    details["CreatedAt"] = format_time(stat[2])
+                if any(file["FileDetails"].get(tag) != value for tag, value in details.items()):
+                    doc.merge({"Files": {file_type: {file_id: {"FileDetails": details}}}})
+        return int(doc.flush())
@@ -1,18 +1,49 @@
 # Работа с мета-данными.
 import ast
 
+from TemplateProject.core.services.doc_file import DirectoryDocFile, FilesDocFile
+from TemplateProject.core.services.doc_sidecar import DocSidecar
 from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.json_file_service import copy_json_data
 from TemplateProject.core.services.metadata_service import MetadataService
 
 
 class MetadataUtils:
+    """
+    Мета-данные директории: DSDocFile.json (директория) и FSDocFile.json (файлы).
+
+    Документы загружаются в память один раз (DirectoryDocFile, FilesDocFile) и перечитываются,
+    только если файл изменили снаружи. Чтение тегов - обращение к словарю, запись - изменение
+    документа в памяти и запись файла целиком без повторного чтения.
+
+    С sidecar=True рядом с документами хранятся двоичные снимки (DSDocFile.bin, FSDocFile.bin) и журналы
+    изменений (DSDocFile.log, FSDocFile.log): запись тега дописывает в журнал одну запись, json
+    перезаписывается только при уплотнении журнала (compact). Документы, у которых снимок уже есть,
+    читаются и пишутся через журнал при любом sidecar.
+
+    :param directory: Директория с DSDocFile.json и FSDocFile.json
+    :param autoflush: True - файл записывается после каждого изменения, False - только при flush()
+    :param sidecar: True - создать двоичный снимок и журнал изменений вместо перезаписи json на каждое изменение
+    """
     Tags = {}
 
-    def __init__(self, directory):
+    def __init__(self, directory, autoflush=True, sidecar=False):
         self.directory = directory
         self.MSTagsData = MetadataService()
         self.DSDocFile = FileService(self.directory, file_name='DSDocFile', file_extension='json')
         self.FSDocFile = FileService(self.directory, file_name='FSDocFile', file_extension='json')
+        self.DSDoc = DirectoryDocFile(self.DSDocFile, autoflush=autoflush, sidecar=sidecar)
+        self.FSDoc = FilesDocFile(self.FSDocFile, autoflush=autoflush, sidecar=sidecar)
+
+    def flush(self):
+        """Записывает изменённые документы (для autoflush=False)"""
+        self.DSDoc.flush()
+        self.FSDoc.flush()
+
+    def compact(self):
+        """Записывает json документы целиком и уплотняет журналы изменений (для sidecar=True)"""
+        self.DSDoc.compact()
+        self.FSDoc.compact()
 
     # def _check_tag(self, level, tag):
     #     if level == "1":
@@ -24,25 +55,27 @@ class MetadataUtils:
     def createDSDocFile(self, rewrite=False):
         filedata = self.__create_doc_file_meta_tags("DSDocFile")
         if rewrite:
-            self.DSDocFile.write_file(content=filedata)
+            self.DSDoc.replace(filedata)
             return True
         else:
             try:
                 self.DSDocFile.create_file(content=filedata)
+                self.DSDoc.invalidate()
                 return self.DSDocFile.get_file_path()
             except FileExistsError:
-                return [self.DSDocFile.get_file_path(), self.DSDocFile.read_file()]
+                return [self.DSDocFile.get_file_path(), ['json', self.DSDoc.get_copy()]]
 
     def createFSDocFile(self, rewrite=False):
         filedata = self.__create_doc_file_meta_tags("FSDocFile")
         if rewrite:
-            self.FSDocFile.write_file(content=filedata)
+            self.FSDoc.replace(filedata)
         else:
             try:
                 self.FSDocFile.create_file(content=filedata)
+                self.FSDoc.invalidate()
                 return self.FSDocFile.get_file_path()
             except FileExistsError:
-                return [self.FSDocFile.get_file_path(), self.FSDocFile.read_file()]
+                return [self.FSDocFile.get_file_path(), ['json', self.FSDoc.get_copy()]]
 
     def __create_doc_file_meta_tags(self, filename):
         if filename == 'DSDocFile':
@@ -154,12 +187,16 @@ class MetadataUtils:
         :param SdN: if 0 and :param target_name_tag: == -1: Возвращает все поддиректории,
                 иначе if :param SdN: == 0 вместо этого параметра берётся вот этот :param target_name_tag:
         :param file_id:
-        :return: {json}
+        :return: {json} - копия, её можно менять
         :raise: KeyError, ValueError
         """
+        return copy_json_data(self.__readMetadataSDocFile(type_tag, level_name_tag, target_name_tag, SdN, file_id))
+
+    def __readMetadataSDocFile(self, type_tag, level_name_tag, target_name_tag, SdN="0", file_id="0"):
+        """readMetadataSDocFile без копии: значение из документа в памяти, только для чтения"""
         # ---------------------------------------Directory---------------------------------------
         if type_tag == "Directory":
-            datafile = self.DSDocFile.read_file()[1]
+            datafile = self.DSDoc.data
             if level_name_tag == "Directory" or level_name_tag == "1":
                 try:
                     return datafile["Directory"][target_name_tag]
@@ -199,7 +236,7 @@ class MetadataUtils:
                 raise KeyError("Уровень не существует")
         # ---------------------------------------Files---------------------------------------
         elif type_tag == "Files":
-            datafile = self.FSDocFile.read_file()[1]
+            datafile = self.FSDoc.data
             if level_name_tag == "Files" or level_name_tag == "1":
                 try:
                     return datafile["Files"][target_name_tag]
@@ -225,7 +262,7 @@ class MetadataUtils:
         """
         if tag_level_name == "Directory":
             if nametag not in ["Details", "SubdirectoryInfo", "SubdirectoryNonIndex"]:
-                self.DSDocFile.write_file({tag_level_name: {nametag: content}}, safeMode=True)
+                self.DSDoc.merge({tag_level_name: {nametag: content}})
                 return 1
             return -1
         elif tag_level_name == "Details":
@@ -244,7 +281,7 @@ class MetadataUtils:
                             if dir_links == "":
                                 dir_links = []
                             dir_links.append(d_link)
-                        self.DSDocFile.write_file({"Directory": {tag_level_name: {nametag: dir_links}}}, safeMode=True)
+                        self.DSDoc.merge({"Directory": {tag_level_name: {nametag: dir_links}}})
                         return 2
                 elif type(content) is str:
                     if content in dir_links:
@@ -253,38 +290,35 @@ class MetadataUtils:
                         if dir_links == "":
                             dir_links = []
                         dir_links.append(content)
-                        self.DSDocFile.write_file({"Directory": {tag_level_name: {nametag: dir_links}}}, safeMode=True)
+                        self.DSDoc.merge({"Directory": {tag_level_name: {nametag: dir_links}}})
                         return 2
             else:
-                self.DSDocFile.write_file({"Directory": {tag_level_name: {nametag: content}}}, safeMode=True)
+                self.DSDoc.merge({"Directory": {tag_level_name: {nametag: content}}})
                 return 2
         elif tag_level_name == "SubdirectoryInfo":
-
-            fileData = self.DSDocFile.read_file()[1]["Directory"]["SubdirectoryInfo"]
-            SdN_New = str(int((max(fileData, key=lambda x: int(x)))) + 1)
+            # Следующий SdN и занятые Dirname - из индексов документа, без перебора поддиректорий
+            index = self.DSDoc.subdirectory_index()
             if SdN == "0" or SdN == "New":
-                SdN = SdN_New
+                SdN = str(index.next_sdn)
             else:
-                if SdN >= SdN_New:
+                if int(SdN) >= index.next_sdn:
                     raise KeyError("Данный SdN не является действительным - SdN is not correct and not keys and values")
 
             if type(content) == str:
                 if nametag == "Dirname" or nametag == "DetailName" or nametag == "DocFile":
                     if nametag == "Dirname":
-                        for i in fileData.keys():
-                            if fileData[i]['Dirname'] == content:
-                                return -2
-                    self.DSDocFile.write_file({"Directory": {tag_level_name: {SdN: {nametag: content}}}}, safeMode=True)
+                        if index.sdn_by_dirname(content) is not None:
+                            return -2
+                    self.DSDoc.set_subdirectory(SdN, {nametag: content})
                     return 2
                 else:
                     return -2
             elif type(content) == list:
                 if len(content) == 3:
-                    for i in fileData.keys():
-                        if fileData[i]['Dirname'] == content[0]:
-                            return -2
-                    self.DSDocFile.write_file({"Directory": {tag_level_name: {
-                        SdN: {"Dirname": content[0], "DetailName": content[1], "DocFile": content[2]}}}}, safeMode=True)
+                    if index.sdn_by_dirname(content[0]) is not None:
+                        return -2
+                    self.DSDoc.set_subdirectory(SdN, {"Dirname": content[0], "DetailName": content[1],
+                                                      "DocFile": content[2]})
                     return 2
                 else:
                     return -2
@@ -294,12 +328,12 @@ class MetadataUtils:
                 if type(content_list) == list:
                     if not content in content_list:
                         content_list.append(content)
-                        self.DSDocFile.write_file({"Directory": {tag_level_name: content_list}}, safeMode=True)
+                        self.DSDoc.merge({"Directory": {tag_level_name: content_list}})
                         return 2
                     else:
                         return -2
                 elif content_list == "":
-                    self.DSDocFile.write_file({"Directory": {tag_level_name: [content]}}, safeMode=True)
+                    self.DSDoc.merge({"Directory": {tag_level_name: [content]}})
                     return 2
                 else:
                     return -2
@@ -310,7 +344,7 @@ class MetadataUtils:
                     content.extend(content_list)
                     content = list(set(content))
                     content.sort()
-                    self.DSDocFile.write_file({"Directory": {tag_level_name: content}}, safeMode=True)
+                    self.DSDoc.merge({"Directory": {tag_level_name: content}})
                     return 2
             else:
                 return -2
@@ -341,14 +375,54 @@ class MetadataUtils:
 
             print("replace_data_wMDSDF (new_content)", new_content)
             if tag == "":
-                self.DSDocFile.write_file({"Directory": {tag_level_name: new_content}}, safeMode=True)
+                self.DSDoc.merge({"Directory": {tag_level_name: new_content}})
                 return 31
             else:
-                self.DSDocFile.write_file({"Directory": {tag_level_name: {tag: new_content}}}, safeMode=True)
+                self.DSDoc.merge({"Directory": {tag_level_name: {tag: new_content}}})
                 return 32   # Записан в файл под tag
         else:
             return -312     # Элемент не найден
 
+    def register_files(self, files, target_name_tag="SystemFiles", existing="error"):
+        """
+        Регистрация пачки файлов в FSDocFile одной записью (вместо AddFile + UpdateFile на каждый файл).
+        ID проверяются по множеству ID документа в памяти; при ошибке проверки ничего не записывается.
+
+        :param files: [(file_id, DirName), ...] или [(file_id, DirName, {тег FileDetails: значение}), ...]
+        :param target_name_tag: "SystemFiles", "UserFiles", "NonIndexedFiles" (без FileDetails)
+        :param existing: Уже зарегистрированный ID: "error" - KeyError, "skip" - пропустить, "replace" - перезаписать
+        :return: Список зарегистрированных ID
+        :raise: KeyError - ID уже есть в документе или повторяется в пачке, ValueError - ID "0" или не строка
+        """
+        if existing not in ("error", "skip", "replace"):
+            raise ValueError(f"existing: 'error', 'skip' или 'replace', а не {existing!r}")
+        registered_ids = set(self.FSDoc.files(target_name_tag))
+        new_files = {}
+        conflicts = []
+        for file in files:
+            file_id, dir_name = file[0], file[1]
+            if type(file_id) is not str or file_id == "0":
+                raise ValueError(f"Недопустимый ID файла: {file_id!r}")
+            if file_id in new_files:
+                raise KeyError(f"ID файла повторяется в пачке: {file_id}")
+            if file_id in registered_ids and existing != "replace":
+                if existing == "error":
+                    conflicts.append(file_id)
+                continue
+            if target_name_tag == "NonIndexedFiles":
+                new_files[file_id] = {"DirName": dir_name, "DetailName": ""}
+            else:
+                details = {"Description": "", "Priority": "", "FilesLinks": [], "FileSize": "",
+                           "CreatedAt": "", "ModifiedAt": ""}
+                if len(file) > 2:
+                    details.update(file[2])
+                new_files[file_id] = {"DirName": dir_name, "DetailName": "", "FileDetails": details}
+        if conflicts:
+            raise KeyError(f"ID файлов уже зарегистрированы в {target_name_tag}: {conflicts}")
+        if new_files:
+            self.FSDoc.merge({"Files": {target_name_tag: new_files}})
+        return list(new_files)
+
     def writeMetadataFSDocFile(self, operation_name, level_name_tag, target_name_tag, content, file_id="0"):
         """
         :param operation_name: "AddType" (content useless), "RemoveType", "AddFile", "RemoveFile", "UpdateFile", "UpdateFileDetails"
@@ -366,8 +440,7 @@ class MetadataUtils:
         if operation_name == "AddType":
             try:
                 if level_name_tag == "Files" and target_name_tag[-5:] == "Files":
-                    self.FSDocFile.write_file({level_name_tag: {target_name_tag: {file_id: self.content}}},
-                                              safeMode=True)
+                    self.FSDoc.merge({level_name_tag: {target_name_tag: {file_id: self.content}}})
                     return 0
                 else:
                     return -1
@@ -384,9 +457,7 @@ class MetadataUtils:
                     files_types = ast.literal_eval(e[28:-2])
                     for type_file in files_types:
                         if type_file == target_name_tag:
-                            datafile = self.FSDocFile.read_file()[1]
-                            del datafile["Files"][type_file]
-                            self.FSDocFile.write_file(datafile)
+                            self.FSDoc.delete("Files", type_file)
                             return 0
                     return -1
             else:
@@ -405,8 +476,7 @@ class MetadataUtils:
                         try:
                             files = list(self.readMetadataSDocFile("Files", "Files", target_name_tag).keys())
                             if files_test(file_id, files) == 0:
-                                self.FSDocFile.write_file({level_name_tag: {target_name_tag: {file_id: self.content}}},
-                                                          safeMode=True)
+                                self.FSDoc.merge({level_name_tag: {target_name_tag: {file_id: self.content}}})
                                 return 0
                             else:
                                 return -1
@@ -415,9 +485,8 @@ class MetadataUtils:
                     elif target_name_tag == "NonIndexedFiles":
                         files = list(self.readMetadataSDocFile("Files", "Files", "NonIndexedFiles").keys())
                         files_test(file_id, files)
-                        self.FSDocFile.write_file(
-                            {level_name_tag: {target_name_tag: {file_id: self.content_non_indexed_file}}},
-                            safeMode=True)
+                        self.FSDoc.merge(
+                            {level_name_tag: {target_name_tag: {file_id: self.content_non_indexed_file}}})
                         return 0
                     else:
                         return -1
@@ -426,18 +495,16 @@ class MetadataUtils:
             else:
                 return -1
         elif operation_name == "RemoveFile":
-            def check_and_del_file(d_file_id, d_filedata, d_target_name_tag):
+            def check_and_del_file(d_file_id, d_target_name_tag):
                 try:
-                    del d_filedata["Files"][d_target_name_tag][d_file_id]
-                    self.FSDocFile.write_file(d_filedata)
+                    self.FSDoc.delete("Files", d_target_name_tag, d_file_id)
                     return 0
                 except KeyError:
                     return -2
 
             if level_name_tag == "Files":
-                filedata = self.FSDocFile.read_file()[1]
                 if file_id != "0":
-                    return check_and_del_file(file_id, filedata, target_name_tag)
+                    return check_and_del_file(file_id, target_name_tag)
                 else:
                     return -1
             else:
@@ -447,10 +514,9 @@ class MetadataUtils:
                 if file_id != 0:
                     if level_name_tag != "FileDetails":
                         try:
-                            filedata = self.FSDocFile.read_file()[1]
-                            check_data = filedata["Files"][target_name_tag][file_id]
+                            check_data = self.FSDoc.file(target_name_tag, file_id)
                             print(check_data)
-                            self.FSDocFile.write_file({"Files": {target_name_tag: {file_id: {content[0]: content[1]}}}}, safeMode=True)
+                            self.FSDoc.merge({"Files": {target_name_tag: {file_id: {content[0]: content[1]}}}})
                             return 0
                         except KeyError:
                             return -2
@@ -463,12 +529,9 @@ class MetadataUtils:
         elif operation_name == "UpdateFileDetails":
             if file_id != 0:
                 try:
-                    filedata = self.FSDocFile.read_file()[1]
-                    check_data = filedata["Files"][level_name_tag][file_id]["FileDetails"][target_name_tag]
-                    filedata = None
-                    self.FSDocFile.write_file(
-                        {"Files": {level_name_tag: {file_id: {"FileDetails": {target_name_tag: content}}}}},
-                        safeMode=True)
+                    check_data = self.FSDoc.file_detail(level_name_tag, file_id, target_name_tag)
+                    self.FSDoc.merge(
+                        {"Files": {level_name_tag: {file_id: {"FileDetails": {target_name_tag: content}}}}})
                     return 0
                 except KeyError as e:
                     if e == "FileDetails":
@@ -477,30 +540,40 @@ class MetadataUtils:
         else:
             return -1
 
+    def find_subdirectory(self, dirname_or_detail_name):
+        """
+        Поддиректория по Dirname или DetailName (индекс документа, без перебора SubdirectoryInfo)
+        :return: (dirname_or_detail_name, SdN) первой подходящей поддиректории или (None, None)
+        """
+        return self.DSDoc.subdirectory_index().find(dirname_or_detail_name)
+
     def removeSubdirMetadataDSDocFile(self, tag_level_name, SdN="0"):
         """
         :param tag_level_name:
         :param SdN: int or str (SdN or DetailName)
         :return: -1 = Элемент не найден. 1 = найден и удалён.
         """
-        file_data = self.DSDocFile.read_file()[1]
+        file_data = self.DSDoc.data
         SdNs = file_data["Directory"][tag_level_name]
 
         try:
             int(SdN)
         except ValueError:
+            if tag_level_name == "SubdirectoryInfo":
+                SdNi = self.DSDoc.subdirectory_index().sdn_by_detail_name(SdN)
+                if SdNi is None:
+                    return -1
+                self.DSDoc.remove_subdirectory(SdNi)
+                return 1
             for SdNi in SdNs:
                 if SdNs[SdNi]["DetailName"] == SdN:
-                    del file_data["Directory"][tag_level_name][SdNi]
-                    self.DSDocFile.write_file(file_data)
+                    self.DSDoc.delete("Directory", tag_level_name, SdNi)
                     return 1
             return -1
         if tag_level_name == "SubdirectoryInfo" and SdN != "0":
-            for key in SdNs.keys():
-                if key == SdN:
-                    del file_data["Directory"][tag_level_name][key]
-                    self.DSDocFile.write_file(file_data)
-                    return 1
+            if SdN in SdNs:
+                self.DSDoc.remove_subdirectory(SdN)
+                return 1
             return -1
         elif tag_level_name == "SubdirectoryNonIndex" and SdN != "0":
             SdNi = file_data["Directory"][tag_level_name]
@@ -514,13 +587,17 @@ class MetadataUtils:
             if check_element == 0:
                 return -1
             else:
-                self.DSDocFile.write_file({"Directory": {tag_level_name: data_list}}, safeMode=True)
+                self.DSDoc.merge({"Directory": {tag_level_name: data_list}})
                 return 2
         else:
             return -2
 
     def deleteDSDocFile(self):
+        self.DSDoc.invalidate()
         self.DSDocFile.delete_file()
+        DocSidecar(self.DSDocFile.get_file_path()).remove()
 
     def deleteFSDocFile(self):
+        self.FSDoc.invalidate()
         self.FSDocFile.delete_file()
+        DocSidecar(self.FSDocFile.get_file_path()).remove()
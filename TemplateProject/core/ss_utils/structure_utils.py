@@ -2,16 +2,52 @@ from distutils.command.build_ext import extension_name_re
 
 from TemplateProject.core.services.directory_service import DirectoryService
 from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_query import MetadataQuery
+from TemplateProject.core.ss_utils.metadata_sync import MetadataSync
 from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
 
 
 class StructureUtils:
-    def __init__(self, dir_name, directory):
+    """
+    :param autoflush: False - сеттеры меняют мета-данные только в памяти, на диск их записывает flush()
+    :param sidecar: True - мета-данные пишутся в журнал изменений двоичного снимка (MetadataUtils);
+                    структура, у которой снимок уже есть, пишется через журнал и с sidecar=False
+    """
+    def __init__(self, dir_name, directory, autoflush=True, sidecar=False):
         self.dir_name = dir_name
         self.directory = directory.replace('\\', '/')
         self.DSMainDir = None
         self.__dirExist()
-        self.MDDocData = MetadataUtils(self.directory)
+        self.MDDocData = MetadataUtils(self.directory, autoflush=autoflush, sidecar=sidecar)
+
+    def flush(self):
+        """Записывает изменённые мета-данные (DSDocFile.json, FSDocFile.json)"""
+        self.MDDocData.flush()
+
+    def compact(self):
+        """Записывает json мета-данных целиком и уплотняет журналы изменений (для sidecar=True)"""
+        self.MDDocData.compact()
+
+    def sync_metadata(self, full=False):
+        """
+        Заполняет TotalSize, FileCount, CreatedAt, ModifiedAt директории и всех вложенных структур
+        и FileDetails зарегистрированных файлов по файловой системе (MetadataSync)
+        :return: Статистика MetadataSync.sync()
+        """
+        self.MDDocData.flush()
+        result = MetadataSync(self.directory).sync(full=full)
+        self.MDDocData.DSDoc.invalidate()
+        self.MDDocData.FSDoc.invalidate()
+        return result
+
+    def metadata_query(self, **kwargs):
+        """
+        Запросы к мета-данным этой структуры и всех вложенных (MetadataQuery, общий на директорию).
+        Изменения мета-данных в памяти (autoflush=False) записываются, чтобы попасть в индекс.
+        :param kwargs: Параметры MetadataQuery (index_path, workers, refresh_interval)
+        """
+        self.MDDocData.flush()
+        return MetadataQuery.for_root(self.directory, **kwargs)
 
     def __dirExist(self):
         try:
@@ -27,10 +63,12 @@ class StructureUtils:
         self.MDDocData.writeMetadataDSDocFile('Details', 'DirectoryPath', self.directory)
 
     def createStructure(self, onFSDocFile=False):
-        self.MDDocData.createDSDocFile()
-        if onFSDocFile:
-            self.MDDocData.createFSDocFile()
-        self.__set_base_metadata_file()
+        # Создание файлов и базовые теги записываются на диск одним разом
+        with FileService.transaction():
+            self.MDDocData.createDSDocFile()
+            if onFSDocFile:
+                self.MDDocData.createFSDocFile()
+            self.__set_base_metadata_file()
 
     def removeStructure(self):
         try:
@@ -123,13 +161,8 @@ class StructureUtils:
         self.MDDocData.readMetadataSDocFile('Directory', '21', 'ModifiedAt')
 
     def getDirectorySdN_by_dirname_or_detail_name(self, dirname_or_detail_name):
-        for keys, values in self.MDDocData.readMetadataSDocFile('Directory', '22', '-1', '0').items():
-            print("getDirectorySdN_by_dirname_or_detail_name    ", keys, values, values["Dirname"], values["DetailName"])
-            if values["Dirname"] == dirname_or_detail_name:
-                return values["Dirname"], keys
-            elif values["DetailName"] == dirname_or_detail_name:
-                return values['DetailName'], keys
-        return None, None
+        """:return: (dirname_or_detail_name, SdN) или (None, None)"""
+        return self.MDDocData.find_subdirectory(dirname_or_detail_name)
 
     def getDirectorySdN_byId(self, SdN):
         self.MDDocData.readMetadataSDocFile('Directory', '22', 'Description')
@@ -161,10 +194,11 @@ class StructureUtils:
         if type(dirLink_name) == str:
             return self.MDDocData.writeMetadataDSDocFile('Details', 'DirLinks', [dirLink_name, ""])
         elif type(dirLink_name) == list:
-            while dirLink_name.__len__() > 0:
-                print(dirLink_name[0])
-                self.MDDocData.writeMetadataDSDocFile('Details', 'DirLinks', [dirLink_name[0], ""])
-                del dirLink_name[0]
+            with FileService.transaction():
+                while dirLink_name.__len__() > 0:
+                    print(dirLink_name[0])
+                    self.MDDocData.writeMetadataDSDocFile('Details', 'DirLinks', [dirLink_name[0], ""])
+                    del dirLink_name[0]
             return 1
 
     def removeDirectoryTotalSize(self):
@@ -197,10 +231,11 @@ class StructureUtils:
             else:
                 return self.MDDocData.writeMetadataDSDocFile('SubdirectoryNonIndex', '', "")
         elif type(content) == list:
-            while content.__len__() > 0:
-                print(content[0])
-                self.MDDocData.writeMetadataDSDocFile('SubdirectoryNonIndex', '', [content[0], ""])
-                del content[0]
+            with FileService.transaction():
+                while content.__len__() > 0:
+                    print(content[0])
+                    self.MDDocData.writeMetadataDSDocFile('SubdirectoryNonIndex', '', [content[0], ""])
+                    del content[0]
             return 1
 
     def __create_file(self, file_name, file_extension, content):
@@ -211,9 +246,30 @@ class StructureUtils:
 
     def new_json_file(self, file_id: str, file_name: str, content: dict):
         extension = "json"
-        self.new_file_metadata(file_id)
-        self.set_file_metadata_name(file_id, file_name, extension)
-        return self.__create_file(file_name, extension, content)
+        with FileService.transaction():
+            # Как прежние AddFile + UpdateFile: запись с тем же ID перезаписывается
+            self.MDDocData.register_files([(file_id, f"{file_name}.{extension}")], existing="replace")
+            return self.__create_file(file_name, extension, content)
+
+    def new_json_files(self, files):
+        """
+        Создание пачки json файлов: мета-данные всех файлов - одна запись FSDocFile,
+        сами файлы записываются одной пачкой при выходе из транзакции.
+        Как и в new_json_file, запись с уже зарегистрированным ID перезаписывается.
+        :param files: [(file_id, file_name, content), ...]
+        :return: [FileService, ...]
+        """
+        with FileService.transaction():
+            self.register_files([(file_id, f"{file_name}.json") for file_id, file_name, _ in files], existing="replace")
+            return [self.__create_file(file_name, "json", content) for _, file_name, content in files]
+
+    def register_files(self, files, target_name_tag="SystemFiles", existing="error"):
+        """
+        Регистрация уже существующих файлов директории в FSDocFile одной записью (MetadataUtils.register_files)
+        :param files: [(file_id, "Name.ext"), ...] или [(file_id, "Name.ext", {тег FileDetails: значение}), ...]
+        :return: Список зарегистрированных ID
+        """
+        return self.MDDocData.register_files(files, target_name_tag, existing)
 
     def new_file_metadata(self, file_id):
         self.MDDocData.writeMetadataFSDocFile("AddFile", "Files", "SystemFiles", "", file_id=file_id)
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from json import JSONDecodeError
+from unittest import mock
+
+from TemplateProject.core.services.atomic_file_service import atomic_write, atomic_write_many
+from TemplateProject.core.services.file_service import FileService
+
+
+class TestAtomicFileService(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.testDir, "TestFile.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_atomic_write(self):
+        atomic_write(self.file_path, '{"Test": 1}')
+        atomic_write(self.file_path, '{"Test": 2}', fsync=True)
+        with open(self.file_path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), '{"Test": 2}')
+        self.assertEqual(os.listdir(self.testDir), ["TestFile.json"])
+
+    def test_failed_write_keeps_old_file(self):
+        """Ошибка при замене файла не должна оставлять обрезанный файл и временные файлы"""
+        atomic_write(self.file_path, '{"Test": "old"}')
+        with mock.patch("os.replace", side_effect=OSError("disk error")):
+            with self.assertRaises(OSError):
+                atomic_write(self.file_path, '{"Test": "new"}')
+        with open(self.file_path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), '{"Test": "old"}')
+        self.assertEqual(os.listdir(self.testDir), ["TestFile.json"])
+
+    def test_atomic_write_many(self):
+        files = [(os.path.join(self.testDir, f"{i}.json"), f'{{"ID": {i}}}') for i in range(5)]
+        atomic_write_many(files)
+        self.assertEqual(sorted(os.listdir(self.testDir)), [f"{i}.json" for i in range(5)])
+
+    def test_write_many_files(self):
+        first = FileService(self.testDir, "First", "json")
+        second = FileService(self.testDir, "Second", "json")
+        first.create_file({"Data": {"A": 1}})
+        result = FileService.write_many_files([(first, {"Data": {"B": 2}}, True), (second, {"Data": 3})])
+        self.assertEqual(result, [{"Data": {"A": 1, "B": 2}}, {"Data": 3}])
+        self.assertEqual(first.read_file()[1], {"Data": {"A": 1, "B": 2}})
+        self.assertEqual(second.read_file()[1], {"Data": 3})
+
+    def test_read_broken_json_raises(self):
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            file.write('{"Test": ')
+        with self.assertRaises(JSONDecodeError):
+            FileService(self.testDir, "TestFile", "json").read_file()
+
+    def test_write_file_value_error_keeps_file(self):
+        file = FileService(self.testDir, "TestFile", "json")
+        file.create_file({"Test": 1})
+        with self.assertRaises(ValueError):
+            file.write_file({1})
+        self.assertEqual(file.read_file()[1], {"Test": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from TemplateProject.core.services import directory_scanner
+from TemplateProject.core.services.path_matcher import PathMatcher
+
+
+def walk_list_files(root, extension_filter=None):
+    """Прежняя реализация DirectoryService.list_files - для сравнения порядка"""
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for fn in filenames:
+            if not extension_filter or fn.lower().endswith(extension_filter.lower()):
+                files.append(os.path.join(dirpath, fn).replace("\\", "/"))
+
+    def natural_key(path):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+    files.sort(key=natural_key)
+    return files
+
+
+class TestDirectoryScanner(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp().replace("\\", "/")
+        for name in ("10.exe", "2.exe", "1.png", "b.txt", "A.TXT"):
+            self.touch(name)
+        for name in ("3.exe", "Doc 11.txt", "Doc 2.txt"):
+            self.touch("DocData/" + name)
+        self.touch("DocData/Deep/1.exe")
+        os.makedirs(f"{self.root}/Empty")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def touch(self, relative_path):
+        path = f"{self.root}/{relative_path}"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write("")
+
+    def test_matches_walk_order(self):
+        self.assertEqual(directory_scanner.list_files(self.root), walk_list_files(self.root))
+        self.assertEqual(directory_scanner.list_files(self.root, "EXE"), walk_list_files(self.root, "EXE"))
+
+    def test_natural_order(self):
+        names = [os.path.basename(path) for path in directory_scanner.list_files(self.root, ".exe")]
+        self.assertEqual(names[-1], "10.exe")
+        self.assertLess(names.index("2.exe"), names.index("3.exe"))
+
+    def test_max_depth(self):
+        top = directory_scanner.list_files(self.root, max_depth=0)
+        self.assertEqual(len(top), 5)
+        self.assertTrue(all(path.count("/") == self.root.count("/") + 1 for path in top))
+        self.assertEqual(len(directory_scanner.list_files(self.root, max_depth=1)), 8)
+
+    def test_limit(self):
+        full = directory_scanner.list_files(self.root)
+        self.assertEqual(directory_scanner.list_files(self.root, limit=3), full[:3])
+        self.assertEqual(directory_scanner.list_files(self.root, limit=100), full)
+
+    def test_name_filter_and_has_files(self):
+        found = list(directory_scanner.scan_files(self.root, name_filter=lambda name: "Doc" in name))
+        self.assertEqual(sorted(found), [f"{self.root}/DocData/Doc 11.txt", f"{self.root}/DocData/Doc 2.txt"])
+        self.assertTrue(directory_scanner.has_files(self.root))
+        self.assertFalse(directory_scanner.has_files(f"{self.root}/Empty"))
+        self.assertEqual(directory_scanner.list_files(f"{self.root}/Missing"), [])
+
+    def test_exclude(self):
+        exclude = PathMatcher(["DocData/Deep/", "*.txt", "!Doc 2.txt"], ignore_case=False)
+        found = directory_scanner.list_files(self.root, exclude=exclude)
+        self.assertEqual(sorted(path[len(self.root) + 1:] for path in found),
+                         ["1.png", "10.exe", "2.exe", "A.TXT", "DocData/3.exe", "DocData/Doc 2.txt"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.doc_file import DirectoryDocFile, DocFile
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+
+class TestDocFile(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.JSONFile = FileService(self.testDir, "DSDocFile", "json")
+        self.JSONFile.create_file({"Directory": {"Dirname": "Main", "Details": {"Priority": ""}}})
+        self.Doc = DirectoryDocFile(self.JSONFile)
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_reads_file_once(self):
+        with mock.patch.object(self.JSONFile, "read_file", wraps=self.JSONFile.read_file) as read_file:
+            for _ in range(100):
+                self.assertEqual(self.Doc.directory("Dirname"), "Main")
+                self.assertEqual(self.Doc.detail("Priority"), "")
+            self.Doc.set_detail("Priority", "1")
+            self.assertEqual(self.Doc.detail("Priority"), "1")
+        self.assertEqual(read_file.call_count, 1)
+        self.assertEqual(self.JSONFile.read_file()[1]["Directory"]["Details"]["Priority"], "1")
+
+    def test_reload_after_external_write(self):
+        self.assertEqual(self.Doc.directory("Dirname"), "Main")
+        FileService(self.testDir, "DSDocFile", "json").write_file({"Directory": {"Dirname": "Other name"}},
+                                                                  safeMode=True)
+        self.assertEqual(self.Doc.directory("Dirname"), "Other name")
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.Doc.detail("DirLinks")
+        self.assertEqual(self.Doc.detail("DirLinks", default=[]), [])
+
+    def test_without_autoflush(self):
+        doc = DocFile(self.JSONFile, autoflush=False)
+        doc.merge({"Directory": {"Description": "Text"}})
+        doc.delete("Directory", "Details")
+        self.assertTrue(doc.dirty)
+        self.assertNotIn("Description", self.JSONFile.read_file()[1]["Directory"])
+        self.assertTrue(doc.flush())
+        self.assertFalse(doc.flush())
+        self.assertEqual(self.JSONFile.read_file()[1], {"Directory": {"Dirname": "Main", "Description": "Text"}})
+
+    def test_caller_values_are_copied(self):
+        links = ["a"]
+        self.Doc.set_detail("DirLinks", links)
+        links.append("b")
+        self.assertEqual(self.Doc.detail("DirLinks"), ["a"])
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with FileService.transaction():
+                self.Doc.set_detail("Priority", "1")
+                self.assertEqual(self.Doc.detail("Priority"), "1")
+                raise RuntimeError
+        self.assertEqual(self.Doc.detail("Priority"), "")
+
+    def test_missing_file(self):
+        doc = DocFile(FileService(self.testDir, "New", "json"))
+        with self.assertRaises(FileNotFoundError):
+            doc.get("Files")
+        doc.merge({"Files": {}})
+        self.assertTrue(os.path.exists(os.path.join(self.testDir, "New.json")))
+
+
+class TestMetadataUtilsDocFile(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.MetadataUtils = MetadataUtils(self.testDir)
+        self.MetadataUtils.createDSDocFile()
+        self.MetadataUtils.createFSDocFile()
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_read_returns_copy(self):
+        self.MetadataUtils.writeMetadataDSDocFile("Details", "DirLinks", ["a", "b", "c"])
+        links = self.MetadataUtils.readMetadataSDocFile("Directory", "21", "DirLinks")
+        links.append("d")
+        self.assertEqual(self.MetadataUtils.readMetadataSDocFile("Directory", "21", "DirLinks"), ["a", "b", "c"])
+        self.assertEqual(self.MetadataUtils.writeMetadataDSDocFile("Details", "DirLinks", "a"), -2)
+
+    def test_subdirectories_and_files(self):
+        self.assertEqual(self.MetadataUtils.writeMetadataDSDocFile("SubdirectoryInfo", "", ["D1", "Det1", "Doc"]), 2)
+        self.assertEqual(self.MetadataUtils.removeSubdirMetadataDSDocFile("SubdirectoryInfo", "Det1"), 1)
+        self.assertEqual(list(self.MetadataUtils.readMetadataSDocFile("Directory", "22", "-1")), ["0"])
+        self.assertEqual(self.MetadataUtils.writeMetadataFSDocFile("AddFile", "Files", "SystemFiles", "", "5"), 0)
+        self.assertEqual(self.MetadataUtils.writeMetadataFSDocFile(
+            "UpdateFile", "File", "SystemFiles", ["DirName", "Data.json"], "5"), 0)
+        self.assertEqual(FileService(self.testDir, "FSDocFile", "json").read_file()[1]
+                         ["Files"]["SystemFiles"]["5"]["DirName"], "Data.json")
+        self.assertEqual(self.MetadataUtils.writeMetadataFSDocFile("RemoveFile", "Files", "SystemFiles", "", "5"), 0)
+        self.assertEqual(self.MetadataUtils.writeMetadataFSDocFile("RemoveFile", "Files", "SystemFiles", "", "5"), -2)
+
+    def test_recreate_after_delete(self):
+        self.MetadataUtils.writeMetadataDSDocFile("Directory", "Dirname", "Main")
+        self.MetadataUtils.deleteDSDocFile()
+        self.MetadataUtils.createDSDocFile()
+        self.assertEqual(self.MetadataUtils.readMetadataSDocFile("Directory", "1", "Dirname"), "")
+
+
+class TestRegisterFiles(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.MetadataUtils = MetadataUtils(self.testDir)
+        self.MetadataUtils.createFSDocFile()
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def read_files(self, target_name_tag="SystemFiles"):
+        return FileService(self.testDir, "FSDocFile", "json").read_file()[1]["Files"][target_name_tag]
+
+    def test_one_write_per_batch(self):
+        files = [(str(file_id), f"File{file_id}.json") for file_id in range(1, 501)]
+        with mock.patch.object(self.MetadataUtils.FSDocFile, "write_file",
+                               wraps=self.MetadataUtils.FSDocFile.write_file) as write_file:
+            self.assertEqual(self.MetadataUtils.register_files(files), [file_id for file_id, _ in files])
+        self.assertEqual(write_file.call_count, 1)
+        data = self.read_files()
+        self.assertEqual(len(data), 501)
+        self.assertEqual(data["500"]["DirName"], "File500.json")
+        self.assertEqual(data["500"]["FileDetails"]["FilesLinks"], [])
+
+    def test_details_and_non_indexed(self):
+        self.MetadataUtils.register_files([("1", "A.txt", {"FileSize": "10"})])
+        self.MetadataUtils.register_files([("1", "B.tmp")], "NonIndexedFiles")
+        self.assertEqual(self.read_files()["1"]["FileDetails"]["FileSize"], "10")
+        self.assertEqual(self.read_files("NonIndexedFiles")["1"], {"DirName": "B.tmp", "DetailName": ""})
+
+    def test_validation_is_all_or_nothing(self):
+        self.MetadataUtils.register_files([("1", "A.json")])
+        with self.assertRaises(KeyError):
+            self.MetadataUtils.register_files([("2", "B.json"), ("1", "A.json")])
+        with self.assertRaises(KeyError):
+            self.MetadataUtils.register_files([("3", "C.json"), ("3", "C.json")])
+        with self.assertRaises(ValueError):
+            self.MetadataUtils.register_files([("0", "D.json")])
+        self.assertEqual(set(self.read_files()), {"0", "1"})
+        self.assertEqual(self.MetadataUtils.register_files([("1", "A.json"), ("2", "B.json")], existing="skip"), ["2"])
+        self.MetadataUtils.register_files([("1", "New.json")], existing="replace")
+        self.assertEqual(self.read_files()["1"]["DirName"], "New.json")
+
+
+class TestSubdirectoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.MetadataUtils = MetadataUtils(self.testDir)
+        self.MetadataUtils.createDSDocFile()
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def add(self, dirname, detail_name="", SdN="0"):
+        return self.MetadataUtils.writeMetadataDSDocFile("SubdirectoryInfo", "", [dirname, detail_name, "Doc"], SdN)
+
+    def subdirectories(self):
+        return FileService(self.testDir, "DSDocFile", "json").read_file()[1]["Directory"]["SubdirectoryInfo"]
+
+    def test_allocation_and_unique_dirname(self):
+        for number in range(1, 13):
+            self.assertEqual(self.add(f"D{number}", f"Det{number}"), 2)
+        self.assertEqual(self.add("D5"), -2)
+        self.assertEqual(list(self.subdirectories())[-1], "12")
+        # SdN сравниваются как числа: "9" существует, хотя "9" > "13" как строки
+        self.assertEqual(self.add("New9", SdN="9"), 2)
+        with self.assertRaises(KeyError):
+            self.add("D13", SdN="13")
+        self.assertEqual(self.add("D5", SdN="5"), -2)
+        self.assertEqual(self.MetadataUtils.writeMetadataDSDocFile("SubdirectoryInfo", "Dirname", "D5", "5"), -2)
+        self.assertEqual(self.MetadataUtils.writeMetadataDSDocFile("SubdirectoryInfo", "Dirname", "Free", "5"), 2)
+        self.assertEqual(self.add("D5"), 2)
+        self.assertEqual(self.subdirectories()["13"]["Dirname"], "D5")
+
+    def test_remove_and_find(self):
+        for number in range(1, 4):
+            self.add(f"D{number}", "Same")
+        self.assertEqual(self.MetadataUtils.find_subdirectory("D2"), ("D2", "2"))
+        self.assertEqual(self.MetadataUtils.find_subdirectory("Same"), ("Same", "1"))
+        self.assertEqual(self.MetadataUtils.removeSubdirMetadataDSDocFile("SubdirectoryInfo", "Same"), 1)
+        self.assertEqual(self.MetadataUtils.find_subdirectory("Same"), ("Same", "2"))
+        self.assertEqual(self.MetadataUtils.find_subdirectory("D1"), (None, None))
+        self.assertEqual(self.MetadataUtils.removeSubdirMetadataDSDocFile("SubdirectoryInfo", "3"), 1)
+        self.assertEqual(self.MetadataUtils.removeSubdirMetadataDSDocFile("SubdirectoryInfo", "3"), -1)
+        # Как max(SdN) + 1: номер удалённого последнего SdN освобождается
+        self.add("D4")
+        self.assertEqual(self.MetadataUtils.find_subdirectory("D4"), ("D4", "3"))
+        self.assertEqual(self.add("D1"), 2)
+
+    def test_index_follows_other_changes(self):
+        self.add("D1")
+        self.MetadataUtils.DSDoc.set("Directory", "SubdirectoryInfo", "7", {"Dirname": "D7", "DetailName": ""})
+        self.assertEqual(self.MetadataUtils.find_subdirectory("D7"), ("D7", "7"))
+        FileService(self.testDir, "DSDocFile", "json").write_file(
+            {"Directory": {"SubdirectoryInfo": {"8": {"Dirname": "D8", "DetailName": ""}}}}, safeMode=True)
+        self.assertEqual(self.add("D9"), 2)
+        self.assertIn("9", self.subdirectories())
+        self.assertEqual(self.add("D8"), -2)
+
+
+if __name__ == '__main__':
+    unittest.main()
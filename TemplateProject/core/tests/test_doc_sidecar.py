@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.doc_file import DirectoryDocFile
+from TemplateProject.core.services.doc_sidecar import DocSidecar, SchemaCodec, schema_keys, sidecar_paths
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+
+class TestSchemaCodec(unittest.TestCase):
+    def test_round_trip(self):
+        codec = SchemaCodec(schema_keys())
+        document = {"Directory": {"Dirname": "Папка", "Details": {"TotalSize": 10 ** 20, "FileCount": -3,
+                                                                   "Priority": 1.5, "DirLinks": ["a", ""]},
+                                  "SubdirectoryInfo": {"0": {}, "17": {"DocFile": None}, "007": True},
+                                  "Свой тег": False}}
+        data = codec.encode(document)
+        self.assertEqual(codec.decode(data), (document, len(data)))
+
+    def test_schema_keys_take_one_byte(self):
+        codec = SchemaCodec(schema_keys())
+        self.assertEqual(len(codec.encode({"SubdirectoryInfo": {"12345": ""}})), 1 + 1 + 1 + 1 + 1 + 3 + 1)
+
+
+class TestDocSidecar(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.JSONFile = FileService(self.testDir, "DSDocFile", "json")
+        self.JSONFile.create_file({"Directory": {"Dirname": "Main", "Details": {"Priority": ""}}})
+        self.snapshot_path, self.log_path = sidecar_paths(self.JSONFile.get_file_path())
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def open(self):
+        return DirectoryDocFile(self.JSONFile, sidecar=True)
+
+    def test_changes_go_to_log(self):
+        doc = self.open()
+        doc.directory("Dirname")
+        with mock.patch.object(self.JSONFile, "write_file", wraps=self.JSONFile.write_file) as write_file:
+            for number in range(1, 101):
+                doc.set("Directory", "SubdirectoryInfo", str(number), {"Dirname": f"D{number}"})
+            doc.set_detail("Priority", "1")
+            doc.delete("Directory", "SubdirectoryInfo", "50")
+        self.assertEqual(write_file.call_count, 0)
+        self.assertEqual(self.JSONFile.read_file()[1]["Directory"]["Details"]["Priority"], "")
+
+        reopened = self.open()
+        self.assertEqual(reopened.detail("Priority"), "1")
+        self.assertEqual(len(reopened.subdirectories()), 99)
+        self.assertEqual(reopened.data, doc.data)
+
+        self.assertTrue(reopened.compact())
+        self.assertEqual(self.JSONFile.read_file()[1], doc.data)
+        self.assertEqual(os.path.getsize(self.log_path), 16)
+
+    def test_compaction_when_log_grows(self):
+        with mock.patch.object(DocSidecar, "COMPACT_MIN_BYTES", 256):
+            doc = self.open()
+            for number in range(1, 51):
+                doc.set_detail("Priority", str(number))
+            self.assertLess(os.path.getsize(self.log_path), 512)
+            self.assertNotEqual(self.JSONFile.read_file()[1]["Directory"]["Details"]["Priority"], "")
+            self.assertEqual(self.open().detail("Priority"), "50")
+
+    def test_external_json_change_wins(self):
+        doc = self.open()
+        doc.set_detail("Priority", "1")
+        self.JSONFile.write_file({"Directory": {"Dirname": "Other name"}}, safeMode=True)
+        self.assertEqual(doc.directory("Dirname"), "Other name")
+        self.assertEqual(doc.detail("Priority"), "")
+        self.assertEqual(self.open().directory("Dirname"), "Other name")
+
+    def test_torn_record_is_dropped(self):
+        doc = self.open()
+        doc.set_detail("Priority", "1")
+        doc.set_detail("Priority", "2")
+        with open(self.log_path, "r+b") as file:
+            file.truncate(os.path.getsize(self.log_path) - 1)
+        reopened = self.open()
+        self.assertEqual(reopened.detail("Priority"), "1")
+        reopened.set_detail("Priority", "3")
+        self.assertEqual(self.open().detail("Priority"), "3")
+
+    def test_transaction_writes_json(self):
+        doc = self.open()
+        with FileService.transaction(fsync=False):
+            doc.set_detail("Priority", "1")
+        self.assertEqual(self.JSONFile.read_file()[1]["Directory"]["Details"]["Priority"], "1")
+        doc.set_detail("TotalSize", 10)
+        reopened = self.open()
+        self.assertEqual((reopened.detail("Priority"), reopened.detail("TotalSize")), ("1", 10))
+
+
+class TestMetadataUtilsSidecar(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.MetadataUtils = MetadataUtils(self.testDir, sidecar=True)
+        self.MetadataUtils.createDSDocFile()
+        self.MetadataUtils.createFSDocFile()
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_same_api(self):
+        self.MetadataUtils.writeMetadataDSDocFile("SubdirectoryInfo", "", ["D1", "Det1", "Doc"])
+        self.MetadataUtils.writeMetadataDSDocFile("Details", "Priority", "2")
+        self.MetadataUtils.register_files([("1", "A.json")])
+        metadata = MetadataUtils(self.testDir, sidecar=True)
+        self.assertEqual(metadata.readMetadataSDocFile("Directory", "21", "Priority"), "2")
+        self.assertEqual(metadata.readMetadataSDocFile("Directory", "22", "", SdN="1"),
+                         {"Dirname": "D1", "DetailName": "Det1", "DocFile": "Doc"})
+        self.assertEqual(metadata.readMetadataSDocFile("Files", "21", "", file_id="1")["DirName"], "A.json")
+        metadata.deleteDSDocFile()
+        self.assertEqual(sorted(os.listdir(self.testDir)), ["FSDocFile.bin", "FSDocFile.json", "FSDocFile.log"])
+
+    def test_plain_writer_uses_existing_sidecar(self):
+        plain = MetadataUtils(self.testDir)
+        self.assertEqual(plain.readMetadataSDocFile("Directory", "21", "Priority"), "")
+        self.MetadataUtils.writeMetadataDSDocFile("Details", "Priority", "high")
+        self.assertEqual(plain.readMetadataSDocFile("Directory", "21", "Priority"), "high")
+        plain.writeMetadataDSDocFile("Directory", "Description", "Описание")
+        for metadata in (MetadataUtils(self.testDir), MetadataUtils(self.testDir, sidecar=True)):
+            self.assertEqual(metadata.readMetadataSDocFile("Directory", "21", "Priority"), "high")
+            self.assertEqual(metadata.readMetadataSDocFile("Directory", "1", "Description"), "Описание")
+
+    def test_create_existing_returns_current_data(self):
+        self.MetadataUtils.writeMetadataDSDocFile("Directory", "Dirname", "Main")
+        self.MetadataUtils.register_files([("1", "A.json")])
+        for metadata in (self.MetadataUtils, MetadataUtils(self.testDir)):
+            path, (file_type, data) = metadata.createDSDocFile()
+            self.assertEqual((file_type, data["Directory"]["Dirname"]), ("json", "Main"))
+            path, (file_type, data) = metadata.createFSDocFile()
+            self.assertEqual(data["Files"]["SystemFiles"]["1"]["DirName"], "A.json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from TemplateProject.core.services.file_index_service import FileIndexService
+
+
+class TestFileIndexService(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp().replace("\\", "/")
+        self.index_dir = tempfile.mkdtemp()
+        self.index_path = f"{self.index_dir}/index.sqlite"
+        for name in ("1.exe", "11.exe", "1.png", "x*y.txt", "a[1].txt"):
+            self.touch(name)
+        self.touch("Sub/21.exe")
+        self.touch("Sub/Deep/3.png")
+        self.service = FileIndexService(self.root, index_path=self.index_path)
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+
+    def touch(self, relative_path):
+        path = f"{self.root}/{relative_path}"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write("")
+
+    def names(self, paths):
+        return sorted(path[len(self.root) + 1:] for path in paths)
+
+    def test_queries(self):
+        self.assertEqual(self.names(self.service.search_files("1")),
+                         ["1.exe", "1.png", "11.exe", "Sub/21.exe", "a[1].txt"])
+        self.assertEqual(self.names(self.service.search_prefix("1")), ["1.exe", "1.png", "11.exe"])
+        self.assertEqual(self.names(self.service.search_glob("*.png")), ["1.png", "Sub/Deep/3.png"])
+        self.assertEqual(self.names(self.service.search_glob("1?.exe")), ["11.exe"])
+        self.assertEqual(self.names(self.service.search_files("*")), ["x*y.txt"])
+        self.assertEqual(self.names(self.service.search_files("[1]")), ["a[1].txt"])
+        self.assertEqual(self.service.search_files("EXE"), [])
+        self.assertEqual(len(self.service.search_files("exe", limit=2)), 2)
+
+    def test_incremental_refresh(self):
+        self.service.refresh()
+        self.touch("Sub/Deep/New.exe")
+        os.remove(f"{self.root}/11.exe")
+        os.rename(f"{self.root}/1.png", f"{self.root}/2.png")
+        shutil.rmtree(f"{self.root}/Sub/Deep")
+        self.touch("Other/1.txt")
+        self.assertEqual(self.names(self.service.search_prefix("")),
+                         ["1.exe", "2.png", "Other/1.txt", "Sub/21.exe", "a[1].txt", "x*y.txt"])
+        self.assertEqual(self.service.search_files("New"), [])
+
+    def test_unchanged_directories_are_not_rescanned(self):
+        old = time.time() - 3600
+        for dirpath, _, _ in os.walk(self.root):
+            os.utime(dirpath, (old, old))
+        self.service.refresh()
+        self.assertEqual(self.service.refresh(), 0)
+        self.touch("Sub/4.exe")
+        self.assertEqual(self.service.refresh(), 1)
+        self.service.close()
+
+        reopened = FileIndexService(self.root, index_path=self.index_path)
+        try:
+            self.assertEqual(self.names(reopened.search_files("4")), ["Sub/4.exe"])
+        finally:
+            reopened.close()
+        self.service = FileIndexService(self.root, index_path=self.index_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from json import JSONDecodeError
 from unittest import result
 
 from TemplateProject.core.services.file_service import FileService
@@ -43,7 +44,7 @@ class TestFileService(unittest.TestCase):
                 self.assertEqual(data, ['json', ""])
                 result_tjref = 'ФайлНеПустой(Строка???)'
             print('test_json_read_empty_file (NoEmptyError)     =   ', result_tjref)
-        except AssertionError:
+        except (AssertionError, JSONDecodeError):
             result_tjref = 'ФайлПустой(JSONDecodeError)'
             print('test_json_read_empty_file     =   ', result_tjref)
 
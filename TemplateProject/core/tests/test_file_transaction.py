@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from TemplateProject.core.services.file_service import FileService
+
+
+class TestFileTransaction(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.JSONFile = FileService(self.testDir, "TestFile", "json")
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_writes_are_flushed_once(self):
+        self.JSONFile.create_file({"Directory": {"Dirname": ""}})
+        with FileService.transaction():
+            self.JSONFile.write_file({"Directory": {"Dirname": "1"}}, safeMode=True)
+            self.JSONFile.write_file({"Directory": {"Details": {"Priority": "0"}}}, safeMode=True)
+            # Внутри транзакции чтение видит накопленные изменения, а файл на диске ещё старый
+            self.assertEqual(self.JSONFile.read_file()[1],
+                             {"Directory": {"Dirname": "1", "Details": {"Priority": "0"}}})
+            self.assertEqual(FileService(self.testDir, "TestFile", "json").read_file()[1]["Directory"]["Dirname"], "1")
+            with open(self.JSONFile.get_file_path(), encoding="utf-8") as file:
+                self.assertNotIn('"Priority"', file.read())
+        self.assertEqual(self.JSONFile.read_file()[1],
+                         {"Directory": {"Dirname": "1", "Details": {"Priority": "0"}}})
+
+    def test_create_in_transaction(self):
+        with FileService.transaction():
+            self.JSONFile.create_file({"Test": 1})
+            self.assertTrue(self.JSONFile.file_exists())
+            self.assertFalse(os.path.exists(self.JSONFile.get_file_path()))
+            with self.assertRaises(FileExistsError):
+                self.JSONFile.create_file({"Test": 2})
+        self.assertEqual(self.JSONFile.read_file()[1], {"Test": 1})
+
+    def test_rollback_on_error(self):
+        self.JSONFile.create_file({"Test": 1})
+        with self.assertRaises(KeyError):
+            with FileService.transaction():
+                self.JSONFile.write_file({"Test": 2})
+                raise KeyError("Test")
+        self.assertEqual(self.JSONFile.read_file()[1], {"Test": 1})
+
+    def test_nested_transaction(self):
+        with FileService.transaction():
+            with FileService.transaction():
+                self.JSONFile.create_file({"Test": 1})
+            self.assertFalse(os.path.exists(self.JSONFile.get_file_path()))
+        self.assertEqual(self.JSONFile.read_file()[1], {"Test": 1})
+
+    def test_delete_pending_file(self):
+        with FileService.transaction():
+            self.JSONFile.create_file({"Test": 1})
+            self.assertEqual(self.JSONFile.delete_file(), 1)
+        self.assertFalse(os.path.exists(self.JSONFile.get_file_path()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from TemplateProject.core.services.id_allocator_service import IDAllocatorService, file_name_id
+
+
+class TestIDAllocatorService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp().replace("\\", "/")
+        self.lock_path = f"{self.directory}_id.lock"
+        for name in ("1.exe.lnk", "1.png", "11.exe.lnk", "3.png", "Readme.txt"):
+            self.touch(name)
+        self.allocator = IDAllocatorService(self.directory, lock_path=self.lock_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if os.path.exists(self.lock_path):
+            os.remove(self.lock_path)
+
+    def touch(self, name):
+        with open(f"{self.directory}/{name}", "w") as file:
+            file.write("")
+
+    def create_app(self, allocator):
+        with allocator.reserve() as iD:
+            self.touch(f"{iD}.exe.lnk")
+            self.touch(f"{iD}.png")
+        return iD
+
+    def test_file_name_id(self):
+        self.assertEqual(file_name_id("12.exe.lnk"), 12)
+        self.assertEqual(file_name_id("12"), 12)
+        self.assertIsNone(file_name_id("App12.exe"))
+        self.assertIsNone(file_name_id("Readme.txt"))
+
+    def test_no_false_matches(self):
+        # Раньше "1" находился в "11.exe.lnk", а "2" - нет, но проверялось вхождение подстроки
+        self.assertEqual([self.create_app(self.allocator) for _ in range(3)], [2, 4, 5])
+        self.assertEqual(self.allocator.used_ids(), [1, 2, 3, 4, 5, 11])
+
+    def test_external_changes_are_rescanned(self):
+        self.assertEqual(self.create_app(self.allocator), 2)
+        self.touch("4.png")
+        os.remove(f"{self.directory}/3.png")
+        self.assertEqual(self.create_app(self.allocator), 3)
+        self.assertEqual(self.create_app(self.allocator), 5)
+
+    def test_failed_block_frees_id(self):
+        with self.assertRaises(RuntimeError):
+            with self.allocator.reserve():
+                raise RuntimeError("create_shortcut")
+        self.assertEqual(self.create_app(self.allocator), 2)
+
+    def test_no_upper_limit(self):
+        for iD in range(2, 1200):
+            self.touch(f"{iD}.png")
+        self.assertEqual(self.create_app(self.allocator), 1200)
+
+    def test_concurrent_allocators(self):
+        # Два распределителя на одну директорию - как два процесса
+        allocators = [self.allocator, IDAllocatorService(self.directory, lock_path=self.lock_path)]
+        results = []
+
+        def worker(allocator):
+            for _ in range(20):
+                results.append(self.create_app(allocator))
+
+        threads = [threading.Thread(target=worker, args=(allocators[i % 2],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 80)
+        self.assertEqual(len(set(results)), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.file_service import FileService
+
+
+class TestJSONCodec(unittest.TestCase):
+    DATA = {"Name": "Проект", "Data": [{"ID": "1", "Size": 1.5, "Active": True, "Parent": None}]}
+
+    def test_backends_roundtrip(self):
+        for name in json_codec.available_backends():
+            codec = json_codec.get_codec(name)
+            for compact in (False, True):
+                with self.subTest(backend=name, compact=compact):
+                    encoded = codec.encode(self.DATA, compact=compact)
+                    self.assertIsInstance(encoded, bytes)
+                    self.assertEqual(json.loads(encoded), self.DATA)
+                    self.assertEqual(codec.decode(encoded), self.DATA)
+                    self.assertEqual(codec.decode(encoded.decode("utf-8")), self.DATA)
+                    self.assertEqual(b"\n" in encoded, not compact)
+
+    def test_indented_output_is_identical(self):
+        expected = json_codec.JSONCodec().encode(self.DATA)
+        for name in json_codec.available_backends():
+            with self.subTest(backend=name):
+                self.assertEqual(json_codec.get_codec(name).encode(self.DATA), expected)
+
+    def test_decode_error_is_json_error(self):
+        for name in json_codec.available_backends():
+            with self.subTest(backend=name):
+                with self.assertRaises(json.JSONDecodeError):
+                    json_codec.get_codec(name).decode(b'{"Name": ')
+
+    def test_stdlib_is_always_available(self):
+        self.assertEqual(json_codec.available_backends()[-1], "json")
+        self.assertEqual(json_codec.get_codec("json").encode({"A": 1}), json.dumps({"A": 1}, indent=4).encode())
+        with self.assertRaises(ValueError):
+            json_codec.get_codec("yaml")
+
+
+class TestCompactFileService(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_compact_file(self):
+        file = FileService(self.testDir, "ChunksData", "json", compact=True)
+        file.create_file({"DataChunks": [{"ID": "1"}]})
+        file.write_file({"DataChunks": [{"ID": "2"}]})
+        with open(file.get_file_path(), encoding="utf-8") as f:
+            self.assertNotIn("\n", f.read())
+        self.assertEqual(file.read_file()[1], {"DataChunks": [{"ID": "2"}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import logging
+import unittest
+
+from TemplateProject.core.services.log_service import LOG_PAYLOAD_LIMIT, get_logger
+
+
+class ExplodingRepr:
+    def __repr__(self):
+        raise AssertionError("repr не должен вызываться при выключенном уровне")
+
+    __str__ = __repr__
+
+
+class TestLazyLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = get_logger("TestLazyLogger")
+        self.logger.logger.setLevel(logging.INFO)
+
+    def test_disabled_level_does_not_format(self):
+        self.logger.debug("Данные: %s", ExplodingRepr())
+
+    def test_payload_is_truncated(self):
+        content = {f"Key{i}": "x" * 1000 for i in range(1000)}
+        with self.assertLogs("TestLazyLogger", level="INFO") as logs:
+            self.logger.info("[📁] - Test - Данные: %s", content)
+            self.logger.info("[📁] - Test - Строка: %s", "y" * 10000)
+        self.assertLess(len(logs.records[0].getMessage()), LOG_PAYLOAD_LIMIT + 100)
+        self.assertLess(len(logs.records[1].getMessage()), LOG_PAYLOAD_LIMIT + 100)
+        self.assertIn("Key0", logs.records[0].getMessage())
+
+    def test_caller_function_name(self):
+        with self.assertLogs("TestLazyLogger", level="INFO") as logs:
+            self.logger.info("Тест")
+        self.assertEqual(logs.records[0].funcName, "test_caller_function_name")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.ss_utils.metadata_query import MetadataQuery
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+
+class TestMetadataQuery(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.root = self.testDir + "/Main"
+        self.metadata = {}
+        for rel_dir, priority, size in (("", "low", 100), ("1", "high", 5000), ("2", "high", 20), ("1/1", "", "7")):
+            path = f"{self.root}/{rel_dir}".rstrip("/")
+            os.makedirs(path, exist_ok=True)
+            metadata = MetadataUtils(path)
+            metadata.createDSDocFile()
+            metadata.writeMetadataDSDocFile("Details", "Priority", priority)
+            metadata.writeMetadataDSDocFile("Details", "TotalSize", size)
+            self.metadata[rel_dir] = metadata
+        for parent, names in (("", ["1", "2"]), ("1", ["1"])):
+            for name in names:
+                self.metadata[parent].writeMetadataDSDocFile("SubdirectoryInfo", "", [name, f"Detail {name}",
+                                                                                      "DSDocFile.json"])
+        # Папка с документом, на которую нет ссылки в SubdirectoryInfo, в дерево не входит
+        os.makedirs(f"{self.root}/Other")
+        MetadataUtils(f"{self.root}/Other").createDSDocFile()
+
+        files = self.metadata["1"]
+        files.createFSDocFile()
+        files.register_files([("1", "A.json", {"FilesLinks": ["X", "Y"], "FileSize": 10}),
+                              ("2", "B.json", {"FilesLinks": ["Y"], "FileSize": 30})])
+        files.register_files([("1", "C.txt", {"FilesLinks": ["X"], "FileSize": 20})], "UserFiles")
+        self.query = MetadataQuery(self.root, index_path=self.testDir + "/Index.sqlite", workers=4)
+        self.query.RACY_SECONDS = 0
+
+    def tearDown(self):
+        self.query.close()
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def paths(self, results):
+        return [result["Path"][len(self.root):] for result in results]
+
+    def test_directories(self):
+        self.assertEqual(self.paths(self.query.directories(where={"Priority": "high"})), ["/1", "/2"])
+        result = self.query.directories(where={"Priority": "high"}, order_by="TotalSize", descending=True)
+        self.assertEqual(self.paths(result), ["/1", "/2"])
+        self.assertEqual((result[0]["SdN"], result[0]["TotalSize"]), ("1", 5000))
+        # Числа сравниваются по значению - "7" записано строкой
+        self.assertEqual(self.paths(self.query.directories(where={"TotalSize": ("<", 50)}, order_by="TotalSize")),
+                         ["/1/1", "/2"])
+        self.assertEqual(self.paths(self.query.directories(where={"Priority": ("in", ["low", ""])})), ["", "/1/1"])
+        self.assertEqual(len(self.query.directories()), 4)
+        with self.assertRaises(ValueError):
+            self.query.directories(where={"Priority": ("~", "high")})
+
+    def test_files(self):
+        self.assertEqual(self.paths(self.query.files(where={"FilesLinks": "X"})), ["/1/A.json", "/1/C.txt"])
+        result = self.query.files(where={"FilesLinks": "Y"}, file_type="SystemFiles", order_by="FileSize",
+                                  descending=True)
+        self.assertEqual(self.paths(result), ["/1/B.json", "/1/A.json"])
+        self.assertEqual((result[1]["FileID"], result[1]["FilesLinks"]), ("1", ["X", "Y"]))
+        self.assertEqual(self.paths(self.query.files(where={"DirName": ("glob", "*.txt")})), ["/1/C.txt"])
+
+    def test_incremental_refresh(self):
+        self.assertEqual(self.query.refresh(), 4)
+        with mock.patch("TemplateProject.core.ss_utils.metadata_query.read_structure") as read_structure:
+            self.assertEqual(self.query.refresh(), 0)
+        read_structure.assert_not_called()
+
+        self.metadata["2"].writeMetadataDSDocFile("Details", "Priority", "low")
+        self.assertEqual(self.query.refresh(), 1)
+        self.assertEqual(self.paths(self.query.directories(where={"Priority": "high"})), ["/1"])
+
+        self.metadata[""].removeSubdirMetadataDSDocFile("SubdirectoryInfo", "1")
+        self.assertEqual(self.paths(self.query.directories()), ["", "/2"])
+        self.assertEqual(self.query.files(where={"FilesLinks": "X"}), [])
+
+    def test_for_root_per_index(self):
+        first = MetadataQuery.for_root(self.root, index_path=self.testDir + "/First.sqlite", workers=2)
+        second = MetadataQuery.for_root(self.root, index_path=self.testDir + "/Second.sqlite")
+        try:
+            self.assertIsNot(first, second)
+            self.assertEqual(second.index_path, self.testDir + "/Second.sqlite")
+            with self.assertLogs("MetadataQuery", "WARNING"):
+                self.assertIs(MetadataQuery.for_root(self.root, index_path=self.testDir + "/First.sqlite",
+                                                     workers=8), first)
+            self.assertEqual(first.workers, 2)
+        finally:
+            first.close()
+            second.close()
+
+    def test_sidecar_documents(self):
+        metadata = MetadataUtils(f"{self.root}/2", sidecar=True)
+        metadata.writeMetadataDSDocFile("Details", "Priority", "urgent")
+        self.assertEqual(self.paths(self.query.directories(where={"Priority": "urgent"})), ["/2"])
+        metadata.writeMetadataDSDocFile("Details", "Priority", "done")
+        self.assertEqual(self.paths(self.query.directories(where={"Priority": "done"})), ["/2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
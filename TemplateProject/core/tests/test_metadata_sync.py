@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_sync import MetadataSync
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+
+class TestMetadataSync(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.root = self.testDir + "/Main"
+        for rel_dir in ("", "1", "1/1", "1/Data"):
+            os.makedirs(f"{self.root}/{rel_dir}", exist_ok=True)
+        for rel_dir in ("", "1", "1/1"):
+            MetadataUtils(f"{self.root}/{rel_dir}".rstrip("/")).createDSDocFile()
+        self.metadata = MetadataUtils(self.root)
+        self.metadata.createFSDocFile()
+        self.metadata.register_files([("1", "Main.json")])
+        self.write("Main.json", 100)
+        self.write("1/A.bin", 1000)
+        self.write("1/1/B.bin", 10)
+        self.write("1/Data/C.bin", 5)
+        self.sync = MetadataSync(self.root, state_path=self.testDir + "/State.json", workers=4, fsync=False)
+        # Всё создано только что - без этого каждая папка считалась бы изменённой в пределах тика mtime
+        self.sync.RACY_SECONDS = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def write(self, rel_path, size):
+        with open(f"{self.root}/{rel_path}", "wb") as file:
+            file.write(b"x" * size)
+
+    def details(self, rel_dir=""):
+        path = f"{self.root}/{rel_dir}".rstrip("/")
+        return FileService(path, "DSDocFile", "json").read_file()[1]["Directory"]["Details"]
+
+    def test_aggregates_bottom_up(self):
+        result = self.sync.sync()
+        self.assertEqual((result["Files"], result["TotalSize"], result["DocFiles"]), (4, 1115, 4))
+        self.assertEqual((self.details()["TotalSize"], self.details()["FileCount"]), (1115, 4))
+        self.assertEqual((self.details("1")["TotalSize"], self.details("1")["FileCount"]), (1015, 3))
+        self.assertEqual((self.details("1/1")["TotalSize"], self.details("1/1")["FileCount"]), (10, 1))
+        self.assertTrue(self.details()["ModifiedAt"])
+        file_details = FileService(self.root, "FSDocFile", "json").read_file()[1]["Files"]["SystemFiles"]["1"]
+        self.assertEqual(file_details["FileDetails"]["FileSize"], 100)
+
+    def test_incremental(self):
+        self.sync.sync()
+        # Запись документов меняет mtime их папок, но он запоминается после записи - папки не перечитываются
+        with mock.patch("TemplateProject.core.ss_utils.metadata_sync.scan_directory") as scan_directory:
+            result = MetadataSync(self.root, state_path=self.testDir + "/State.json", fsync=False).sync()
+        scan_directory.assert_not_called()
+        self.assertEqual((result["Scanned"], result["DocFiles"]), (0, 0))
+
+        self.write("1/1/New.bin", 7)
+        result = MetadataSync(self.root, state_path=self.testDir + "/State.json", fsync=False).sync()
+        self.assertEqual(result["Scanned"], 1)
+        self.assertEqual(result["DocFiles"], 3)
+        self.assertEqual((self.details()["TotalSize"], self.details()["FileCount"]), (1122, 5))
+        self.assertEqual(self.details("1/1")["FileCount"], 2)
+
+    def test_incremental_repairs_rewritten_document(self):
+        self.sync.sync()
+        MetadataUtils(f"{self.root}/1").createDSDocFile(rewrite=True)
+        self.assertEqual(self.details("1")["TotalSize"], '')
+        result = self.sync.sync()
+        self.assertEqual(result["DocFiles"], 1)
+        self.assertEqual((self.details("1")["TotalSize"], self.details("1")["FileCount"]), (1015, 3))
+
+    def test_incremental_with_sidecar(self):
+        MetadataUtils(f"{self.root}/1", sidecar=True).writeMetadataDSDocFile("Details", "Priority", "high")
+        self.sync.sync()
+        # Чтение после записи json не пересобирает снимок (и не меняет mtime папки) - он пересобран в sync()
+        self.assertEqual(MetadataUtils(f"{self.root}/1").readMetadataSDocFile("Directory", "21", "Priority"), "high")
+        with mock.patch("TemplateProject.core.ss_utils.metadata_sync.scan_directory") as scan_directory:
+            self.assertEqual(self.sync.sync()["Scanned"], 0)
+        scan_directory.assert_not_called()
+
+    def test_removed_directory(self):
+        self.sync.sync()
+        shutil.rmtree(f"{self.root}/1/Data")
+        self.sync.sync()
+        self.assertEqual((self.details("1")["TotalSize"], self.details("1")["FileCount"]), (1010, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
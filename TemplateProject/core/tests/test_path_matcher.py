@@ -0,0 +1,66 @@
+import unittest
+
+from TemplateProject.core.services.path_matcher import PathMatcher, build_matcher
+
+
+class TestPathMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = PathMatcher([
+            "# комментарий",
+            "__pycache__/",
+            "node_modules",
+            "*.log",
+            "!keep.log",
+            "/build",
+            "docs/**/*.tmp",
+            "cache/**",
+            "[Tt]emp?/",
+            "\\#notes.txt",
+        ], ignore_case=False)
+
+    def test_names_and_directory_only(self):
+        self.assertTrue(self.matcher.excludes_dir("src/__pycache__"))
+        self.assertFalse(self.matcher.excludes_file("__pycache__"))
+        self.assertTrue(self.matcher.excludes_dir("web/node_modules"))
+        self.assertTrue(self.matcher.excludes_file("node_modules"))
+        self.assertTrue(self.matcher.excludes_dir("temp1"))
+        self.assertFalse(self.matcher.excludes_dir("temp"))
+
+    def test_globs_and_negation(self):
+        self.assertTrue(self.matcher.excludes_file("logs/app.log"))
+        self.assertFalse(self.matcher.excludes_file("logs/keep.log"))
+        self.assertTrue(self.matcher.excludes_file("docs/c.tmp"))
+        self.assertTrue(self.matcher.excludes_file("docs/a/b/c.tmp"))
+        self.assertFalse(self.matcher.excludes_file("src/c.tmp"))
+        self.assertTrue(self.matcher.excludes_file("#notes.txt"))
+
+    def test_anchored(self):
+        self.assertTrue(self.matcher.excludes_dir("build"))
+        self.assertFalse(self.matcher.excludes_dir("src/build"))
+        self.assertFalse(self.matcher.excludes_dir("cache"))
+        self.assertTrue(self.matcher.excludes_dir("cache/sub"))
+
+    def test_parent_directories(self):
+        # Файл в исключённой папке не возвращается "!" - как в git
+        matcher = PathMatcher(["logs/", "!logs/keep.log"], ignore_case=False)
+        self.assertTrue(matcher.is_excluded("logs/keep.log"))
+        self.assertFalse(matcher.is_excluded("src/keep.log"))
+
+    def test_ignore_case_and_size(self):
+        matcher = PathMatcher([".venv/", "*.TMP"], max_file_size=100, ignore_case=True)
+        self.assertTrue(matcher.excludes_dir("a/.VENV"))
+        self.assertTrue(matcher.excludes_file("x.tmp"))
+        self.assertTrue(matcher.excludes_file("big.bin", size=101))
+        self.assertFalse(matcher.excludes_file("small.bin", size=100))
+
+    def test_build_matcher(self):
+        matcher = build_matcher(["temp", "logs"], ["!logs"])
+        self.assertTrue(matcher.excludes_dir("a/temp"))
+        self.assertFalse(matcher.excludes_file("temp"))
+        self.assertFalse(matcher.excludes_dir("logs"))
+        self.assertFalse(build_matcher())
+        self.assertEqual(matcher.filter_dirs(".", ["temp", "src"]), ["src"])
+
+
+if __name__ == '__main__':
+    unittest.main()
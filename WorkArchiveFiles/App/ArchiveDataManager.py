@@ -1,10 +1,20 @@
 import os
 import subprocess
+import tempfile
+import time
 import zipfile
 import logging
 from datetime import datetime
 
 from TemplateProject.core.services.directory_service import DirectoryService
+from TemplateProject.core.services.path_matcher import build_matcher
+from WorkArchiveFiles.App.ArchiveProgress import ArchiveProgress
+from WorkArchiveFiles.App.ArchiveReader import ArchiveReader
+from WorkArchiveFiles.App.CompressionPolicy import CompressionPolicy
+from WorkArchiveFiles.App.DedupStore import DedupStore
+from WorkArchiveFiles.App.IncrementalBackup import IncrementalBackup
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+from WorkArchiveFiles.settings import Archive_workers
 
 # === Настройка логирования ===
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -41,35 +51,70 @@ class ArchiveDataManager:
             archive_type: str = "zip",
             archive_password: str | None = None,
             exclude_dirs: list[str] | None = None,
+            workers: int | None = None,
+            exclude_patterns: list[str] | None = None,
+            max_file_size: int | None = None,
+            progress: ArchiveProgress | None = None,
+            resume: bool = False,
     ) -> str:
         """
         Архивирует директорию с возможностью задать пароль и тип архива.
-        Поддерживаются ZIP (встроенно) и RAR5 (через WinRAR).
+        Поддерживаются ZIP (встроенно), RAR5 (через WinRAR) и "dedup" - хранилище с дедупликацией
+        (DedupStore): каждый вызов добавляет снимок в <target_dir>/<archive_name>.dedup.
+        Метод сжатия каждого файла ZIP выбирает CompressionPolicy по настройкам Archive_compression*.
+
+        ZIP пишется во временный <archive_name>.zip.part и переименовывается после записи. Если ZIP без пароля
+        прерван (ошибка, отмена), .part остаётся: с resume=True архивирование продолжается с готовых записей.
+
+        :param exclude_dirs: Имена папок, исключаемых на любом уровне
+        :param workers: Потоков сжатия для ZIP без пароля (None - Archive_workers из settings, 0 - по числу ядер)
+        :param exclude_patterns: Шаблоны .gitignore ("*.log", "/build/", "**/cache/*.tmp", "!keep.log")
+        :param max_file_size: Не архивировать файлы больше этого размера в байтах
+        :param progress: Прогресс в файлах и байтах и флаг отмены (ArchiveProgress), для фонового запуска
+        :param resume: Продолжить прерванный ZIP без пароля
         """
-        exclude_dirs = set(exclude_dirs or [])
+        exclude = build_matcher(exclude_dirs, exclude_patterns, max_file_size)
         archive_type = archive_type.lower()
 
         self.logger.info(f"Начало архивирования: '{self.source_dir}' → '{self.target_dir}' ({archive_type.upper()})")
 
-        if exclude_dirs:
-            self.logger.info(f"Исключаем директории: {', '.join(exclude_dirs)}")
+        if exclude:
+            self.logger.info(f"Исключения: {', '.join(exclude.patterns)}"
+                             + (f", файлы больше {max_file_size} байт" if max_file_size is not None else ""))
 
         os.makedirs(self.target_dir, exist_ok=True)
         archive_path = os.path.join(self.target_dir, f"{archive_name}.{archive_type}").replace("\\", "/")
+        # Обход нужен ZIP и для подсчёта объёма; RAR и dedup обходят директорию сами
+        entries = list(self._walk_source(exclude)) if archive_type == "zip" or progress is not None else []
+        if progress is not None:
+            progress.start(sum(len(files) for _, _, files in entries),
+                           sum(os.path.getsize(os.path.join(root, file)) for _, root, files in entries for file in files))
 
-        if os.path.exists(archive_path):
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            backup_path = os.path.join(self.target_dir, f"({archive_name})v{timestamp}.{archive_type}")
-            self.logger.warning(f"⚠️ Архив '{archive_path}' уже существует, создаю новый: {backup_path}")
-            archive_path = backup_path
+        if archive_type == "dedup":
+            # Хранилище общее для всех снимков - не создаём новое при каждом вызове
+            if archive_password:
+                raise ValueError("Хранилище dedup не поддерживает пароль, используйте ZIP или RAR5")
+            self._create_dedup_snapshot(archive_path, archive_name, exclude, progress)
+            self.logger.info(f"✅ Снимок добавлен в хранилище: {archive_path}")
+            return archive_path
 
         # ZIP архивирование
         if archive_type == "zip":
-            self._create_zip_archive(archive_path, exclude_dirs, archive_password)
+            part_path = archive_path + ".part"
+            if archive_password:
+                self._create_zip_archive(part_path, entries, archive_password, progress)
+            else:
+                self._create_parallel_zip_archive(part_path, entries, Archive_workers if workers is None else workers,
+                                                  progress, resume)
+            archive_path = self._free_archive_path(archive_path, archive_name, archive_type)
+            os.replace(part_path, archive_path)
 
         # RAR архивирование через WinRAR
         elif archive_type in ("rar", "rar5"):
-            self._create_rar_archive(archive_path, exclude_dirs, archive_password)
+            archive_path = self._free_archive_path(archive_path, archive_name, archive_type)
+            self._create_rar_archive(archive_path, exclude, archive_password, progress)
+            if progress is not None:
+                progress.skip(progress.total_files, progress.total_bytes)
 
         else:
             raise ValueError(f"Неподдерживаемый тип архива: {archive_type}")
@@ -77,9 +122,81 @@ class ArchiveDataManager:
         self.logger.info(f"✅ Архив успешно создан: {archive_path}")
         return archive_path
 
-    def _create_zip_archive(self, archive_path, exclude_dirs, archive_password):
+    def _free_archive_path(self, archive_path, archive_name, archive_type):
+        """Существующий архив не перезаписывается - новый получает имя с датой"""
+        if os.path.exists(archive_path):
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            backup_path = os.path.join(self.target_dir, f"({archive_name})v{timestamp}.{archive_type}")
+            self.logger.warning(f"⚠️ Архив '{archive_path}' уже существует, создаю новый: {backup_path}")
+            archive_path = backup_path
+        return archive_path
+
+    def backup_data(
+            self,
+            backup_name: str,
+            mode: str = "incremental",
+            archive_password: str | None = None,
+            exclude_dirs: list[str] | None = None,
+            workers: int | None = None,
+            exclude_patterns: list[str] | None = None,
+            max_file_size: int | None = None,
+    ) -> dict:
+        """
+        Резервная копия в цепочку <target_dir>/<backup_name>.backup: архивируются только новые
+        и изменённые с прошлой копии файлы (см. IncrementalBackup).
+
+        :param mode: "incremental", "differential" или "full"
+        :param exclude_patterns: Шаблоны .gitignore, как в archive_data
+        :return: Статистика копии
+        """
+        backup = IncrementalBackup(self.source_dir, self._backup_directory(backup_name))
+        self.logger.info(f"Резервная копия ({mode}): '{self.source_dir}' → '{backup.backup_dir}'")
+        return backup.backup(mode=mode, archive_password=archive_password,
+                             workers=Archive_workers if workers is None else workers,
+                             exclude=build_matcher(exclude_dirs, exclude_patterns, max_file_size))
+
+    def restore_data(
+            self,
+            backup_name: str,
+            restore_directory: str,
+            sequence: int | None = None,
+            archive_password: str | None = None,
+            prefix: str = "",
+    ) -> dict:
+        """
+        Восстанавливает дерево на момент копии sequence (None - последней) из цепочки backup_name.
+
+        :param prefix: Восстановить только этот файл или папку ("" - всё дерево)
+        """
+        backup = IncrementalBackup(self.source_dir, self._backup_directory(backup_name))
+        return backup.restore(restore_directory, sequence=sequence, archive_password=archive_password, prefix=prefix)
+
+    def verify_archive(self, archive_path: str, archive_password: str | None = None,
+                       workers: int | None = None) -> dict:
+        """
+        Проверяет CRC (и HMAC AES для архива с паролем) всех записей ZIP-архива без распаковки на диск.
+        :return: {"Members", "Bytes", "Errors", "Duration"}
+        """
+        with ArchiveReader(archive_path, archive_password, Archive_workers if workers is None else workers) as reader:
+            return reader.verify()
+
+    def extract_from_archive(self, archive_path: str, path: str, restore_directory: str,
+                             archive_password: str | None = None) -> int:
+        """
+        Извлекает из ZIP-архива один файл или папку path (относительно архивированной директории),
+        не распаковывая остальное.
+        :return: Количество извлечённых записей
+        """
+        with ArchiveReader(archive_path, archive_password) as reader:
+            return reader.extract(path, restore_directory)
+
+    def _backup_directory(self, backup_name: str) -> str:
+        return f"{self.target_dir}/{backup_name}.backup"
+
+    def _create_zip_archive(self, archive_path, entries, archive_password, progress=None):
         """Создание ZIP архива (встроенным zipfile)."""
         import pyzipper  # безопасный вариант с поддержкой AES и пароля
+        policy = CompressionPolicy.from_settings()
         try:
             with pyzipper.AESZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
                 if archive_password:
@@ -87,47 +204,161 @@ class ArchiveDataManager:
                     zf.setencryption(pyzipper.WZ_AES, nbits=256)
                     self.logger.info("🔐 Установлен пароль на ZIP-архив")
 
-                for root, dirs, files in os.walk(self.source_dir):
-                    dirs[:] = [d for d in dirs if d not in exclude_dirs]
-                    rel_dir = os.path.relpath(root, start=self.source_dir)
+                for rel_dir, root, files in entries:
                     if rel_dir != ".":
                         zf.writestr(rel_dir + "/", b"")
                     for file in files:
                         full_path = os.path.join(root, file)
                         rel_path = os.path.relpath(full_path, start=self.source_dir)
+                        if progress is not None:
+                            progress.set_current(rel_path)
+                        if policy is None:
+                            zf.write(full_path, arcname=rel_path)
+                        else:
+                            compression = policy.choose(full_path)
+                            zf.write(full_path, arcname=rel_path, compress_type=compression.method,
+                                     compresslevel=compression.level)
+                        if progress is not None:
+                            progress.add_bytes(os.path.getsize(full_path))
+                            progress.file_done()
+        except BaseException as e:
+            # Архив с паролем не продолжается - недописанный файл удаляется
+            self.logger.error(f"Ошибка создания ZIP архива: {e!r}")
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+            raise
+
+    def _create_parallel_zip_archive(self, archive_path, entries, workers, progress=None, resume=False):
+        """Создание ZIP архива без пароля: файлы сжимаются параллельно (ParallelZipWriter)."""
+        try:
+            with ParallelZipWriter(archive_path, workers=workers, policy=CompressionPolicy.from_settings(),
+                                   on_progress=progress.add_bytes if progress is not None else None,
+                                   resume=resume, keep=self._unchanged_member) as zf:
+                self.logger.info(f"Параллельное сжатие ZIP, потоков: {zf.workers}")
+                done = [zinfo for zinfo in zf.written.values() if not zinfo.is_dir()]
+                if done and progress is not None:
+                    progress.skip(len(done), sum(zinfo.file_size for zinfo in done))
+                for rel_dir, root, files in entries:
+                    if rel_dir != "." and rel_dir.replace("\\", "/") + "/" not in zf.written:
+                        zf.write_directory(rel_dir)
+                    for file in files:
+                        full_path = os.path.join(root, file)
+                        rel_path = os.path.relpath(full_path, start=self.source_dir)
+                        if rel_path.replace("\\", "/") in zf.written:
+                            continue
+                        if progress is not None:
+                            progress.set_current(rel_path)
                         zf.write(full_path, arcname=rel_path)
-        except Exception as e:
-            self.logger.error(f"Ошибка создания ZIP архива: {e}")
+                        if progress is not None:
+                            progress.file_done()
+                self.logger.info(f"Методы сжатия файлов: {dict(zf.methods)}")
+        except BaseException as e:
+            self.logger.error(f"Ошибка создания ZIP архива: {e!r}, недописанный архив оставлен для продолжения: "
+                              f"{archive_path}")
             raise
 
+    def _unchanged_member(self, zinfo) -> bool:
+        """Для продолжения ZIP: запись годится, если исходный файл не изменился с прошлого запуска"""
+        full_path = os.path.join(self.source_dir, zinfo.filename)
+        if zinfo.is_dir():
+            return os.path.isdir(full_path)
+        try:
+            source = zipfile.ZipInfo.from_file(full_path, zinfo.filename)
+        except OSError:
+            return False
+        if (source.file_size, source.date_time) != (zinfo.file_size, zinfo.date_time):
+            return False
+        zinfo.external_attr = source.external_attr
+        return True
+
+    def _create_dedup_snapshot(self, store_path, archive_name, exclude, progress=None):
+        """Снимок директории в хранилище с дедупликацией чанков (DedupStore)."""
+        with DedupStore(store_path) as store:
+            result = store.backup(self.source_dir, archive_name, exclude=exclude, progress=progress)
+            stats = store.stats()
+        self.logger.info(f"Снимок {result['Snapshot']}: новых данных {result['NewBytes'] / 1024 / 1024:.1f} МБ "
+                         f"из {result['LogicalBytes'] / 1024 / 1024:.1f} МБ, "
+                         f"коэффициент дедупликации хранилища {stats['DedupRatio']:.2f}")
+        return result
+
+    def _walk_source(self, exclude):
+        """
+        Обход исходной директории без исключённых папок и файлов (PathMatcher):
+        (относительный путь папки, папка, файлы). Исключённые папки не обходятся.
+        """
+        for root, dirs, files in os.walk(self.source_dir):
+            rel_dir = os.path.relpath(root, start=self.source_dir)
+            rel_path = rel_dir.replace("\\", "/")
+            dirs[:] = exclude.filter_dirs(rel_path, dirs)
+            yield rel_dir, root, exclude.filter_files(rel_path, files, root)
+
     # ----------------------------------------------------------------------
-    def _create_rar_archive(self, archive_path, exclude_dirs, archive_password):
-        """Создание RAR5 архива через WinRAR CLI."""
+    def _create_rar_archive(self, archive_path, exclude, archive_password, progress=None):
+        """
+        Создание RAR5 архива через WinRAR CLI.
+        С исключениями список файлов отбирается тем же PathMatcher, что и для ZIP, и передаётся
+        WinRAR файлом-списком (@list, UTF-8) - шаблоны -x WinRAR не совпадают с .gitignore.
+        """
         winrar_path = r"C:/(1)MyProgramms/WinRAR/WinRAR.exe"
         if not os.path.exists(winrar_path):
             winrar_path = r"C:\Program Files\WinRAR\WinRAR.exe"
             if not os.path.exists(winrar_path):
                 raise FileNotFoundError("WinRAR.exe не найден. Установите WinRAR и проверьте путь.")
 
-        # Формируем список исключений
-        exclude_args = []
-        for ex in exclude_dirs:
-            # *\folder_name\* — исключает эту папку в любом месте
-            exclude_args += [f"-x*{ex}\\*"]
-
-        cmd = [
-                  winrar_path,
-                  "a",  # добавить в архив
-                  "-ep1",  # сохранять структуру без абсолютных путей
-                  "-r",  # рекурсивно
-                  "-ma5",  # формат RAR5
-                  archive_path,
-                  self.source_dir + "\\*",
-              ] + exclude_args
+        list_path = None
+        if exclude:
+            # Файлы и пустые папки относительно source_dir; WinRAR запускается из source_dir
+            entries = []
+            for root, dirs, files in os.walk(self.source_dir):
+                rel_dir = os.path.relpath(root, start=self.source_dir).replace("\\", "/")
+                if not dirs and not files and rel_dir != ".":
+                    entries.append(rel_dir)
+                dirs[:] = exclude.filter_dirs(rel_dir, dirs)
+                prefix = "" if rel_dir == "." else rel_dir + "/"
+                entries.extend(prefix + name for name in exclude.filter_files(rel_dir, files, root))
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".lst", delete=False) as list_file:
+                list_file.write("\n".join(entries).replace("/", "\\"))
+                list_path = list_file.name
+            cmd = [
+                winrar_path,
+                "a",  # добавить в архив
+                "-ma5",  # формат RAR5
+                "-scfl",  # файл-список в UTF-8
+                os.path.abspath(archive_path),
+                f"@{list_path}",
+            ]
+        else:
+            cmd = [
+                winrar_path,
+                "a",  # добавить в архив
+                "-ep1",  # сохранять структуру без абсолютных путей
+                "-r",  # рекурсивно
+                "-ma5",  # формат RAR5
+                archive_path,
+                self.source_dir + "\\*",
+            ]
 
         if archive_password:
             cmd.insert(2, f"-hp{archive_password}")  # защищает заголовки архива
 
         self.logger.info(f"Запуск WinRAR для создания RAR5 архива...")
-        subprocess.run(cmd, check=True)
+        try:
+            if progress is None:
+                subprocess.run(cmd, check=True, cwd=self.source_dir if list_path else None)
+            else:
+                # WinRAR не сообщает прогресс - только ожидание с проверкой отмены
+                process = subprocess.Popen(cmd, cwd=self.source_dir if list_path else None)
+                while process.poll() is None:
+                    if progress.token.cancelled:
+                        process.terminate()
+                        process.wait()
+                        if os.path.exists(archive_path):
+                            os.remove(archive_path)
+                        progress.token.check()
+                    time.sleep(0.2)
+                if process.returncode:
+                    raise subprocess.CalledProcessError(process.returncode, cmd)
+        finally:
+            if list_path:
+                os.remove(list_path)
         self.logger.info("RAR5 архив успешно создан.")
@@ -0,0 +1,169 @@
+import itertools
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import Callable
+
+from WorkArchiveFiles.App.ArchiveProgress import ArchiveCancelled, ArchiveProgress
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class ArchiveJob:
+    """
+    Задание очереди архивирования: функция run(progress) и её состояние.
+    Состояние, прогресс и результат читаются из любого потока.
+    """
+
+    def __init__(self, jobID: int, name: str, run: Callable[[ArchiveProgress], object]):
+        self.jobID = jobID
+        self.name = name
+        self.run = run
+        self.progress = ArchiveProgress()
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def cancel(self):
+        """Отмена: задание в очереди не запустится, запущенное остановится на ближайшем блоке или файле"""
+        self.progress.token.cancel()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """:return: True - задание завершено (успешно, с ошибкой или отменено)"""
+        return self.finished.wait(timeout)
+
+    @property
+    def active(self) -> bool:
+        return self.state in (QUEUED, RUNNING)
+
+    def status(self) -> dict:
+        """:return: ArchiveProgress.snapshot() + {"JobID", "Name", "State", "Error"}"""
+        status = self.progress.snapshot()
+        status.update(JobID=self.jobID, Name=self.name, State=self.state,
+                      Error=f"{type(self.error).__name__}: {self.error}" if self.error is not None else None)
+        return status
+
+
+class ArchiveJobQueue:
+    """
+    Очередь фонового архивирования. Задания выполняются по порядку в workers рабочих потоках
+    (по умолчанию один: архивы пишутся на тот же диск, параллельные задания только мешают друг другу).
+    Сжатие внутри задания и так многопоточное (ParallelZipWriter), zlib отпускает GIL - поэтому потоки,
+    а не процессы: прогресс и отмена - общие объекты без межпроцессного обмена.
+
+    Интерфейс и CLI не ждут задание, а опрашивают job.status() таймером.
+
+    :param workers: Количество рабочих потоков
+    """
+
+    def __init__(self, workers: int = 1):
+        self.logger = logging.getLogger("ArchiveJobQueue")
+        self.__queue = queue.Queue()
+        self.__jobs: dict[int, ArchiveJob] = {}
+        self.__ids = itertools.count(1)
+        self.__lock = threading.Lock()
+        self.__threads = [threading.Thread(target=self.__run, name=f"ArchiveJobQueue-{index}", daemon=True)
+                          for index in range(max(workers, 1))]
+        for thread in self.__threads:
+            thread.start()
+
+    def submit(self, name: str, run: Callable[[ArchiveProgress], object]) -> ArchiveJob:
+        """Ставит в очередь run(progress); run должен обновлять progress и тем самым проверять отмену"""
+        with self.__lock:
+            job = ArchiveJob(next(self.__ids), name, run)
+            self.__jobs[job.jobID] = job
+        self.__queue.put(job)
+        self.logger.info(f"[📁] - ArchiveJobQueue - submit - Задание {job.jobID} '{name}' в очереди")
+        return job
+
+    def submit_archive(self, manager, archive_name: str, **kwargs) -> ArchiveJob:
+        """Задание ArchiveDataManager.archive_data(archive_name, **kwargs) с прогрессом и отменой"""
+        return self.submit(archive_name,
+                           lambda progress: manager.archive_data(archive_name, progress=progress, **kwargs))
+
+    def jobs(self) -> list[ArchiveJob]:
+        with self.__lock:
+            return list(self.__jobs.values())
+
+    def get(self, jobID: int) -> ArchiveJob:
+        return self.__jobs[jobID]
+
+    def cancel(self, jobID: int):
+        self.get(jobID).cancel()
+
+    def stop(self, cancel_running: bool = True, wait: bool = True):
+        """Останавливает рабочие потоки: задания в очереди отменяются, запущенные - если cancel_running"""
+        for job in self.jobs():
+            if job.state == QUEUED or cancel_running:
+                job.cancel()
+        for _ in self.__threads:
+            self.__queue.put(None)
+        if wait:
+            for thread in self.__threads:
+                thread.join()
+
+    def __run(self):
+        while True:
+            job = self.__queue.get()
+            if job is None:
+                return
+            if job.progress.token.cancelled:
+                job.state = CANCELLED
+                job.finished.set()
+                continue
+            job.state = RUNNING
+            started = time.perf_counter()
+            try:
+                job.result = job.run(job.progress)
+                job.state = DONE
+                self.logger.info(f"[✅] - ArchiveJobQueue - __run - Задание {job.jobID} '{job.name}' "
+                                 f"выполнено за {time.perf_counter() - started:.1f} с")
+            except ArchiveCancelled:
+                job.state = CANCELLED
+                self.logger.warning(f"[📁] - ArchiveJobQueue - __run - Задание {job.jobID} '{job.name}' отменено")
+            except Exception as error:
+                job.error = error
+                job.state = FAILED
+                self.logger.error(f"[📁] - ArchiveJobQueue - __run - Задание {job.jobID} '{job.name}': {error!r}")
+            finally:
+                job.finished.set()
+
+
+def _format_size(size: float) -> str:
+    for unit in ("Б", "КБ", "МБ", "ГБ"):
+        if size < 1024 or unit == "ГБ":
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_progress(status: dict, width: int = 30) -> str:
+    """Строка прогресса для CLI и строки состояния: [#####-----]  42.0%  12/30 файлов  1.2/3.0 МБ  8.5 МБ/с  ETA 3 с"""
+    filled = int(width * status["Percent"] / 100)
+    eta = f"ETA {status['ETA']:.0f} с" if status["ETA"] is not None else "ETA --"
+    return (f"[{'#' * filled}{'-' * (width - filled)}] {status['Percent']:5.1f}%  "
+            f"{status['Files']}/{status['TotalFiles']} файлов  "
+            f"{_format_size(status['Bytes'])}/{_format_size(status['TotalBytes'])}  "
+            f"{_format_size(status['Speed'])}/с  {eta}")
+
+
+def print_progress(job: ArchiveJob, stream=None, interval: float = 0.2):
+    """Рисует прогресс задания в одной строке до завершения; Ctrl+C отменяет задание. :return: job.status()"""
+    stream = stream or sys.stdout
+    try:
+        while not job.wait(interval):
+            stream.write("\r" + format_progress(job.status()))
+            stream.flush()
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+    status = job.status()
+    stream.write("\r" + format_progress(status) + f"  {status['State']}\n")
+    stream.flush()
+    return status
@@ -0,0 +1,91 @@
+import threading
+import time
+
+
+class ArchiveCancelled(Exception):
+    """Архивирование остановлено через CancellationToken"""
+
+
+class CancellationToken:
+    """Флаг отмены, который проверяет архивирование между файлами и блоками"""
+
+    def __init__(self):
+        self.__event = threading.Event()
+
+    def cancel(self):
+        self.__event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__event.is_set()
+
+    def check(self):
+        if self.__event.is_set():
+            raise ArchiveCancelled("Архивирование отменено")
+
+
+class ArchiveProgress:
+    """
+    Прогресс архивирования в файлах и байтах. Обновляется из потока архивирования,
+    читается (snapshot) из любого потока - интерфейс опрашивает его таймером.
+
+    Каждое обновление проверяет token: после cancel() архивирование прерывается ArchiveCancelled
+    на ближайшем блоке или файле.
+
+    :param token: Флаг отмены, по умолчанию - новый
+    """
+
+    def __init__(self, token: CancellationToken | None = None):
+        self.token = token or CancellationToken()
+        self.__lock = threading.Lock()
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.done_bytes = 0
+        self.skipped_bytes = 0
+        self.current = None
+        self.started_at = None
+
+    def start(self, total_files: int, total_bytes: int):
+        with self.__lock:
+            self.total_files = total_files
+            self.total_bytes = total_bytes
+            self.started_at = time.monotonic()
+        self.token.check()
+
+    def skip(self, files: int, size: int):
+        """Файлы, записанные в прошлый раз (продолжение архива): считаются готовыми, но не входят в скорость"""
+        with self.__lock:
+            self.done_files += files
+            self.done_bytes += size
+            self.skipped_bytes += size
+
+    def set_current(self, name: str):
+        self.current = name
+        self.token.check()
+
+    def add_bytes(self, size: int):
+        with self.__lock:
+            self.done_bytes += size
+        self.token.check()
+
+    def file_done(self):
+        with self.__lock:
+            self.done_files += 1
+        self.token.check()
+
+    def snapshot(self) -> dict:
+        """:return: {"Files", "TotalFiles", "Bytes", "TotalBytes", "Percent", "Speed" (байт/с), "ETA" (с или None), "Current"}"""
+        with self.__lock:
+            done_bytes = self.done_bytes
+            total_bytes = self.total_bytes
+            elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+            speed = (done_bytes - self.skipped_bytes) / elapsed if elapsed > 0 else 0.0
+            if total_bytes:
+                percent = min(100.0, done_bytes * 100 / total_bytes)
+            else:
+                percent = 100.0 * self.done_files / self.total_files if self.total_files else 0.0
+            eta = (total_bytes - done_bytes) / speed if speed > 0 else None
+            return {"Files": self.done_files, "TotalFiles": self.total_files, "Bytes": done_bytes,
+                    "TotalBytes": total_bytes, "Percent": percent, "Speed": speed,
+                    "ETA": max(eta, 0.0) if eta is not None else None, "Current": self.current}
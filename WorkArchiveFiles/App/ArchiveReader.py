@@ -0,0 +1,146 @@
+import bisect
+import logging
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ArchiveReader:
+    """
+    Чтение ZIP-архива, созданного ArchiveDataManager, без распаковки всего архива.
+
+    Центральный каталог читается один раз при открытии: поиск записи по имени - словарь zipfile,
+    записи папки - диапазон в отсортированном списке имён (bisect). Извлечение одного файла
+    или поддерева читает с диска только сжатые данные этих записей.
+
+    verify() распаковывает все записи в память блоками, ничего не записывая на диск:
+    zipfile проверяет CRC-32, pyzipper для архивов с паролем - ещё и HMAC AES.
+    Записи делятся между потоками по сжатому размеру, у каждого потока свой дескриптор архива
+    (zlib и crc32 отпускают GIL).
+
+    :param archive_path: Путь к ZIP-архиву
+    :param archive_password: Пароль архива (AES, pyzipper) или None
+    :param workers: Потоков проверки, None или 0 - по числу ядер
+    """
+    BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, archive_path: str, archive_password: str | None = None, workers: int | None = None):
+        self.logger = logging.getLogger("ArchiveReader")
+        self.archive_path = archive_path.replace("\\", "/")
+        self.archive_password = archive_password
+        self.workers = workers or os.cpu_count() or 1
+        self.zf = self.__open()
+        self.names = sorted(self.zf.NameToInfo)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __open(self):
+        if self.archive_password:
+            import pyzipper  # AES и пароль - как в ArchiveDataManager._create_zip_archive
+            zf = pyzipper.AESZipFile(self.archive_path)
+            zf.setpassword(self.archive_password.encode("utf-8"))
+            return zf
+        return zipfile.ZipFile(self.archive_path)
+
+    def close(self):
+        self.zf.close()
+
+    # --- произвольный доступ ---
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        return self.zf.getinfo(name)
+
+    def members(self, prefix: str = "") -> list[zipfile.ZipInfo]:
+        """:return: Записи файла или папки prefix со всем содержимым ("" - весь архив)"""
+        prefix = prefix.replace("\\", "/").strip("/")
+        if not prefix:
+            return [self.zf.NameToInfo[name] for name in self.names]
+        # Имена папки: от "prefix/" до "prefix0" ("0" - следующий после "/" символ)
+        start = bisect.bisect_left(self.names, prefix + "/")
+        end = bisect.bisect_left(self.names, prefix + "0", start)
+        infos = [self.zf.NameToInfo[name] for name in self.names[start:end]]
+        if prefix in self.zf.NameToInfo:
+            infos.insert(0, self.zf.NameToInfo[prefix])
+        return infos
+
+    def open(self, name: str):
+        """Поток чтения одной записи (CRC проверяется при дочитывании до конца)"""
+        return self.zf.open(name)
+
+    def read(self, name: str) -> bytes:
+        return self.zf.read(name)
+
+    def extract(self, prefix: str, target_dir: str) -> int:
+        """
+        Извлекает файл или папку prefix со всем содержимым в target_dir (пути внутри архива сохраняются).
+        :return: Количество извлечённых записей
+        """
+        infos = self.members(prefix)
+        if not infos:
+            raise KeyError(f"В архиве {self.archive_path} нет '{prefix}'")
+        for info in infos:
+            self.zf.extract(info, target_dir)
+        self.logger.info(f"[📁] - ArchiveReader - extract - '{prefix}': извлечено {len(infos)} записей в {target_dir}")
+        return len(infos)
+
+    # --- проверка ---
+    def verify(self) -> dict:
+        """
+        Проверяет все записи архива без записи на диск.
+        :return: {"Members", "Bytes", "Errors": {имя записи: ошибка}, "Duration"}
+        """
+        start = time.perf_counter()
+        infos = [info for info in self.zf.infolist() if not info.is_dir()]
+        # Крупные записи первыми - к потоку с наименьшей нагрузкой
+        groups = [[] for _ in range(min(self.workers, len(infos)) or 1)]
+        loads = [0] * len(groups)
+        for info in sorted(infos, key=lambda item: item.compress_size, reverse=True):
+            index = loads.index(min(loads))
+            groups[index].append(info)
+            loads[index] += info.compress_size
+        total = 0
+        errors = {}
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="ArchiveReader") as executor:
+            for verified, group_errors in executor.map(self.__verify_members, groups):
+                total += verified
+                errors.update(group_errors)
+        result = {"Members": len(infos), "Bytes": total, "Errors": errors, "Duration": time.perf_counter() - start}
+        if errors:
+            self.logger.error(f"[📁] - ArchiveReader - verify - {self.archive_path}: ошибок {len(errors)} "
+                              f"из {len(infos)} записей")
+        else:
+            self.logger.info(f"[✅] - ArchiveReader - verify - {self.archive_path}: {len(infos)} записей в порядке "
+                             f"за {result['Duration']:.2f} с")
+        return result
+
+    def __verify_members(self, infos: list[zipfile.ZipInfo]) -> tuple[int, dict]:
+        total = 0
+        errors = {}
+        with self.__open() as zf:
+            for info in infos:
+                try:
+                    with zf.open(info) as member:
+                        while block := member.read(self.BLOCK_SIZE):
+                            total += len(block)
+                except Exception as error:
+                    errors[info.filename] = f"{type(error).__name__}: {error}"
+        return total, errors
+
+
+if __name__ == '__main__':
+    # python -m WorkArchiveFiles.App.ArchiveReader verify <архив> [пароль]
+    # python -m WorkArchiveFiles.App.ArchiveReader extract <архив> <файл или папка в архиве> <куда> [пароль]
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "verify":
+        with ArchiveReader(sys.argv[2], *sys.argv[3:4]) as reader:
+            print(reader.verify())
+    elif command == "extract":
+        with ArchiveReader(sys.argv[2], *sys.argv[5:6]) as reader:
+            print(reader.extract(sys.argv[3], sys.argv[4]))
+    else:
+        print("verify <архив> [пароль] | extract <архив> <файл или папка в архиве> <куда> [пароль]")
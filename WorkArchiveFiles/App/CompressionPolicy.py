@@ -0,0 +1,127 @@
+import os
+import zipfile
+import zlib
+from typing import NamedTuple
+
+METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Форматы, которые уже сжаты: повторное сжатие тратит процессор и почти не уменьшает размер
+STORED_EXTENSIONS = frozenset((
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".lz4", ".cab", ".dedup",
+    ".jar", ".apk", ".docx", ".xlsx", ".pptx", ".odt", ".ods",
+    ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac", ".mp4", ".mkv", ".avi", ".mov", ".webm",
+    ".woff", ".woff2",
+))
+
+# Сигнатуры сжатых форматов: (смещение, байты)
+STORED_SIGNATURES = (
+    (0, b"\x89PNG\r\n\x1a\n"), (0, b"\xff\xd8\xff"), (0, b"GIF87a"), (0, b"GIF89a"),
+    (0, b"PK\x03\x04"), (0, b"PK\x05\x06"), (0, b"\x1f\x8b"), (0, b"BZh"), (0, b"\xfd7zXZ\x00"),
+    (0, b"7z\xbc\xaf\x27\x1c"), (0, b"Rar!\x1a\x07"), (0, b"\x28\xb5\x2f\xfd"), (0, b"\x04\x22\x4d\x18"),
+    (0, b"MSCF"), (0, b"OggS"), (0, b"fLaC"), (0, b"ID3"), (0, b"wOFF"), (0, b"wOF2"),
+    (4, b"ftyp"), (8, b"WEBP"),
+)
+
+
+class Compression(NamedTuple):
+    """Выбранное сжатие файла: метод ZIP, уровень (None - по умолчанию метода) и причина выбора"""
+    method: int
+    level: int | None
+    reason: str
+
+    @property
+    def name(self) -> str:
+        return next(name for name, method in METHODS.items() if method == self.method)
+
+
+def parse_method(value: str) -> tuple[int, int | None]:
+    """"deflate" -> (ZIP_DEFLATED, None), "deflate:9" -> (ZIP_DEFLATED, 9)"""
+    name, _, level = value.lower().partition(":")
+    if name not in METHODS:
+        raise ValueError(f"Неизвестный метод сжатия: {value}")
+    return METHODS[name], int(level) if level else None
+
+
+class CompressionPolicy:
+    """
+    Выбор сжатия для каждого файла ZIP-архива.
+
+    Порядок проверок (первая сработавшая решает):
+        1. rules - явное правило для расширения из настроек ({".log": "lzma", ".txt": "deflate:9"})
+        2. пустой файл или расширение уже сжатого формата (STORED_EXTENSIONS) - без сжатия
+        3. сигнатура сжатого формата в начале файла (STORED_SIGNATURES) - без сжатия
+        4. пробное сжатие выборки (начало и середина файла) deflate уровня 1:
+           сжалось хуже stored_ratio - без сжатия, хуже fast_ratio - deflate уровня 1,
+           иначе strong_method (deflate с level, bzip2 или lzma; bzip2 и lzma - только для файлов до strong_max_size)
+
+    :param level: Уровень deflate для хорошо сжимаемых файлов
+    :param strong_method: Метод для хорошо сжимаемых файлов: "deflate", "bzip2" или "lzma"
+    :param rules: {расширение: "метод" или "метод:уровень"}
+    :param stored_extensions: Дополнительные расширения, которые не сжимаются
+    :param sample_size: Размер каждой части пробной выборки
+    :param stored_ratio: Порог отношения сжатый/исходный размер выборки, выше которого файл не сжимается
+    :param fast_ratio: Порог, выше которого файл сжимается быстрым уровнем 1
+    :param strong_max_size: Максимальный размер файла для bzip2 и lzma (они сжимают файл целиком в одном потоке)
+    """
+
+    def __init__(self, level: int = 6, strong_method: str = "deflate", rules: dict | None = None,
+                 stored_extensions=(), sample_size: int = 64 * 1024, stored_ratio: float = 0.95,
+                 fast_ratio: float = 0.8, strong_max_size: int = 64 * 1024 * 1024):
+        self.level = level
+        self.strong_method = parse_method(strong_method)[0]
+        self.rules = {extension.lower(): parse_method(value) for extension, value in (rules or {}).items()}
+        self.stored_extensions = STORED_EXTENSIONS | {extension.lower() for extension in stored_extensions}
+        self.sample_size = sample_size
+        self.stored_ratio = stored_ratio
+        self.fast_ratio = fast_ratio
+        self.strong_max_size = strong_max_size
+
+    @classmethod
+    def from_settings(cls):
+        """Политика из WorkArchiveFiles.settings, None - если адаптивное сжатие выключено (всё deflate)"""
+        from WorkArchiveFiles import settings
+        if settings.Archive_compression != "adaptive":
+            return None
+        return cls(level=settings.Archive_compress_level, strong_method=settings.Archive_strong_method,
+                   rules=settings.Archive_compression_rules,
+                   stored_extensions=settings.Archive_stored_extensions)
+
+    def choose(self, full_path: str, size: int | None = None) -> Compression:
+        """:return: Сжатие для файла full_path размером size (None - узнать через os.stat)"""
+        extension = os.path.splitext(full_path)[1].lower()
+        rule = self.rules.get(extension)
+        if rule is not None:
+            return Compression(rule[0], rule[1], "rule")
+        if size is None:
+            size = os.stat(full_path).st_size
+        if size == 0:
+            return Compression(zipfile.ZIP_STORED, None, "empty")
+        if extension in self.stored_extensions:
+            return Compression(zipfile.ZIP_STORED, None, "extension")
+
+        with open(full_path, "rb") as file:
+            head = file.read(self.sample_size)
+            sample = head
+            if size > 4 * self.sample_size:
+                file.seek(size // 2)
+                sample += file.read(self.sample_size)
+        for offset, signature in STORED_SIGNATURES:
+            if head[offset:offset + len(signature)] == signature:
+                return Compression(zipfile.ZIP_STORED, None, "signature")
+        if not sample:
+            return Compression(zipfile.ZIP_STORED, None, "empty")
+
+        ratio = len(zlib.compress(sample, 1)) / len(sample)
+        if ratio > self.stored_ratio:
+            return Compression(zipfile.ZIP_STORED, None, "sample")
+        if ratio > self.fast_ratio:
+            return Compression(zipfile.ZIP_DEFLATED, 1, "sample")
+        if self.strong_method != zipfile.ZIP_DEFLATED and size <= self.strong_max_size:
+            return Compression(self.strong_method, None, "sample")
+        return Compression(zipfile.ZIP_DEFLATED, self.level, "sample")
@@ -0,0 +1,405 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from TemplateProject.core.services.path_matcher import PathMatcher, build_matcher
+
+try:
+    import numpy as np
+except ImportError:  # без numpy границы считаются тем же хэшем, но медленнее
+    np = None
+
+
+# --- Разбиение на чанки по содержимому (gear rolling hash) ---
+# Граница чанка - после байта i, если младшие MASK_BITS бит gear-хэша равны нулю.
+# h_i = (h_{i-1} << 1) + GEAR[b_i]: младшие MASK_BITS бит зависят только от последних MASK_BITS байт,
+# поэтому хэш считается векторно (numpy) и совпадает с последовательным расчётом.
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "little") for i in range(256)]
+MASK_BITS = 13
+MIN_CHUNK = 2 * 1024
+AVG_CHUNK = 1 << MASK_BITS
+MAX_CHUNK = 64 * 1024
+READ_SIZE = 4 * 1024 * 1024
+_MASK = (1 << MASK_BITS) - 1
+_GEAR_NP = np.array(GEAR, dtype=np.uint32) if np is not None else None
+
+
+def boundary_candidates(data: bytes) -> list[int]:
+    """:return: Позиции i, после которых можно разрезать data (младшие биты хэша равны нулю)"""
+    if np is not None:
+        gear = _GEAR_NP[np.frombuffer(data, dtype=np.uint8)]
+        rolling = gear.copy()
+        for shift in range(1, MASK_BITS):
+            rolling[shift:] += gear[:-shift] << np.uint32(shift)
+        return np.flatnonzero((rolling & np.uint32(_MASK)) == 0).tolist()
+    candidates = []
+    rolling = 0
+    for position, byte in enumerate(data):
+        rolling = ((rolling << 1) + GEAR[byte]) & 0xFFFFFFFF
+        if not rolling & _MASK:
+            candidates.append(position)
+    return candidates
+
+
+def iter_chunks(file):
+    """Делит поток на чанки от MIN_CHUNK до MAX_CHUNK байт (в среднем ~AVG_CHUNK), границы зависят от содержимого"""
+    data = b""
+    eof = False
+    while True:
+        if not eof:
+            block = file.read(READ_SIZE)
+            eof = not block
+            data += block
+        candidates = boundary_candidates(data)
+        start = 0
+        while True:
+            max_end = start + MAX_CHUNK
+            index = bisect_left(candidates, start + MIN_CHUNK - 1)
+            if index < len(candidates) and candidates[index] + 1 <= max_end:
+                cut = candidates[index] + 1
+            elif len(data) >= max_end:
+                cut = max_end
+            else:
+                break
+            yield data[start:cut]
+            start = cut
+        data = data[start:]
+        if eof:
+            if data:
+                yield data
+            return
+
+
+class DedupStore:
+    """
+    Хранилище резервных копий с дедупликацией по содержимому.
+
+        <store_dir>/index.sqlite        - чанки, снимки и списки чанков файлов
+        <store_dir>/packs/<N>.pack      - сжатые чанки подряд, файл пака до PACK_SIZE байт
+
+    Файлы делятся на чанки по содержимому (iter_chunks), ID чанка - SHA-256 исходных байт.
+    Одинаковые чанки (копии иконок, повторяющиеся SourceData, неизменённые файлы прошлых снимков)
+    хранятся один раз. Чанк сжимается zlib, если это уменьшает его размер.
+    Паки сбрасываются на диск до фиксации транзакции индекса - индекс никогда не ссылается на незаписанные данные.
+
+    :param store_dir: Директория хранилища
+    """
+    SCHEMA_VERSION = 1
+    PACK_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, store_dir: str):
+        self.logger = logging.getLogger("DedupStore")
+        self.store_dir = store_dir.replace("\\", "/")
+        self.packs_dir = f"{self.store_dir}/packs"
+        os.makedirs(self.packs_dir, exist_ok=True)
+        self.connection = sqlite3.connect(f"{self.store_dir}/index.sqlite")
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.__create_schema()
+        self.__pack = None
+        self.__pack_id = None
+
+    def __create_schema(self):
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                hash BLOB NOT NULL UNIQUE,
+                pack INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                compressed INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                snapshot INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                chunks BLOB NOT NULL,
+                PRIMARY KEY (snapshot, path)
+            );
+            CREATE TABLE IF NOT EXISTS directories (
+                snapshot INTEGER NOT NULL,
+                path TEXT NOT NULL
+            );
+        """)
+        self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def close(self):
+        self.__close_pack()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --- паки ---
+    def pack_path(self, pack_id: int) -> str:
+        return f"{self.packs_dir}/{pack_id:06d}.pack"
+
+    def __open_pack(self):
+        """Текущий пак для дописывания, новый - если текущий заполнен"""
+        if self.__pack is not None and self.__pack.tell() < self.PACK_SIZE:
+            return self.__pack
+        self.__close_pack()
+        existing = [int(name[:-5]) for name in os.listdir(self.packs_dir) if name.endswith(".pack")]
+        self.__pack_id = max(existing, default=0) + 1
+        self.__pack = open(self.pack_path(self.__pack_id), "ab")
+        return self.__pack
+
+    def __sync_pack(self):
+        if self.__pack is not None:
+            self.__pack.flush()
+            os.fsync(self.__pack.fileno())
+
+    def __close_pack(self):
+        if self.__pack is not None:
+            self.__sync_pack()
+            self.__pack.close()
+            self.__pack = None
+
+    def __store_chunk(self, digest: bytes, data: bytes) -> int:
+        compressed = zlib.compress(data, 6)
+        is_compressed = len(compressed) < len(data)
+        payload = compressed if is_compressed else data
+        pack = self.__open_pack()
+        offset = pack.tell()
+        pack.write(payload)
+        return self.connection.execute(
+            "INSERT INTO chunks (hash, pack, offset, length, size, compressed) VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, self.__pack_id, offset, len(payload), len(data), int(is_compressed))).lastrowid
+
+    def read_chunk(self, chunkID: int) -> bytes:
+        pack, offset, length, compressed = self.connection.execute(
+            "SELECT pack, offset, length, compressed FROM chunks WHERE id = ?", (chunkID,)).fetchone()
+        with open(self.pack_path(pack), "rb") as file:
+            file.seek(offset)
+            payload = file.read(length)
+        return zlib.decompress(payload) if compressed else payload
+
+    # --- снимки ---
+    def backup(self, source_dir: str, name: str, exclude_dirs=(), exclude: PathMatcher | None = None,
+               progress=None) -> dict:
+        """
+        Записывает снимок директории source_dir.
+        :param exclude: Исключения .gitignore (PathMatcher), по умолчанию - папки exclude_dirs
+        :param progress: ArchiveProgress - обновляется после каждого файла, отмена откатывает снимок
+        :return: Статистика: {"Snapshot", "Files", "UnchangedFiles", "LogicalBytes", "NewChunks", "ReusedChunks",
+                              "NewBytes", "StoredBytes", "Duration"}
+        """
+        start = time.perf_counter()
+        source_dir = source_dir.replace("\\", "/")
+        exclude = exclude or build_matcher(exclude_dirs)
+        known = dict(self.connection.execute("SELECT hash, id FROM chunks"))
+        # Файлы прошлого снимка с тем же именем: при совпадении размера и mtime файл не читается
+        previous = {}
+        previousID = self.latest_snapshot(name)
+        if previousID is not None:
+            previous = {path: (size, mtime_ns, chunks) for path, size, mtime_ns, chunks in self.connection.execute(
+                "SELECT path, size, mtime_ns, chunks FROM files WHERE snapshot = ?", (previousID,))}
+        stats = {"Files": 0, "UnchangedFiles": 0, "LogicalBytes": 0, "NewChunks": 0, "ReusedChunks": 0,
+                 "NewBytes": 0, "StoredBytes": 0}
+        try:
+            with self.connection:
+                snapshotID = self.connection.execute(
+                    "INSERT INTO snapshots (name, source, created_at) VALUES (?, ?, ?)",
+                    (name, source_dir, datetime.now().isoformat(timespec="seconds"))).lastrowid
+                for root, dirs, files in os.walk(source_dir):
+                    rel_dir = os.path.relpath(root, start=source_dir).replace("\\", "/")
+                    dirs[:] = exclude.filter_dirs(rel_dir, dirs)
+                    files = exclude.filter_files(rel_dir, files, root)
+                    prefix = "" if rel_dir == "." else rel_dir + "/"
+                    if prefix:
+                        self.connection.execute("INSERT INTO directories (snapshot, path) VALUES (?, ?)",
+                                                (snapshotID, rel_dir))
+                    for file_name in files:
+                        full_path = os.path.join(root, file_name)
+                        if progress is not None:
+                            progress.set_current(prefix + file_name)
+                        stat = os.stat(full_path)
+                        old = previous.get(prefix + file_name)
+                        if old is not None and old[:2] == (stat.st_size, stat.st_mtime_ns):
+                            chunks = old[2]
+                            stats["UnchangedFiles"] += 1
+                        else:
+                            chunks = self.__store_file(full_path, known, stats)
+                        self.connection.execute(
+                            "INSERT INTO files (snapshot, path, size, mtime_ns, chunks) VALUES (?, ?, ?, ?, ?)",
+                            (snapshotID, prefix + file_name, stat.st_size, stat.st_mtime_ns, chunks))
+                        stats["Files"] += 1
+                        stats["LogicalBytes"] += stat.st_size
+                        if progress is not None:
+                            progress.add_bytes(stat.st_size)
+                            progress.file_done()
+                # Данные чанков на диске раньше, чем индекс, который на них ссылается
+                self.__sync_pack()
+        finally:
+            self.__close_pack()
+        stats["StoredBytes"] = self.connection.execute("SELECT COALESCE(SUM(length), 0) FROM chunks").fetchone()[0]
+        stats.update(Snapshot=snapshotID, Duration=time.perf_counter() - start)
+        self.logger.info(f"[✅] - DedupStore - backup - Снимок {snapshotID} '{name}': {stats['Files']} файлов, "
+                         f"новых чанков {stats['NewChunks']}, повторных {stats['ReusedChunks']}")
+        return stats
+
+    def __store_file(self, full_path: str, known: dict, stats: dict) -> bytes:
+        """Делит файл на чанки и записывает новые. :return: Список ID чанков файла (array("q").tobytes())"""
+        chunkIDs = array("q")
+        with open(full_path, "rb") as file:
+            for chunk in iter_chunks(file):
+                digest = hashlib.sha256(chunk).digest()
+                chunkID = known.get(digest)
+                if chunkID is None:
+                    chunkID = self.__store_chunk(digest, chunk)
+                    known[digest] = chunkID
+                    stats["NewChunks"] += 1
+                    stats["NewBytes"] += len(chunk)
+                else:
+                    stats["ReusedChunks"] += 1
+                chunkIDs.append(chunkID)
+        return chunkIDs.tobytes()
+
+    def snapshots(self) -> list[dict]:
+        return [{"Snapshot": snapshotID, "Name": name, "Source": source, "CreatedAt": created_at}
+                for snapshotID, name, source, created_at in
+                self.connection.execute("SELECT id, name, source, created_at FROM snapshots ORDER BY id")]
+
+    def latest_snapshot(self, name: str | None = None) -> int | None:
+        query, args = "SELECT MAX(id) FROM snapshots", ()
+        if name is not None:
+            query, args = query + " WHERE name = ?", (name,)
+        return self.connection.execute(query, args).fetchone()[0]
+
+    def restore(self, snapshotID: int, restore_dir: str) -> int:
+        """
+        Восстанавливает снимок в пустую директорию restore_dir.
+        :return: Количество восстановленных файлов
+        """
+        restore_dir = restore_dir.replace("\\", "/")
+        if os.path.isdir(restore_dir) and os.listdir(restore_dir):
+            raise FileExistsError(f"Директория восстановления не пуста: {restore_dir}")
+        if self.connection.execute("SELECT 1 FROM snapshots WHERE id = ?", (snapshotID,)).fetchone() is None:
+            raise KeyError(f"Снимок не найден: {snapshotID}")
+        os.makedirs(restore_dir, exist_ok=True)
+        for path, in self.connection.execute("SELECT path FROM directories WHERE snapshot = ?", (snapshotID,)):
+            os.makedirs(f"{restore_dir}/{path}", exist_ok=True)
+        restored = 0
+        for path, mtime_ns, chunks in self.connection.execute(
+                "SELECT path, mtime_ns, chunks FROM files WHERE snapshot = ?", (snapshotID,)).fetchall():
+            full_path = f"{restore_dir}/{path}"
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            chunkIDs = array("q")
+            chunkIDs.frombytes(chunks)
+            with open(full_path, "wb") as file:
+                for chunkID in chunkIDs:
+                    file.write(self.read_chunk(chunkID))
+            os.utime(full_path, ns=(mtime_ns, mtime_ns))
+            restored += 1
+        return restored
+
+    def delete_snapshot(self, snapshotID: int):
+        """Удаляет снимок из индекса, место освобождает gc()"""
+        with self.connection:
+            for table, column in (("files", "snapshot"), ("directories", "snapshot"), ("snapshots", "id")):
+                self.connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (snapshotID,))
+
+    # --- сборка мусора ---
+    def gc(self, repack_threshold: float = 0.5) -> dict:
+        """
+        Удаляет чанки, на которые не ссылается ни один снимок. Пак, в котором мусора больше
+        repack_threshold, переписывается: живые чанки копируются в новый пак, старый удаляется.
+        :return: {"RemovedChunks", "RepackedPacks", "FreedBytes"}
+        """
+        referenced = set()
+        for chunks, in self.connection.execute("SELECT chunks FROM files"):
+            chunkIDs = array("q")
+            chunkIDs.frombytes(chunks)
+            referenced.update(chunkIDs)
+        rows = self.connection.execute("SELECT id, pack, length FROM chunks").fetchall()
+        garbage = [chunkID for chunkID, _, _ in rows if chunkID not in referenced]
+        pack_sizes = {}
+        pack_garbage = {}
+        for chunkID, pack, length in rows:
+            pack_sizes[pack] = pack_sizes.get(pack, 0) + length
+            if chunkID not in referenced:
+                pack_garbage[pack] = pack_garbage.get(pack, 0) + length
+        freed_before = self.__packs_size()
+
+        repack = [pack for pack, size in pack_garbage.items() if size >= pack_sizes[pack] * repack_threshold]
+        try:
+            with self.connection:
+                self.connection.executemany("DELETE FROM chunks WHERE id = ?", ((chunkID,) for chunkID in garbage))
+                for pack in repack:
+                    live = self.connection.execute(
+                        "SELECT id, offset, length FROM chunks WHERE pack = ? ORDER BY offset", (pack,)).fetchall()
+                    with open(self.pack_path(pack), "rb") as old_pack:
+                        for chunkID, offset, length in live:
+                            old_pack.seek(offset)
+                            payload = old_pack.read(length)
+                            new_pack = self.__open_pack()
+                            new_offset = new_pack.tell()
+                            new_pack.write(payload)
+                            self.connection.execute("UPDATE chunks SET pack = ?, offset = ? WHERE id = ?",
+                                                    (self.__pack_id, new_offset, chunkID))
+                self.__sync_pack()
+        finally:
+            self.__close_pack()
+        # Старые паки (и паки прерванных копий, на которые индекс не ссылается) удаляются после фиксации индекса
+        live_packs = {pack for pack, in self.connection.execute("SELECT DISTINCT pack FROM chunks")}
+        for name in os.listdir(self.packs_dir):
+            if name.endswith(".pack") and int(name[:-5]) not in live_packs:
+                os.remove(f"{self.packs_dir}/{name}")
+        freed_after = self.__packs_size()
+        self.connection.execute("VACUUM")
+        result = {"RemovedChunks": len(garbage), "RepackedPacks": len(repack),
+                  "FreedBytes": max(freed_before - freed_after, 0)}
+        self.logger.info(f"[✅] - DedupStore - gc - {result}")
+        return result
+
+    def __packs_size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.packs_dir) if entry.name.endswith(".pack"))
+
+    # --- статистика ---
+    def stats(self) -> dict:
+        """
+        :return: {"Snapshots", "Files", "LogicalBytes", "UniqueChunks", "UniqueBytes", "StoredBytes",
+                  "DedupRatio" (логический объём / уникальный), "CompressionRatio" (уникальный / на диске)}
+        """
+        snapshots, = self.connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()
+        files, logical = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files").fetchone()
+        chunks, unique, stored = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM chunks").fetchone()
+        return {"Snapshots": snapshots, "Files": files, "LogicalBytes": logical, "UniqueChunks": chunks,
+                "UniqueBytes": unique, "StoredBytes": stored,
+                "DedupRatio": logical / unique if unique else 1.0,
+                "CompressionRatio": unique / stored if stored else 1.0}
+
+
+if __name__ == '__main__':
+    # python -m WorkArchiveFiles.App.DedupStore <хранилище> stats | gc | snapshots | restore <номер снимка> <куда>
+    import sys
+
+    with DedupStore(sys.argv[1]) as dedup_store:
+        command = sys.argv[2] if len(sys.argv) > 2 else "stats"
+        if command == "gc":
+            print(dedup_store.gc())
+        elif command == "snapshots":
+            print(dedup_store.snapshots())
+        elif command == "restore":
+            print(dedup_store.restore(int(sys.argv[3]), sys.argv[4]))
+        else:
+            print(dedup_store.stats())
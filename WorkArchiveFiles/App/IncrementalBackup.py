@@ -0,0 +1,283 @@
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+import zipfile
+from datetime import datetime
+
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.atomic_file_service import atomic_write
+from TemplateProject.core.services.path_matcher import PathMatcher, build_matcher
+from WorkArchiveFiles.App.ArchiveReader import ArchiveReader
+from WorkArchiveFiles.App.CompressionPolicy import CompressionPolicy
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+
+def file_sha256(full_path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IncrementalBackup:
+    """
+    Цепочка резервных копий директории: полная копия + инкременты (или дифференциальные копии).
+
+    Каждый запуск записывает в backup_dir:
+        <NNNNNN>.zip   - только новые и изменённые файлы (полная копия - все файлы)
+        <NNNNNN>.json  - манифест: состояние всего дерева на момент копии
+                         {"Version": 1, "Sequence": N, "Base": <номер полной копии>, "Mode": ..., "CreatedAt": ...,
+                          "Directories": [...], "Files": {путь: {"Size", "MTime", "SHA256", "Archive": номер архива}}}
+
+    Для каждого файла манифест хранит номер архива, в котором лежит его содержимое, поэтому
+    восстановление на любой момент берёт каждый файл ровно из одного архива цепочки.
+    Файл считается неизменённым без чтения, если совпали размер и mtime; иначе сравнивается SHA-256.
+    Манифест записывается последним (атомарно) - прерванная копия не попадает в цепочку.
+
+    Режимы:
+        "full"         - новая полная копия, начало новой цепочки
+        "incremental"  - изменения относительно последней копии
+        "differential" - изменения относительно последней полной копии (для восстановления нужны 2 архива)
+
+    :param source_dir: Директория, которая копируется
+    :param backup_dir: Директория цепочки копий
+    """
+    VERSION = 1
+    MODES = ("full", "incremental", "differential")
+
+    def __init__(self, source_dir: str, backup_dir: str):
+        self.logger = logging.getLogger("IncrementalBackup")
+        self.source_dir = source_dir.replace("\\", "/")
+        self.backup_dir = backup_dir.replace("\\", "/")
+
+    # --- цепочка ---
+    def archive_path(self, sequence: int) -> str:
+        return f"{self.backup_dir}/{sequence:06d}.zip"
+
+    def manifest_path(self, sequence: int) -> str:
+        return f"{self.backup_dir}/{sequence:06d}.json"
+
+    def sequences(self) -> list[int]:
+        """:return: Номера записанных копий по возрастанию"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        return sorted(int(name[:-5]) for name in os.listdir(self.backup_dir) if re.fullmatch(r"\d{6}\.json", name))
+
+    def read_manifest(self, sequence: int | None = None) -> dict | None:
+        """:param sequence: Номер копии, None - последняя. :return: Манифест или None, если копий нет"""
+        if sequence is None:
+            sequences = self.sequences()
+            if not sequences:
+                return None
+            sequence = sequences[-1]
+        with open(self.manifest_path(sequence), "rb") as file:
+            return json_codec.decode(file.read())
+
+    # --- копирование ---
+    def walk_source(self, exclude_dirs=(), exclude: PathMatcher | None = None):
+        """
+        :param exclude: Исключения .gitignore (PathMatcher), по умолчанию - папки exclude_dirs
+        :return: ([относительные пути папок], {относительный путь файла: os.stat_result})
+        """
+        exclude = exclude or build_matcher(exclude_dirs)
+        directories = []
+        files = {}
+        for root, dirs, names in os.walk(self.source_dir):
+            rel_dir = os.path.relpath(root, start=self.source_dir).replace("\\", "/")
+            dirs[:] = exclude.filter_dirs(rel_dir, dirs)
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            if prefix:
+                directories.append(rel_dir)
+            for name in exclude.filter_files(rel_dir, names, root):
+                files[prefix + name] = os.stat(os.path.join(root, name))
+        return directories, files
+
+    def backup(self, mode: str = "incremental", archive_password: str | None = None,
+               exclude_dirs=(), workers: int | None = None, exclude: PathMatcher | None = None) -> dict:
+        """
+        Записывает следующую копию цепочки.
+        :param exclude: Исключения .gitignore (PathMatcher), по умолчанию - папки exclude_dirs
+        :return: Статистика: {"Sequence", "Mode", "Files", "Changed", "Unchanged", "Deleted", "ArchivedBytes", "Archive", "Duration"}
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим резервной копии: {mode}")
+        start = time.perf_counter()
+        os.makedirs(self.backup_dir, exist_ok=True)
+        previous = self.read_manifest()
+        if previous is None or mode == "full":
+            mode, reference = "full", None
+        elif mode == "differential":
+            reference = self.read_manifest(previous["Base"])
+        else:
+            reference = previous
+        sequence = previous["Sequence"] + 1 if previous else 1
+        base = sequence if reference is None else previous["Base"]
+        referenced_files = reference["Files"] if reference else {}
+
+        directories, stats = self.walk_source(exclude_dirs, exclude)
+        files = {}
+        changed = []
+        for path, stat in stats.items():
+            entry = {"Size": stat.st_size, "MTime": stat.st_mtime_ns}
+            old = referenced_files.get(path)
+            if old is not None and old["Size"] == stat.st_size and old["MTime"] == stat.st_mtime_ns:
+                files[path] = dict(old)
+                continue
+            entry["SHA256"] = file_sha256(f"{self.source_dir}/{path}")
+            if old is not None and old["SHA256"] == entry["SHA256"]:
+                # Файл перезаписан тем же содержимым - в архив не попадает
+                entry["Archive"] = old["Archive"]
+            else:
+                entry["Archive"] = sequence
+                changed.append(path)
+            files[path] = entry
+
+        archive_path = None
+        if changed or mode == "full":
+            archive_path = self.archive_path(sequence)
+            self.__write_archive(archive_path, changed, archive_password, workers)
+
+        manifest = {"Version": self.VERSION, "Sequence": sequence, "Base": base, "Mode": mode,
+                    "CreatedAt": datetime.now().isoformat(timespec="seconds"),
+                    "Archive": archive_path is not None, "Directories": directories, "Files": files}
+        # Манифест - точка фиксации копии
+        atomic_write(self.manifest_path(sequence), json_codec.encode(manifest, compact=True), fsync=True)
+
+        result = {"Sequence": sequence, "Mode": mode, "Files": len(files), "Changed": len(changed),
+                  "Unchanged": len(files) - len(changed),
+                  "Deleted": len(referenced_files.keys() - files.keys()),
+                  "ArchivedBytes": sum(files[path]["Size"] for path in changed),
+                  "Archive": archive_path, "Duration": time.perf_counter() - start}
+        self.logger.info(f"[✅] - IncrementalBackup - backup - Копия {sequence} ({mode}): изменено {len(changed)} "
+                         f"из {len(files)} файлов за {result['Duration']:.2f} с")
+        return result
+
+    def __write_archive(self, archive_path: str, paths: list[str], archive_password, workers):
+        """Архив пишется во временный файл и переименовывается после записи"""
+        temp_path = archive_path + ".tmp"
+        policy = CompressionPolicy.from_settings()
+        try:
+            if archive_password:
+                import pyzipper  # AES и пароль - как в ArchiveDataManager._create_zip_archive
+                with pyzipper.AESZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                    zf.setpassword(archive_password.encode("utf-8"))
+                    zf.setencryption(pyzipper.WZ_AES, nbits=256)
+                    for path in paths:
+                        full_path = f"{self.source_dir}/{path}"
+                        if policy is None:
+                            zf.write(full_path, arcname=path)
+                        else:
+                            compression = policy.choose(full_path)
+                            zf.write(full_path, arcname=path, compress_type=compression.method,
+                                     compresslevel=compression.level)
+            else:
+                with ParallelZipWriter(temp_path, workers=workers, policy=policy) as zf:
+                    for path in paths:
+                        zf.write(f"{self.source_dir}/{path}", arcname=path)
+            os.replace(temp_path, archive_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    # --- восстановление ---
+    def chain(self, sequence: int | None = None) -> list[int]:
+        """:return: Номера архивов, нужных для восстановления копии sequence"""
+        manifest = self.read_manifest(sequence)
+        if manifest is None:
+            return []
+        return sorted({entry["Archive"] for entry in manifest["Files"].values()})
+
+    def restore(self, restore_dir: str, sequence: int | None = None, archive_password: str | None = None,
+                prefix: str = "") -> dict:
+        """
+        Восстанавливает дерево на момент копии sequence (None - последней) в пустую директорию restore_dir.
+        prefix - восстановить только этот файл или папку: читаются только нужные записи нужных архивов.
+        :return: {"Sequence", "Files", "Archives"}
+        """
+        manifest = self.read_manifest(sequence)
+        if manifest is None:
+            raise FileNotFoundError(f"Нет резервных копий в {self.backup_dir}")
+        restore_dir = restore_dir.replace("\\", "/")
+        if os.path.isdir(restore_dir) and os.listdir(restore_dir):
+            raise FileExistsError(f"Директория восстановления не пуста: {restore_dir}")
+        prefix = prefix.replace("\\", "/").strip("/")
+        files = manifest["Files"]
+        directories = manifest["Directories"]
+        if prefix:
+            files = {path: entry for path, entry in files.items() if path == prefix or path.startswith(prefix + "/")}
+            directories = [path for path in directories if path == prefix or path.startswith(prefix + "/")]
+            if not files and not directories:
+                raise KeyError(f"В копии {manifest['Sequence']} нет '{prefix}'")
+        by_archive = {}
+        for path, entry in files.items():
+            by_archive.setdefault(entry["Archive"], []).append(path)
+        missing = [number for number in by_archive if not os.path.exists(self.archive_path(number))]
+        if missing:
+            raise FileNotFoundError(f"Цепочка неполная, нет архивов: {missing}")
+
+        os.makedirs(restore_dir, exist_ok=True)
+        for directory in directories:
+            os.makedirs(f"{restore_dir}/{directory}", exist_ok=True)
+        for number, paths in sorted(by_archive.items()):
+            with self.__open_archive(self.archive_path(number), archive_password) as zf:
+                for path in paths:
+                    zf.extract(path, restore_dir)
+                    entry = files[path]
+                    os.utime(f"{restore_dir}/{path}", ns=(entry["MTime"], entry["MTime"]))
+        self.logger.info(f"[✅] - IncrementalBackup - restore - Копия {manifest['Sequence']} восстановлена "
+                         f"в {restore_dir} из {len(by_archive)} архивов")
+        return {"Sequence": manifest["Sequence"], "Files": len(files), "Archives": sorted(by_archive)}
+
+    def verify(self, sequence: int | None = None, archive_password: str | None = None,
+               workers: int | None = None) -> dict:
+        """
+        Проверяет архивы, нужные для восстановления копии sequence, без распаковки на диск (ArchiveReader)
+        и наличие в них всех файлов манифеста.
+        :return: {"Sequence", "Archives", "Members", "Bytes", "Errors": {"<номер>:<путь>": ошибка}}
+        """
+        manifest = self.read_manifest(sequence)
+        if manifest is None:
+            raise FileNotFoundError(f"Нет резервных копий в {self.backup_dir}")
+        expected = {}
+        for path, entry in manifest["Files"].items():
+            expected.setdefault(entry["Archive"], set()).add(path)
+        result = {"Sequence": manifest["Sequence"], "Archives": sorted(expected), "Members": 0, "Bytes": 0, "Errors": {}}
+        for number, paths in sorted(expected.items()):
+            if not os.path.exists(self.archive_path(number)):
+                result["Errors"][f"{number}"] = "FileNotFoundError: архив цепочки отсутствует"
+                continue
+            with ArchiveReader(self.archive_path(number), archive_password, workers) as reader:
+                verified = reader.verify()
+                missing = paths - set(reader.names)
+            result["Members"] += verified["Members"]
+            result["Bytes"] += verified["Bytes"]
+            result["Errors"].update((f"{number}:{path}", error) for path, error in verified["Errors"].items())
+            result["Errors"].update((f"{number}:{path}", "KeyError: нет в архиве") for path in sorted(missing))
+        return result
+
+    @staticmethod
+    def __open_archive(archive_path: str, archive_password):
+        if archive_password:
+            import pyzipper
+            zf = pyzipper.AESZipFile(archive_path)
+            zf.setpassword(archive_password.encode("utf-8"))
+            return zf
+        return zipfile.ZipFile(archive_path)
+
+
+if __name__ == '__main__':
+    # python -m WorkArchiveFiles.App.IncrementalBackup backup <источник> <директория копий> [full|incremental|differential]
+    # python -m WorkArchiveFiles.App.IncrementalBackup restore <директория копий> <куда> [номер копии]
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "backup":
+        print(IncrementalBackup(sys.argv[2], sys.argv[3]).backup(*sys.argv[4:5]))
+    elif command == "restore":
+        number = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        print(IncrementalBackup("", sys.argv[2]).restore(sys.argv[3], number))
+    else:
+        print("backup <источник> <директория копий> [режим] | restore <директория копий> <куда> [номер копии]")
@@ -0,0 +1,318 @@
+import logging
+import os
+import struct
+import zipfile
+import zlib
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from WorkArchiveFiles.App.CompressionPolicy import Compression, CompressionPolicy
+
+
+def compress_block(block: bytes, zdict: bytes | None, last: bool, level: int) -> bytes:
+    """
+    Сжимает один блок файла в "сырой" deflate (как в ZIP). Блоки одного файла сжимаются независимо
+    и склеиваются по порядку: каждый блок завершается Z_SYNC_FLUSH (выравнивание на байт),
+    последний - Z_FINISH. zdict - последние 32 КБ предыдущего блока, чтобы сжатие почти не ухудшалось.
+    zlib отпускает GIL, поэтому блоки сжимаются в потоках параллельно.
+    """
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def compress_file(full_path: str, compress_type: int, level: int | None, block_size: int) -> tuple[bytes, int, int]:
+    """
+    Сжимает файл целиком одним потоком (bzip2, lzma - их поток нельзя собрать из независимых блоков).
+    :return: (сжатые данные, CRC32, размер файла)
+    """
+    compressor = zipfile._get_compressor(compress_type, level)
+    parts = []
+    crc = 0
+    file_size = 0
+    with open(full_path, "rb") as file:
+        while block := file.read(block_size):
+            crc = zlib.crc32(block, crc)
+            file_size += len(block)
+            parts.append(compressor.compress(block))
+    parts.append(compressor.flush())
+    return b"".join(parts), crc, file_size
+
+
+def read_written_members(fp) -> tuple[list[zipfile.ZipInfo], int]:
+    """
+    Читает подряд локальные заголовки недописанного архива (центрального каталога может не быть).
+    Запись считается готовой, если в её заголовке уже записаны CRC и размеры (флаг дескриптора данных
+    снят, см. ParallelZipWriter) и все её данные есть в файле.
+    :return: (готовые записи по порядку, смещение конца последней готовой записи)
+    """
+    fp.seek(0, os.SEEK_END)
+    file_length = fp.tell()
+    members = []
+    offset = 0
+    while offset + zipfile.sizeFileHeader <= file_length:
+        fp.seek(offset)
+        header = struct.unpack(zipfile.structFileHeader, fp.read(zipfile.sizeFileHeader))
+        if header[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader \
+                or header[zipfile._FH_GENERAL_PURPOSE_FLAG_BITS] & zipfile._MASK_USE_DATA_DESCRIPTOR:
+            break
+        raw_name = fp.read(header[zipfile._FH_FILENAME_LENGTH])
+        extra = fp.read(header[zipfile._FH_EXTRA_FIELD_LENGTH])
+        flag_bits = header[zipfile._FH_GENERAL_PURPOSE_FLAG_BITS]
+        name = raw_name.decode("utf-8" if flag_bits & zipfile._MASK_UTF_FILENAME else "cp437")
+        file_size = header[zipfile._FH_UNCOMPRESSED_SIZE]
+        compress_size = header[zipfile._FH_COMPRESSED_SIZE]
+        zip64 = False
+        if compress_size == 0xFFFFFFFF:
+            # ZIP64: размеры в дополнительном поле (file_size, compress_size) - как пишет ZipInfo.FileHeader
+            position = 0
+            while position + 4 <= len(extra):
+                tag, length = struct.unpack("<HH", extra[position:position + 4])
+                if tag == 1:
+                    file_size, compress_size = struct.unpack("<QQ", extra[position + 4:position + 20])
+                    zip64 = True
+                    break
+                position += 4 + length
+        data_end = fp.tell() + compress_size
+        if data_end > file_length:
+            break
+        date, dostime = header[zipfile._FH_LAST_MOD_DATE], header[zipfile._FH_LAST_MOD_TIME]
+        zinfo = zipfile.ZipInfo(name, ((date >> 9) + 1980, (date >> 5) & 0xF, date & 0x1F,
+                                       dostime >> 11, (dostime >> 5) & 0x3F, (dostime & 0x1F) * 2))
+        zinfo.flag_bits = flag_bits
+        zinfo.compress_type = header[zipfile._FH_COMPRESSION_METHOD]
+        zinfo.CRC = header[zipfile._FH_CRC]
+        zinfo.file_size = file_size
+        zinfo.compress_size = compress_size
+        zinfo.extra = zipfile._strip_extra(extra, (1,)) if zip64 else extra
+        zinfo.header_offset = offset
+        if name.endswith("/"):
+            zinfo.external_attr = 0o40775 << 16 | 0x10  # как ZipFile.writestr для папки
+        members.append(zinfo)
+        offset = data_end
+    return members, offset
+
+
+def _completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class _Member:
+    """Запись архива, которая сейчас пишется: ZipInfo, CRC и размеры накапливаются по блокам"""
+
+    def __init__(self, zinfo: zipfile.ZipInfo, zip64: bool):
+        self.zinfo = zinfo
+        self.zip64 = zip64
+        self.started = False
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+
+class ParallelZipWriter:
+    """
+    ZIP-архив (без пароля), файлы которого сжимаются в пуле потоков.
+
+    Файлы читаются блоками по block_size, блоки сжимаются параллельно и записываются в архив
+    строго по порядку - архив получается таким же, как при последовательном zipfile.write
+    (порядок записей, пути, время изменения), и читается любым zip-инструментом.
+    Одновременно в работе не больше workers * 4 блоков - память не зависит от размера файлов.
+
+    Сжатие каждого файла выбирает policy (CompressionPolicy): уже сжатые файлы записываются без сжатия,
+    deflate - блоками параллельно, bzip2 и lzma - целиком в одном потоке пула (параллельно между файлами).
+    Без policy все файлы сжимаются deflate с compresslevel. Выбранные методы считаются в self.methods.
+
+    Используются внутренние поля zipfile.ZipFile (fp, start_dir, filelist, NameToInfo) - так же, как это
+    делает сам zipfile при записи через ZipFile.open(..., "w").
+
+    Пока запись не дописана, в её локальном заголовке стоит флаг дескриптора данных; после последнего
+    блока заголовок перезаписывается с CRC и размерами. Поэтому прерванный архив можно продолжить
+    (resume=True): готовые записи читаются из заголовков, недописанный хвост обрезается,
+    имена готовых записей - в self.written, их не нужно записывать снова.
+
+    :param archive_path: Путь к создаваемому архиву
+    :param workers: Количество потоков сжатия, None или 0 - по числу ядер
+    :param compresslevel: Уровень deflate (-1 - по умолчанию zlib, как в zipfile)
+    :param block_size: Размер блока, на которые делятся большие файлы
+    :param policy: Выбор сжатия для каждого файла, None - всё deflate
+    :param on_progress: Вызывается с числом исходных байт после записи каждого блока (может прервать
+                        архивирование исключением - архив закрывается через abort)
+    :param resume: Продолжить существующий недописанный архив archive_path
+    :param keep: Для resume: keep(ZipInfo) -> bool - оставить ли готовую запись; первая отвергнутая
+                 запись и все записи после неё обрезаются. Может дополнить ZipInfo (external_attr)
+    """
+    ZDICT_SIZE = 32 * 1024
+
+    def __init__(self, archive_path: str, workers: int | None = None, compresslevel: int = -1,
+                 block_size: int = 1024 * 1024, policy: CompressionPolicy | None = None,
+                 on_progress: Callable[[int], None] | None = None, resume: bool = False,
+                 keep: Callable[[zipfile.ZipInfo], bool] | None = None):
+        self.logger = logging.getLogger("ParallelZipWriter")
+        self.workers = workers or os.cpu_count() or 1
+        self.compresslevel = compresslevel
+        self.block_size = block_size
+        self.policy = policy
+        self.methods = Counter()
+        self.max_pending = self.workers * 4
+        self.on_progress = on_progress
+        self.written: dict[str, zipfile.ZipInfo] = {}
+        self.__fp = None
+        if resume and os.path.exists(archive_path):
+            self.__fp = open(archive_path, "r+b")
+            members, end = read_written_members(self.__fp)
+            for zinfo in members:
+                if keep is not None and not keep(zinfo):
+                    end = zinfo.header_offset
+                    break
+                self.written[zinfo.filename] = zinfo
+            self.__fp.seek(end)
+            self.__fp.truncate()
+            self.zf = zipfile.ZipFile(self.__fp, "w", compression=zipfile.ZIP_DEFLATED)
+            for zinfo in self.written.values():
+                self.zf.filelist.append(zinfo)
+                self.zf.NameToInfo[zinfo.filename] = zinfo
+            self.logger.info(f"[📁] - ParallelZipWriter - __init__ - {archive_path}: продолжение, "
+                             f"готово записей {len(self.written)}")
+        else:
+            self.zf = zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ParallelZipWriter")
+        # Очередь записи по порядку: (запись, future со сжатым блоком, исходный блок, последний ли блок);
+        # для файла, сжатого целиком, исходного блока нет - future возвращает (данные, CRC, размер)
+        self.pending = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, full_path: str, arcname: str):
+        """Ставит файл в очередь на сжатие (аналог ZipFile.write)"""
+        zinfo = zipfile.ZipInfo.from_file(full_path, arcname)
+        if zinfo.is_dir():
+            self.write_directory(arcname)
+            return
+        if self.policy is None:
+            compression = Compression(zipfile.ZIP_DEFLATED, self.compresslevel, "default")
+        else:
+            compression = self.policy.choose(full_path, zinfo.file_size)
+        self.methods[compression.name] += 1
+        zinfo.compress_type = compression.method
+        member = _Member(zinfo, zip64=zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT)
+        if compression.method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            future = self.executor.submit(compress_file, full_path, compression.method, compression.level,
+                                          self.block_size)
+            self.__enqueue((member, future, None, True))
+            return
+        level = self.compresslevel if compression.level is None else compression.level
+        zdict = None
+        with open(full_path, "rb") as file:
+            block = file.read(self.block_size)
+            while True:
+                next_block = file.read(self.block_size) if len(block) == self.block_size else b""
+                last = not next_block
+                if compression.method == zipfile.ZIP_STORED:
+                    future = _completed(block)
+                else:
+                    future = self.executor.submit(compress_block, block, zdict, last, level)
+                self.__enqueue((member, future, block, last))
+                if last:
+                    break
+                zdict = block[-self.ZDICT_SIZE:]
+                block = next_block
+
+    def write_directory(self, arcname: str):
+        """Запись папки (аналог ZipFile.writestr(arcname + "/", b""))"""
+        self.__enqueue((arcname, None, None, True))
+
+    def __enqueue(self, item):
+        self.pending.append(item)
+        while len(self.pending) > self.max_pending:
+            self.__write_next()
+
+    def __write_next(self):
+        member, future, block, last = self.pending.popleft()
+        if future is None:
+            self.zf.writestr(member.rstrip("/") + "/", b"")
+            return
+        data = future.result()
+        fp = self.zf.fp
+        if not member.started:
+            zinfo = member.zinfo
+            zinfo.compress_size = 0
+            zinfo.CRC = 0
+            # Признак недописанной записи для resume, снимается в __finish_member
+            zinfo.flag_bits = zipfile._MASK_USE_DATA_DESCRIPTOR
+            if not zinfo.external_attr:
+                zinfo.external_attr = 0o600 << 16
+            fp.seek(self.zf.start_dir)
+            zinfo.header_offset = fp.tell()
+            self.zf._writecheck(zinfo)
+            fp.write(zinfo.FileHeader(member.zip64))
+            member.started = True
+        if block is None:
+            data, member.crc, member.file_size = data
+        else:
+            member.crc = zlib.crc32(block, member.crc)
+            member.file_size += len(block)
+        fp.write(data)
+        member.compress_size += len(data)
+        if last:
+            self.__finish_member(member)
+        else:
+            self.zf.start_dir = fp.tell()
+        if self.on_progress is not None:
+            self.on_progress(member.file_size if block is None else len(block))
+
+    def __finish_member(self, member: _Member):
+        """Дописывает CRC и размеры в заголовок записи - как ZipFile при закрытии записи"""
+        zinfo = member.zinfo
+        zinfo.CRC = member.crc
+        zinfo.file_size = member.file_size
+        zinfo.compress_size = member.compress_size
+        zinfo.flag_bits = 0
+        if not member.zip64 and max(member.file_size, member.compress_size) > zipfile.ZIP64_LIMIT:
+            raise RuntimeError(f"Файл {zinfo.filename} вырос во время архивирования, нужен ZIP64")
+        fp = self.zf.fp
+        self.zf.start_dir = fp.tell()
+        fp.seek(zinfo.header_offset)
+        fp.write(zinfo.FileHeader(member.zip64))
+        fp.seek(self.zf.start_dir)
+        self.zf.filelist.append(zinfo)
+        self.zf.NameToInfo[zinfo.filename] = zinfo
+
+    def close(self):
+        """Дожидается всех блоков и записывает центральный каталог архива"""
+        try:
+            while self.pending:
+                self.__write_next()
+        except BaseException:
+            self.abort()
+            raise
+        self.executor.shutdown()
+        self.zf.close()
+        self.__close_file()
+
+    def abort(self):
+        """Останавливает сжатие после ошибки, архив закрывается недописанным"""
+        for _, future, _, _ in self.pending:
+            if future is not None:
+                future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=True)
+        self.zf.close()
+        self.__close_file()
+
+    def __close_file(self):
+        """Файл продолжаемого архива открыт нами - ZipFile его не закрывает"""
+        if self.__fp is not None:
+            self.__fp.close()
+            self.__fp = None
@@ -0,0 +1,154 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+
+from WorkArchiveFiles.App.ArchiveJobQueue import ArchiveJobQueue, format_progress, print_progress
+from WorkArchiveFiles.App.ArchiveProgress import ArchiveCancelled, ArchiveProgress
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter, read_written_members
+
+
+class TestArchiveProgress(unittest.TestCase):
+    def test_snapshot(self):
+        progress = ArchiveProgress()
+        progress.start(4, 1000)
+        progress.skip(1, 400)
+        progress.set_current("Data/A.txt")
+        progress.add_bytes(100)
+        progress.file_done()
+        status = progress.snapshot()
+        self.assertEqual((status["Files"], status["TotalFiles"]), (2, 4))
+        self.assertEqual((status["Bytes"], status["TotalBytes"]), (500, 1000))
+        self.assertAlmostEqual(status["Percent"], 50.0)
+        self.assertEqual(status["Current"], "Data/A.txt")
+        self.assertIn("50.0%", format_progress(status))
+
+    def test_cancel_raises_on_next_update(self):
+        progress = ArchiveProgress()
+        progress.start(1, 10)
+        progress.token.cancel()
+        with self.assertRaises(ArchiveCancelled):
+            progress.add_bytes(1)
+
+
+class TestArchiveJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = ArchiveJobQueue()
+
+    def tearDown(self):
+        self.queue.stop()
+
+    def test_jobs_run_in_order(self):
+        order = []
+        jobs = [self.queue.submit(f"Job{index}", lambda progress, index=index: order.append(index) or index)
+                for index in range(3)]
+        for job in jobs:
+            self.assertTrue(job.wait(5))
+        self.assertEqual(order, [0, 1, 2])
+        self.assertEqual([job.state for job in jobs], ["done"] * 3)
+        self.assertEqual(jobs[2].result, 2)
+
+    def test_failed_job(self):
+        job = self.queue.submit("Broken", lambda progress: 1 / 0)
+        job.wait(5)
+        self.assertEqual(job.state, "failed")
+        self.assertIn("ZeroDivisionError", job.status()["Error"])
+
+    def test_cancel_running_and_queued(self):
+        started = threading.Event()
+
+        def run(progress):
+            progress.start(1, 1)
+            started.set()
+            while True:
+                progress.add_bytes(0)
+
+        running = self.queue.submit("Running", run)
+        queued = self.queue.submit("Queued", lambda progress: "never")
+        started.wait(5)
+        queued.cancel()
+        running.cancel()
+        self.assertTrue(running.wait(5) and queued.wait(5))
+        self.assertEqual((running.state, queued.state), ("cancelled", "cancelled"))
+        self.assertIsNone(queued.result)
+
+    def test_print_progress(self):
+        job = self.queue.submit("Print", lambda progress: progress.start(2, 10) or progress.add_bytes(10))
+        stream = io.StringIO()
+        status = print_progress(job, stream=stream, interval=0.01)
+        self.assertEqual(status["State"], "done")
+        self.assertTrue(stream.getvalue().endswith("done\n"))
+
+
+class TestResumableZip(unittest.TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.archive_path = os.path.join(tempfile.mkdtemp(), "Archive.zip.part")
+        rng = random.Random(19)
+        self.files = {f"Data/File{index}.bin": rng.randbytes(100 * 1024) + b"MGSD" * 20000 for index in range(8)}
+        for name, content in self.files.items():
+            path = os.path.join(self.source, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.source, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(self.archive_path), ignore_errors=True)
+
+    def write(self, progress: ArchiveProgress, **kwargs) -> ParallelZipWriter:
+        with ParallelZipWriter(self.archive_path, workers=2, block_size=64 * 1024,
+                               on_progress=progress.add_bytes, **kwargs) as zf:
+            for name in self.files:
+                if name not in zf.written:
+                    zf.write(os.path.join(self.source, name), arcname=name)
+        return zf
+
+    def cancel_after(self, size: int) -> ArchiveProgress:
+        progress = ArchiveProgress()
+        progress.start(len(self.files), sum(map(len, self.files.values())))
+        original = progress.add_bytes
+
+        def add_bytes(block):
+            original(block)
+            if progress.done_bytes >= size:
+                progress.token.cancel()
+
+        progress.add_bytes = add_bytes
+        return progress
+
+    def test_cancel_and_resume(self):
+        total = sum(map(len, self.files.values()))
+        with self.assertRaises(ArchiveCancelled):
+            self.write(self.cancel_after(total // 2))
+        with open(self.archive_path, "rb") as file:
+            members, _ = read_written_members(file)
+        self.assertTrue(0 < len(members) < len(self.files))
+
+        progress = ArchiveProgress()
+        zf = self.write(progress, resume=True)
+        self.assertEqual(list(zf.written), [zinfo.filename for zinfo in members])
+        # Записанные в прошлый раз файлы не сжимаются снова
+        self.assertEqual(progress.done_bytes, sum(len(self.files[name]) for name in self.files
+                                                  if name not in zf.written))
+        with zipfile.ZipFile(self.archive_path) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual({name: archive.read(name) for name in archive.namelist()}, self.files)
+
+    def test_resume_drops_rejected_members(self):
+        with self.assertRaises(ArchiveCancelled):
+            self.write(self.cancel_after(sum(map(len, self.files.values())) * 3 // 4))
+        # keep отвергает вторую запись - она и все следующие пишутся заново
+        zf = self.write(ArchiveProgress(), resume=True, keep=lambda zinfo: zinfo.filename != "Data/File1.bin")
+        self.assertEqual(list(zf.written), ["Data/File0.bin"])
+        with zipfile.ZipFile(self.archive_path) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), list(self.files))
+
+
+if __name__ == '__main__':
+    unittest.main()
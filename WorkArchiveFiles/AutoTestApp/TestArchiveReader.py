@@ -0,0 +1,70 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from WorkArchiveFiles.App.ArchiveReader import ArchiveReader
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+
+class TestArchiveReader(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp().replace("\\", "/")
+        self.archive_path = f"{self.temp}/Archive.zip"
+        rng = random.Random(13)
+        self.files = {
+            "DataFile.json": b"{}",
+            "SourceData/1.json": b'{"ID": "1"}' * 1000,
+            "SourceData/Sub/2.bin": rng.randbytes(200 * 1024),
+            "SourceData0.txt": b"not in SourceData",
+            "ResultData/Result.txt": b"MGSD " * 5000,
+        }
+        with ParallelZipWriter(self.archive_path, workers=2) as zf:
+            zf.write_directory("SourceData")
+            for name, content in self.files.items():
+                full_path = f"{self.temp}/Source/{name}"
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, "wb") as file:
+                    file.write(content)
+                zf.write(full_path, arcname=name)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp, ignore_errors=True)
+
+    def test_verify(self):
+        with ArchiveReader(self.archive_path, workers=3) as reader:
+            result = reader.verify()
+        self.assertEqual((result["Members"], result["Errors"]), (5, {}))
+        self.assertEqual(result["Bytes"], sum(map(len, self.files.values())))
+
+    def test_verify_reports_corrupted_member(self):
+        with ArchiveReader(self.archive_path) as reader:
+            info = reader.getinfo("ResultData/Result.txt")
+            # Данные записи начинаются после локального заголовка (30 байт + имя + extra)
+            offset = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra) + 10
+        with open(self.archive_path, "r+b") as file:
+            file.seek(offset)
+            byte = file.read(1)
+            file.seek(offset)
+            file.write(bytes([byte[0] ^ 0xFF]))
+        with ArchiveReader(self.archive_path, workers=2) as reader:
+            errors = reader.verify()["Errors"]
+        self.assertEqual(list(errors), ["ResultData/Result.txt"])
+
+    def test_list_and_extract_subtree(self):
+        with ArchiveReader(self.archive_path) as reader:
+            self.assertEqual([info.filename for info in reader.members("SourceData")],
+                             ["SourceData/", "SourceData/1.json", "SourceData/Sub/2.bin"])
+            self.assertEqual(reader.read("SourceData/Sub/2.bin"), self.files["SourceData/Sub/2.bin"])
+            self.assertEqual(reader.extract("SourceData/Sub", f"{self.temp}/Restored"), 1)
+            self.assertEqual(reader.extract("DataFile.json", f"{self.temp}/Restored"), 1)
+            with self.assertRaises(KeyError):
+                reader.extract("Missing", f"{self.temp}/Restored")
+        restored = sorted(os.path.relpath(os.path.join(root, name), f"{self.temp}/Restored").replace("\\", "/")
+                          for root, _, names in os.walk(f"{self.temp}/Restored") for name in names)
+        self.assertEqual(restored, ["DataFile.json", "SourceData/Sub/2.bin"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from WorkArchiveFiles.App.CompressionPolicy import CompressionPolicy, parse_method
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.policy = CompressionPolicy(level=9)
+        self.rng = random.Random(11)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_extension_and_empty(self):
+        self.assertEqual(self.policy.choose(self.write("1.png", b"MGSD" * 1000)).reason, "extension")
+        self.assertEqual(self.policy.choose(self.write("Empty.txt", b"")).method, zipfile.ZIP_STORED)
+
+    def test_signature(self):
+        # Сжатые данные без "правильного" расширения: ZIP внутри .bin
+        inner = os.path.join(self.temp, "Inner.zip")
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("Data.txt", b"MGSD" * 1000)
+        with open(inner, "rb") as file:
+            compression = self.policy.choose(self.write("Data.bin", file.read()))
+        self.assertEqual((compression.method, compression.reason), (zipfile.ZIP_STORED, "signature"))
+
+    def test_sample(self):
+        random_data = self.policy.choose(self.write("App.exe", self.rng.randbytes(300 * 1024)))
+        self.assertEqual((random_data.method, random_data.reason), (zipfile.ZIP_STORED, "sample"))
+        text = self.policy.choose(self.write("Data.json", b'{"ID": "1", "Name": "MGSD"}, ' * 5000))
+        self.assertEqual((text.method, text.level), (zipfile.ZIP_DEFLATED, 9))
+        # Сжимается слабо (~0.9) - быстрый уровень
+        mixed = b"".join(self.rng.randbytes(3000) + b"MGSD" * 100 for _ in range(50))
+        self.assertEqual(self.policy.choose(self.write("Mixed.bin", mixed)).level, 1)
+
+    def test_strong_method_and_rules(self):
+        policy = CompressionPolicy(strong_method="lzma", rules={".LOG": "bzip2:5", ".png": "deflate"},
+                                   strong_max_size=100 * 1024)
+        text = b"MGSD Project Data " * 4000
+        self.assertEqual(policy.choose(self.write("Data.txt", text)).method, zipfile.ZIP_LZMA)
+        self.assertEqual(policy.choose(self.write("Big.txt", text * 3)).method, zipfile.ZIP_DEFLATED)
+        self.assertEqual(policy.choose(self.write("App.log", b"")), (zipfile.ZIP_BZIP2, 5, "rule"))
+        self.assertEqual(policy.choose(self.write("1.png", b"")).method, zipfile.ZIP_DEFLATED)
+        with self.assertRaises(ValueError):
+            parse_method("zstd")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from WorkArchiveFiles.App import DedupStore as dedup
+from WorkArchiveFiles.App.DedupStore import DedupStore, iter_chunks
+
+
+class TestChunking(unittest.TestCase):
+    def test_chunk_sizes_and_shift(self):
+        data = random.Random(1).randbytes(400 * 1024)
+        chunks = list(iter_chunks(io.BytesIO(data)))
+        self.assertEqual(b"".join(chunks), data)
+        self.assertTrue(all(dedup.MIN_CHUNK <= len(chunk) <= dedup.MAX_CHUNK for chunk in chunks[:-1]))
+        # Вставка в начало меняет только первый чанк
+        shifted = list(iter_chunks(io.BytesIO(b"MGSD" + data)))
+        self.assertGreaterEqual(len(set(chunks) & set(shifted)), len(chunks) - 2)
+
+    def test_small_read_size(self):
+        data = random.Random(2).randbytes(300 * 1024)
+        read_size = dedup.READ_SIZE
+        try:
+            dedup.READ_SIZE = 10000
+            small = list(iter_chunks(io.BytesIO(data)))
+        finally:
+            dedup.READ_SIZE = read_size
+        self.assertEqual(small, list(iter_chunks(io.BytesIO(data))))
+
+
+class TestDedupStore(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp().replace("\\", "/")
+        self.source = f"{self.temp}/Source"
+        rng = random.Random(3)
+        self.icon = rng.randbytes(50 * 1024)
+        self.write("1.png", self.icon)
+        self.write("2.png", self.icon)
+        self.write("SourceData/Data.bin", rng.randbytes(200 * 1024))
+        self.write("SourceData/Text.txt", b"MGSD " * 20000)
+        self.write("Empty.txt", b"")
+        os.makedirs(f"{self.source}/ResultData")
+        self.store = DedupStore(f"{self.temp}/Store.dedup")
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp, ignore_errors=True)
+
+    def write(self, path, content):
+        full_path = f"{self.source}/{path}"
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as file:
+            file.write(content)
+
+    def tree(self, root):
+        result = {}
+        for dirpath, dirs, files in os.walk(root):
+            for directory in dirs:
+                result[os.path.relpath(os.path.join(dirpath, directory), root) + "/"] = None
+            for name in files:
+                with open(os.path.join(dirpath, name), "rb") as file:
+                    result[os.path.relpath(os.path.join(dirpath, name), root)] = file.read()
+        return result
+
+    def test_dedup_and_restore(self):
+        first = self.store.backup(self.source, "Project")
+        self.assertGreater(first["ReusedChunks"], 0)  # вторая копия иконки
+        before = self.tree(self.source)
+        self.write("3.png", self.icon)
+        second = self.store.backup(self.source, "Project")
+        self.assertEqual(second["NewChunks"], 0)
+        self.assertEqual(second["UnchangedFiles"], 5)  # не изменённые файлы не перечитываются
+        stats = self.store.stats()
+        self.assertGreater(stats["DedupRatio"], 2)
+        self.assertEqual(self.store.restore(first["Snapshot"], f"{self.temp}/First"), 5)
+        self.assertEqual(self.tree(f"{self.temp}/First"), before)
+        self.store.restore(self.store.latest_snapshot("Project"), f"{self.temp}/Latest")
+        self.assertEqual(self.tree(f"{self.temp}/Latest"), self.tree(self.source))
+
+    def test_gc(self):
+        first = self.store.backup(self.source, "Project")
+        shutil.rmtree(f"{self.source}/SourceData")
+        second = self.store.backup(self.source, "Project")
+        self.assertEqual(self.store.gc()["RemovedChunks"], 0)
+        self.store.delete_snapshot(first["Snapshot"])
+        result = self.store.gc(repack_threshold=0.1)
+        self.assertGreater(result["RemovedChunks"], 0)
+        self.assertEqual(result["RepackedPacks"], 1)
+        self.assertGreater(result["FreedBytes"], 0)
+        self.store.restore(second["Snapshot"], f"{self.temp}/Restored")
+        self.assertEqual(self.tree(f"{self.temp}/Restored"), self.tree(self.source))
+
+
+if __name__ == '__main__':
+    unittest.main()
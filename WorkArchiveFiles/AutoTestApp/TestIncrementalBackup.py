@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from TemplateProject.core.services.path_matcher import PathMatcher
+from WorkArchiveFiles.App.IncrementalBackup import IncrementalBackup
+
+
+class TestIncrementalBackup(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp().replace("\\", "/")
+        self.source = f"{self.temp}/Source"
+        self.backup = IncrementalBackup(self.source, f"{self.temp}/Backup")
+        self.write("DataFile.json", "{}")
+        self.write("SourceData/1.txt", "first")
+        self.write("SourceData/2.txt", "second")
+        self.write("__pycache__/cache.pyc", "cache")
+        os.makedirs(f"{self.source}/EmptyDir")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp, ignore_errors=True)
+
+    def write(self, path, content):
+        full_path = f"{self.source}/{path}"
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as file:
+            file.write(content)
+
+    def tree(self, root):
+        result = {}
+        for dirpath, dirs, files in os.walk(root):
+            for directory in dirs:
+                result[os.path.relpath(os.path.join(dirpath, directory), root).replace("\\", "/") + "/"] = None
+            for name in files:
+                full_path = os.path.join(dirpath, name)
+                with open(full_path) as file:
+                    result[os.path.relpath(full_path, root).replace("\\", "/")] = file.read()
+        return result
+
+    def test_incremental_chain_and_restore(self):
+        first = self.backup.backup(exclude_dirs=["__pycache__"])
+        self.assertEqual((first["Mode"], first["Changed"]), ("full", 3))
+        snapshot = self.tree(self.source)
+
+        self.write("SourceData/2.txt", "second v2")
+        self.write("SourceData/3.txt", "third")
+        os.remove(f"{self.source}/DataFile.json")
+        second = self.backup.backup(exclude_dirs=["__pycache__"])
+        self.assertEqual((second["Mode"], second["Changed"], second["Unchanged"], second["Deleted"]),
+                         ("incremental", 2, 1, 1))
+
+        third = self.backup.backup(exclude_dirs=["__pycache__"])
+        self.assertEqual((third["Changed"], third["Archive"]), (0, None))
+        self.assertEqual(self.backup.chain(), [1, 2])
+
+        latest = self.tree(self.source)
+        self.backup.restore(f"{self.temp}/Latest")
+        self.assertEqual(self.tree(f"{self.temp}/Latest"), {k: v for k, v in latest.items() if "__pycache__" not in k})
+        self.backup.restore(f"{self.temp}/First", sequence=1)
+        self.assertEqual(self.tree(f"{self.temp}/First"), {k: v for k, v in snapshot.items() if "__pycache__" not in k})
+
+    def test_same_content_is_not_archived(self):
+        self.backup.backup()
+        self.write("SourceData/1.txt", "first")
+        result = self.backup.backup()
+        self.assertEqual(result["Changed"], 0)
+        self.assertEqual(self.backup.read_manifest()["Files"]["SourceData/1.txt"]["Archive"], 1)
+
+    def test_differential(self):
+        self.backup.backup()
+        self.write("SourceData/1.txt", "first v2")
+        self.backup.backup(mode="differential")
+        self.write("SourceData/2.txt", "second v2")
+        result = self.backup.backup(mode="differential")
+        # Дифференциальная копия содержит все изменения с полной копии
+        self.assertEqual(result["Changed"], 2)
+        self.assertEqual(self.backup.chain(), [1, 3])
+        self.backup.restore(f"{self.temp}/Restored")
+        self.assertEqual(self.tree(f"{self.temp}/Restored"), self.tree(self.source))
+
+    def test_verify_and_restore_subtree(self):
+        self.backup.backup()
+        self.write("SourceData/2.txt", "second v2")
+        self.backup.backup()
+        result = self.backup.verify()
+        self.assertEqual((result["Archives"], result["Errors"]), ([1, 2], {}))
+        restored = self.backup.restore(f"{self.temp}/Restored", prefix="SourceData")
+        self.assertEqual((restored["Files"], restored["Archives"]), (2, [1, 2]))
+        self.assertEqual(self.tree(f"{self.temp}/Restored"),
+                         {"SourceData/": None, "SourceData/1.txt": "first", "SourceData/2.txt": "second v2"})
+        os.remove(self.backup.archive_path(1))
+        self.assertIn("1", self.backup.verify()["Errors"])
+
+    def test_exclude_patterns(self):
+        self.write("SourceData/debug.log", "log")
+        self.write("SourceData/.venv/lib.py", "venv")
+        exclude = PathMatcher(["__pycache__/", ".venv/", "*.log"], ignore_case=False)
+        result = self.backup.backup(exclude=exclude)
+        self.assertEqual(sorted(self.backup.read_manifest()["Files"]),
+                         ["DataFile.json", "SourceData/1.txt", "SourceData/2.txt"])
+        self.assertEqual(result["Files"], 3)
+
+    def test_restore_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            self.backup.restore(f"{self.temp}/Restored")
+        self.backup.backup()
+        self.write("SourceData/1.txt", "first v2")
+        self.backup.backup()
+        os.remove(self.backup.archive_path(1))
+        with self.assertRaises(FileNotFoundError):
+            self.backup.restore(f"{self.temp}/Restored")
+        with self.assertRaises(FileExistsError):
+            self.backup.restore(self.source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from WorkArchiveFiles.App.CompressionPolicy import CompressionPolicy
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+
+class TestParallelZipWriter(unittest.TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.archive_path = os.path.join(tempfile.mkdtemp(), "Archive.zip")
+        rng = random.Random(5)
+        self.files = {
+            "Empty.txt": b"",
+            "Small.txt": b"MGSD " * 100,
+            "Data/Random.bin": rng.randbytes(300 * 1024),
+            "Data/Text.json": b"".join(b'{"ID": "%d", "Name": "Item"},' % i for i in range(40000)),
+            "Data/Exact.bin": b"x" * (64 * 1024),
+        }
+        for name, content in self.files.items():
+            path = os.path.join(self.source, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.source, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(self.archive_path), ignore_errors=True)
+
+    def write_archive(self, **kwargs):
+        with ParallelZipWriter(self.archive_path, **kwargs) as zf:
+            zf.write_directory("Data")
+            for name in self.files:
+                zf.write(os.path.join(self.source, name), arcname=name)
+
+    def test_archive_matches_sources(self):
+        # Маленький блок - большие файлы делятся на много блоков
+        self.write_archive(workers=4, block_size=64 * 1024)
+        with zipfile.ZipFile(self.archive_path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist(), ["Data/"] + list(self.files))
+            for name, content in self.files.items():
+                self.assertEqual(zf.read(name), content)
+            self.assertLess(zf.getinfo("Data/Text.json").compress_size, len(self.files["Data/Text.json"]) // 5)
+
+    def test_single_worker(self):
+        self.write_archive(workers=1)
+        with zipfile.ZipFile(self.archive_path) as zf:
+            self.assertEqual({name: zf.read(name) for name in self.files}, self.files)
+
+    def test_compression_policy(self):
+        policy = CompressionPolicy(strong_method="lzma", rules={".txt": "bzip2"})
+        self.write_archive(workers=2, block_size=64 * 1024, policy=policy)
+        with zipfile.ZipFile(self.archive_path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual({name: zf.read(name) for name in self.files}, self.files)
+            methods = {info.filename: info.compress_type for info in zf.infolist()}
+        self.assertEqual(methods["Data/Random.bin"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["Data/Text.json"], zipfile.ZIP_LZMA)
+        self.assertEqual(methods["Small.txt"], zipfile.ZIP_BZIP2)
+
+    def test_error_aborts_archive(self):
+        with self.assertRaises(FileNotFoundError):
+            with ParallelZipWriter(self.archive_path, workers=2) as zf:
+                zf.write(os.path.join(self.source, "Small.txt"), arcname="Small.txt")
+                zf.write(os.path.join(self.source, "Missing.txt"), arcname="Missing.txt")
+        self.assertTrue(zf.zf.fp is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
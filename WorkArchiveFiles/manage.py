@@ -1,4 +1,5 @@
 from WorkArchiveFiles.App.ArchiveDataManager import ArchiveDataManager
+from WorkArchiveFiles.App.ArchiveJobQueue import ArchiveJobQueue, print_progress
 from WorkArchiveFiles.settings import FullTemplateDataDirectory, FullTestDirectory, Archive_type, Archive_password
 
 
@@ -16,13 +17,24 @@ def TestingArchive():
     # Тест архивации с исключением временных папок
     if not password or "":
         password = Archive_password
-    archive_path = manager.archive_data(
+    resume = input("Продолжить прерванный ZIP, если он есть? (y/N): ").strip().lower() == "y"
+
+    # Архивирование в фоне с прогрессом, Ctrl+C - отмена (недописанный ZIP без пароля можно продолжить)
+    job_queue = ArchiveJobQueue()
+    job = job_queue.submit_archive(
+        manager,
         archive_name="TestArchiveNameData",
         archive_type=Archive_type,
         archive_password=password,
-        exclude_dirs=["__pycache__", "temp", "logs", "BackData", ".venv", ".obsidian"]
+        exclude_dirs=["__pycache__", "temp", "logs", "BackData", ".venv", ".obsidian"],
+        resume=resume,
     )
-    print(f"Создан архив: {archive_path}")
+    status = print_progress(job)
+    job_queue.stop()
+    if status["State"] == "done":
+        print(f"Создан архив: {job.result}")
+    else:
+        print(f"Архив не создан: {status['State']} {status['Error'] or ''}")
 
 
 if __name__ == '__main__':
@@ -2,6 +2,18 @@ import os
 
 Archive_type = 'zip'
 Archive_password = '<P@S5W0rD>'
+# Потоков сжатия для ZIP без пароля: 0 - по числу ядер, 1 - последовательно
+Archive_workers = 0
+# Сжатие файлов ZIP (CompressionPolicy): 'adaptive' - по расширению, сигнатуре и пробному сжатию, 'deflate' - всё deflate
+Archive_compression = 'adaptive'
+# Уровень deflate для хорошо сжимаемых файлов
+Archive_compress_level = 6
+# Метод для хорошо сжимаемых файлов: 'deflate', 'bzip2' или 'lzma'
+Archive_strong_method = 'deflate'
+# Явные правила по расширению: {'.log': 'lzma', '.txt': 'deflate:9', '.exe': 'stored'}
+Archive_compression_rules = {}
+# Расширения, которые не сжимаются (дополнительно к встроенному списку уже сжатых форматов)
+Archive_stored_extensions = []
 
 FullTestDirectory = str(os.path.dirname(os.path.realpath(__file__))).replace('\\', '/') + '/TestApp'
 FullTemplateDataDirectory = str(os.path.dirname(os.path.realpath(__file__))).replace('\\', '/') + '/TemplateData'
@@ -0,0 +1,73 @@
+import os
+
+from TemplateProject.core.services.file_transaction import FileTransaction
+from TemplateProject.core.services.json_file_service import copy_json_data
+
+
+class DocumentCache:
+    """
+    Кэш json-документов одной директории: {название файла: (подпись файла, документ)}.
+    Подпись файла - (st_mtime_ns, st_size); если файл изменился на диске, запись считается устаревшей.
+    Документы хранятся и отдаются копиями, чтобы изменения у вызывающего кода не портили кэш.
+    """
+    __directories = {}
+
+    def __init__(self, full_directory: str):
+        self.full_directory = full_directory
+        self.__entries = {}
+
+    @classmethod
+    def for_directory(cls, full_directory: str):
+        """Один общий кэш на директорию - все JSONDataManager этой директории видят одни и те же данные."""
+        key = os.path.normcase(os.path.abspath(full_directory))
+        cache = cls.__directories.get(key)
+        if cache is None:
+            cache = cls(full_directory)
+            cls.__directories[key] = cache
+        return cache
+
+    @staticmethod
+    def file_signature(file_path: str):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, filename: str, file_path: str):
+        """
+        :return: Копия документа, если файл не менялся с момента последнего чтения/записи, иначе None
+        """
+        entry = self.__entries.get(filename)
+        if entry is None:
+            return None
+        signature, document = entry
+        if signature is None or signature != self.file_signature(file_path):
+            del self.__entries[filename]
+            return None
+        return copy_json_data(document)
+
+    def peek(self, filename: str, file_path: str):
+        """Как get, но без копирования - только для чтения внутри JSONDataManager."""
+        entry = self.__entries.get(filename)
+        if entry is None or entry[0] is None or entry[0] != self.file_signature(file_path):
+            self.__entries.pop(filename, None)
+            return None
+        return entry[1]
+
+    def put(self, filename: str, file_path: str, document: dict, copy=True):
+        """
+        :param copy: False - кэш забирает документ себе, вызывающий код больше не должен его изменять
+        """
+        if not isinstance(document, dict) or FileTransaction.current() is not None:
+            # Внутри транзакции файл на диске ещё старый - подпись не соответствует документу
+            self.__entries.pop(filename, None)
+            return
+        self.__entries[filename] = (self.file_signature(file_path),
+                                    copy_json_data(document) if copy else document)
+
+    def invalidate(self, filename: str | None = None):
+        if filename is None:
+            self.__entries.clear()
+        else:
+            self.__entries.pop(filename, None)
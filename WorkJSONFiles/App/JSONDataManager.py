@@ -1,95 +1,216 @@
+import functools
 import logging
 import os
+import threading
 
 from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.json_file_service import copy_json_data, deep_merge_dicts
+from TemplateProject.core.services.log_service import get_logger
+from WorkJSONFiles.App.DocumentCache import DocumentCache
+from WorkJSONFiles.settings import CompactJSONFiles
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def synchronized(method):
+    """Публичные методы JSONDataManager выполняются под его RLock - менеджер можно использовать из нескольких потоков."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class JSONDataManager:
     __OpenFile = None
     __load_data = None
     __filename = None
 
-    def __init__(self, full_directory: str):
-        self.logger = logging.getLogger("JSONDataManager")
+    def __init__(self, full_directory: str, compact_files: list[str] | None = None):
+        """
+        :param compact_files: Префиксы названий файлов, которые записываются без отступов
+                              (по умолчанию - CompactJSONFiles из settings)
+        """
+        self.logger = get_logger("JSONDataManager")
+        self.lock = threading.RLock()
 
         self.full_directory = full_directory
+        self.compact_files = tuple(CompactJSONFiles if compact_files is None else compact_files)
+        self.__cache = DocumentCache.for_directory(self.full_directory)
         if not os.path.exists(self.full_directory):
             # Если нет — создаём всю структуру директорий
             os.makedirs(self.full_directory, exist_ok=True)
-            self.logger.info(f"[📁] - JSONDataManager - __open_file - Директория создана: {self.full_directory}")
+            self.logger.info("[📁] - JSONDataManager - __open_file - Директория создана: %s", self.full_directory)
         else:
-            self.logger.info(f"✅ Директория существует: {self.full_directory}")
+            self.logger.info("✅ Директория существует: %s", self.full_directory)
 
-    def __open_file(self, filename):
+    def __open_file(self, filename, create=True):
+        """
+        :param create: False - не создавать пустой файл, если его нет (файл сразу будет перезаписан)
+        """
         filename = filename.replace(".json", "")
-        self.logger.info(f"[📁] - JSONDataManager - __open_file - Открываем файл с названием {filename}")
-        self.logger.info(
-            f"[if📁else] - JSONDataManager - __open_file - Условие - self.__OpenFile = {self.__OpenFile} is None or filename != {self.__filename}")
+        self.logger.info("[📁] - JSONDataManager - __open_file - Открываем файл с названием %s", filename)
+        self.logger.info("[if📁else] - JSONDataManager - __open_file - Условие - self.__OpenFile = %s is None or filename != %s", self.__OpenFile, self.__filename)
         if self.__OpenFile is None or filename != self.__filename:
-            self.logger.info(f"[if📁else] - JSONDataManager - __open_file - Условие соблюдено!")
+            self.logger.info("[if📁else] - JSONDataManager - __open_file - Условие соблюдено!")
             self.__filename = filename
-            self.logger.info(
-                f"[if📁else] - JSONDataManager - __open_file - Текущие параметры открытия: {self.full_directory, self.__filename}")
+            self.logger.info("[if📁else] - JSONDataManager - __open_file - Текущие параметры открытия: %s", (self.full_directory, self.__filename))
             self.__OpenFile = FileService(full_directory=self.full_directory, file_name=self.__filename,
-                                          file_extension="json")
-            if not self.__OpenFile.file_exists():
-                self.logger.info(f"[if📁else][if📁else] - JSONDataManager - __open_file - Файла не существует")
-                self.logger.info(f"...Создаём пустой файл...")
-                self.__OpenFile.create_file({})
-                self.logger.info(
-                    f"[✅][if📁else][if📁else] - JSONDataManager - __open_file - Файл {filename} успешно создан!")
-            else:
-                self.logger.info(f"[✅][if📁else][if📁else] - JSONDataManager - __open_file - Файл существует")
+                                          file_extension="json", compact=self.is_compact_file(filename))
+            if "/" in filename:
+                # Файл во вложенной директории: "StructureFileDataMain/GlobalProjectsData"
+                os.makedirs(os.path.dirname(self.__OpenFile.get_file_path()), exist_ok=True)
         else:
-            self.logger.info(
-                f"[if📁else] - JSONDataManager - __open_file - Файл {filename} уже открыт!")
+            self.logger.info("[if📁else] - JSONDataManager - __open_file - Файл %s уже открыт!", filename)
+        if create and not self.__OpenFile.file_exists():
+            self.logger.info("[if📁else][if📁else] - JSONDataManager - __open_file - Файла не существует")
+            self.logger.info("...Создаём пустой файл...")
+            self.__OpenFile.create_file({})
+            self.logger.info("[✅][if📁else][if📁else] - JSONDataManager - __open_file - Файл %s успешно создан!", filename)
+
+    @synchronized
+    def file_exists(self, filename) -> bool:
+        """Проверка наличия файла без создания пустого (в отличие от read_file)."""
+        filename = filename.replace(".json", "")
+        return FileService(full_directory=self.full_directory, file_name=filename, file_extension="json").file_exists()
+
+    def is_compact_file(self, filename) -> bool:
+        return filename.replace("\\", "/").startswith(self.compact_files)
 
     def __close_file(self):
-        self.logger.info(f"[📁] - JSONDataManager - __close_file - Закрываем файл, стираем сохранённые данные...")
+        self.logger.info("[📁] - JSONDataManager - __close_file - Закрываем файл, стираем сохранённые данные...")
         self.__OpenFile = None
         self.__load_data = None
         self.__filename = None
-        self.logger.info(f"[✅] - JSONDataManager - __close_file - Файл успешно закрыт, данные {self.__load_data} - стёрты!")
+        self.logger.info("[✅] - JSONDataManager - __close_file - Файл успешно закрыт, данные %s - стёрты!", self.__load_data)
+
+    def __cached_document(self, filename):
+        """
+        Документ открытого файла из кэша, а если файл изменился на диске - одно чтение с диска.
+        Возвращается без копирования, снаружи JSONDataManager его не отдавать.
+        """
+        file_path = self.__OpenFile.get_file_path()
+        document = self.__cache.peek(filename, file_path)
+        if document is None:
+            document = self.__OpenFile.read_file()[1]
+            self.__cache.put(filename, file_path, document, copy=False)
+        return document
 
-    def __safe_file(self, filename):
+    def __safe_file(self, filename, saved_data):
         filename = filename.replace(".json", "")
-        self.logger.info(f"[📁] - JSONDataManager - __safe_file - Сохраняем файл {filename}...")
-        cache_load_data = self.__load_data
-        self.read_file(filename)
-        cache_read_data = self.__load_data
-        if cache_load_data != cache_read_data:
-            self.__open_file(filename)
-            self.__OpenFile.append_file(cache_load_data)
-            self.read_file(filename)
-            self.logger.info(f"[✅] - JSONDataManager - __safe_file - Данные сохранены, текущие данные: {self.__load_data}")
-        self.logger.info(f"[✅] - JSONDataManager - __safe_file - Данные совпадают, сохранение не требуется.")
+        self.logger.info("[📁] - JSONDataManager - __safe_file - Сохраняем файл %s...", filename)
+        if self.__load_data != saved_data:
+            self.__OpenFile.write_file(self.__load_data)
+            self.__cache.put(filename, self.__OpenFile.get_file_path(), self.__load_data, copy=False)
+            self.logger.info("[✅] - JSONDataManager - __safe_file - Данные сохранены, текущие данные: %s", self.__load_data)
+        else:
+            self.logger.info("[✅] - JSONDataManager - __safe_file - Данные совпадают, сохранение не требуется.")
 
+    @synchronized
     def read_file(self, filename) -> dict:
         try:
             filename = filename.replace(".json", "")
         except AttributeError:
             filename = list(filename)[0].replace(".json", "")
-        self.logger.info(f"[📁] - JSONDataManager - read_file - Читаем файл с названием {filename}")
+        self.logger.info("[📁] - JSONDataManager - read_file - Читаем файл с названием %s", filename)
         self.__open_file(filename)
-        self.__load_data = self.__OpenFile.read_file()[1]
-        self.logger.info(f"[✅] - JSONDataManager - read_file - Данные из файла успешно получены {self.__load_data}")
+        document = self.__cached_document(filename)
+        self.__load_data = copy_json_data(document) if isinstance(document, dict) else document
+        self.logger.info("[✅] - JSONDataManager - read_file - Данные из файла успешно получены %s", self.__load_data)
         return self.__load_data
 
+    def __merge_data(self, filename, data):
+        """
+        Объединяет data с текущим содержимым файла (из кэша).
+        :return: (сохранённые данные, объединённые данные)
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Content for JSON files must be a dictionary.")
+        self.__open_file(filename)
+        saved_data = self.__cached_document(filename)
+        if not isinstance(saved_data, dict):
+            saved_data = {}
+        merged_data = copy_json_data(saved_data)
+        deep_merge_dicts(merged_data, copy_json_data(data))
+        return saved_data, merged_data
+
+    @synchronized
     def write_data(self, filename, data):
+        """
+        Объединяет data с текущим содержимым файла (как FileService.append_file) и сохраняет результат
+        одной записью. Текущее содержимое берётся из кэша, повторных чтений файла нет.
+        """
         filename = filename.replace(".json", "")
-        self.logger.info(f"[📁] - JSONDataManager - write_data - Записываем новые данные: {data}")
-        self.__open_file(filename)
-        self.__load_data = data
-        self.__safe_file(filename)
-        self.logger.info(f"[✅] - JSONDataManager - write_data - Запись прошла успешно! Новые данные: {self.__load_data}")
+        self.logger.info("[📁] - JSONDataManager - write_data - Записываем новые данные: %s", data)
+        saved_data, self.__load_data = self.__merge_data(filename, data)
+        self.__safe_file(filename, saved_data)
+        self.logger.info("[✅] - JSONDataManager - write_data - Запись прошла успешно! Новые данные: %s", self.__load_data)
+
+    def __replace_data(self, filename, data):
+        """
+        Данные для полной перезаписи файла без чтения с диска.
+        :return: Данные для записи или None, если в кэше уже лежат такие же
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Content for JSON files must be a dictionary.")
+        self.__open_file(filename, create=False)
+        if self.__cache.peek(filename, self.__OpenFile.get_file_path()) == data:
+            return None
+        return copy_json_data(data)
+
+    @synchronized
+    def write_many_data(self, files_data: dict, fsync=True, merge=True):
+        """
+        Как write_data, но для нескольких файлов сразу: все изменившиеся файлы записываются
+        атомарно одной пачкой с одним барьером fsync.
+
+        :param files_data: {название файла: данные, ...}
+        :param fsync: True - дождаться записи всей пачки на диск
+        :param merge: False - данные полностью заменяют содержимое файлов, файлы с диска не читаются
+        :return: Список названий файлов, которые были записаны
+        """
+        self.logger.info("[📁] - JSONDataManager - write_many_data - Записываем файлы: %s", list(files_data))
+        changed_files = []
+        for filename, data in files_data.items():
+            filename = filename.replace(".json", "")
+            if merge:
+                saved_data, new_data = self.__merge_data(filename, data)
+                if new_data == saved_data:
+                    continue
+            else:
+                new_data = self.__replace_data(filename, data)
+                if new_data is None:
+                    continue
+            changed_files.append((filename, self.__OpenFile, new_data))
+
+        if changed_files:
+            FileService.write_many_files([(file, data) for _, file, data in changed_files], fsync=fsync)
+            for filename, file, data in changed_files:
+                self.__cache.put(filename, file.get_file_path(), data, copy=False)
+        self.logger.info("[✅] - JSONDataManager - write_many_data - Записано файлов: %s", len(changed_files))
+        return [filename for filename, _, _ in changed_files]
 
+    @synchronized
     def delete_file(self, filename):
         filename = filename.replace(".json", "")
-        self.logger.info(f"[📁] - JSONDataManager - delete_file - Удаление файла {filename} ...")
+        self.logger.info("[📁] - JSONDataManager - delete_file - Удаление файла %s ...", filename)
         self.__open_file(filename)
         self.__OpenFile.delete_file()
-        self.logger.info(f"[✅] - JSONDataManager - delete_file - Файл {filename} успешно удалён!")
+        self.__cache.invalidate(filename)
+        self.logger.info("[✅] - JSONDataManager - delete_file - Файл %s успешно удалён!", filename)
+        self.__close_file()
+
+    @synchronized
+    def retire_file(self, filename, suffix="migrated"):
+        """
+        Выводит файл из работы: <файл>.json переименовывается в <файл>.json.<suffix>.
+        Данные остаются на диске, но read_file их больше не видит.
+        """
+        filename = filename.replace(".json", "")
+        file_path = FileService(full_directory=self.full_directory, file_name=filename,
+                                file_extension="json").get_file_path()
+        self.logger.info("[📁] - JSONDataManager - retire_file - Переименование файла %s в .%s ...", filename, suffix)
+        os.replace(file_path, f"{file_path}.{suffix}")
+        self.__cache.invalidate(filename)
         self.__close_file()
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from WorkJSONFiles.api import apiFilesService
+
+
+class TestJSONDataManager(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.JSONFiles = apiFilesService(self.testDir)
+
+    def tearDown(self):
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def test_read_empty_file(self):
+        self.assertEqual(self.JSONFiles.read_file("UserFile"), {})
+        self.assertTrue(os.path.exists(self.testDir + "/UserFile.json"))
+
+    def test_write_data_merge(self):
+        self.JSONFiles.write_data("UserFile", {"User": {"FirstName": "Test"}, "Tags": ["1"]})
+        self.JSONFiles.write_data("UserFile", {"User": {"LastName": "Testov"}})
+        self.assertEqual(self.JSONFiles.read_file("UserFile"),
+                         {"User": {"FirstName": "Test", "LastName": "Testov"}, "Tags": ["1"]})
+
+    def test_read_file_returns_copy(self):
+        """Изменение прочитанных данных не должно менять кэш"""
+        self.JSONFiles.write_data("UserFile", {"User": {"FirstName": "Test"}})
+        data = self.JSONFiles.read_file("UserFile")
+        data["User"]["FirstName"] = "Changed"
+        self.assertEqual(self.JSONFiles.read_file("UserFile"), {"User": {"FirstName": "Test"}})
+
+    def test_write_data_keeps_caller_data(self):
+        """Изменение переданных в write_data данных после записи не должно менять кэш"""
+        data = {"Data": [{"ID": "1"}]}
+        self.JSONFiles.write_data("UserFile", data)
+        data["Data"].append({"ID": "2"})
+        self.assertEqual(self.JSONFiles.read_file("UserFile"), {"Data": [{"ID": "1"}]})
+
+    def test_external_change_invalidates_cache(self):
+        self.JSONFiles.write_data("UserFile", {"User": "Test"})
+        with open(self.testDir + "/UserFile.json", "w", encoding="utf-8") as file:
+            json.dump({"User": "External", "Extra": True}, file)
+        self.assertEqual(self.JSONFiles.read_file("UserFile"), {"User": "External", "Extra": True})
+
+    def test_write_many_data(self):
+        self.JSONFiles.write_data("UserFile", {"User": "Test"})
+        written = self.JSONFiles.write_many_data({"UserFile": {"User": "Test"}, "ProfileFile": {"Profile": "Test"}})
+        self.assertEqual(written, ["ProfileFile"])
+        self.assertEqual(self.JSONFiles.read_file("ProfileFile"), {"Profile": "Test"})
+
+    def test_delete_file(self):
+        self.JSONFiles.write_data("UserFile", {"User": "Test"})
+        self.JSONFiles.delete_file("UserFile")
+        self.assertFalse(os.path.exists(self.testDir + "/UserFile.json"))
+        self.assertEqual(self.JSONFiles.read_file("UserFile"), {})
+
+    def test_compact_files(self):
+        JSONFiles = apiFilesService(self.testDir)
+        JSONFiles.compact_files = ("ChunksData",)
+        JSONFiles.write_data("ChunksData", {"DataChunks": [{"ID": "1"}]})
+        JSONFiles.write_data("UserFile", {"User": "Test"})
+        with open(self.testDir + "/ChunksData.json", encoding="utf-8") as file:
+            self.assertNotIn("\n", file.read())
+        with open(self.testDir + "/UserFile.json", encoding="utf-8") as file:
+            self.assertIn("\n", file.read())
+        self.assertEqual(JSONFiles.read_file("ChunksData"), {"DataChunks": [{"ID": "1"}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
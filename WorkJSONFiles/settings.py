@@ -1,3 +1,7 @@
 import os
 
 FullTestDirectory = str(os.path.dirname(os.path.realpath(__file__))).replace('\\', '/') + '/TestApp/dir_is_none'
+
+# Файлы (префиксы путей относительно директории JSONDataManager), которые читает только программа -
+# они записываются без отступов
+CompactJSONFiles = ["chunks_ge-0n_data/"]
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+
+
+class AutoSaveManager:
+    """
+    Фоновое автосохранение по настройкам AutoSave / AutoSaveIntervalMinutes из MAIN_DATA.
+
+    request_save() вызывается из потока интерфейса (таймер, правка данных): там снимается копия
+    изменённых данных (StructureManager.snapshot_changes) - это быстро и не требует синхронизации с моделью.
+    Сериализация и запись выполняются в рабочем потоке. Запросы, пришедшие в течение debounce_seconds,
+    объединяются в одну запись: последние данные файла заменяют предыдущие.
+
+    Ручное сохранение при работающем AutoSaveManager - тоже через него (request_save(immediate=True)):
+    все записи идут из одного потока в порядке снимков, и снимок, снятый раньше, не перезапишет более новые данные.
+
+    :param iPM: StructureManager()
+    :param interval_minutes: Интервал автосохранения (используется таймером интерфейса)
+    :param debounce_seconds: Сколько ждать новых правок перед записью
+    """
+    DEFAULT_INTERVAL_MINUTES = 5
+
+    def __init__(self, iPM, interval_minutes: float = DEFAULT_INTERVAL_MINUTES, debounce_seconds: float = 2.0):
+        self.logger = logging.getLogger("AutoSaveManager")
+        self.iPM = iPM
+        self.interval_minutes = interval_minutes
+        self.debounce_seconds = debounce_seconds
+        self.metrics = {"saves": 0, "coalesced": 0, "failures": 0, "files": 0,
+                        "last_duration": 0.0, "max_duration": 0.0, "total_duration": 0.0, "last_error": None}
+        self.__condition = threading.Condition()
+        self.__pending = None
+        self.__requested_at = 0.0
+        self.__immediate = False
+        self.__saving = False
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__run, name="AutoSaveManager", daemon=True)
+        self.__thread.start()
+
+    @classmethod
+    def from_main_data(cls, iPM, **kwargs):
+        """
+        :return: AutoSaveManager, если в MAIN_DATA включено AutoSave, иначе None
+        """
+        if str(iPM.MAIN_DATA.get("AutoSave", "False")).lower() != "true":
+            return None
+        try:
+            interval_minutes = float(iPM.MAIN_DATA.get("AutoSaveIntervalMinutes") or cls.DEFAULT_INTERVAL_MINUTES)
+        except ValueError:
+            interval_minutes = cls.DEFAULT_INTERVAL_MINUTES
+        return cls(iPM, interval_minutes=max(interval_minutes, 0.1), **kwargs)
+
+    def interval_ms(self) -> int:
+        return int(self.interval_minutes * 60 * 1000)
+
+    def request_save(self, immediate=False) -> bool:
+        """
+        Снимает копию изменённых данных и ставит её в очередь записи. Вызывается из потока интерфейса.
+        :param immediate: True - записать без ожидания debounce_seconds (ручное сохранение)
+        :return: False - изменений нет
+        """
+        snapshot = self.iPM.snapshot_changes()
+        if not snapshot["files_data"] and not snapshot["removed_files"]:
+            return False
+        with self.__condition:
+            if self.__pending is None:
+                self.__pending = snapshot
+            else:
+                # Более поздний снимок важнее: файл, удалённый после правки, не записывается, и наоборот
+                for filename in snapshot["removed_files"]:
+                    self.__pending["files_data"].pop(filename, None)
+                self.__pending["removed_files"] = [filename for filename in self.__pending["removed_files"]
+                                                   if filename not in snapshot["files_data"]]
+                self.__pending["files_data"].update(snapshot["files_data"])
+                self.__pending["removed_files"].extend(snapshot["removed_files"])
+                self.__pending["dirty_names"].extend(snapshot["dirty_names"])
+                self.metrics["coalesced"] += 1
+            self.__requested_at = time.monotonic()
+            self.__immediate = self.__immediate or immediate
+            self.__condition.notify()
+        return True
+
+    def __take_pending(self):
+        """Ждёт запрос и паузу debounce_seconds после последней правки. :return: снимок или None при остановке"""
+        with self.__condition:
+            while True:
+                if self.__pending is not None:
+                    wait = self.__requested_at + self.debounce_seconds - time.monotonic()
+                    if wait <= 0 or self.__stopped or self.__immediate:
+                        snapshot, self.__pending = self.__pending, None
+                        self.__immediate = False
+                        self.__saving = True
+                        return snapshot
+                    self.__condition.wait(wait)
+                elif self.__stopped:
+                    return None
+                else:
+                    self.__condition.wait()
+
+    def __run(self):
+        while True:
+            snapshot = self.__take_pending()
+            if snapshot is None:
+                return
+            start = time.perf_counter()
+            try:
+                written = self.iPM.write_snapshot(snapshot)
+                self.metrics["files"] += len(written)
+                self.metrics["saves"] += 1
+            except Exception as e:
+                self.metrics["failures"] += 1
+                self.metrics["last_error"] = repr(e)
+                self.logger.exception(f"[!!] - AutoSaveManager - __run - Ошибка автосохранения: {e}")
+            finally:
+                duration = time.perf_counter() - start
+                self.metrics["last_duration"] = duration
+                self.metrics["max_duration"] = max(self.metrics["max_duration"], duration)
+                self.metrics["total_duration"] += duration
+                with self.__condition:
+                    self.__saving = False
+                    self.__condition.notify_all()
+            self.logger.info(f"[✅] - AutoSaveManager - __run - Автосохранение за {duration * 1000:.1f} мс")
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Ждёт, пока очередь записи опустеет. :return: False - не дождались за timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            while self.__pending is not None or self.__saving:
+                wait = None if deadline is None else deadline - time.monotonic()
+                if wait is not None and wait <= 0:
+                    return False
+                self.__condition.wait(wait)
+        return True
+
+    def average_duration(self) -> float:
+        return self.metrics["total_duration"] / self.metrics["saves"] if self.metrics["saves"] else 0.0
+
+    def stop(self, flush=True):
+        """
+        Останавливает рабочий поток. :param flush: True - сохранить последние изменения перед остановкой
+        """
+        if flush:
+            self.request_save()
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+        self.__thread.join()
@@ -0,0 +1,200 @@
+import logging
+import os
+import sys
+
+from TemplateProject.core.services.json_file_service import copy_json_data
+
+
+class ChunkStorage:
+    """
+    Хранение Структурного Файла по частям - каждый чанк в отдельном файле, чтобы при запуске
+    читать только то, что нужно для первого окна:
+
+        <MainStructureFile>/Manifest.json           {"Version": 1, "DataChunks": ["GlobalProjectsData", ...]}
+        <MainStructureFile>/<Чанк>.json             {"<Чанк>": [...]}
+        <MainStructureFile>/GlobalProjectsData/<GlobalProjectID>.json
+                                                    {"GlobalProjectProjectsData": [...]} - проекты одного
+                                                    Глобального Проекта, в файле чанка их нет
+
+    В памяти незагруженный чанк хранится как {"<Чанк>": None}, а незагруженные проекты Глобального
+    Проекта - как "GlobalProjectProjectsData": None.
+    """
+    VERSION = 1
+    MANIFEST_FILE = "Manifest"
+    GLOBAL_PROJECTS_CHUNK = "GlobalProjectsData"
+    PROJECTS_KEY = "GlobalProjectProjectsData"
+
+    def __init__(self, MainIFS, structure_file: str):
+        self.logger = logging.getLogger("ChunkStorage")
+        self.MainIFS = MainIFS
+        self.structure_file = structure_file
+
+    def manifest_file(self) -> str:
+        return f"{self.structure_file}/{self.MANIFEST_FILE}"
+
+    def chunk_file(self, chunk_name: str) -> str:
+        return f"{self.structure_file}/{chunk_name}"
+
+    def projects_file(self, globalProjectID) -> str:
+        return f"{self.structure_file}/{self.GLOBAL_PROJECTS_CHUNK}/{globalProjectID}"
+
+    @classmethod
+    def projects_dirty_name(cls, globalProjectID) -> str:
+        """Название для mark_dirty: изменены проекты одного Глобального Проекта"""
+        return f"{cls.GLOBAL_PROJECTS_CHUNK}/{globalProjectID}"
+
+    def exists(self) -> bool:
+        return self.MainIFS.file_exists(self.manifest_file())
+
+    def read_manifest(self) -> dict:
+        return self.MainIFS.read_file(self.manifest_file())
+
+    def lazy_structure_data(self) -> dict:
+        """:return: MAIN_STRUCTURE_DATA, в котором ни один чанк ещё не загружен"""
+        return {"DataChunks": [{chunk_name: None} for chunk_name in self.read_manifest().get("DataChunks", [])]}
+
+    def read_chunk(self, chunk_name: str) -> list[dict]:
+        self.logger.info(f"[🡻] - ChunkStorage - read_chunk - Загрузка чанка {chunk_name}")
+        chunk = self.MainIFS.read_file(self.chunk_file(chunk_name)).get(chunk_name, [])
+        if chunk_name == self.GLOBAL_PROJECTS_CHUNK:
+            for globalProject in chunk:
+                globalProject.setdefault(self.PROJECTS_KEY, None)
+        return chunk
+
+    def read_projects(self, globalProjectID) -> list[dict]:
+        self.logger.info(f"[🡻] - ChunkStorage - read_projects - Загрузка проектов Глобального Проекта {globalProjectID}")
+        return self.MainIFS.read_file(self.projects_file(globalProjectID)).get(self.PROJECTS_KEY, [])
+
+    def chunk_content(self, chunk_name: str, chunk: list[dict]) -> dict:
+        """Содержимое файла чанка. Проекты Глобальных Проектов в него не входят."""
+        if chunk_name == self.GLOBAL_PROJECTS_CHUNK:
+            chunk = [{key: value for key, value in globalProject.items() if key != self.PROJECTS_KEY}
+                     for globalProject in chunk]
+        return {chunk_name: chunk}
+
+    def files_data(self, structure_data: dict, dirty_names, full=False) -> tuple[dict, list[str]]:
+        """
+        Файлы для записи изменённых частей структуры.
+
+        :param structure_data: MAIN_STRUCTURE_DATA
+        :param dirty_names: Названия изменённых чанков и projects_dirty_name(ID) изменённых проектов
+        :param full: True - записывается вся структура, манифест перезаписывается
+        :return: ({файл: содержимое}, [файлы проектов удалённых Глобальных Проектов])
+        """
+        dirty_names = set(dirty_names)
+        chunks = {chunk_name: chunk for data_chunk in structure_data["DataChunks"]
+                  for chunk_name, chunk in data_chunk.items()}
+        files_data = {}
+        removed_files = []
+        for chunk_name, chunk in chunks.items():
+            if chunk_name in dirty_names and chunk is not None:
+                files_data[self.chunk_file(chunk_name)] = self.chunk_content(chunk_name, chunk)
+
+        globalProjects = {str(globalProject["GlobalProjectID"]): globalProject
+                          for globalProject in chunks.get(self.GLOBAL_PROJECTS_CHUNK) or []}
+        prefix = self.projects_dirty_name("")
+        for name in dirty_names:
+            if not name.startswith(prefix):
+                continue
+            globalProjectID = name[len(prefix):]
+            globalProject = globalProjects.get(globalProjectID)
+            if globalProject is None:
+                removed_files.append(self.projects_file(globalProjectID))
+            elif globalProject.get(self.PROJECTS_KEY) is not None:
+                files_data[self.projects_file(globalProjectID)] = {self.PROJECTS_KEY: globalProject[self.PROJECTS_KEY]}
+
+        if files_data and (full or not self.exists()):
+            files_data[self.manifest_file()] = {"Version": self.VERSION, "DataChunks": list(chunks)}
+        return files_data, removed_files
+
+    def all_dirty_names(self, structure_data: dict) -> list[str]:
+        """Все загруженные части структуры - для полной записи"""
+        names = []
+        for data_chunk in structure_data["DataChunks"]:
+            for chunk_name, chunk in data_chunk.items():
+                if chunk is None:
+                    continue
+                names.append(chunk_name)
+                if chunk_name == self.GLOBAL_PROJECTS_CHUNK:
+                    names.extend(self.projects_dirty_name(globalProject["GlobalProjectID"]) for globalProject in chunk
+                                 if globalProject.get(self.PROJECTS_KEY) is not None)
+        return names
+
+    def write(self, structure_data: dict, dirty_names=None):
+        """
+        Записывает части структуры одной пачкой и удаляет файлы проектов удалённых Глобальных Проектов.
+        :param dirty_names: None - записать все загруженные части
+        """
+        full = dirty_names is None
+        if full:
+            dirty_names = self.all_dirty_names(structure_data)
+        files_data, removed_files = self.files_data(structure_data, dirty_names, full=full)
+        written = self.MainIFS.write_many_data(files_data, merge=False) if files_data else []
+        for filename in removed_files:
+            if self.MainIFS.file_exists(filename):
+                self.MainIFS.delete_file(filename)
+        return written
+
+    def full_structure_data(self, structure_data: dict) -> dict:
+        """:return: Полная копия структуры в прежнем формате одного файла (все чанки и проекты загружаются)"""
+        data_chunks = []
+        for data_chunk in structure_data["DataChunks"]:
+            for chunk_name, chunk in data_chunk.items():
+                if chunk is None:
+                    chunk = self.read_chunk(chunk_name)
+                chunk = copy_json_data(chunk)
+                if chunk_name == self.GLOBAL_PROJECTS_CHUNK:
+                    for globalProject in chunk:
+                        if globalProject.get(self.PROJECTS_KEY) is None:
+                            globalProject[self.PROJECTS_KEY] = self.read_projects(globalProject["GlobalProjectID"])
+                data_chunks.append({chunk_name: chunk})
+        return {"DataChunks": data_chunks}
+
+    def migrate(self, structure_data: dict):
+        """
+        Перенос структуры из одного файла в раскладку по чанкам.
+        Манифест записывается в той же пачке - если запись прервётся, при следующем запуске перенос повторится.
+        После записи исходный файл переименовывается в <Структурный Файл>.json.migrated, чтобы при
+        отсутствии манифеста (например, после удаления структуры) старые данные не перенеслись снова.
+        """
+        self.logger.info(f"[!!] - ChunkStorage - migrate - Перенос {self.structure_file} в раздельные файлы чанков")
+        written = self.write(structure_data)
+        if self.MainIFS.file_exists(self.structure_file):
+            self.MainIFS.retire_file(self.structure_file)
+        return written
+
+    def delete(self):
+        """
+        Удаляет манифест, файлы чанков и проектов Глобальных Проектов.
+        Манифест удаляется первым - прерванное удаление не оставляет структуру, которая выглядит целой.
+        """
+        self.logger.info(f"[!!] - ChunkStorage - delete - Удаление файлов чанков {self.structure_file}")
+        chunk_names = self.read_manifest().get("DataChunks", []) if self.exists() else []
+        files = [self.manifest_file()] + [self.chunk_file(chunk_name) for chunk_name in chunk_names]
+        projects_directory = os.path.join(self.MainIFS.full_directory, self.structure_file, self.GLOBAL_PROJECTS_CHUNK)
+        if os.path.isdir(projects_directory):
+            files.extend(self.projects_file(os.path.splitext(name)[0]) for name in sorted(os.listdir(projects_directory))
+                         if name.endswith(".json"))
+        for filename in files:
+            if self.MainIFS.file_exists(filename):
+                self.MainIFS.delete_file(filename)
+
+
+def migrate_structure_file(full_directory: str, structure_file: str = "StructureFileDataMain") -> list[str]:
+    """
+    Инструмент переноса: python -m WorkProjectManager.App.ChunkStorage <директория данных> [<Структурный Файл>]
+    :return: Список записанных файлов
+    """
+    from WorkJSONFiles.api import apiFilesService
+
+    MainIFS = apiFilesService(full_directory)
+    storage = ChunkStorage(MainIFS, structure_file)
+    if storage.exists():
+        raise FileExistsError(f"Структура уже разделена на чанки: {storage.manifest_file()}")
+    if not MainIFS.file_exists(structure_file):
+        raise FileNotFoundError(f"Не найден Структурный Файл: {structure_file}")
+    return storage.migrate(MainIFS.read_file(structure_file))
+
+
+if __name__ == '__main__':
+    print(migrate_structure_file(*sys.argv[1:3]))
@@ -1,3 +1,5 @@
+from WorkProjectManager.App.ChunkStorage import ChunkStorage
+from WorkProjectManager.App.ListIndex import ListIndex
 from WorkProjectManager.App.WorkChunksAndFiles import StructureChunksDataManager
 from WorkProjectManager.AppData.schemas import GLOBAL_PROJECT_STRUCTURE_DATA, GLOBAL_PROJECT_PROJECT_STRUCTURE_DATA
 
@@ -11,19 +13,22 @@ class StructureGlobalProjectsDataManager(StructureChunksDataManager):
 
     def __init__(self, MainIFS):
         super().__init__(MainIFS)
+        self.globalProjectsIndex = ListIndex("GlobalProjectID")
 
     def load_global_projects_data(self) -> dict or None:
         self.globalProjectsList: list[dict] = self.get_chunk_data("GlobalProjectsData")
+        self.globalProjectsIndex.bind(self.globalProjectsList)
 
     def get_global_project_data(self, globalProjectID: int) -> dict:
         """
         :param globalProjectID: int
         :return: {"indexGlobalProject": iD, "dataGlobalProject": globalProject}
         """
-        for iD, globalProject in enumerate(self.globalProjectsList):
-            if str(globalProject["GlobalProjectID"]) == str(globalProjectID):
-                return {"indexGlobalProject": iD, "dataGlobalProject": globalProject}
-        raise KeyError("Не был найден не один релевантный проект...")
+        try:
+            iD = self.globalProjectsIndex.find(self.globalProjectsList, globalProjectID)
+        except KeyError:
+            raise KeyError("Не был найден не один релевантный проект...")
+        return {"indexGlobalProject": iD, "dataGlobalProject": self.globalProjectsList[iD]}
 
     def get_last_global_project_id(self) -> int:
         try:
@@ -47,13 +52,16 @@ class InterfaceGlobalProjectsDataManager(StructureGlobalProjectsDataManager):
         newData["GlobalProjectID"] = str(self.get_last_global_project_id() + 1)
         newData["GlobalProjectName"] = globalProjectName
         newData["GlobalProjectDescription"] = globalProjectDescription
-        self.globalProjectsList.append(newData)
+        newData["GlobalProjectProjectsData"] = []
+        self.globalProjectsIndex.append(self.globalProjectsList, newData)
+        self.mark_dirty("GlobalProjectsData", ChunkStorage.projects_dirty_name(newData["GlobalProjectID"]))
 
     def edit_global_project_data(self, globalProjectID: int, key: str, value: str):
         if key != "GlobalProjectProjectsData":
             if key != "GlobalProjectID":
                 editData: dict = self.get_global_project_data(globalProjectID)["dataGlobalProject"]
                 editData[key] = value
+                self.mark_dirty("GlobalProjectsData")
             else:
                 raise ValueError("Ключ 'GlobalProjectID' запрещено редактировать!")
         else:
@@ -61,7 +69,9 @@ class InterfaceGlobalProjectsDataManager(StructureGlobalProjectsDataManager):
 
     def delete_global_project_data(self, globalProjectID: int):
         delData: dict = self.get_global_project_data(globalProjectID)
-        self.globalProjectsList.pop(delData["indexGlobalProject"])
+        self.globalProjectsIndex.pop(self.globalProjectsList, delData["indexGlobalProject"])
+        self.mark_dirty("GlobalProjectsData",
+                        ChunkStorage.projects_dirty_name(delData["dataGlobalProject"]["GlobalProjectID"]))
 
 
 class StructureGlobalProjectProjectsDataManager(StructureGlobalProjectsDataManager):
@@ -75,27 +85,28 @@ class StructureGlobalProjectProjectsDataManager(StructureGlobalProjectsDataManag
 
     def __init__(self, MainIFS):
         super().__init__(MainIFS)
-
+        self.projectsIndex = ListIndex("ProjectID")
 
     def load_projects_data(self, globalProjectID: int):
         self.logger.info(f"[🡻] - StructureGlobalProjectProjectsDataManager - load_projects_data - Начало -> Получение данных проекта по globalProjectID")
         self.currentGlobalProject = globalProjectID
-        self.globalProjectProjectsList: list[dict] = self.get_global_project_data(globalProjectID)[
-            "dataGlobalProject"]["GlobalProjectProjectsData"]
+        globalProject: dict = self.get_global_project_data(globalProjectID)["dataGlobalProject"]
+        if globalProject["GlobalProjectProjectsData"] is None:
+            # Проекты Глобального Проекта хранятся в отдельном файле и читаются при первом открытии
+            globalProject["GlobalProjectProjectsData"] = self.chunkStorage.read_projects(globalProjectID)
+        self.globalProjectProjectsList: list[dict] = globalProject["GlobalProjectProjectsData"]
         self.logger.info(f"[✅] - StructureGlobalProjectProjectsDataManager - load_projects_data - Данные загружены")
 
     def get_project_data(self, globalProjectProjectID: int) -> dict:
         self.logger.info(f"[🡻] - StructureGlobalProjectProjectsDataManager - get_project_data - Начало -> Получение данных проекта по globalProjectProjectID")
-        for iD, globalProjectProject in enumerate(self.globalProjectProjectsList):
-            self.logger.info(f"[🡻][if!!else] - StructureGlobalProjectProjectsDataManager - get_project_data - Условие -> str(globalProjectProject[ProjectID]) == str(globalProjectProjectID)")
-            if str(globalProjectProject["ProjectID"]) == str(globalProjectProjectID):
-                self.logger.info(f"[🡻][if!!else] - StructureGlobalProjectProjectsDataManager - get_project_data - Истина -> self.currentProject = globalProjectProjectID")
-                self.currentProject = globalProjectProjectID
-                self.logger.info(f"[✅][if!!else] - StructureGlobalProjectProjectsDataManager - get_project_data - Истина -> Возврат данных!")
-                return {"indexGlobalProjectProject": iD, "dataGlobalProjectProject": globalProjectProject}
-            self.logger.info(f"[🡻]... - StructureGlobalProjectProjectsDataManager - get_project_data - Продолжение или конец Цикла")
-        self.logger.info(f"[✅] - StructureGlobalProjectProjectsDataManager - get_project_data - Конец, вызов ошибки!")
-        raise KeyError("Не был найден не один релевантный проект...")
+        try:
+            iD = self.projectsIndex.find(self.globalProjectProjectsList, globalProjectProjectID)
+        except KeyError:
+            self.logger.info(f"[✅] - StructureGlobalProjectProjectsDataManager - get_project_data - Проект не найден, вызов ошибки!")
+            raise KeyError("Не был найден не один релевантный проект...")
+        self.currentProject = globalProjectProjectID
+        self.logger.info(f"[✅] - StructureGlobalProjectProjectsDataManager - get_project_data - Возврат данных!")
+        return {"indexGlobalProjectProject": iD, "dataGlobalProjectProject": self.globalProjectProjectsList[iD]}
 
     def get_last_project_id(self) -> int:
         try:
@@ -120,13 +131,15 @@ class InterfaceGlobalProjectProjectsDataManager(StructureGlobalProjectProjectsDa
         newData["ProjectName"] = projectName
         newData["ProjectType"] = projectType
         newData["ProjectDescription"] = projectDescription
-        self.globalProjectProjectsList.append(newData)
+        self.projectsIndex.append(self.globalProjectProjectsList, newData)
+        self.mark_dirty(ChunkStorage.projects_dirty_name(self.currentGlobalProject))
 
     def edit_project_data(self, ProjectID: int, key: str, value: str or dict or list[dict]):
         if key != "ProjectData":
             if key != "ProjectID":
                 editData: dict = self.get_project_data(ProjectID)["dataGlobalProjectProject"]
                 editData[key] = value
+                self.mark_dirty(ChunkStorage.projects_dirty_name(self.currentGlobalProject))
             else:
                 raise ValueError("Ключ 'ProjectID' запрещено редактировать!")
         else:
@@ -134,4 +147,5 @@ class InterfaceGlobalProjectProjectsDataManager(StructureGlobalProjectProjectsDa
 
     def delete_project_data(self, projectID: int):
         delData: dict = self.get_project_data(projectID)
-        self.globalProjectProjectsList.pop(delData["indexGlobalProjectProject"])
+        self.projectsIndex.pop(self.globalProjectProjectsList, delData["indexGlobalProjectProject"])
+        self.mark_dirty(ChunkStorage.projects_dirty_name(self.currentGlobalProject))
@@ -0,0 +1,90 @@
+from bisect import bisect_left, insort
+
+
+class ListIndex:
+    """
+    Хэш-индекс списка словарей: {str(ID): позиция в списке}.
+
+    Список остаётся источником истины - индекс только ускоряет поиск. Каждая найденная позиция проверяется,
+    поэтому если список изменили в обход индекса (или подменили целиком), индекс перестраивается.
+    При повторяющихся ID находится первый элемент, как при линейном поиске.
+
+    Удаление не пересчитывает позиции всех следующих элементов: в индексе хранятся позиции на момент
+    построения, а удалённые позиции копятся в отсортированном списке removed. Текущая позиция =
+    сохранённая - количество удалённых перед ней (bisect). Когда удалённых становится много - полная перестройка.
+
+    :param key: Название ключа с ID ("GlobalProjectID") или функция, возвращающая ID элемента
+    """
+
+    def __init__(self, key):
+        self.key = key if callable(key) else (lambda item: item[key])
+        self.items = None
+        self.positions: dict[str, int] = {}
+        self.removed: list[int] = []
+        self.next_position = 0
+
+    def bind(self, items: list[dict]):
+        self.items = items
+        self.rebuild()
+
+    def rebuild(self):
+        self.positions = {}
+        self.removed = []
+        for position, item in enumerate(self.items or []):
+            self.positions.setdefault(str(self.key(item)), position)
+        self.next_position = len(self.items or [])
+
+    def __position(self, itemID: str):
+        """:return: Текущая позиция элемента по индексу (без проверки) или None"""
+        position = self.positions.get(itemID)
+        if position is None or not self.removed:
+            return position
+        return position - bisect_left(self.removed, position)
+
+    def __is_item(self, position, itemID: str) -> bool:
+        try:
+            return position is not None and str(self.key(self.items[position])) == itemID
+        except (IndexError, KeyError):
+            return False
+
+    def find(self, items: list[dict], itemID) -> int:
+        """
+        :return: Позиция элемента с ID itemID в items
+        :raise: KeyError - если элемента нет
+        """
+        if items is not self.items:
+            self.bind(items)
+        itemID = str(itemID)
+        position = self.__position(itemID)
+        if self.__is_item(position, itemID):
+            return position
+        # Промах или устаревшая позиция - список меняли в обход индекса
+        self.rebuild()
+        position = self.positions.get(itemID)
+        if position is None:
+            raise KeyError(itemID)
+        return position
+
+    def append(self, items: list[dict], item: dict):
+        """Добавляет item в конец items и в индекс."""
+        if items is not self.items:
+            self.bind(items)
+        items.append(item)
+        self.positions.setdefault(str(self.key(item)), self.next_position)
+        self.next_position += 1
+
+    def pop(self, items: list[dict], position: int) -> dict:
+        """Удаляет элемент из items и исправляет индекс."""
+        if items is not self.items:
+            self.bind(items)
+        itemID = str(self.key(items[position]))
+        indexed = self.positions.get(itemID) if self.__position(itemID) == position else None
+        item = items.pop(position)
+        if indexed is None:
+            self.rebuild()
+            return item
+        del self.positions[itemID]
+        insort(self.removed, indexed)
+        if len(self.removed) > max(256, len(items) // 16):
+            self.rebuild()
+        return item
@@ -1,3 +1,4 @@
+from WorkProjectManager.App.ListIndex import ListIndex
 from WorkProjectManager.App.WorkChunksAndFiles import StructureChunksDataManager
 from WorkProjectManager.AppData.schemas import APPLICATION_STRUCTURE_DATA
 
@@ -10,6 +11,7 @@ class StructureApplicationsDataManager(StructureChunksDataManager):
 
     def __init__(self, MainIFS):
         super().__init__(MainIFS)
+        self.applicationsIndex = ListIndex("ApplicationID")
 
     def load_applications_data(self) -> None:
         """
@@ -17,12 +19,14 @@ class StructureApplicationsDataManager(StructureChunksDataManager):
         :return: None
         """
         self.applicationsList: list[dict] = self.get_chunk_data("ApplicationsData")
+        self.applicationsIndex.bind(self.applicationsList)
 
     def get_application_data(self, applicationID: int) -> dict:
-        for iD, application in enumerate(self.applicationsList):
-            if str(application["ApplicationID"]) == str(applicationID):
-                return {"indexApplication": iD, "dataApplication": application}
-        raise KeyError("Не было найдено ни одного релевантного Приложения... / No Found Application...")
+        try:
+            iD = self.applicationsIndex.find(self.applicationsList, applicationID)
+        except KeyError:
+            raise KeyError("Не было найдено ни одного релевантного Приложения... / No Found Application...")
+        return {"indexApplication": iD, "dataApplication": self.applicationsList[iD]}
 
     def get_last_application_id(self) -> int:
         try:
@@ -49,15 +53,18 @@ class InterfaceApplicationsDataManager(StructureApplicationsDataManager):
         newData["ApplicationDescription"] = applicationDescription
         newData["ApplicationAppPath"] = ApplicationAppPath
         newData["ApplicationIconPath"] = applicationIconPath
-        self.applicationsList.append(newData)
+        self.applicationsIndex.append(self.applicationsList, newData)
+        self.mark_dirty("ApplicationsData")
 
     def edit_application_data(self, applicationID: int, key: str, value: str):
         if key != "ApplicationID":
             editData: dict = self.get_application_data(applicationID)["dataApplication"]
             editData[key] = value
+            self.mark_dirty("ApplicationsData")
         else:
             raise ValueError("Ключ 'ApplicationID' запрещено редактировать!")
 
     def delete_application_data(self, applicationID: int):
         delData: dict = self.get_application_data(applicationID)
-        self.applicationsList.pop(delData["indexApplication"])
+        self.applicationsIndex.pop(self.applicationsList, delData["indexApplication"])
+        self.mark_dirty("ApplicationsData")
@@ -1,5 +1,6 @@
 import logging
 
+from TemplateProject.core.services.json_file_service import copy_json_data
 from WorkProjectManager.App.InterfacesChunksLoader import InterfacesChunksLoader
 
 
@@ -17,6 +18,56 @@ class StructureManager(InterfacesChunksLoader):
         self.load_global_projects_data()
         self.load_applications_data()
 
-    def save_all_data(self):
-        self.save_main_data()
-        self.save_main_structure_data()
+    def snapshot_changes(self, force=False, copy=True) -> dict:
+        """
+        Снимок несохранённых изменений: копии данных изменённых файлов. Отметки изменений снимаются -
+        новые правки после снимка попадут в следующее сохранение. Снимок можно записать в другом потоке.
+
+        :param force: True - снимок всех загруженных данных
+        :param copy: False - без копирования данных, только для записи в том же потоке
+        :return: {"files_data": {файл: данные}, "removed_files": [...], "dirty_names": [...]}
+        """
+        files_data = {}
+        removed_files = []
+        with self.dirtyLock:
+            if force or self.MAIN_FILE in self.dirtyChunks:
+                files_data[self.MAIN_FILE] = self.MAIN_DATA
+            if force or self.structure_is_dirty():
+                structure_files, removed_files = self.chunkStorage.files_data(self.MAIN_STRUCTURE_DATA,
+                                                                              self.structure_dirty_names(force))
+                files_data.update(structure_files)
+            dirty_names = list(self.dirtyChunks)
+            self.dirtyChunks.clear()
+        if copy:
+            files_data = copy_json_data(files_data)
+        return {"files_data": files_data, "removed_files": removed_files, "dirty_names": dirty_names}
+
+    def write_snapshot(self, snapshot: dict) -> list[str]:
+        """
+        Записывает снимок snapshot_changes одной пачкой. Если запись не удалась - изменения снова
+        отмечаются несохранёнными.
+        :return: Список записанных файлов
+        """
+        try:
+            for filename in snapshot["removed_files"]:
+                if self.MainIFS.file_exists(filename):
+                    self.MainIFS.delete_file(filename)
+            if not snapshot["files_data"]:
+                return []
+            return self.MainIFS.write_many_data(snapshot["files_data"], merge=False)
+        except Exception:
+            self.mark_dirty(*snapshot["dirty_names"])
+            raise
+
+    def save_all_data(self, force=False):
+        """
+        Записывает только изменённые данные (см. mark_dirty) одной пачкой, без чтения файлов с диска.
+        :param force: True - записать все данные, даже если они не отмечены изменёнными
+        :return: Список записанных файлов
+        """
+        self.logger.info(f"[!!] - StructureManager - save_all_data")
+        snapshot = self.snapshot_changes(force, copy=False)
+        if not snapshot["files_data"] and not snapshot["removed_files"]:
+            self.logger.info(f"[✅] - StructureManager - save_all_data - Изменений нет")
+            return []
+        return self.write_snapshot(snapshot)
@@ -1,5 +1,9 @@
 import logging
+import threading
 
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkProjectManager.App.ChunkStorage import ChunkStorage
+from WorkProjectManager.App.ListIndex import ListIndex
 from WorkProjectManager.AppData.schemas import MAIN_STRUCTURE_DATA, MAIN_DATA
 
 
@@ -13,25 +17,43 @@ class FileLoaderManager:
     def __init__(self, MainIFS):
         self.logger = logging.getLogger("FileLoaderManager")
         self.MainIFS = MainIFS
+        # Изменённые, но ещё не сохранённые части данных: MAIN_FILE или названия чанков.
+        # Меняется и из потока AutoSaveManager (повторная отметка при ошибке записи) - только под dirtyLock
+        self.dirtyChunks: set[str] = set()
+        self.dirtyLock = threading.RLock()
+
+    def mark_dirty(self, *names: str):
+        """
+        Отмечает данные изменёнными - их запишет следующее сохранение.
+        :param names: MAIN_FILE для главных настроек или названия чанков ("GlobalProjectsData", ...)
+        """
+        with self.dirtyLock:
+            self.dirtyChunks.update(names)
 
     def load_main_data(self):
         self.logger.info(f"[!!] - FileLoaderManager - load_main_data")
         self.MAIN_DATA = self.MainIFS.read_file(self.MAIN_FILE)
+        with self.dirtyLock:
+            self.dirtyChunks.discard(self.MAIN_FILE)
         if self.MAIN_DATA == {}:
             self.MAIN_DATA = MAIN_DATA
+            self.mark_dirty(self.MAIN_FILE)
 
     def save_main_data(self):
         self.logger.info(f"[!!] - FileLoaderManager - save_main_data - Начинаем сохранение главных настроек...")
-        if self.MainIFS.read_file(self.MAIN_FILE) == {} or self.MAIN_DATA != self.MainIFS.read_file(self.MAIN_FILE):
-            self.logger.info(f"save_main_data = Условия выполнены, начинаю сохранение...")
-            self.MainIFS.write_data(self.MAIN_FILE, self.MAIN_DATA)
+        if self.MAIN_FILE in self.dirtyChunks:
+            self.logger.info(f"save_main_data = Есть изменения, начинаю сохранение...")
+            self.MainIFS.write_many_data({self.MAIN_FILE: self.MAIN_DATA}, merge=False)
+            with self.dirtyLock:
+                self.dirtyChunks.discard(self.MAIN_FILE)
         else:
-            self.logger.info(f"save_main_data = Условия НЕ выполнены, завершение!")
+            self.logger.info(f"save_main_data = Изменений нет, завершение!")
 
 
 class StructureFileLoaderManager(FileLoaderManager):
     """
-        Загрузка, получение и сохранение данных по Структурному Файлу
+        Загрузка, получение и сохранение данных по Структурному Файлу.
+        Структура хранится по частям (см. ChunkStorage), чанки загружаются при первом обращении.
     """
     MAIN_STRUCTURE_FILE = None
     MAIN_STRUCTURE_DATA = None
@@ -39,36 +61,83 @@ class StructureFileLoaderManager(FileLoaderManager):
 
     def __init__(self, MainIFS):
         super().__init__(MainIFS)
+        self.chunkStorage: ChunkStorage | None = None
 
     def load_main_structure_file_name(self):
         self.MAIN_STRUCTURE_FILE = self.MAIN_DATA["MainStructureFile"]
         self.MAIN_STRUCTURE_BACKUP_FILE = self.MAIN_DATA["MainStructureBackUpFile"]
+        self.chunkStorage = ChunkStorage(self.MainIFS, self.MAIN_STRUCTURE_FILE)
 
     def load_main_structure_data(self):
-        self.MAIN_STRUCTURE_DATA = self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE)
-        if self.MAIN_STRUCTURE_DATA == {}:
-            self.MAIN_STRUCTURE_DATA = MAIN_STRUCTURE_DATA
+        """
+        Загружает только манифест структуры. Если структура ещё хранится одним файлом - она
+        переносится в раздельные файлы чанков (исходный файл переименовывается в .migrated).
+        """
+        with self.dirtyLock:
+            self.dirtyChunks.intersection_update({self.MAIN_FILE})
+        if not self.chunkStorage.exists():
+            legacy_data = self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE)
+            if legacy_data == {}:
+                self.MAIN_STRUCTURE_DATA = MAIN_STRUCTURE_DATA
+                self.mark_dirty(*self.chunkStorage.all_dirty_names(self.MAIN_STRUCTURE_DATA))
+                return
+            self.chunkStorage.migrate(legacy_data)
+        self.MAIN_STRUCTURE_DATA = self.chunkStorage.lazy_structure_data()
+
+    def migrate_main_structure_data(self):
+        """Перенос Структурного Файла в раздельные файлы чанков (выполняется и автоматически при загрузке)"""
+        if not self.chunkStorage.exists():
+            self.chunkStorage.migrate(self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE))
+
+    def pending_changes(self) -> dict[str, list[str]]:
+        """
+        :return: Несохранённые изменения {файл: [названия чанков]}, пустой словарь - сохранять нечего
+        """
+        changes = {}
+        with self.dirtyLock:
+            dirty_names = sorted(self.dirtyChunks)
+        for name in dirty_names:
+            filename = self.MAIN_FILE if name == self.MAIN_FILE else self.MAIN_STRUCTURE_FILE
+            changes.setdefault(filename, []).append(name)
+        return changes
+
+    def structure_is_dirty(self) -> bool:
+        with self.dirtyLock:
+            return bool(self.dirtyChunks - {self.MAIN_FILE})
+
+    def structure_dirty_names(self, force=False) -> list[str]:
+        if force:
+            return self.chunkStorage.all_dirty_names(self.MAIN_STRUCTURE_DATA)
+        with self.dirtyLock:
+            return [name for name in self.dirtyChunks if name != self.MAIN_FILE]
 
     def save_main_structure_data(self):
-        if self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE) == {}:
-            self.MainIFS.write_data(self.MAIN_STRUCTURE_FILE, self.MAIN_STRUCTURE_DATA)
-        elif self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE) != self.MAIN_STRUCTURE_DATA:
-            self.MainIFS.write_data(self.MAIN_STRUCTURE_FILE, self.MAIN_STRUCTURE_DATA)
+        if self.structure_is_dirty():
+            self.chunkStorage.write(self.MAIN_STRUCTURE_DATA, self.structure_dirty_names())
+            with self.dirtyLock:
+                self.dirtyChunks.intersection_update({self.MAIN_FILE})
 
     def set_default_main_structure_data(self):
-        self.MainIFS.write_data(self.MAIN_STRUCTURE_FILE, MAIN_STRUCTURE_DATA)
+        self.chunkStorage.write(copy_json_data(MAIN_STRUCTURE_DATA))
 
     def backup_main_structure_data(self):
-        if self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE) != self.MAIN_STRUCTURE_DATA:
-            self.MainIFS.write_data(self.MAIN_STRUCTURE_BACKUP_FILE, self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE))
+        """Резервная копия сохранённой на диске структуры - одним файлом в прежнем формате"""
+        if self.chunkStorage.exists():
+            saved_data = self.chunkStorage.full_structure_data(self.chunkStorage.lazy_structure_data())
+        else:
+            saved_data = self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE)
+        if saved_data != {}:
+            self.MainIFS.write_many_data({self.MAIN_STRUCTURE_BACKUP_FILE: saved_data}, merge=False)
 
     def import_main_structure_data(self, import_data: dict):
         self.backup_main_structure_data()
-        if self.MainIFS.read_file(self.MAIN_STRUCTURE_FILE) != import_data and import_data != {}:
-            self.MainIFS.write_data(self.MAIN_STRUCTURE_FILE, import_data)
+        if import_data != {}:
+            self.chunkStorage.write(import_data)
 
     def delete_main_structure_data(self):
-        self.MainIFS.write_data(self.MAIN_STRUCTURE_FILE, {})
+        """Удаляет файлы чанков; Структурный Файл перезаписывается пустым - следующая загрузка даст структуру по умолчанию"""
+        self.chunkStorage.delete()
+        self.MainIFS.write_many_data({self.MAIN_STRUCTURE_FILE: {}}, merge=False)
 
 
 class StructureChunksDataManager(StructureFileLoaderManager):
@@ -79,11 +148,19 @@ class StructureChunksDataManager(StructureFileLoaderManager):
 
     def __init__(self, MainIFS):
         super().__init__(MainIFS)
+        # Чанк - словарь с одним ключом, название чанка: {"GlobalProjectsData": [...]}
+        self.chunksIndex = ListIndex(lambda chunk: next(iter(chunk), None))
 
     def load_chunks_data(self):
         self.LIST_CHUNKS_DATA: list[dict] = self.MAIN_STRUCTURE_DATA["DataChunks"]
+        self.chunksIndex.bind(self.LIST_CHUNKS_DATA)
 
     def get_chunk_data(self, chunk_name: str) -> list[dict]:
-        for iD, chunk in enumerate(self.LIST_CHUNKS_DATA):
-            if list(chunk.keys())[0] == chunk_name:
-                return self.LIST_CHUNKS_DATA[iD][chunk_name]
+        """Данные чанка, при первом обращении чанк читается из своего файла"""
+        try:
+            iD = self.chunksIndex.find(self.LIST_CHUNKS_DATA, chunk_name)
+        except KeyError:
+            return None
+        if self.LIST_CHUNKS_DATA[iD][chunk_name] is None:
+            self.LIST_CHUNKS_DATA[iD][chunk_name] = self.chunkStorage.read_chunk(chunk_name)
+        return self.LIST_CHUNKS_DATA[iD][chunk_name]
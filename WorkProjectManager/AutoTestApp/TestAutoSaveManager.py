@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkJSONFiles.api import apiFilesService
+from WorkProjectManager.App.AutoSaveManager import AutoSaveManager
+from WorkProjectManager.App.StructureManager import StructureManager
+from WorkProjectManager.AppData import schemas
+
+
+class TestAutoSaveManager(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.patches = [mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_DATA",
+                                   copy_json_data(schemas.MAIN_DATA)),
+                        mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_STRUCTURE_DATA",
+                                   copy_json_data(schemas.MAIN_STRUCTURE_DATA))]
+        for patch in self.patches:
+            patch.start()
+        self.manager = self.load_manager()
+        self.manager.save_all_data()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def load_manager(self):
+        manager = StructureManager(apiFilesService(self.testDir))
+        manager.load_all_data()
+        return manager
+
+    def test_from_main_data(self):
+        self.assertIsNone(AutoSaveManager.from_main_data(self.manager))
+        self.manager.MAIN_DATA["AutoSave"] = "True"
+        self.manager.MAIN_DATA["AutoSaveIntervalMinutes"] = "2"
+        autoSave = AutoSaveManager.from_main_data(self.manager)
+        self.assertEqual(autoSave.interval_ms(), 120000)
+        autoSave.stop()
+
+    def test_coalesced_background_save(self):
+        autoSave = AutoSaveManager(self.manager, debounce_seconds=0.2)
+        self.assertFalse(autoSave.request_save())
+        self.manager.new_global_project_data("Test1", "")
+        self.assertTrue(autoSave.request_save())
+        self.manager.new_global_project_data("Test2", "")
+        self.manager.delete_global_project_data(1)
+        self.assertTrue(autoSave.request_save())
+        # Правка после снимка не должна попасть в записываемые данные
+        self.manager.edit_global_project_data(2, "GlobalProjectName", "NotSaved")
+        self.assertTrue(autoSave.wait_idle(timeout=5))
+        self.assertEqual(autoSave.metrics["saves"], 1)
+        self.assertEqual(autoSave.metrics["coalesced"], 1)
+        self.assertEqual([(gp["GlobalProjectID"], gp["GlobalProjectName"]) for gp in self.load_manager().globalProjectsList],
+                         [("2", "Test2")])
+        self.assertEqual(self.manager.pending_changes(), {"StructureFileDataMain": ["GlobalProjectsData"]})
+        autoSave.stop(flush=True)
+        self.assertEqual(self.load_manager().globalProjectsList[0]["GlobalProjectName"], "NotSaved")
+        self.assertGreater(autoSave.metrics["max_duration"], 0)
+
+    def test_immediate_save_skips_debounce_and_keeps_order(self):
+        autoSave = AutoSaveManager(self.manager, debounce_seconds=60)
+        self.manager.new_global_project_data("Old", "")
+        self.assertTrue(autoSave.request_save())
+        self.manager.edit_global_project_data(1, "GlobalProjectName", "New")
+        # Ручное сохранение: ждущий снимок и новые правки записываются сразу, одной записью в порядке снимков
+        self.assertTrue(autoSave.request_save(immediate=True))
+        self.assertTrue(autoSave.wait_idle(timeout=5))
+        self.assertEqual(autoSave.metrics["saves"], 1)
+        self.assertEqual(self.load_manager().globalProjectsList[0]["GlobalProjectName"], "New")
+        self.assertEqual(self.manager.pending_changes(), {})
+        autoSave.stop()
+
+    def test_failed_save_marks_dirty_again(self):
+        autoSave = AutoSaveManager(self.manager, debounce_seconds=0)
+        self.manager.new_application_data("App", "", "", "", "")
+        with mock.patch.object(self.manager.MainIFS, "write_many_data", side_effect=OSError("disk")):
+            autoSave.request_save()
+            autoSave.wait_idle(timeout=5)
+        self.assertEqual(autoSave.metrics["failures"], 1)
+        self.assertIn("ApplicationsData", self.manager.pending_changes()["StructureFileDataMain"])
+        autoSave.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
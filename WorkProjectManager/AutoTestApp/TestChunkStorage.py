@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkJSONFiles.api import apiFilesService
+from WorkProjectManager.App.ChunkStorage import migrate_structure_file
+from WorkProjectManager.App.StructureManager import StructureManager
+from WorkProjectManager.AppData import schemas
+
+
+def legacy_structure_data():
+    data = copy_json_data(schemas.MAIN_STRUCTURE_DATA)
+    data["DataChunks"][0]["GlobalProjectsData"] = [
+        {"GlobalProjectID": str(i), "GlobalProjectName": f"GP {i}", "GlobalProjectDescription": "",
+         "GlobalProjectProjectsData": [{"ProjectID": "1", "ProjectName": f"P {i}", "ProjectType": "",
+                                        "ProjectDescription": "", "ProjectData": []}]}
+        for i in range(1, 4)]
+    data["DataChunks"][1]["ApplicationsData"] = [{"ApplicationID": "1", "ApplicationName": "App"}]
+    return data
+
+
+class TestChunkStorage(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        self.patches = [mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_DATA",
+                                   copy_json_data(schemas.MAIN_DATA)),
+                        mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_STRUCTURE_DATA",
+                                   copy_json_data(schemas.MAIN_STRUCTURE_DATA))]
+        for patch in self.patches:
+            patch.start()
+        MainIFS = apiFilesService(self.testDir)
+        MainIFS.write_data("DataFile", copy_json_data(schemas.MAIN_DATA))
+        MainIFS.write_data("StructureFileDataMain", legacy_structure_data())
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def load_manager(self):
+        manager = StructureManager(apiFilesService(self.testDir))
+        manager.load_all_data()
+        return manager
+
+    def chunk_path(self, *names):
+        return os.path.join(self.testDir, "StructureFileDataMain", *names)
+
+    def test_auto_migration_and_lazy_loading(self):
+        manager = self.load_manager()
+        self.assertTrue(os.path.exists(self.chunk_path("Manifest.json")))
+        self.assertTrue(os.path.exists(self.chunk_path("GlobalProjectsData", "2.json")))
+        # Исходный файл выведен из работы и больше не читается
+        self.assertFalse(os.path.exists(os.path.join(self.testDir, "StructureFileDataMain.json")))
+        self.assertTrue(os.path.exists(os.path.join(self.testDir, "StructureFileDataMain.json.migrated")))
+        self.assertEqual(manager.pending_changes(), {})
+        # Не нужные первому окну чанки и проекты не загружены
+        self.assertIsNone(manager.MAIN_STRUCTURE_DATA["DataChunks"][2]["ModulesData"])
+        self.assertIsNone(manager.get_global_project_data(2)["dataGlobalProject"]["GlobalProjectProjectsData"])
+        manager.load_projects_data(2)
+        self.assertEqual(manager.get_project_data(1)["dataGlobalProjectProject"]["ProjectName"], "P 2")
+        self.assertEqual(manager.get_chunk_data("ModulesData"), schemas.MAIN_STRUCTURE_DATA["DataChunks"][2]["ModulesData"])
+        self.assertEqual(manager.chunkStorage.full_structure_data(manager.MAIN_STRUCTURE_DATA), legacy_structure_data())
+
+    def test_save_project_changes(self):
+        manager = self.load_manager()
+        manager.load_projects_data(1)
+        manager.new_project_data("New", "Code", "")
+        manager.delete_global_project_data(3)
+        manager.save_all_data()
+        self.assertFalse(os.path.exists(self.chunk_path("GlobalProjectsData", "3.json")))
+        manager = self.load_manager()
+        self.assertEqual([gp["GlobalProjectID"] for gp in manager.globalProjectsList], ["1", "2"])
+        manager.load_projects_data(1)
+        self.assertEqual([p["ProjectName"] for p in manager.globalProjectProjectsList], ["P 1", "New"])
+
+    def test_delete_structure(self):
+        manager = self.load_manager()
+        manager.load_projects_data(1)
+        manager.new_project_data("New", "Code", "")
+        manager.save_all_data()
+        manager.delete_main_structure_data()
+        self.assertFalse(os.path.exists(self.chunk_path("Manifest.json")))
+        self.assertFalse(os.path.exists(self.chunk_path("GlobalProjectsData", "1.json")))
+        manager = self.load_manager()
+        self.assertEqual(manager.globalProjectsList, [])
+        self.assertEqual(manager.applicationsList, [])
+        manager.save_all_data()
+        self.assertEqual(self.load_manager().globalProjectsList, [])
+
+    def test_migration_tool(self):
+        written = migrate_structure_file(self.testDir)
+        self.assertIn("StructureFileDataMain/Manifest", written)
+        with self.assertRaises(FileExistsError):
+            migrate_structure_file(self.testDir)
+
+    def test_backup_and_import(self):
+        manager = self.load_manager()
+        imported = legacy_structure_data()
+        imported["DataChunks"][1]["ApplicationsData"] = []
+        manager.import_main_structure_data(imported)
+        self.assertEqual(manager.MainIFS.read_file("StructureFileDataMainBackup"), legacy_structure_data())
+        self.assertEqual(self.load_manager().applicationsList, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
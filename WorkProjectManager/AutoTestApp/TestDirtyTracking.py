@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkJSONFiles.api import apiFilesService
+from WorkProjectManager.App.StructureManager import StructureManager
+from WorkProjectManager.AppData import schemas
+
+
+class TestDirtyTracking(unittest.TestCase):
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp()
+        # schemas отдаются менеджеру без копирования - защищаем их от изменений в тесте
+        self.patches = [mock.patch.object(schemas, "MAIN_DATA", copy_json_data(schemas.MAIN_DATA)),
+                        mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_DATA",
+                                   copy_json_data(schemas.MAIN_DATA)),
+                        mock.patch("WorkProjectManager.App.WorkChunksAndFiles.MAIN_STRUCTURE_DATA",
+                                   copy_json_data(schemas.MAIN_STRUCTURE_DATA))]
+        for patch in self.patches:
+            patch.start()
+        self.manager = self.load_manager()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.testDir, ignore_errors=True)
+
+    def load_manager(self):
+        manager = StructureManager(apiFilesService(self.testDir))
+        manager.load_all_data()
+        return manager
+
+    def test_first_load_is_dirty(self):
+        self.assertEqual(set(self.manager.pending_changes()), {"DataFile", "StructureFileDataMain"})
+        written = self.manager.save_all_data()
+        self.assertEqual(written[0], "DataFile")
+        self.assertIn("StructureFileDataMain/Manifest", written)
+        self.assertEqual(self.manager.pending_changes(), {})
+        self.assertEqual(self.manager.save_all_data(), [])
+        self.assertEqual(self.load_manager().pending_changes(), {})
+
+    def test_save_only_changed_without_reading(self):
+        self.manager.save_all_data()
+        self.manager.new_global_project_data("Test", "Description")
+        self.manager.new_application_data("App", "Type", "Description", "C:/App", "")
+        self.assertEqual(self.manager.pending_changes(),
+                         {"StructureFileDataMain": ["ApplicationsData", "GlobalProjectsData", "GlobalProjectsData/1"]})
+        with mock.patch.object(FileService, "read_file", side_effect=AssertionError("read_file")):
+            self.assertEqual(set(self.manager.save_all_data()),
+                             {"StructureFileDataMain/ApplicationsData", "StructureFileDataMain/GlobalProjectsData",
+                              "StructureFileDataMain/GlobalProjectsData/1"})
+        manager = self.load_manager()
+        self.assertEqual(manager.get_global_project_data(1)["dataGlobalProject"]["GlobalProjectName"], "Test")
+        self.assertEqual(manager.get_application_data(1)["dataApplication"]["ApplicationName"], "App")
+
+    def test_delete_is_saved(self):
+        self.manager.new_global_project_data("Test1", "")
+        self.manager.new_global_project_data("Test2", "")
+        self.manager.save_all_data()
+        self.manager.delete_global_project_data(1)
+        self.assertEqual(self.manager.pending_changes(),
+                         {"StructureFileDataMain": ["GlobalProjectsData", "GlobalProjectsData/1"]})
+        self.manager.save_all_data()
+        self.assertEqual([gp["GlobalProjectID"] for gp in self.load_manager().globalProjectsList], ["2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from WorkProjectManager.App.ListIndex import ListIndex
+
+
+class TestListIndex(unittest.TestCase):
+    def setUp(self):
+        self.items = [{"ID": str(i)} for i in range(1, 6)]
+        self.index = ListIndex("ID")
+        self.index.bind(self.items)
+
+    def test_find(self):
+        self.assertEqual(self.index.find(self.items, 3), 2)
+        self.assertEqual(self.index.find(self.items, "5"), 4)
+        with self.assertRaises(KeyError):
+            self.index.find(self.items, 10)
+
+    def test_append_and_pop(self):
+        self.index.append(self.items, {"ID": "6"})
+        self.assertEqual(self.index.find(self.items, 6), 5)
+        self.assertEqual(self.index.pop(self.items, 1), {"ID": "2"})
+        self.assertEqual([self.index.find(self.items, i) for i in (1, 3, 4, 5, 6)], [0, 1, 2, 3, 4])
+        with self.assertRaises(KeyError):
+            self.index.find(self.items, 2)
+
+    def test_external_changes(self):
+        """Список изменили в обход индекса - индекс перестраивается"""
+        self.items.pop(0)
+        self.items.append({"ID": "7"})
+        self.assertEqual(self.index.find(self.items, 2), 0)
+        self.assertEqual(self.index.find(self.items, 7), 4)
+        other = [{"ID": "9"}]
+        self.assertEqual(self.index.find(other, 9), 0)
+
+    def test_duplicates_find_first(self):
+        self.items.insert(0, {"ID": "4"})
+        self.index.rebuild()
+        self.assertEqual(self.index.find(self.items, 4), 0)
+        self.index.pop(self.items, 0)
+        self.assertEqual(self.index.find(self.items, 4), 3)
+
+    def test_many_pops(self):
+        items = [{"ID": str(i)} for i in range(2000)]
+        index = ListIndex("ID")
+        index.bind(items)
+        random.seed(0)
+        for step in range(1500):
+            itemID = random.choice(items)["ID"]
+            index.pop(items, index.find(items, itemID))
+            if step % 7 == 0:
+                index.append(items, {"ID": f"new{step}"})
+        for position, item in enumerate(items):
+            self.assertEqual(index.find(items, item["ID"]), position)
+
+    def test_key_function(self):
+        chunks = [{"GlobalProjectsData": []}, {"ApplicationsData": []}]
+        index = ListIndex(lambda chunk: next(iter(chunk), None))
+        self.assertEqual(index.find(chunks, "ApplicationsData"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
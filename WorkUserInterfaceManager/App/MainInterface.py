@@ -1,7 +1,10 @@
 import logging
+import time
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import QTimer, Slot
 
+from WorkArchiveFiles.App.ArchiveJobQueue import ArchiveJob, ArchiveJobQueue, format_progress
+from WorkProjectManager.App.AutoSaveManager import AutoSaveManager
 from WorkUserInterfaceManager.App.MainInterfaceModel import MIModel
 from WorkUserInterfaceManager.App.Tools.LoggingCustom import get_logger_img
 from WorkUserInterfaceManager.App.Tools.system_tools import system_tool, system_tool_load
@@ -29,6 +32,12 @@ class MainInterfaceViewModel(MainInterfaceView):
     def __init__(self, iPM, uIF):
         super().__init__(iPM, uIF)
 
+    def data_changed(self):
+        """Данные изменены из интерфейса (см. MainInterface - автосохранение)"""
+
+    def vm_save_data(self):
+        self.iPM.save_all_data()
+
     def vm_new_global_project(self):
         self.logger.info(f"[!!]  -  MainInterfaceViewModel  -  vm_new_global_project  -  : Создание проекта...")
         data_list: list = self.UiMainWindow.get_dialog_data("Глобальный Проект", count_data=2)
@@ -37,6 +46,7 @@ class MainInterfaceViewModel(MainInterfaceView):
             item_data = self.get_last_global_project_data()
             widget_list = self.UiMainWindow.get_global_projects_widget_list()
             self.UiMainWindow.update_list_new_item(item_data, widget_list)
+            self.data_changed()
             self.logger.info(f"[✅]  -  MainInterfaceViewModel  -  vm_new_global_project  -  : Новый проект создан!")
         else:
             raise IndexError("Создание проекта отменено!")
@@ -50,6 +60,7 @@ class MainInterfaceViewModel(MainInterfaceView):
             item_data = self.get_last_project_in_global_project_data()
             widget_list = self.UiMainWindow.get_projects_in_global_project_widget_list()
             self.UiMainWindow.update_list_new_item(item_data, widget_list)
+            self.data_changed()
             self.logger.info(
                 f"[✅]  -  MainInterfaceViewModel  -  vm_new_project_in_global_project  -  : Новый проект создан!")
 
@@ -66,6 +77,7 @@ class MainInterfaceViewModel(MainInterfaceView):
             item_data = self.new_applications_item(data_list[0], data_list[1], data_list[2], link_path, icon_path)
             widget_list = self.UiMainWindow.get_applications_widget_list()
             self.UiMainWindow.update_list_new_item(item_data, widget_list, icon_path=icon_path)
+            self.data_changed()
             self.logger.info(f"[✅]  -  MainInterfaceViewModel  -  vm_new_application  -  Новый инструмент создан!")
         else:
             raise IndexError("Произошла ошибка или добавление Приложения отменено!")
@@ -155,7 +167,7 @@ class MainInterfaceViewModelLinkData(MainInterfaceViewModel):
         self.UiMainWindow.get_button_project_in_global_project_add().clicked.connect(
             self.vm_new_project_in_global_project)
         self.UiMainWindow.get_button_applications_add().clicked.connect(self.vm_new_application)
-        self.UiMainWindow.get_button_save_data().clicked.connect(self.iPM.save_all_data)
+        self.UiMainWindow.get_button_save_data().clicked.connect(self.vm_save_data)
         self.UiMainWindow.get_button_start_project().clicked.connect(self._start_project)
 
     def link_signals(self):
@@ -184,11 +196,126 @@ class MainInterface(MainInterfaceViewModelLinkData):
     def __init__(self, iPM, uIF):
         super().__init__(iPM, uIF)
         self.logger = logging.getLogger("MainInterface")
+        self.autoSave: AutoSaveManager | None = None
+        self.autoSaveTimer: QTimer | None = None
+        self.archiveJobs: ArchiveJobQueue | None = None
+        self.archiveJob: ArchiveJob | None = None
+        self.archiveTimer: QTimer | None = None
+        self.archiveButton = None
+        self.archiveButtonText = ""
 
     def start(self):
         self.init_ui()
         self.all_links()
         self.setup_style()
+        self.setup_autosave()
+        self.link_archive_button()
+
+    def setup_autosave(self):
+        """
+        Автосохранение по настройкам AutoSave / AutoSaveIntervalMinutes: таймер в потоке интерфейса
+        снимает копию изменений, запись выполняется в фоновом потоке AutoSaveManager.
+        """
+        self.autoSave = AutoSaveManager.from_main_data(self.iPM)
+        if self.autoSave is None:
+            self.logger.info(f"{get_logger_img('Загрузка')} - MainInterface - setup_autosave - Автосохранение выключено")
+            return
+        self.autoSaveTimer = QTimer(self.UiMainWindow)
+        self.autoSaveTimer.setInterval(self.autoSave.interval_ms())
+        self.autoSaveTimer.timeout.connect(self.autoSave.request_save)
+        self.autoSaveTimer.start()
+        self.logger.info(
+            f"{get_logger_img('Загрузка')} - MainInterface - setup_autosave - Автосохранение каждые {self.autoSave.interval_minutes} мин.")
+
+    def data_changed(self):
+        """Правка из интерфейса: снимок ставится в очередь, серия правок за debounce_seconds записывается один раз"""
+        if self.autoSave is not None:
+            self.autoSave.request_save()
+
+    def vm_save_data(self):
+        """
+        Кнопка сохранения. При включённом автосохранении запись идёт через очередь AutoSaveManager, а не
+        в потоке интерфейса: иначе снимок, уже ждущий записи, мог бы перезаписать сохранённые данные.
+        """
+        if self.autoSave is None:
+            super().vm_save_data()
+        else:
+            self.autoSave.request_save(immediate=True)
+
+    def start_archive_job(self, source_dir: str, target_dir: str, archive_name: str, **kwargs) -> ArchiveJob:
+        """
+        Архивирование в фоновом потоке ArchiveJobQueue (kwargs - как у ArchiveDataManager.archive_data).
+        Интерфейс не блокируется: таймер раз в 200 мс выводит прогресс задания в строку состояния.
+        """
+        from WorkArchiveFiles.App.ArchiveDataManager import ArchiveDataManager
+        if self.archiveJobs is None:
+            self.archiveJobs = ArchiveJobQueue()
+        self.archiveJob = self.archiveJobs.submit_archive(ArchiveDataManager(source_dir, target_dir),
+                                                          archive_name, **kwargs)
+        if self.archiveTimer is None:
+            self.archiveTimer = QTimer(self.UiMainWindow)
+            self.archiveTimer.setInterval(200)
+            self.archiveTimer.timeout.connect(self.update_archive_progress)
+        self.archiveTimer.start()
+        return self.archiveJob
+
+    def cancel_archive_job(self):
+        if self.archiveJob is not None:
+            self.archiveJob.cancel()
+
+    def link_archive_button(self):
+        """Кнопка «Сделать резервную копию»: архивирование текущего проекта, во время задания - его отмена"""
+        self.archiveButton = self.UiMainWindow.get_button_backup_project()
+        self.archiveButtonText = self.archiveButton.text()
+        self.archiveButton.clicked.connect(self.vm_backup_project)
+
+    @Slot()
+    def vm_backup_project(self):
+        if self.archiveJob is not None and self.archiveJob.active:
+            self.logger.info(f"[!!] - MainInterface - vm_backup_project - Отмена архивирования '{self.archiveJob.name}'")
+            self.cancel_archive_job()
+            return
+        gp, gpp = self.iPM.currentGlobalProject, self.iPM.currentProject
+        if gp is int or gpp is int:
+            self.logger.warning(f"[!!] - MainInterface - vm_backup_project - Проект не выбран")
+            return
+        self.start_archive_job(f"{self.get_data_path('MainGlobalProjectsPath')}{gp}/{gpp}",
+                               f"{self.get_data_path('BackupsStructurePath')}{gp}",
+                               f"{gpp}_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.archiveButton.setText("Отменить резервное копирование")
+
+    @Slot()
+    def update_archive_progress(self):
+        job = self.archiveJob
+        if job is None:
+            return
+        status = job.status()
+        text = f"Архив '{job.name}': {format_progress(status, width=20)}"
+        if not job.active:
+            self.archiveTimer.stop()
+            if self.archiveButton is not None:
+                self.archiveButton.setText(self.archiveButtonText)
+            text = f"Архив '{job.name}': {status['State']}" + (f" - {status['Error']}" if status["Error"] else "")
+            self.logger.info(f"[📁] - MainInterface - update_archive_progress - {text}")
+        status_bar = getattr(self.UiMainWindow, "statusBar", None)
+        if status_bar is not None:
+            status_bar().showMessage(text)
+
+    def stop(self):
+        if self.archiveTimer is not None:
+            self.archiveTimer.stop()
+            self.archiveTimer = None
+        if self.archiveJobs is not None:
+            self.archiveJobs.stop(cancel_running=True)
+            self.archiveJobs = None
+        if self.autoSaveTimer is not None:
+            self.autoSaveTimer.stop()
+            self.autoSaveTimer = None
+        if self.autoSave is not None:
+            self.autoSave.stop(flush=True)
+            self.logger.info(f"[✅] - MainInterface - stop - Автосохранение остановлено, метрики: {self.autoSave.metrics}")
+            self.autoSave = None
+        super().stop()
 
     def setup_style(self):
         self.logger.info(f"{get_logger_img('Загрузка')} - MainInterface - setup_style - Установка стилей интерфейса")
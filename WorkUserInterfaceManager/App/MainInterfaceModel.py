@@ -22,6 +22,14 @@ class MIModelBase:
             f"[🡻][↴] - MIModelBase  -   load_all_data - Загрузка всех основных данных - Метод load_all_data")
         self.iPM.load_all_data()
 
+    def mark_dirty(self, *names: str):
+        """Отмечает данные изменёнными, см. StructureManager.mark_dirty"""
+        self.iPM.mark_dirty(*names)
+
+    def pending_changes(self) -> dict[str, list[str]]:
+        """Несохранённые изменения для интерфейса, см. StructureManager.pending_changes"""
+        return self.iPM.pending_changes()
+
 
 class MIModelMainSettingsData(MIModelBase):
     def __init__(self, iPM):
@@ -53,10 +61,10 @@ class MIModelMainSettingsData(MIModelBase):
             return path_getter
 
     def __set_default_path(self, path_type_key, path_getter, default_path_setter):
-        if path_getter == "":
-            self.iPM.MAIN_DATA[f"{path_type_key}"] = default_path_setter
-            return self.iPM.MAIN_DATA[f"{path_type_key}"]
-        self.iPM.MAIN_DATA[f"{path_type_key}"] = path_getter
+        value = default_path_setter if path_getter == "" else path_getter
+        if self.iPM.MAIN_DATA[f"{path_type_key}"] != value:
+            self.iPM.MAIN_DATA[f"{path_type_key}"] = value
+            self.mark_dirty(self.iPM.MAIN_FILE)
         return self.iPM.MAIN_DATA[f"{path_type_key}"]
 
     def _get_test_path(self):
@@ -313,3 +313,8 @@ class UiMainWindow(QMainWindow):
         self.logger.info(
             f"{get_logger_img('Возвращение')} - UiMainWindow - get_button_save_data - Возвращение BTN11114116_3")
         return self.ui.BTN11114116_3
+
+    def get_button_backup_project(self):
+        self.logger.info(
+            f"{get_logger_img('Возвращение')} - UiMainWindow - get_button_backup_project - Возвращение BTN11114116_2")
+        return self.ui.BTN11114116_2
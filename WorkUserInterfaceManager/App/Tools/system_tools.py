@@ -1,6 +1,7 @@
 import logging
 
 from TemplateProject.core.services.directory_service import DirectoryService
+from TemplateProject.core.services.id_allocator_service import IDAllocatorService
 
 
 def system_tool(type_tool, main_path, load_exe_path, icon_ico_path) -> list:
@@ -10,45 +11,47 @@ def system_tool(type_tool, main_path, load_exe_path, icon_ico_path) -> list:
     logging.info(f"[if⏳else] - vm_new_application - system_tool - Условие -> type_tool")
     if type_tool == 'new_app':
         logging.info(f"[if⏳else] - vm_new_application - system_tool - Истина -> type_tool")
-        file_name_id = 1
-        logging.info(f"[if⏳else] - vm_new_application - system_tool - Начало бесконечного цикла -> while True")
-        while True:
-            logging.info(f"[if⏳else] - vm_new_application - system_tool - Условие Цикла -> if not DSApplicationService, file_name_id = {file_name_id}")
-            if not DSApplicationService.search_files(str(file_name_id)):
-                logging.info(f"[if⏳else] - vm_new_application - system_tool - Истина Цикла -> if not DSApplicationService, file_name_id = {file_name_id}")
-                try:
-                    DSApplicationService.create_shortcut(load_exe_path, main_path, shortcut_name=str(file_name_id) + '.exe',
-                                                         source_mode=True)
-                    DSApplicationService.copy_file(icon_ico_path, main_path,
-                                                   new_name=str(file_name_id) + '.png',
-                                                   source_mode=True)
-                except Exception as e:
-                    logging.debug(f"[Except][if⏳else] - vm_new_application - system_tool - Ошибка create_shortcut - {e}")
-                    raise e
-                logging.info(f"[✅][if⏳else] - vm_new_application - system_tool - Конец Цикла -> Возвращение!")
-                return [main_path, [str(file_name_id) + '.exe', str(file_name_id) + '.png']]
-            elif file_name_id > 993:
-                logging.info(f"[✅][if⏳else] - vm_new_application - system_tool - Конец Цикла -> ValueError")
-                raise ValueError("Ошибка, номер файла больше 993...")
-            else:
-                file_name_id += 1
-            logging.info(f"[!!][if⏳else] - vm_new_application - system_tool - Повтор Цикла...")
+        with IDAllocatorService.for_directory(main_path).reserve() as file_name_id:
+            logging.info(f"[if⏳else] - vm_new_application - system_tool - Свободный номер файла, file_name_id = {file_name_id}")
+            try:
+                DSApplicationService.create_shortcut(load_exe_path, main_path, shortcut_name=str(file_name_id) + '.exe',
+                                                     source_mode=True)
+                DSApplicationService.copy_file(icon_ico_path, main_path,
+                                               new_name=str(file_name_id) + '.png',
+                                               source_mode=True)
+            except Exception as e:
+                logging.debug(f"[Except][if⏳else] - vm_new_application - system_tool - Ошибка create_shortcut - {e}")
+                raise e
+        logging.info(f"[✅][if⏳else] - vm_new_application - system_tool - Возвращение!")
+        return [main_path, [str(file_name_id) + '.exe', str(file_name_id) + '.png']]
 
 
-def system_tool_load(type_tool, main_path, sub_path, sub_sub_path) -> list:
+def system_tool_load(type_tool, main_path, sub_path, sub_sub_path, files_limit: int | None = None) -> list:
+    """
+    :param files_limit: load_project - показать только первые files_limit файлов (без полной сортировки списка).
+                        Если файлов больше, последним элементом идёт {'id', 'name', 'truncated': True} - сколько
+                        файлов не показано; все файлы - повторный вызов с files_limit=None (по умолчанию)
+    """
     if sub_path == int or sub_sub_path == int:
         return []
     logging.getLogger("system_tool_load")
     logging.info(f"[!!] - load_project_data - system_tool_load - Начало -> {type_tool, main_path, sub_path, sub_sub_path}")
     DSApplicationService = DirectoryService(str(main_path) + str(sub_path) + '/' + str(sub_sub_path), starry_dir=True)
     if type_tool == 'load_project':
-        logging.info(
-            f"[!!] - system_tool_load - load_project - Условно -> list_files = {DSApplicationService.list_files()}")
         DSApplicationService.create_directory("DocData")
         DSApplicationService.create_directory("LearnData")
         DSApplicationService.create_directory("SourceData")
         DSApplicationService.create_directory("ResultData")
-        return [{'id': idx, 'name': item} for idx, item in enumerate(DSApplicationService.list_files() + DSApplicationService.get_directories())]
+        files = DSApplicationService.list_files(limit=None if files_limit is None else files_limit + 1)
+        truncated = files_limit is not None and len(files) > files_limit
+        if truncated:
+            files = files[:files_limit]
+            logging.warning(f"[!!] - system_tool_load - load_project - Показаны первые {files_limit} файлов проекта")
+        logging.info(f"[!!] - system_tool_load - load_project - Условно -> list_files = {len(files)} файлов")
+        items = [{'id': idx, 'name': item} for idx, item in enumerate(files + DSApplicationService.get_directories())]
+        if truncated:
+            items.append({'id': len(items), 'name': f"... показаны первые {files_limit} файлов", 'truncated': True})
+        return items
     elif type_tool == 'start_project':
         logging.info(f"[!!] - system_tool_load - load_project - Условно -> start_project")
         DSApplicationService.openFolder("")
@@ -0,0 +1,110 @@
+"""
+Фоновое архивирование через ArchiveJobQueue: цена прогресса и отмены, и продолжение после отмены.
+Сравнивается:
+    1. ParallelZipWriter без прогресса (как прежний archive_data)
+    2. то же задание в очереди с ArchiveProgress (обновление и проверка отмены на каждом блоке)
+    3. отмена на середине и повторный запуск: без resume архив пишется заново, с resume - только остаток
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_archive_jobs
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from WorkArchiveFiles.App.ArchiveJobQueue import ArchiveJobQueue
+from WorkArchiveFiles.App.ArchiveProgress import ArchiveCancelled, ArchiveProgress
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+FILES = 400
+FILE_SIZE = 512 * 1024
+
+
+def make_tree(root):
+    rng = random.Random(19)
+    words = [b"MGSD", b"Project", b"Data", b"Chunk", b"Archive", b"Global", b"ID"]
+    for i in range(FILES):
+        directory = os.path.join(root, str(i // 50))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{i}.dat"), "wb") as file:
+            text = b" ".join(rng.choice(words) + str(rng.randint(0, 9999)).encode() for _ in range(FILE_SIZE // 18))
+            file.write(text[:FILE_SIZE // 2] + rng.randbytes(FILE_SIZE // 2))
+
+
+def members(root):
+    for dirpath, _, files in os.walk(root):
+        for file in sorted(files):
+            full_path = os.path.join(dirpath, file)
+            yield full_path, os.path.relpath(full_path, root).replace("\\", "/")
+
+
+def write_archive(root, archive_path, progress=None, resume=False, cancel_at=None):
+    def on_progress(size):
+        progress.add_bytes(size)
+        if cancel_at is not None and progress.done_bytes >= cancel_at:
+            progress.token.cancel()
+
+    with ParallelZipWriter(archive_path, on_progress=on_progress if progress is not None else None,
+                           resume=resume) as zf:
+        for full_path, arcname in members(root):
+            if arcname in zf.written:
+                continue
+            if progress is not None:
+                progress.set_current(arcname)
+            zf.write(full_path, arcname=arcname)
+            if progress is not None:
+                progress.file_done()
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    root = tempfile.mkdtemp()
+    out = tempfile.mkdtemp()
+    job_queue = ArchiveJobQueue()
+    try:
+        make_tree(root)
+        total = FILES * FILE_SIZE
+        print(f"Файлов: {FILES}, объём: {total / 1024 / 1024:.0f} МБ, ядер: {os.cpu_count()}")
+        archive_path = os.path.join(out, "Archive.zip")
+
+        plain = timed(lambda: write_archive(root, archive_path))
+        print(f"{'Без прогресса':<40} {plain:6.2f} с")
+
+        def queued():
+            job = job_queue.submit("Archive", lambda progress: progress.start(FILES, total) or
+                                   write_archive(root, archive_path, progress))
+            job.wait()
+            assert job.state == "done", job.status()
+
+        with_progress = timed(queued)
+        print(f"{'Очередь + ArchiveProgress':<40} {with_progress:6.2f} с ({with_progress / plain - 1:+.1%})")
+
+        for resume in (False, True):
+            os.remove(archive_path)
+            progress = ArchiveProgress()
+            progress.start(FILES, total)
+            try:
+                write_archive(root, archive_path, progress, cancel_at=total // 2)
+            except ArchiveCancelled:
+                pass
+            restart = timed(lambda: write_archive(root, archive_path, ArchiveProgress(), resume=resume))
+            with zipfile.ZipFile(archive_path) as zf:
+                assert zf.testzip() is None and len(zf.namelist()) == FILES
+            label = "После отмены на 50%, resume" if resume else "После отмены на 50%, заново"
+            print(f"{label:<40} {restart:6.2f} с")
+    finally:
+        job_queue.stop()
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
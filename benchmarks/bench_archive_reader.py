@@ -0,0 +1,74 @@
+"""
+Проверка и чтение большого ZIP-архива: распаковка всего архива (единственный способ раньше)
+против ArchiveReader.verify (без записи на диск) и извлечения одного файла или папки.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_archive_reader
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from WorkArchiveFiles.App.ArchiveReader import ArchiveReader
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+PROJECTS = 200
+FILES_PER_PROJECT = 50
+
+
+def text_block(rng, size):
+    words = [b"MGSD", b"Project", b"Data", b"Chunk", b"Archive", b"Global", b"ID"]
+    return b" ".join(rng.choice(words) + str(rng.randint(0, 9999)).encode() for _ in range(size // 9))[:size]
+
+
+def make_archive(root, archive_path):
+    rng = random.Random(17)
+    block = text_block(rng, 256 * 1024)
+    with ParallelZipWriter(archive_path) as zf:
+        for project in range(PROJECTS):
+            for i in range(FILES_PER_PROJECT):
+                full_path = f"{root}/{project}/{i}.json"
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, "wb") as file:
+                    file.write(rng.randbytes(64) + block[:rng.randint(1000, 200 * 1024)])
+                zf.write(full_path, arcname=f"Projects/{project}/SourceData/{i}.json")
+
+
+def measure(title, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"{title:<40} {(time.perf_counter() - start) * 1000:9.1f} мс  {result}")
+
+
+def main():
+    temp = tempfile.mkdtemp().replace("\\", "/")
+    try:
+        archive_path = f"{temp}/Backup.zip"
+        make_archive(f"{temp}/Source", archive_path)
+        with zipfile.ZipFile(archive_path) as zf:
+            total = sum(info.file_size for info in zf.infolist())
+        print(f"Записей: {PROJECTS * FILES_PER_PROJECT}, распакованный объём: {total / 1024 / 1024:.0f} МБ, "
+              f"архив {os.path.getsize(archive_path) / 1024 / 1024:.0f} МБ, ядер: {os.cpu_count()}")
+
+        def extract_all():
+            with zipfile.ZipFile(archive_path) as zf:
+                zf.extractall(f"{temp}/All")
+            shutil.rmtree(f"{temp}/All")
+            return "распакован весь архив"
+
+        measure("zipfile.extractall (весь архив)", extract_all)
+        measure("ArchiveReader.verify", lambda: len(ArchiveReader(archive_path).verify()["Errors"]))
+        with ArchiveReader(archive_path) as reader:
+            measure("ArchiveReader.extract (один файл)",
+                    lambda: reader.extract("Projects/123/SourceData/7.json", f"{temp}/One"))
+            measure("ArchiveReader.extract (папка проекта)",
+                    lambda: reader.extract("Projects/42", f"{temp}/Project"))
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Архивирование дерева, похожего на папку приложений (иконки PNG, установщики и архивы, EXE, JSON):
+ParallelZipWriter со сжатием deflate всех файлов (как раньше) против выбора сжатия CompressionPolicy.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_compression_policy
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+import zlib
+
+from WorkArchiveFiles.App.CompressionPolicy import CompressionPolicy
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+ICONS = 1500
+APPLICATIONS = 40
+JSON_FILES = 1000
+
+
+def text_block(rng, size):
+    words = [b"MGSD", b"Project", b"Data", b"Chunk", b"Archive", b"Global", b"ID"]
+    return b" ".join(rng.choice(words) + str(rng.randint(0, 9999)).encode() for _ in range(size // 9))[:size]
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+
+
+def make_tree(root):
+    rng = random.Random(9)
+    for i in range(ICONS):
+        # PNG: сигнатура + уже сжатые данные изображения
+        write(f"{root}/resources/{i}.png", b"\x89PNG\r\n\x1a\n" + zlib.compress(rng.randbytes(rng.randint(4000, 60000))))
+    for i in range(APPLICATIONS):
+        application = f"{root}/Applications/{i}"
+        # EXE: код сжимается примерно вдвое, встроенные ресурсы - нет
+        write(f"{application}/App.exe", b"MZ" + text_block(rng, 1024 * 1024) + rng.randbytes(1024 * 1024))
+        write(f"{application}/Setup.zip", b"PK\x03\x04" + rng.randbytes(2 * 1024 * 1024))
+        write(f"{application}/Data.pak", rng.randbytes(1024 * 1024))
+    for i in range(JSON_FILES):
+        write(f"{root}/SourceData/{i // 100}/{i}.json", text_block(rng, rng.randint(500, 30000)))
+
+
+def members(root):
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            full_path = os.path.join(dirpath, file)
+            yield full_path, os.path.relpath(full_path, root)
+
+
+def archive(root, archive_path, policy):
+    with ParallelZipWriter(archive_path, policy=policy) as zf:
+        for full_path, arcname in members(root):
+            zf.write(full_path, arcname=arcname)
+    return zf.methods
+
+
+def main():
+    root = tempfile.mkdtemp()
+    out = tempfile.mkdtemp()
+    try:
+        make_tree(root)
+        total = sum(os.path.getsize(path) for path, _ in members(root))
+        print(f"Файлов: {ICONS + APPLICATIONS * 3 + JSON_FILES}, объём: {total / 1024 / 1024:.0f} МБ, "
+              f"ядер: {os.cpu_count()}")
+        runs = [
+            ("deflate для всех файлов", None),
+            ("CompressionPolicy", CompressionPolicy()),
+            ("CompressionPolicy + lzma", CompressionPolicy(strong_method="lzma")),
+        ]
+        for title, policy in runs:
+            archive_path = os.path.join(out, "Bench.zip")
+            start = time.perf_counter()
+            methods = archive(root, archive_path, policy)
+            elapsed = time.perf_counter() - start
+            print(f"{title:<26} {elapsed:6.2f} с, {total / elapsed / 1024 / 1024:6.1f} МБ/с, "
+                  f"архив {os.path.getsize(archive_path) / 1024 / 1024:6.1f} МБ, {dict(methods)}")
+            with zipfile.ZipFile(archive_path) as zf:
+                assert zf.testzip() is None
+            os.remove(archive_path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Резервные копии директории Глобальных Проектов с повторяющимися данными (иконки, копии SourceData):
+ZIP каждый раз против хранилища DedupStore (archive_type="dedup").
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_dedup_store
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from WorkArchiveFiles.App import DedupStore as dedup
+from WorkArchiveFiles.App.DedupStore import DedupStore
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+PROJECTS = 20
+SNAPSHOTS = 3
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+
+
+def make_tree(root, rng):
+    icons = [rng.randbytes(30 * 1024) for _ in range(5)]
+    shared = rng.randbytes(2 * 1024 * 1024)
+    for project in range(PROJECTS):
+        base = f"{root}/{project}"
+        for i, icon in enumerate(icons):
+            write(f"{base}/{i}.png", icon)
+        write(f"{base}/SourceData/Shared.bin", shared)
+        write(f"{base}/ResultData/Result.bin", rng.randbytes(256 * 1024))
+
+
+def zip_tree(root, archive_path):
+    with ParallelZipWriter(archive_path, workers=1) as zf:
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                full_path = os.path.join(dirpath, name)
+                zf.write(full_path, arcname=os.path.relpath(full_path, root))
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(dirpath, name)) for dirpath, _, files in os.walk(path) for name in files)
+
+
+def main():
+    rng = random.Random(11)
+    temp = tempfile.mkdtemp()
+    source = f"{temp}/GlobalProjects"
+    try:
+        make_tree(source, rng)
+        print(f"Проектов: {PROJECTS}, объём: {directory_size(source) / 1024 / 1024:.1f} МБ, "
+              f"numpy: {'да' if dedup.np is not None else 'нет'}")
+        os.makedirs(f"{temp}/Zip")
+        zip_time = dedup_time = 0.0
+        with DedupStore(f"{temp}/Store.dedup") as store:
+            for snapshot in range(SNAPSHOTS):
+                if snapshot:
+                    write(f"{source}/{rng.randrange(PROJECTS)}/ResultData/Result.bin", rng.randbytes(256 * 1024))
+                start = time.perf_counter()
+                zip_tree(source, f"{temp}/Zip/{snapshot}.zip")
+                zip_time += time.perf_counter() - start
+                result = store.backup(source, "GlobalProjects")
+                dedup_time += result["Duration"]
+            stats = store.stats()
+        print(f"ZIP x{SNAPSHOTS}:      {zip_time:6.2f} с, на диске {directory_size(f'{temp}/Zip') / 1024 / 1024:7.1f} МБ")
+        print(f"DedupStore x{SNAPSHOTS}: {dedup_time:6.2f} с, на диске "
+              f"{directory_size(f'{temp}/Store.dedup') / 1024 / 1024:7.1f} МБ")
+        print(f"Коэффициент дедупликации {stats['DedupRatio']:.1f}, сжатия {stats['CompressionRatio']:.2f}, "
+              f"уникальных чанков {stats['UniqueChunks']}")
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
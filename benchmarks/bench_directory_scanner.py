@@ -0,0 +1,68 @@
+"""
+Время получения списка файлов проекта: прежний os.walk + полная естественная сортировка
+против directory_scanner (os.scandir, кэш ключей, limit через heapq.nsmallest).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_directory_scanner
+"""
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services import directory_scanner
+
+FILES = 100000
+PER_DIRECTORY = 5000
+LIMIT = 1000
+
+
+def walk_list_files(root):
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for fn in filenames:
+            files.append(os.path.join(dirpath, fn).replace("\\", "/"))
+
+    def natural_key(path):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+    files.sort(key=natural_key)
+    return files
+
+
+def measure(function):
+    directory_scanner.natural_name_key.cache_clear()
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        for i in range(FILES):
+            directory = f"{root}/SourceData/{i // PER_DIRECTORY}"
+            if i % PER_DIRECTORY == 0:
+                os.makedirs(directory)
+            open(f"{directory}/Файл {i}.txt", "w").close()
+        open(f"{root}/1.exe", "w").close()
+
+        print(f"Файлов: {FILES}")
+        old, old_files = measure(lambda: walk_list_files(root))
+        print(f"os.walk + сортировка всего списка      {old:9.1f} мс")
+        new, new_files = measure(lambda: directory_scanner.list_files(root))
+        print(f"directory_scanner.list_files           {new:9.1f} мс")
+        assert new_files == old_files
+        limited, limited_files = measure(lambda: directory_scanner.list_files(root, limit=LIMIT))
+        print(f"directory_scanner.list_files(limit={LIMIT}) {limited:7.1f} мс")
+        assert limited_files == old_files[:LIMIT]
+        top, _ = measure(lambda: directory_scanner.list_files(root, max_depth=0))
+        print(f"directory_scanner.list_files(max_depth=0) {top:6.1f} мс")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Поиск файлов по имени на дереве из 200 тысяч файлов: прежний обход os.walk на каждый запрос
+против FileIndexService (SQLite, инкрементальное обновление по mtime папок).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_file_index
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services.file_index_service import FileIndexService
+
+FILES = 200000
+PER_DIRECTORY = 2000
+QUERIES = 200
+
+
+def walk_search_files(root, keyword):
+    result = []
+    for dirpath, _, filenames in os.walk(root):
+        for file in filenames:
+            if keyword in file:
+                result.append(os.path.join(dirpath, file).replace("\\", "/"))
+    return result
+
+
+def elapsed_ms(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    root = tempfile.mkdtemp().replace("\\", "/")
+    index_path = tempfile.mktemp(suffix=".sqlite")
+    try:
+        for i in range(FILES):
+            directory = f"{root}/Applications/{i // PER_DIRECTORY}"
+            if i % PER_DIRECTORY == 0:
+                os.makedirs(directory)
+            open(f"{directory}/{i}.exe", "w").close()
+        # Дерево создано "давно" - иначе все папки попадают в окно RACY_SECONDS и перечитываются
+        old = time.time() - 3600
+        for dirpath, _, _ in os.walk(root):
+            os.utime(dirpath, (old, old))
+        print(f"Файлов: {FILES}, папок: {FILES // PER_DIRECTORY}")
+
+        walk, expected = elapsed_ms(lambda: walk_search_files(root, "12345"))
+        print(f"os.walk + подстрока, один запрос         {walk:9.1f} мс")
+
+        service = FileIndexService(root, index_path=index_path)
+        build, _ = elapsed_ms(service.refresh)
+        print(f"Построение индекса                       {build:9.1f} мс")
+        refresh, _ = elapsed_ms(service.refresh)
+        print(f"Обновление без изменений (stat папок)    {refresh:9.2f} мс")
+        open(f"{root}/Applications/7/new.exe", "w").close()
+        changed, _ = elapsed_ms(service.refresh)
+        print(f"Обновление, изменилась одна папка        {changed:9.2f} мс")
+
+        service.refresh_interval = 60
+        found = service.search_files("12345")
+        assert sorted(found) == sorted(expected), (found, expected)
+        for title, query, argument in (("подстрока", service.search_files, "12345"),
+                                       ("префикс", service.search_prefix, "19999"),
+                                       ("glob", service.search_glob, "1234?.exe")):
+            total, _ = elapsed_ms(lambda: [query(argument) for _ in range(QUERIES)])
+            print(f"Запрос ({title:<9}), среднее              {total / QUERIES:9.3f} мс")
+        service.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(index_path + suffix):
+                os.remove(index_path + suffix)
+
+
+if __name__ == '__main__':
+    main()
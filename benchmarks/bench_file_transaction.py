@@ -0,0 +1,75 @@
+"""
+Сравнение количества операций чтения/записи и времени StructureUtils.createStructure
+и установки 8 тегов деталей - без транзакции (как раньше) и внутри FileService.transaction().
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_file_transaction
+"""
+import builtins
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from unittest import mock
+
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.structure_utils import StructureUtils
+
+ROUNDS = 50
+
+
+@contextmanager
+def count_io(counter: dict):
+    real_open = builtins.open
+    real_replace = os.replace
+
+    def counting_open(file, mode='r', *args, **kwargs):
+        if str(file).endswith(".json") and 'r' in mode:
+            counter["reads"] += 1
+        return real_open(file, mode, *args, **kwargs)
+
+    def counting_replace(src, dst, *args, **kwargs):
+        counter["writes"] += 1
+        return real_replace(src, dst, *args, **kwargs)
+
+    with mock.patch("builtins.open", counting_open), mock.patch("os.replace", counting_replace):
+        yield counter
+
+
+def create_and_fill(base_dir, index, use_transaction):
+    structure = StructureUtils(str(index), base_dir)
+    context = FileService.transaction(fsync=False) if use_transaction else nullcontext()
+    with context:
+        structure.createStructure(onFSDocFile=True)
+        structure.setDirectoryDescription("Описание директории")
+        structure.setDirectoryDetailName(f"Директория {index}")
+        structure.setDirectoryPriority("1")
+        structure.setDirectoryTotalSize("0")
+        structure.setDirectoryFileCount("0")
+        structure.setDirectoryCreatedAt("12-01-2025 09:36:41")
+        structure.setDirectoryModifiedAt("12-03-2025 13:46:41")
+        structure.setDirectoryDirLinks("C:/Links/1")
+
+
+def run(use_transaction):
+    base_dir = tempfile.mkdtemp()
+    counter = {"reads": 0, "writes": 0}
+    try:
+        with count_io(counter):
+            start = time.perf_counter()
+            for index in range(ROUNDS):
+                create_and_fill(base_dir, index, use_transaction)
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return elapsed, counter
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    for title, use_transaction in (("Без транзакции", False), ("FileService.transaction()", True)):
+        elapsed, counter = run(use_transaction)
+        print(f"{title:<28} структур: {ROUNDS:>4}  чтений: {counter['reads']:>5}  записей: {counter['writes']:>5}  "
+              f"время: {elapsed * 1000:8.1f} мс  ({elapsed / ROUNDS * 1000:.2f} мс на структуру)")
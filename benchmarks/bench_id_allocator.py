@@ -0,0 +1,67 @@
+"""
+Регистрация нового приложения в директории ярлыков: прежний перебор search_files(str(ID))
+(обход директории на каждую попытку) против IDAllocatorService.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_id_allocator
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services.id_allocator_service import IDAllocatorService
+
+APPLICATIONS = 900
+NEW_APPLICATIONS = 50
+
+
+def walk_search_files(root, keyword):
+    result = []
+    for dirpath, _, filenames in os.walk(root):
+        for file in filenames:
+            if keyword in file:
+                result.append(os.path.join(dirpath, file).replace("\\", "/"))
+    return result
+
+
+def create_app(directory, iD):
+    for name in (f"{iD}.exe.lnk", f"{iD}.png"):
+        open(f"{directory}/{name}", "w").close()
+
+
+def probe_register(directory):
+    file_name_id = 1
+    while walk_search_files(directory, str(file_name_id)):
+        file_name_id += 1
+    create_app(directory, file_name_id)
+    return file_name_id
+
+
+def allocator_register(allocator):
+    with allocator.reserve() as file_name_id:
+        create_app(allocator.directory, file_name_id)
+    return file_name_id
+
+
+def main():
+    for title, register in (("Перебор search_files", probe_register), ("IDAllocatorService", allocator_register)):
+        directory = tempfile.mkdtemp().replace("\\", "/")
+        try:
+            for iD in range(1, APPLICATIONS + 1):
+                create_app(directory, iD)
+            target = directory if register is probe_register else IDAllocatorService(
+                directory, lock_path=f"{directory}.lock")
+            start = time.perf_counter()
+            ids = [register(target) for _ in range(NEW_APPLICATIONS)]
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{title:<22} {elapsed / NEW_APPLICATIONS:9.3f} мс на приложение (ID {ids[0]}..{ids[-1]})")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+            if os.path.exists(f"{directory}.lock"):
+                os.remove(f"{directory}.lock")
+    print(f"Уже зарегистрировано приложений: {APPLICATIONS}")
+
+
+if __name__ == '__main__':
+    main()
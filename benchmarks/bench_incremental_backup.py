@@ -0,0 +1,80 @@
+"""
+Ночные резервные копии проекта: полный архив каждую ночь (прежний archive_data)
+против цепочки IncrementalBackup, когда за день меняется около 1% файлов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_incremental_backup
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from WorkArchiveFiles.App.IncrementalBackup import IncrementalBackup
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+FILES = 3000
+NIGHTS = 5
+CHANGED_PER_NIGHT = 30
+
+
+def write_file(rng, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(rng.randbytes(rng.randint(1000, 8000)) + b"MGSD" * rng.randint(1000, 5000))
+
+
+def full_archive(source, archive_path):
+    with ParallelZipWriter(archive_path, workers=1) as zf:
+        for dirpath, _, files in os.walk(source):
+            for name in files:
+                full_path = os.path.join(dirpath, name)
+                zf.write(full_path, arcname=os.path.relpath(full_path, source))
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(dirpath, name)) for dirpath, _, files in os.walk(path) for name in files)
+
+
+def main():
+    rng = random.Random(3)
+    temp = tempfile.mkdtemp()
+    source = os.path.join(temp, "Project")
+    paths = [os.path.join(source, "SourceData", str(i // 100), f"{i}.bin") for i in range(FILES)]
+    try:
+        for path in paths:
+            write_file(rng, path)
+        full_dir = os.path.join(temp, "Full")
+        os.makedirs(full_dir)
+        backup = IncrementalBackup(source, os.path.join(temp, "Incremental"))
+        full_times = []
+        incremental_times = []
+        for night in range(NIGHTS):
+            if night:
+                for path in rng.sample(paths, CHANGED_PER_NIGHT):
+                    write_file(rng, path)
+            start = time.perf_counter()
+            full_archive(source, os.path.join(full_dir, f"{night}.zip"))
+            full_times.append(time.perf_counter() - start)
+            result = backup.backup(workers=1)
+            incremental_times.append(result["Duration"])
+            print(f"Ночь {night + 1}: {result['Mode']:<11} изменено {result['Changed']:5} файлов, "
+                  f"полный архив {full_times[-1]:.2f} с, копия {result['Duration']:.2f} с")
+        print(f"Файлов: {FILES}, ночей: {NIGHTS}, изменяется за ночь: {CHANGED_PER_NIGHT}")
+        print(f"Полный архив каждую ночь:  {sum(full_times):7.2f} с, "
+              f"на диске {directory_size(full_dir) / 1024 / 1024:7.1f} МБ")
+        print(f"IncrementalBackup:         {sum(incremental_times):7.2f} с, "
+              f"на диске {directory_size(backup.backup_dir) / 1024 / 1024:7.1f} МБ")
+        nightly = slice(1, None)
+        print(f"Обычная ночь (после первой): {sum(full_times[nightly]) / (NIGHTS - 1):.2f} с против "
+              f"{sum(incremental_times[nightly]) / (NIGHTS - 1):.3f} с")
+        start = time.perf_counter()
+        backup.restore(os.path.join(temp, "Restored"))
+        print(f"Восстановление последней копии из цепочки: {time.perf_counter() - start:.2f} с")
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Скорость encode/decode json_codec на всех установленных бэкендах (orjson/ujson/msgspec/json)
+для сгенерированного MAIN_STRUCTURE_DATA с тысячами глобальных проектов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_json_codec [количество глобальных проектов]
+"""
+import sys
+import time
+
+from TemplateProject.core.services import json_codec
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkProjectManager.AppData.schemas import MAIN_STRUCTURE_DATA, GLOBAL_PROJECT_STRUCTURE_DATA, \
+    GLOBAL_PROJECT_PROJECT_STRUCTURE_DATA, PROJECT_STRUCTURE_DATA
+
+ROUNDS = 5
+
+
+def generate_structure(global_projects_count: int) -> dict:
+    data = copy_json_data(MAIN_STRUCTURE_DATA)
+    global_projects = data["DataChunks"][0]["GlobalProjectsData"]
+    for global_index in range(1, global_projects_count + 1):
+        global_project = copy_json_data(GLOBAL_PROJECT_STRUCTURE_DATA)
+        global_project["GlobalProjectID"] = str(global_index)
+        global_project["GlobalProjectName"] = f"Глобальный проект {global_index}"
+        global_project["GlobalProjectDescription"] = "Описание глобального проекта " * 3
+        for project_index in range(1, 4):
+            project = copy_json_data(GLOBAL_PROJECT_PROJECT_STRUCTURE_DATA)
+            project["ProjectID"] = str(project_index)
+            project["ProjectName"] = f"Проект {global_index}-{project_index}"
+            project["ProjectType"] = "Code"
+            project["ProjectData"] = [copy_json_data(PROJECT_STRUCTURE_DATA)]
+            global_project["GlobalProjectProjectsData"].append(project)
+        global_projects.append(global_project)
+    return data
+
+
+def measure(function, *args):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    data = generate_structure(count)
+    print(f"Глобальных проектов: {count}, лучшее из {ROUNDS} запусков")
+    print(f"{'backend':<10}{'mode':<10}{'size, KB':>10}{'encode, ms':>12}{'decode, ms':>12}{'enc MB/s':>10}{'dec MB/s':>10}")
+    for name in json_codec.available_backends():
+        codec = json_codec.get_codec(name)
+        for compact in (False, True):
+            encode_time, encoded = measure(codec.encode, data, compact)
+            decode_time, decoded = measure(codec.decode, encoded)
+            assert decoded == data
+            size_mb = len(encoded) / 1024 / 1024
+            print(f"{name:<10}{'compact' if compact else 'indent':<10}{len(encoded) / 1024:>10.0f}"
+                  f"{encode_time * 1000:>12.1f}{decode_time * 1000:>12.1f}"
+                  f"{size_mb / encode_time:>10.0f}{size_mb / decode_time:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
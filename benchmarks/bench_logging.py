@@ -0,0 +1,56 @@
+"""
+Задержка FileService.write_file на большом json документе при разных уровнях логирования.
+Для сравнения - стоимость прежнего f-строкового сообщения с полным содержимым документа.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_logging
+"""
+import io
+import logging
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services.file_service import FileService
+
+ROUNDS = 20
+ITEMS = 20000
+
+
+def measure(function):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    content = {"DataChunks": [{"ID": str(i), "Name": f"Элемент {i}", "Tags": ["1", "2"]} for i in range(ITEMS)]}
+    base_dir = tempfile.mkdtemp()
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    logger = logging.getLogger("FileService")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        file = FileService(base_dir, "Bench", "json", compact=True)
+        file.create_file({})
+        print(f"Элементов в документе: {ITEMS}, лучшее из {ROUNDS} запусков")
+        for level in (logging.WARNING, logging.INFO, logging.DEBUG):
+            logger.setLevel(level)
+            elapsed = measure(lambda: file.write_file(content))
+            print(f"write_file, уровень {logging.getLevelName(level):<8} {elapsed:8.2f} мс"
+                  f"   (в лог записано {len(stream.getvalue()) // 1024} KB)")
+            stream.seek(0)
+            stream.truncate()
+        eager = measure(lambda: f"[📁] - FileService - write_file - Параметры записи: {content, False, False}")
+        print(f"Прежнее f-строковое сообщение с документом: {eager:8.2f} мс на одну запись")
+    finally:
+        logger.removeHandler(handler)
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
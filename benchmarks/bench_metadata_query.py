@@ -0,0 +1,101 @@
+"""
+Поиск по мета-данным всего дерева структур: директории с Priority == "high" и файлы, ссылающиеся на "X":
+    вручную          - обход по SubdirectoryInfo, MetadataUtils каждой структуры, перебор тегов
+    MetadataQuery    - первый запрос (построение индекса), повторный (документы не менялись)
+                       и после изменения одного документа
+
+Дерево: 3 уровня по 6 структур (259 DSDocFile.json), в каждой FSDocFile.json с 40 файлами.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_metadata_query
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_query import MetadataQuery
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+BRANCHING = 6
+DEPTH = 3
+FILES_PER_STRUCTURE = 40
+
+
+def make_tree(root):
+    count = 0
+    level = [root]
+    directories = [root]
+    for _ in range(DEPTH):
+        level = [f"{parent}/{index}" for parent in level for index in range(1, BRANCHING + 1)]
+        directories.extend(level)
+    with FileService.transaction(fsync=False):
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+            metadata = MetadataUtils(directory)
+            metadata.createDSDocFile()
+            metadata.createFSDocFile()
+            metadata.writeMetadataDSDocFile("Details", "Priority", "high" if count % 10 == 0 else "low")
+            if directory.count("/") - root.count("/") < DEPTH:
+                metadata.DSDoc.merge({"Directory": {"SubdirectoryInfo": {
+                    str(index): {"Dirname": str(index), "DetailName": "", "DocFile": "DSDocFile.json"}
+                    for index in range(1, BRANCHING + 1)}}})
+            metadata.register_files([(str(number), f"{number}.json",
+                                      {"FilesLinks": ["X"] if (count + number) % 97 == 0 else []})
+                                     for number in range(1, FILES_PER_STRUCTURE + 1)])
+            count += 1
+    return directories
+
+
+def manual(root):
+    directories, files = [], []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        metadata = MetadataUtils(directory)
+        if metadata.readMetadataSDocFile("Directory", "21", "Priority") == "high":
+            directories.append(directory)
+        for sdn, entry in metadata.readMetadataSDocFile("Directory", "22", "-1").items():
+            if entry["Dirname"]:
+                stack.append(f"{directory}/{entry['Dirname']}")
+        for file_id, entry in metadata.readMetadataSDocFile("Files", "Files", "SystemFiles").items():
+            if "X" in entry["FileDetails"]["FilesLinks"]:
+                files.append(f"{directory}/{entry['DirName']}")
+    return len(directories), len(files)
+
+
+def indexed(query):
+    return len(query.directories(where={"Priority": "high"})), len(query.files(where={"FilesLinks": "X"}))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    base = tempfile.mkdtemp()
+    try:
+        root = base + "/Main"
+        directories = make_tree(root)
+        print(f"Структур: {len(directories)}, файлов: {len(directories) * FILES_PER_STRUCTURE}, ядер: {os.cpu_count()}")
+        elapsed, expected = timed(lambda: manual(root))
+        print(f"{'Вручную':<36} {elapsed * 1000:9.1f} мс  найдено: {expected}")
+
+        query = MetadataQuery(root, index_path=base + "/Index.sqlite")
+        query.RACY_SECONDS = 0
+        for title in ("MetadataQuery, построение индекса", "MetadataQuery, повторно"):
+            elapsed, result = timed(lambda: indexed(query))
+            assert result == expected, (result, expected)
+            print(f"{title:<36} {elapsed * 1000:9.1f} мс  найдено: {result}")
+
+        MetadataUtils(f"{root}/3/2/1").writeMetadataDSDocFile("Details", "Priority", "high")
+        elapsed, result = timed(lambda: indexed(query))
+        print(f"{'MetadataQuery, изменён один документ':<36} {elapsed * 1000:9.1f} мс  найдено: {result}")
+        query.close()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
@@ -0,0 +1,64 @@
+"""
+Изменение тегов DSDocFile.json структуры с большим SubdirectoryInfo:
+    json      - MetadataUtils: каждое изменение перезаписывает json документ целиком
+    sidecar   - MetadataUtils(sidecar=True): изменение дописывается в журнал, json и двоичный снимок
+                записываются при уплотнении журнала
+
+Печатает время изменений, размер json и снимка, время открытия документа заново.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_metadata_sidecar
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services.doc_sidecar import sidecar_paths
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+SUBDIRECTORIES = (500, 5000)
+UPDATES = 500
+
+
+def make_document(directory, subdirectories):
+    metadata = MetadataUtils(directory)
+    metadata.createDSDocFile()
+    metadata.DSDoc.merge({"Directory": {"SubdirectoryInfo": {
+        str(number): {"Dirname": f"Directory {number}", "DetailName": f"Detail {number}", "DocFile": "DSDocFile.json"}
+        for number in range(1, subdirectories + 1)}}})
+
+
+def run(subdirectories, sidecar):
+    directory = tempfile.mkdtemp()
+    try:
+        make_document(directory, subdirectories)
+        metadata = MetadataUtils(directory, sidecar=sidecar)
+        metadata.readMetadataSDocFile("Directory", "21", "Priority")
+        start = time.perf_counter()
+        for number in range(UPDATES):
+            metadata.writeMetadataDSDocFile("Details", "Priority", str(number))
+            metadata.writeMetadataDSDocFile("Details", "TotalSize", number * 1024)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = MetadataUtils(directory, sidecar=sidecar)
+        assert reopened.readMetadataSDocFile("Directory", "21", "Priority") == str(UPDATES - 1)
+        load = time.perf_counter() - start
+        json_size = os.path.getsize(metadata.DSDocFile.get_file_path())
+        snapshot_path, log_path = sidecar_paths(metadata.DSDocFile.get_file_path())
+        sidecar_size = sum(os.path.getsize(path) for path in (snapshot_path, log_path) if os.path.exists(path))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return elapsed, load, json_size, sidecar_size
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    for subdirectories in SUBDIRECTORIES:
+        for title, sidecar in (("json", False), ("sidecar", True)):
+            elapsed, load, json_size, sidecar_size = run(subdirectories, sidecar)
+            print(f"{title:<8} SdN: {subdirectories:>5}  {UPDATES * 2} изменений: {elapsed * 1000:8.1f} мс  "
+                  f"json: {json_size / 1024:7.1f} КБ  снимок+журнал: {sidecar_size / 1024:7.1f} КБ  "
+                  f"открытие: {load * 1000:6.1f} мс")
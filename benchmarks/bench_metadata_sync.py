@@ -0,0 +1,90 @@
+"""
+Заполнение TotalSize, FileCount, CreatedAt, ModifiedAt во всех DSDocFile.json структуры:
+    вручную        - для каждой структуры свой os.walk поддерева и четыре сеттера
+                     (writeMetadataDSDocFile на тег, как StructureUtils.setDirectoryTotalSize и т.д.)
+    MetadataSync   - один параллельный обход, итоги снизу вверх, одна пачка записи
+    повторно       - MetadataSync после изменения одной папки (инкрементально)
+
+Дерево: 3 уровня по 6 структур (259 DSDocFile.json), в каждой 40 файлов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_metadata_sync
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from TemplateProject.core.ss_utils.metadata_sync import DATE_FORMAT, DOC_FILES, MetadataSync
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+BRANCHING = 6
+DEPTH = 3
+FILES_PER_DIRECTORY = 40
+
+
+def make_tree(root):
+    directories = [root]
+    level = [root]
+    for _ in range(DEPTH):
+        level = [f"{parent}/{index}" for parent in level for index in range(1, BRANCHING + 1)]
+        directories.extend(level)
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+        MetadataUtils(directory).createDSDocFile()
+        for index in range(FILES_PER_DIRECTORY):
+            with open(f"{directory}/{index}.dat", "wb") as file:
+                file.write(b"x" * (index * 10))
+    return directories
+
+
+def manual(directories):
+    for directory in directories:
+        size = count = latest = 0
+        for dirpath, _, files in os.walk(directory):
+            for name in files:
+                if name in DOC_FILES:
+                    continue
+                stat = os.stat(os.path.join(dirpath, name))
+                size += stat.st_size
+                count += 1
+                latest = max(latest, stat.st_mtime)
+        metadata = MetadataUtils(directory)
+        metadata.writeMetadataDSDocFile("Details", "TotalSize", size)
+        metadata.writeMetadataDSDocFile("Details", "FileCount", count)
+        metadata.writeMetadataDSDocFile("Details", "CreatedAt",
+                                        datetime.fromtimestamp(os.stat(directory).st_ctime).strftime(DATE_FORMAT))
+        metadata.writeMetadataDSDocFile("Details", "ModifiedAt", datetime.fromtimestamp(latest).strftime(DATE_FORMAT))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    base = tempfile.mkdtemp()
+    try:
+        root = base + "/Main"
+        directories = make_tree(root)
+        print(f"Структур: {len(directories)}, файлов: {len(directories) * FILES_PER_DIRECTORY}, ядер: {os.cpu_count()}")
+        sync = MetadataSync(root, state_path=base + "/State.json", fsync=False)
+        sync.RACY_SECONDS = 0
+        elapsed, result = timed(lambda: sync.sync(full=True))
+        print(f"{'MetadataSync, полный':<36} {elapsed * 1000:9.1f} мс  документов записано: {result['DocFiles']}")
+        sync.sync()  # папки, в которые записаны документы, перечитываются один раз
+
+        with open(f"{root}/3/2/1/New.dat", "wb") as file:
+            file.write(b"x" * 1000)
+        elapsed, result = timed(sync.sync)
+        print(f"{'MetadataSync, изменена одна папка':<36} {elapsed * 1000:9.1f} мс  перечитано папок: "
+              f"{result['Scanned']}, документов записано: {result['DocFiles']}")
+
+        elapsed, _ = timed(lambda: manual(directories))
+        print(f"{'Вручную (os.walk + 4 сеттера)':<36} {elapsed * 1000:9.1f} мс")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
@@ -0,0 +1,129 @@
+"""
+1000 изменений мета-данных директории (теги деталей, DirLinks) с чтением тега после каждого изменения.
+DSDocFile.json с 300 поддиректориями в SubdirectoryInfo.
+
+    чтение с диска на каждый вызов - как MetadataUtils до DocFile: каждый геттер читает и разбирает файл,
+                                      сеттер пишет с safeMode (чтение + запись), DirLinks - ещё одно чтение
+    DocFile, autoflush              - MetadataUtils: документ в памяти, запись файла на каждое изменение
+    DocFile, autoflush=False        - все изменения в памяти, одна запись в конце (flush)
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_metadata_updates
+"""
+import builtins
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from TemplateProject.core.services.file_service import FileService
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+UPDATES = 1000
+SUBDIRECTORIES = 300
+TAGS = ("Priority", "TotalSize", "FileCount", "ModifiedAt")
+
+
+@contextmanager
+def count_io(counter: dict):
+    real_open = builtins.open
+    real_replace = os.replace
+
+    def counting_open(file, mode='r', *args, **kwargs):
+        if str(file).endswith(".json") and 'r' in mode:
+            counter["reads"] += 1
+        return real_open(file, mode, *args, **kwargs)
+
+    def counting_replace(src, dst, *args, **kwargs):
+        counter["writes"] += 1
+        return real_replace(src, dst, *args, **kwargs)
+
+    with mock.patch("builtins.open", counting_open), mock.patch("os.replace", counting_replace):
+        yield counter
+
+
+class DiskMetadata:
+    """Пути чтения и записи MetadataUtils до DocFile"""
+
+    def __init__(self, directory):
+        self.DSDocFile = FileService(directory, file_name='DSDocFile', file_extension='json')
+
+    def set_detail(self, tag, value):
+        self.DSDocFile.write_file({"Directory": {"Details": {tag: value}}}, safeMode=True)
+
+    def add_dir_link(self, link):
+        dir_links = self.get_detail("DirLinks") or []
+        if link not in dir_links:
+            dir_links.append(link)
+            self.DSDocFile.write_file({"Directory": {"Details": {"DirLinks": dir_links}}}, safeMode=True)
+
+    def get_detail(self, tag):
+        return self.DSDocFile.read_file()[1]["Directory"]["Details"][tag]
+
+    def flush(self):
+        pass
+
+
+class DocFileMetadata:
+    def __init__(self, directory, autoflush):
+        self.metadata = MetadataUtils(directory, autoflush=autoflush)
+
+    def set_detail(self, tag, value):
+        self.metadata.writeMetadataDSDocFile("Details", tag, value)
+
+    def add_dir_link(self, link):
+        self.metadata.writeMetadataDSDocFile("Details", "DirLinks", link)
+
+    def get_detail(self, tag):
+        return self.metadata.readMetadataSDocFile("Directory", "21", tag)
+
+    def flush(self):
+        self.metadata.flush()
+
+
+def make_doc_file(directory):
+    metadata = MetadataUtils(directory)
+    metadata.createDSDocFile()
+    metadata.DSDoc.merge({"Directory": {"SubdirectoryInfo": {
+        str(index): {"Dirname": f"Dir{index}", "DetailName": f"Поддиректория {index}", "DocFile": "DSDocFile.json"}
+        for index in range(1, SUBDIRECTORIES + 1)}}})
+
+
+def run(make_metadata):
+    directory = tempfile.mkdtemp()
+    counter = {"reads": 0, "writes": 0}
+    try:
+        make_doc_file(directory)
+        metadata = make_metadata(directory)
+        with count_io(counter):
+            start = time.perf_counter()
+            for index in range(UPDATES):
+                if index % 10 == 9:
+                    metadata.add_dir_link(f"C:/Links/{index}")
+                    metadata.get_detail("DirLinks")
+                else:
+                    tag = TAGS[index % len(TAGS)]
+                    metadata.set_detail(tag, str(index))
+                    assert metadata.get_detail(tag) == str(index)
+            metadata.flush()
+            elapsed = time.perf_counter() - start
+        result = FileService(directory, "DSDocFile", "json").read_file()[1]["Directory"]["Details"]
+        assert len(result["DirLinks"]) == UPDATES // 10, result["DirLinks"]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return elapsed, counter
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    for title, make_metadata in (
+            ("Чтение с диска на каждый вызов", DiskMetadata),
+            ("DocFile, autoflush", lambda directory: DocFileMetadata(directory, autoflush=True)),
+            ("DocFile, autoflush=False", lambda directory: DocFileMetadata(directory, autoflush=False)),
+    ):
+        elapsed, counter = run(make_metadata)
+        print(f"{title:<32} изменений: {UPDATES:>5}  чтений: {counter['reads']:>5}  записей: {counter['writes']:>5}  "
+              f"время: {elapsed * 1000:8.1f} мс  ({elapsed / UPDATES * 1000:.3f} мс на изменение)")
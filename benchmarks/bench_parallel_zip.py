@@ -0,0 +1,87 @@
+"""
+Архивирование синтетического дерева (много мелких файлов и несколько больших) в ZIP:
+последовательный zipfile.write (как прежний _create_zip_archive без пароля) против ParallelZipWriter.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_parallel_zip
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from WorkArchiveFiles.App.ParallelZipWriter import ParallelZipWriter
+
+SMALL_FILES = 2000
+LARGE_FILES = 4
+LARGE_SIZE = 32 * 1024 * 1024
+
+
+def text_block(rng, size):
+    words = [b"MGSD", b"Project", b"Data", b"Chunk", b"Archive", b"Global", b"ID"]
+    return b" ".join(rng.choice(words) + str(rng.randint(0, 9999)).encode() for _ in range(size // 9))[:size]
+
+
+def make_tree(root):
+    rng = random.Random(7)
+    for i in range(SMALL_FILES):
+        directory = os.path.join(root, "SourceData", str(i // 200))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{i}.json"), "wb") as file:
+            file.write(text_block(rng, rng.randint(200, 20000)))
+    os.makedirs(os.path.join(root, "ResultData"), exist_ok=True)
+    for i in range(LARGE_FILES):
+        with open(os.path.join(root, "ResultData", f"Large{i}.bin"), "wb") as file:
+            # Наполовину сжимаемые данные
+            for _ in range(LARGE_SIZE // (1024 * 1024)):
+                file.write(text_block(rng, 512 * 1024) + rng.randbytes(512 * 1024))
+
+
+def members(root):
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            full_path = os.path.join(dirpath, file)
+            yield full_path, os.path.relpath(full_path, root)
+
+
+def sequential(root, archive_path):
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for full_path, arcname in members(root):
+            zf.write(full_path, arcname=arcname)
+
+
+def parallel(root, archive_path, workers):
+    with ParallelZipWriter(archive_path, workers=workers) as zf:
+        for full_path, arcname in members(root):
+            zf.write(full_path, arcname=arcname)
+
+
+def main():
+    root = tempfile.mkdtemp()
+    out = tempfile.mkdtemp()
+    try:
+        make_tree(root)
+        total = sum(os.path.getsize(path) for path, _ in members(root))
+        print(f"Файлов: {SMALL_FILES + LARGE_FILES}, объём: {total / 1024 / 1024:.0f} МБ, ядер: {os.cpu_count()}")
+        runs = [("zipfile, последовательно", lambda path: sequential(root, path))]
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            runs.append((f"ParallelZipWriter, потоков {workers}", lambda path, w=workers: parallel(root, path, w)))
+        for title, run in runs:
+            archive_path = os.path.join(out, "Bench.zip")
+            start = time.perf_counter()
+            run(archive_path)
+            elapsed = time.perf_counter() - start
+            print(f"{title:<32} {elapsed:7.2f} с, {total / elapsed / 1024 / 1024:7.1f} МБ/с, "
+                  f"архив {os.path.getsize(archive_path) / 1024 / 1024:.1f} МБ")
+            with zipfile.ZipFile(archive_path) as zf:
+                assert zf.testzip() is None
+            os.remove(archive_path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Исключения при обходе проекта с большими .venv и node_modules:
+обход всего дерева с проверкой каждого пути через fnmatch против PathMatcher,
+который отсекает исключённые папки целиком и проверяет шаблоны одним регулярным выражением.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_path_matcher
+"""
+import fnmatch
+import os
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.services import directory_scanner
+from TemplateProject.core.services.path_matcher import PathMatcher
+
+PATTERNS = ["__pycache__/", ".venv/", "node_modules/", "*.log", "*.tmp", "/build/", "docs/**/*.bak", "!keep.log"]
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def make_tree(root):
+    for package in range(300):
+        for i in range(40):
+            touch(f"{root}/.venv/Lib/site-packages/package{package}/module{i}.py")
+    for package in range(500):
+        for i in range(30):
+            touch(f"{root}/web/node_modules/package{package}/lib/file{i}.js")
+    for project in range(100):
+        for i in range(30):
+            touch(f"{root}/Projects/{project}/SourceData/{i}.json")
+        touch(f"{root}/Projects/{project}/debug.log")
+        touch(f"{root}/Projects/{project}/__pycache__/cache.pyc")
+
+
+def naive(root):
+    """Обход всего дерева, каждый путь сверяется со всеми шаблонами (без отсечения папок)"""
+    plain = [pattern.rstrip("/").lstrip("/") for pattern in PATTERNS if not pattern.startswith("!")]
+    result = []
+    for dirpath, _, files in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace("\\", "/")
+        parts = [] if rel_dir == "." else rel_dir.split("/")
+        if any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in plain):
+            continue
+        for name in files:
+            if not any(fnmatch.fnmatch(name, pattern) for pattern in plain) or name == "keep.log":
+                result.append(f"{dirpath}/{name}")
+    return result
+
+
+def main():
+    root = tempfile.mkdtemp().replace("\\", "/")
+    try:
+        make_tree(root)
+        total = sum(len(files) for _, _, files in os.walk(root))
+        print(f"Файлов в дереве: {total}")
+        runs = [
+            ("os.walk + fnmatch по всем путям", lambda: naive(root)),
+            ("scan_files + PathMatcher", lambda: list(directory_scanner.scan_files(root, exclude=PathMatcher(PATTERNS)))),
+        ]
+        for title, run in runs:
+            start = time.perf_counter()
+            files = run()
+            print(f"{title:<34} {(time.perf_counter() - start) * 1000:8.1f} мс, файлов: {len(files)}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Редактирование и удаление Глобальных Проектов, Проектов и Приложений через индексы ListIndex
+в сравнении с прежним линейным поиском - на структуре с десятками тысяч записей.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_project_index [количество глобальных проектов]
+"""
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from WorkJSONFiles.api import apiFilesService
+from WorkProjectManager.App.StructureManager import StructureManager
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkProjectManager.AppData.schemas import MAIN_STRUCTURE_DATA
+
+OPERATIONS = 2000
+
+
+def linear_find(items, key, itemID):
+    """Прежний поиск: полный проход по списку со сравнением строк"""
+    for iD, item in enumerate(items):
+        if str(item[key]) == str(itemID):
+            return iD
+    raise KeyError(itemID)
+
+
+def build_manager(base_dir, count):
+    data = copy_json_data(MAIN_STRUCTURE_DATA)
+    data["DataChunks"][0]["GlobalProjectsData"] = [
+        {"GlobalProjectID": str(i), "GlobalProjectName": f"GP {i}", "GlobalProjectDescription": "",
+         "GlobalProjectProjectsData": [{"ProjectID": str(j), "ProjectName": f"P {j}", "ProjectType": "",
+                                        "ProjectDescription": "", "ProjectData": []} for j in range(1, 11)]}
+        for i in range(1, count + 1)]
+    data["DataChunks"][1]["ApplicationsData"] = [
+        {"ApplicationID": str(i), "ApplicationName": f"App {i}"} for i in range(1, count + 1)]
+    manager = StructureManager(apiFilesService(base_dir))
+    manager.load_main_data()
+    manager.load_main_structure_file_name()
+    manager.MAIN_STRUCTURE_DATA = data
+    manager.load_chunks_data()
+    manager.load_global_projects_data()
+    manager.load_applications_data()
+    return manager
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    logging.disable(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(1)
+    ids = [random.randint(1, count) for _ in range(OPERATIONS)]
+    base_dir = tempfile.mkdtemp()
+    try:
+        manager = build_manager(base_dir, count)
+        print(f"Глобальных проектов и приложений: {count}, операций: {OPERATIONS}")
+
+        def indexed_edit():
+            for iD in ids:
+                manager.edit_global_project_data(iD, "GlobalProjectName", "Edit")
+                manager.edit_application_data(iD, "ApplicationName", "Edit")
+                manager.get_chunk_data("ApplicationsData")
+
+        def linear_edit():
+            for iD in ids:
+                manager.globalProjectsList[linear_find(manager.globalProjectsList, "GlobalProjectID", iD)][
+                    "GlobalProjectName"] = "Edit"
+                manager.applicationsList[linear_find(manager.applicationsList, "ApplicationID", iD)][
+                    "ApplicationName"] = "Edit"
+
+        def indexed_projects():
+            for iD in ids:
+                manager.load_projects_data(iD)
+                manager.edit_project_data(5, "ProjectName", "Edit")
+
+        print(f"Редактирование, линейный поиск:  {timed(linear_edit):10.1f} мс")
+        print(f"Редактирование, индекс:          {timed(indexed_edit):10.1f} мс")
+        print(f"Загрузка и правка проектов:      {timed(indexed_projects):10.1f} мс")
+
+        delete_ids = random.sample(range(1, count + 1), OPERATIONS // 4)
+
+        def indexed_delete():
+            for iD in delete_ids:
+                manager.delete_global_project_data(iD)
+                manager.delete_application_data(iD)
+
+        linear = build_manager(base_dir, count)
+
+        def linear_delete():
+            for iD in delete_ids:
+                linear.globalProjectsList.pop(linear_find(linear.globalProjectsList, "GlobalProjectID", iD))
+                linear.applicationsList.pop(linear_find(linear.applicationsList, "ApplicationID", iD))
+
+        print(f"Удаление, линейный поиск:        {timed(linear_delete):10.1f} мс")
+        print(f"Удаление, индекс:                {timed(indexed_delete):10.1f} мс")
+        assert [gp["GlobalProjectID"] for gp in manager.globalProjectsList] == \
+               [gp["GlobalProjectID"] for gp in linear.globalProjectsList]
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
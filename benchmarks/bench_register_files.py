@@ -0,0 +1,79 @@
+"""
+Регистрация файлов директории в FSDocFile.json:
+    по одному   - AddFile + UpdateFile на каждый файл (как StructureUtils.new_file_metadata и
+                  set_file_metadata_name): две полные перезаписи документа на файл
+    пачкой      - MetadataUtils.register_files: проверка ID по множеству в памяти и одна запись
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_register_files
+"""
+import builtins
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+SIZES = (100, 500, 2000)
+
+
+@contextmanager
+def count_io(counter: dict):
+    real_open = builtins.open
+    real_replace = os.replace
+
+    def counting_open(file, mode='r', *args, **kwargs):
+        if str(file).endswith(".json") and 'r' in mode:
+            counter["reads"] += 1
+        return real_open(file, mode, *args, **kwargs)
+
+    def counting_replace(src, dst, *args, **kwargs):
+        counter["writes"] += 1
+        return real_replace(src, dst, *args, **kwargs)
+
+    with mock.patch("builtins.open", counting_open), mock.patch("os.replace", counting_replace):
+        yield counter
+
+
+def one_by_one(metadata, files):
+    # writeMetadataFSDocFile печатает отладочные сообщения - не учитываем их вывод
+    with redirect_stdout(StringIO()):
+        for file_id, name in files:
+            metadata.writeMetadataFSDocFile("AddFile", "Files", "SystemFiles", "", file_id=file_id)
+            metadata.writeMetadataFSDocFile("UpdateFile", "File", "SystemFiles", ["DirName", name], file_id=file_id)
+
+
+def batch(metadata, files):
+    metadata.register_files(files)
+
+
+def run(register, size):
+    directory = tempfile.mkdtemp()
+    counter = {"reads": 0, "writes": 0}
+    try:
+        metadata = MetadataUtils(directory)
+        metadata.createFSDocFile()
+        files = [(str(file_id), f"File{file_id}.json") for file_id in range(1, size + 1)]
+        with count_io(counter):
+            start = time.perf_counter()
+            register(metadata, files)
+            elapsed = time.perf_counter() - start
+        assert len(MetadataUtils(directory).readMetadataSDocFile("Files", "Files", "SystemFiles")) == size + 1
+        document_size = os.path.getsize(metadata.FSDocFile.get_file_path())
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return elapsed, counter, document_size
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    for size in SIZES:
+        for title, register in (("по одному", one_by_one), ("register_files", batch)):
+            elapsed, counter, document_size = run(register, size)
+            print(f"{title:<16} файлов: {size:>5}  чтений: {counter['reads']:>5}  записей: {counter['writes']:>5}  "
+                  f"документ: {document_size / 1024:7.1f} КБ  время: {elapsed * 1000:9.1f} мс")
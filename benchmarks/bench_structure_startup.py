@@ -0,0 +1,74 @@
+"""
+Время до первого окна (StructureManager.load_all_data) для структуры с 10 000 проектов:
+прежний Структурный Файл одним документом против раздельных файлов чанков (ChunkStorage).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_structure_startup [глобальных проектов] [проектов в каждом]
+"""
+import logging
+import shutil
+import sys
+import tempfile
+import time
+
+from TemplateProject.core.services.json_file_service import copy_json_data
+from WorkJSONFiles.App.DocumentCache import DocumentCache
+from WorkJSONFiles.api import apiFilesService
+from WorkProjectManager.App.StructureManager import StructureManager
+from WorkProjectManager.AppData.schemas import MAIN_DATA, MAIN_STRUCTURE_DATA, PROJECT_STRUCTURE_DATA
+
+ROUNDS = 5
+
+
+def generate_structure(global_projects_count, projects_count):
+    data = copy_json_data(MAIN_STRUCTURE_DATA)
+    data["DataChunks"][0]["GlobalProjectsData"] = [
+        {"GlobalProjectID": str(i), "GlobalProjectName": f"Глобальный проект {i}", "GlobalProjectDescription": "",
+         "GlobalProjectProjectsData": [
+             {"ProjectID": str(j), "ProjectName": f"Проект {i}-{j}", "ProjectType": "Code",
+              "ProjectDescription": "Описание проекта", "ProjectData": [copy_json_data(PROJECT_STRUCTURE_DATA)]}
+             for j in range(1, projects_count + 1)]}
+        for i in range(1, global_projects_count + 1)]
+    return data
+
+
+def cold_load(base_dir, legacy=False):
+    """Загрузка с пустым кэшем документов - как при запуске приложения"""
+    DocumentCache.for_directory(base_dir).invalidate()
+    start = time.perf_counter()
+    manager = StructureManager(apiFilesService(base_dir))
+    if legacy:
+        # Прежняя загрузка: весь Структурный Файл одним документом
+        manager.load_main_data()
+        manager.MAIN_STRUCTURE_DATA = manager.MainIFS.read_file(manager.MAIN_DATA["MainStructureFile"])
+        manager.load_chunks_data()
+        manager.load_global_projects_data()
+        manager.load_applications_data()
+    else:
+        manager.load_all_data()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    logging.disable(logging.INFO)
+    global_projects_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    projects_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    base_dir = tempfile.mkdtemp()
+    try:
+        MainIFS = apiFilesService(base_dir)
+        MainIFS.write_data("DataFile", copy_json_data(MAIN_DATA))
+        MainIFS.write_data("StructureFileDataMain", generate_structure(global_projects_count, projects_count))
+        print(f"Глобальных проектов: {global_projects_count}, проектов: {global_projects_count * projects_count}")
+
+        legacy = min(cold_load(base_dir, legacy=True) for _ in range(ROUNDS))
+        migration = cold_load(base_dir)
+        chunked = min(cold_load(base_dir) for _ in range(ROUNDS))
+        print(f"Один Структурный Файл:              {legacy:8.1f} мс")
+        print(f"Первый запуск с переносом в чанки:  {migration:8.1f} мс")
+        print(f"Раздельные файлы чанков:            {chunked:8.1f} мс")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
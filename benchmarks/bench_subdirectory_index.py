@@ -0,0 +1,76 @@
+"""
+Операции с SubdirectoryInfo директории с большим числом поддиректорий (документ в памяти, autoflush=False -
+запись на диск не учитывается):
+    перебор   - как раньше: max(SubdirectoryInfo, key=int) + 1 и проверка Dirname перебором на каждое добавление,
+                поиск по Dirname/DetailName и удаление по DetailName - перебором
+    индекс    - MetadataUtils: SubdirectoryIndex (следующий SdN, Dirname -> SdN, DetailName -> SdN)
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_subdirectory_index
+"""
+import logging
+import shutil
+import tempfile
+import time
+
+from TemplateProject.core.ss_utils.metadata_utils import MetadataUtils
+
+SIZES = (1000, 10000, 30000)
+OPERATIONS = 300
+
+
+def prepare(directory, size):
+    metadata = MetadataUtils(directory, autoflush=False)
+    metadata.createDSDocFile()
+    metadata.DSDoc.merge({"Directory": {"SubdirectoryInfo": {
+        str(number): {"Dirname": f"D{number}", "DetailName": f"Detail {number}", "DocFile": "DSDocFile.json"}
+        for number in range(1, size + 1)}}})
+    return metadata
+
+
+def scan(metadata, size):
+    doc = metadata.DSDoc
+    for number in range(OPERATIONS):
+        subdirectories = doc.subdirectories()
+        sdn = str(int(max(subdirectories, key=lambda x: int(x))) + 1)
+        if any(entry["Dirname"] == f"New{number}" for entry in subdirectories.values()):
+            raise AssertionError
+        doc.merge({"Directory": {"SubdirectoryInfo": {
+            sdn: {"Dirname": f"New{number}", "DetailName": f"New detail {number}", "DocFile": "DSDocFile.json"}}}})
+    for number in range(OPERATIONS):
+        name = f"D{size - number}"
+        found = next((sdn for sdn, entry in doc.subdirectories().items()
+                      if entry["Dirname"] == name or entry["DetailName"] == name), None)
+        assert found is not None
+    for number in range(OPERATIONS):
+        name = f"Detail {size - number}"
+        subdirectories = doc.subdirectories()
+        sdn = next(sdn for sdn in subdirectories if subdirectories[sdn]["DetailName"] == name)
+        doc.delete("Directory", "SubdirectoryInfo", sdn)
+
+
+def indexed(metadata, size):
+    for number in range(OPERATIONS):
+        assert metadata.writeMetadataDSDocFile("SubdirectoryInfo", "",
+                                               [f"New{number}", f"New detail {number}", "DSDocFile.json"]) == 2
+    for number in range(OPERATIONS):
+        assert metadata.find_subdirectory(f"D{size - number}")[1] is not None
+    for number in range(OPERATIONS):
+        assert metadata.removeSubdirMetadataDSDocFile("SubdirectoryInfo", f"Detail {size - number}") == 1
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    for size in SIZES:
+        for title, operations in (("перебор", scan), ("индекс", indexed)):
+            directory = tempfile.mkdtemp()
+            try:
+                metadata = prepare(directory, size)
+                start = time.perf_counter()
+                operations(metadata, size)
+                elapsed = time.perf_counter() - start
+                assert len(metadata.DSDoc.subdirectories()) == size + 1
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+            print(f"{title:<8} SdN: {size:>6}  по {OPERATIONS} добавлений, поисков, удалений: "
+                  f"{elapsed * 1000:9.1f} мс")